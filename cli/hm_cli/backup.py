@@ -0,0 +1,161 @@
+"""
+Backup module for the hm-cli tool.
+Compresses etcd snapshots chunk by chunk into gzip files, verifying the
+SHA-256 checksum etcd appends to every snapshot on the way, and rotates old
+snapshots according to a retention policy.
+"""
+
+import gzip
+import hashlib
+import os
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Optional
+
+
+DEFAULT_BACKUP_DIR = os.path.join(os.path.expanduser("~"), ".local", "share", "hm-cli", "backups", "etcd")
+# Snapshots kept per cluster by default
+DEFAULT_RETENTION = 7
+# Bytes read and compressed at a time, so memory use does not grow with the snapshot
+CHUNK_SIZE = 1024 * 1024
+
+# etcd appends the SHA-256 of the snapshot data to every snapshot it streams
+_CHECKSUM_SIZE = hashlib.sha256().digest_size
+_TIMESTAMP_FORMAT = "%Y%m%dT%H%M%SZ"
+
+
+class SnapshotError(Exception):
+    """A snapshot is incomplete or fails its checksum."""
+
+
+@dataclass
+class SnapshotFile:
+    """A compressed snapshot written to disk."""
+    path: str
+    # Bytes of the raw snapshot and of the compressed file
+    size: int
+    compressed_size: int
+    # SHA-256 of the compressed file, also written next to it as `<file>.sha256`
+    sha256: str
+    seconds: float
+
+
+def snapshot_name(cluster: str, when: Optional[datetime] = None) -> str:
+    """Return the file name of a compressed snapshot of a cluster taken at `when`."""
+    when = when or datetime.now(timezone.utc)
+    return f"etcd-{cluster}-{when.strftime(_TIMESTAMP_FORMAT)}.db.gz"
+
+
+def compress_snapshot(source: str, dest: str, verify: bool = True, chunk_size: int = CHUNK_SIZE) -> SnapshotFile:
+    """Compress a raw etcd snapshot into a gzip file.
+
+    The snapshot is read in chunks, hashed and compressed as it is read, so
+    only one chunk is held in memory at a time. The compressed file is written
+    under a temporary name and only renamed to `dest` once it is complete and,
+    if `verify` is set, the snapshot matched its checksum.
+
+    Args:
+        source: Raw snapshot, as written by `talosctl etcd snapshot`.
+        dest: Compressed file to write.
+        verify: Check the SHA-256 checksum etcd appends to the snapshot.
+        chunk_size: Bytes read at a time.
+
+    Returns:
+        The written file.
+
+    Raises:
+        SnapshotError: If the snapshot is too short or fails its checksum.
+    """
+    started = time.monotonic()
+    data_hash = hashlib.sha256()
+    file_hash = hashlib.sha256()
+    tail = b""
+    size = 0
+    tmp_file = f"{dest}.part"
+    try:
+        with open(source, 'rb') as raw, open(tmp_file, 'wb') as out:
+            # The file hash is computed over the compressed bytes as gzip writes them
+            with gzip.GzipFile(filename=os.path.basename(dest)[:-len(".gz")], mode='wb',
+                               fileobj=_HashingWriter(out, file_hash)) as compressed:
+                while True:
+                    chunk = raw.read(chunk_size)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    compressed.write(chunk)
+                    # Hold back the last bytes read; they may be the appended checksum
+                    data = tail + chunk
+                    data_hash.update(data[:-_CHECKSUM_SIZE])
+                    tail = data[-_CHECKSUM_SIZE:]
+        if verify:
+            if size <= _CHECKSUM_SIZE:
+                raise SnapshotError(f"Snapshot {source} is only {size} bytes long")
+            if tail != data_hash.digest():
+                raise SnapshotError(f"Snapshot {source} does not match its SHA-256 checksum")
+        os.replace(tmp_file, dest)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+
+    digest = file_hash.hexdigest()
+    with open(f"{dest}.sha256", 'w') as f:
+        f.write(f"{digest}  {os.path.basename(dest)}\n")
+    return SnapshotFile(dest, size, os.path.getsize(dest), digest, time.monotonic() - started)
+
+
+class _HashingWriter:
+    """File object wrapper hashing every byte written through it."""
+
+    def __init__(self, fileobj, digest):
+        self.fileobj = fileobj
+        self.digest = digest
+
+    def write(self, data: bytes) -> int:
+        self.digest.update(data)
+        return self.fileobj.write(data)
+
+    def flush(self) -> None:
+        self.fileobj.flush()
+
+
+def rotate_snapshots(directory: str, cluster: str, keep: int = DEFAULT_RETENTION,
+                     max_age_days: Optional[float] = None, now: Optional[datetime] = None) -> List[str]:
+    """Remove old compressed snapshots of a cluster.
+
+    Snapshots are ordered by the time in their name. The newest `keep`
+    snapshots are kept, minus those older than `max_age_days`; the newest
+    snapshot is never removed.
+
+    Args:
+        directory: Directory holding the snapshots.
+        cluster: Cluster whose snapshots are rotated; other files are left alone.
+        keep: Number of snapshots to keep.
+        max_age_days: Remove snapshots older than this many days.
+        now: Current time, replaceable in tests.
+
+    Returns:
+        Paths of the removed snapshots, oldest first.
+    """
+    pattern = re.compile(rf"^etcd-{re.escape(cluster)}-(\d{{8}}T\d{{6}}Z)\.db\.gz$")
+    snapshots = []
+    for name in os.listdir(directory) if os.path.isdir(directory) else []:
+        match = pattern.match(name)
+        if match:
+            taken = datetime.strptime(match.group(1), _TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+            snapshots.append((taken, os.path.join(directory, name)))
+    snapshots.sort(reverse=True)
+
+    now = now or datetime.now(timezone.utc)
+    removed = []
+    for index, (taken, path) in enumerate(snapshots):
+        expired = max_age_days is not None and (now - taken).total_seconds() > max_age_days * 86400
+        if index == 0 or (index < max(1, keep) and not expired):
+            continue
+        for file_path in (path, f"{path}.sha256"):
+            if os.path.exists(file_path):
+                os.remove(file_path)
+        removed.append(path)
+    return list(reversed(removed))
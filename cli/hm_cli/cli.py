@@ -4,13 +4,39 @@ Main CLI entry point for the hm-cli tool.
 
 import os
 import sys
+import importlib
 import click
 from rich.console import Console
 
-from hm_cli.core import logger, console, ConfigManager, get_repo_path
-from hm_cli.cluster import ClusterManager
-from hm_cli.service import ServiceManager
-from hm_cli.gitops import GitOpsManager
+from hm_cli.core import logger, console, ConfigManager, get_repo_path, configure_logging
+
+# Managers pull in GitPython, questionary and the Kubernetes client, so they are
+# imported when a command first needs them rather than when the CLI starts.
+_LAZY_IMPORTS = {
+    "ClusterManager": "hm_cli.cluster",
+    "ServiceManager": "hm_cli.service",
+    "GitOpsManager": "hm_cli.gitops",
+    "PodQuery": "hm_cli.status",
+}
+
+
+def __getattr__(name):
+    """Import lazily loaded names on first access (PEP 562)."""
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _lazy(name):
+    """Resolve a lazily imported name from inside this module.
+
+    Module-level `__getattr__` is not consulted for global lookups, so commands
+    go through this helper; names patched onto the module take precedence.
+    """
+    return globals().get(name) or __getattr__(name)
+
 
 @click.group()
 @click.version_option(version="0.1.0")
@@ -20,7 +46,7 @@ def cli():
     This tool helps manage the lifecycle of a homelab Kubernetes cluster
     based on Talos OS, Flux CD, and GitOps principles.
     """
-    pass
+    configure_logging()
 
 # Cluster commands
 @cli.group()
@@ -28,32 +54,133 @@ def cluster():
     """Manage Kubernetes cluster lifecycle."""
     pass
 
+def _apply_options(command):
+    """Add the options controlling how Talos configurations are applied to nodes."""
+    command = click.option("--serial-control-plane/--parallel-control-plane", default=None,
+                           help="Configure control plane nodes one at a time before the workers")(command)
+    command = click.option("--apply-concurrency", type=click.IntRange(min=1),
+                           help="Maximum number of nodes configured at once")(command)
+    return command
+
 @cluster.command("create")
-def cluster_create():
+@_apply_options
+@click.option("--resume", is_flag=True, help="Continue an interrupted creation, skipping the steps that already completed")
+@click.option("--from", "from_file", type=click.Path(exists=True, dir_okay=False),
+              help="Create the cluster described by an inventory file, without prompts")
+def cluster_create(apply_concurrency, serial_control_plane, resume, from_file):
     """Create a new Kubernetes cluster."""
-    manager = ClusterManager()
-    if not manager.create():
+    manager = _lazy("ClusterManager")()
+    if not manager.create(apply_concurrency=apply_concurrency, serial_control_plane=serial_control_plane,
+                          resume=resume, from_file=from_file):
         sys.exit(1)
 
 @cluster.command("upgrade")
-def cluster_upgrade():
+@_apply_options
+@click.option("--rolling/--all-at-once", default=None, help="Upgrade node by node, waiting for each node to be healthy")
+@click.option("--max-unavailable", type=click.IntRange(min=1), help="Maximum number of workers upgraded at once in a rolling upgrade")
+@click.option("--dry-run", is_flag=True, help="List the nodes whose configuration would change, without applying it")
+@click.option("--force", is_flag=True, help="Apply the configuration to every node, even if it is unchanged")
+@click.option("--pool", help="Only upgrade the workers of this pool")
+@click.option("--from", "from_file", type=click.Path(exists=True, dir_okay=False),
+              help="Read the nodes from an inventory file instead of discovering them")
+def cluster_upgrade(apply_concurrency, serial_control_plane, rolling, max_unavailable, dry_run, force, pool, from_file):
     """Upgrade an existing Kubernetes cluster."""
-    manager = ClusterManager()
-    if not manager.upgrade():
+    manager = _lazy("ClusterManager")()
+    if not manager.upgrade(apply_concurrency=apply_concurrency, serial_control_plane=serial_control_plane,
+                           rolling=rolling, max_unavailable=max_unavailable, dry_run=dry_run, force=force,
+                           pool=pool, from_file=from_file):
         sys.exit(1)
 
 @cluster.command("delete")
-def cluster_delete():
+@click.option("--concurrency", type=click.IntRange(min=1), help="Maximum number of nodes to reset at once")
+@click.option("--timeout", type=click.FloatRange(min=0, min_open=True), help="Seconds to wait for each node reset")
+def cluster_delete(concurrency, timeout):
     """Delete an existing Kubernetes cluster."""
-    manager = ClusterManager()
-    if not manager.delete():
+    manager = _lazy("ClusterManager")()
+    if not manager.delete(concurrency=concurrency, timeout=timeout):
         sys.exit(1)
 
 @cluster.command("status")
-def cluster_status():
+@click.option("--concurrency", type=click.IntRange(min=1), help="Maximum number of status checks to run at once")
+@click.option("--backend", type=click.Choice(["auto", "api", "kubectl"]), help="Read cluster state in-process (api) or through kubectl")
+@click.option("--watch", "watch", is_flag=True, help="Keep a live view of nodes, pods, Kustomizations and PVCs until interrupted")
+@click.option("--output", "-o", type=click.Choice(["json", "yaml", "ndjson"]), help="Write typed status records instead of tables")
+@click.option("--namespace", "-n", help="Only show pods in this namespace")
+@click.option("--selector", "-l", "label_selector", help="Only show pods matching this label selector")
+@click.option("--field-selector", help="Only show pods matching this field selector (e.g. status.phase!=Running)")
+@click.option("--pods", "pod_view", type=click.Choice(["summary", "full"]), help="Pod phases per namespace plus unhealthy pods (summary), or every pod (full)")
+@click.option("--refresh", is_flag=True, help="Query the cluster even if a recent status is cached")
+def cluster_status(concurrency, backend, watch, output, namespace, label_selector, field_selector, pod_view, refresh):
     """Show the status of the Kubernetes cluster."""
-    manager = ClusterManager()
-    if not manager.status():
+    if watch and output:
+        raise click.UsageError("--watch cannot be combined with --output")
+    if watch and (namespace or label_selector or field_selector or pod_view):
+        raise click.UsageError("Pod filters and --pods cannot be combined with --watch")
+    if watch and refresh:
+        raise click.UsageError("--refresh cannot be combined with --watch")
+    manager = _lazy("ClusterManager")()
+    if watch:
+        if not manager.watch_status(backend=backend):
+            sys.exit(1)
+        return
+    pod_query = None
+    if namespace or label_selector or field_selector or pod_view:
+        pod_query = _lazy("PodQuery")(namespace=namespace, label_selector=label_selector, field_selector=field_selector, view=pod_view)
+    if output:
+        if not manager.status(max_concurrency=concurrency, backend=backend, output=output, pod_query=pod_query, refresh=refresh):
+            sys.exit(1)
+        return
+    if not manager.status(max_concurrency=concurrency, backend=backend, pod_query=pod_query, refresh=refresh):
+        sys.exit(1)
+
+@cluster.group("inventory")
+def cluster_inventory():
+    """Show or refresh the cached cluster inventory."""
+    pass
+
+@cluster_inventory.command("show")
+def cluster_inventory_show():
+    """Show the cached nodes, IPs, roles and VIP of the cluster."""
+    manager = _lazy("ClusterManager")()
+    if not manager.show_inventory():
+        sys.exit(1)
+
+@cluster_inventory.command("refresh")
+def cluster_inventory_refresh():
+    """Discover the cluster again and update the cached inventory."""
+    manager = _lazy("ClusterManager")()
+    if not manager.refresh_inventory():
+        sys.exit(1)
+
+@cluster.group("etcd")
+def cluster_etcd():
+    """Maintain the etcd members of the control plane."""
+    pass
+
+@cluster_etcd.command("defrag")
+@click.option("--yes", "-y", is_flag=True, help="Do not ask for confirmation")
+@click.option("--allow-quorum-loss", is_flag=True,
+              help="Defragment etcd with fewer than three members, blocking the control plane meanwhile")
+def cluster_etcd_defrag(yes, allow_quorum_loss):
+    """Defragment etcd members one at a time, followers first and the leader last."""
+    manager = _lazy("ClusterManager")()
+    if not manager.defrag_etcd(yes=yes, allow_quorum_loss=allow_quorum_loss):
+        sys.exit(1)
+
+@cluster.group("backup")
+def cluster_backup():
+    """Back up cluster state."""
+    pass
+
+@cluster_backup.command("etcd")
+@click.option("--output-dir", type=click.Path(file_okay=False), help="Directory for the snapshots (default: backup.etcd_dir)")
+@click.option("--keep", type=click.IntRange(min=1), help="Number of snapshots to keep (default: backup.etcd_retention)")
+@click.option("--node", help="Name or IP of the control plane node to take the snapshot on")
+@click.option("--verify/--no-verify", default=True, help="Check the SHA-256 checksum etcd appends to the snapshot")
+def cluster_backup_etcd(output_dir, keep, node, verify):
+    """Take a compressed etcd snapshot and rotate old ones."""
+    manager = _lazy("ClusterManager")()
+    if not manager.backup_etcd(output_dir=output_dir, keep=keep, node=node, verify=verify):
         sys.exit(1)
 
 # Service commands
@@ -65,21 +192,21 @@ def service():
 @service.command("add")
 def service_add():
     """Add a new service to the cluster."""
-    manager = ServiceManager()
+    manager = _lazy("ServiceManager")()
     if not manager.add():
         sys.exit(1)
 
 @service.command("list")
 def service_list():
     """List all services in the cluster."""
-    manager = ServiceManager()
+    manager = _lazy("ServiceManager")()
     if not manager.list():
         sys.exit(1)
 
 @service.command("remove")
 def service_remove():
     """Remove a service from the cluster."""
-    manager = ServiceManager()
+    manager = _lazy("ServiceManager")()
     if not manager.remove():
         sys.exit(1)
 
@@ -93,7 +220,7 @@ def gitops():
 @click.option("--message", "-m", help="Commit message")
 def gitops_commit(message):
     """Commit changes to Git repository."""
-    manager = GitOpsManager()
+    manager = _lazy("GitOpsManager")()
     if not manager.commit(message):
         sys.exit(1)
 
@@ -102,14 +229,14 @@ def gitops_commit(message):
 @click.option("--branch", help="Branch name")
 def gitops_push(remote, branch):
     """Push changes to remote repository."""
-    manager = GitOpsManager()
+    manager = _lazy("GitOpsManager")()
     if not manager.push(remote, branch):
         sys.exit(1)
 
 @gitops.command("sync")
 def gitops_sync():
     """Trigger Flux synchronization."""
-    manager = GitOpsManager()
+    manager = _lazy("GitOpsManager")()
     if not manager.sync():
         sys.exit(1)
 
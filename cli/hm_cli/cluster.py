@@ -4,18 +4,71 @@ Handles cluster creation, upgrade, deletion, and status.
 """
 
 import os
+import re
 import sys
+import json
+import dataclasses
 import time
-from typing import Dict, Any, List, Optional
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Tuple, Callable
 
 import yaml
 import questionary
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
 from rich.panel import Panel
+from rich.live import Live
+from rich.console import Group
 from rich.table import Table
 from rich.text import Text
 
-from hm_cli.core import logger, console, ConfigManager, run_command, validate_ip_address, get_repo_path
+from hm_cli.core import (
+    logger, console, ConfigManager, run_command, run_commands, validate_ip_address, get_repo_path, COMMAND_TIMEOUT_RETURNCODE
+)
+from hm_cli.kube import KubeApiError, get_kube_backend
+from hm_cli.watch import ClusterWatch
+from hm_cli.journal import CreateJournal, CREATE_JOURNAL_FILE, input_digest
+from hm_cli.inventory import Inventory, InventoryCache, InventoryFileError, load_inventory_file, DEFAULT_INVENTORY_TTL
+from hm_cli.pools import POOL_LABEL, WorkerPool, group_by_pool, load_pools
+from hm_cli.talos import (
+    AppliedConfigs, TalosRenderer, TalosRenderError, file_digest, text_digest, APPLIED_CONFIGS_FILE, DEFAULT_SECRETS_FILE,
+    ROLE_DIRS
+)
+from hm_cli.rolling import (
+    NodeOperations, PhaseResult, RollingUpgrade, plan_batches, is_control_plane,
+    DEFAULT_MAX_UNAVAILABLE, DEFAULT_DRAIN_TIMEOUT, DEFAULT_NODE_READY_TIMEOUT, UPGRADE_PHASES
+)
+from hm_cli.waiter import Waiter, api_reachable, nodes_ready, etcd_healthy
+from hm_cli.report import (
+    StatusReport, PodRecord, VipProbeRecord, TcpProbeRecord, EtcdMemberRecord, build_report, pod_record, render_report
+)
+from hm_cli.backup import (
+    SnapshotError, compress_snapshot, rotate_snapshots, snapshot_name, DEFAULT_BACKUP_DIR, DEFAULT_RETENTION
+)
+from hm_cli.etcd import (
+    DefragResult, EtcdDefrag, MIN_DEFRAG_MEMBERS, format_bytes, member_records, member_rows,
+    DEFAULT_FRAGMENTATION_THRESHOLD, DEFAULT_RAFT_LAG_THRESHOLD, DEFAULT_LATENCY_THRESHOLD_MS, DEFAULT_DEFRAG_TIMEOUT
+)
+from hm_cli.probe import probe, probe_rows, probe_targets, DEFAULT_PROBE_ATTEMPTS, DEFAULT_PROBE_TIMEOUT
+from hm_cli.status import (
+    SectionBuffer, StatusCheck, StatusEngine, StatusTable, ClusterSnapshot, PodQuery, PodSummary, parse_kubectl_table,
+    StatusCache, StatusResults, DEFAULT_STATUS_CACHE_TTL, status_fields,
+    SYSTEM_POD_NAMESPACES, DEFAULT_STATUS_CONCURRENCY, SNAPSHOT_KINDS, FLUX_SOURCE_KINDS,
+    node_rows, pod_rows, storage_class_rows, pv_rows, pvc_rows, kustomization_rows, flux_source_rows
+)
+
+
+# Nodes configured at the same time by `talosctl apply-config`
+DEFAULT_APPLY_CONCURRENCY = 4
+
+# Nodes reset at the same time by `cluster delete`, and the time allowed per node
+DEFAULT_RESET_CONCURRENCY = 8
+DEFAULT_RESET_TIMEOUT = 300
+
+# Seconds to wait for a healthy cluster after bootstrapping and after an upgrade
+DEFAULT_BOOTSTRAP_TIMEOUT = 900
+DEFAULT_UPGRADE_WAIT_TIMEOUT = 1800
 
 
 class ClusterManager:
@@ -30,51 +83,154 @@ class ClusterManager:
         self.config = ConfigManager()
         self.repo_path = repo_path or get_repo_path()
         
-    def create(self) -> bool:
-        """Create a new Kubernetes cluster interactively, similar to bootstrap.sh."""
-        console.print(Panel.fit("🚀 Starting Homelab Cluster Creation Process 🚀", title="[bold cyan]Cluster Creation[/bold cyan]", subtitle="Interactive Setup"))
+    def create(self, apply_concurrency: Optional[int] = None, serial_control_plane: Optional[bool] = None,
+               resume: bool = False, from_file: Optional[str] = None) -> bool:
+        """Create a new Kubernetes cluster interactively, similar to bootstrap.sh.
+
+        Every completed step is recorded in `.hm-cli/create-journal.json` in the
+        repository together with a digest of its inputs.
+
+        Args:
+            apply_concurrency: Maximum number of nodes configured at the same time.
+            serial_control_plane: Configure control plane nodes one at a time.
+            resume: Continue an interrupted creation, skipping the steps that completed
+                with unchanged inputs and only configuring nodes that did not get their
+                configuration yet.
+            from_file: Inventory file listing the cluster and its nodes. The cluster is
+                then created without any prompts.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        journal = self._create_journal()
+        cluster_info = None
+        if from_file:
+            try:
+                cluster_info = load_inventory_file(from_file)
+            except InventoryFileError as e:
+                console.print(f"[bold red]Error: {e}[/bold red]")
+                return False
+            if resume and journal.cluster_info and journal.cluster_info != cluster_info:
+                console.print("[yellow]The inventory differs from the interrupted creation; starting from the beginning.[/yellow]")
+                resume = False
+        if resume and not journal.cluster_info:
+            console.print("[yellow]No interrupted cluster creation to resume; starting from the beginning.[/yellow]")
+            resume = False
+
+        succeeded = self._create_steps(journal, resume, apply_concurrency, serial_control_plane, cluster_info)
+        if journal.cluster_info and not journal.finished():
+            # Failed or skipped steps, including the Flux steps that do not abort the creation
+            console.print("[yellow]Completed steps were recorded. Run `hm-cli cluster create --resume` "
+                          "to continue with the steps that failed or were skipped.[/yellow]")
+        elif succeeded:
+            journal.clear()
+        return succeeded
+
+    def _create_journal(self) -> CreateJournal:
+        """Return the journal of the current cluster creation."""
+        return CreateJournal(os.path.join(self.repo_path, CREATE_JOURNAL_FILE))
+
+    @staticmethod
+    def _journaled(journal: CreateJournal, step: str, digest: str, title: str) -> bool:
+        """Return True, and say so, if a step already completed with the same inputs."""
+        if journal.done(step, digest):
+            console.print(f"[dim]Skipping {title}: completed at {journal.completed_at(step)} with the same inputs.[/dim]")
+            return True
+        return False
+
+    def _talos_configs_digest(self, cluster_info: Dict[str, Any]) -> str:
+        """Return a digest of the cluster information and the current Talos configuration files."""
+        project_root = self._talos_project_root()
+        digests = []
+        for node in cluster_info['nodes']:
+            path = self._talos_config_file(node, project_root)
+            digests.append(file_digest(path) if os.path.exists(path) else None)
+        return input_digest(cluster_info, digests)
+
+    def _create_steps(self, journal: CreateJournal, resume: bool, apply_concurrency: Optional[int],
+                      serial_control_plane: Optional[bool], inventory: Optional[Dict[str, Any]] = None) -> bool:
+        """Run the steps of `create`, recording each completed step in the journal.
+
+        Args:
+            inventory: Cluster information loaded from an inventory file. If given,
+                every step runs without asking.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        interactive = inventory is None
+
+        def confirm(message: str, default: bool = True) -> bool:
+            return questionary.confirm(message, default=default).ask() if interactive else True
+
+        console.print(Panel.fit("🚀 Starting Homelab Cluster Creation Process 🚀", title="[bold cyan]Cluster Creation[/bold cyan]",
+                                subtitle="Interactive Setup" if interactive else "From Inventory"))
 
         # 0. Collect cluster information
         console.print("\n[bold blue]Step 0: Collecting Cluster Information[/bold blue]")
-        cluster_info = self._collect_cluster_info()
-        if not cluster_info:
-            console.print("[bold red]Cluster information collection cancelled or failed. Aborting.[/bold red]")
-            return False
-        console.print("[green]Cluster information collected successfully.[/green]")
+        if resume:
+            cluster_info = journal.cluster_info
+            console.print(f"[dim]Resuming the creation of cluster {cluster_info['name']} started at {journal.entries.get('started_at')}.[/dim]")
+        elif inventory is not None:
+            cluster_info = inventory
+            self._save_cluster_settings(cluster_info)
+            journal.start(cluster_info)
+            roles = [node['type'] for node in cluster_info['nodes']]
+            console.print(f"[green]Inventory loaded: {roles.count('controlplane')} control plane and {roles.count('worker')} worker node(s).[/green]")
+        else:
+            cluster_info = self._collect_cluster_info()
+            if not cluster_info:
+                console.print("[bold red]Cluster information collection cancelled or failed. Aborting.[/bold red]")
+                return False
+            journal.start(cluster_info)
+            console.print("[green]Cluster information collected successfully.[/green]")
+        try:
+            self._inventory_cache().put(self.repo_path, Inventory.from_cluster_info(cluster_info, source="create"))
+        except OSError as e:
+            logger.warning(f"Could not cache the cluster inventory: {e}")
+        cluster_digest = input_digest(cluster_info)
 
         # 1. Generate Talos configurations
         console.print("\n[bold blue]Step 1: Talos Configurations[/bold blue]")
-        generate_talos_configs = True
-        if os.path.exists(os.path.join(self.repo_path, "infrastructure", "talos", "controlplane", f"{cluster_info['nodes'][0]['name']}.yaml")):
-            if not questionary.confirm("Talos configurations might already exist. Do you want to re-generate them?", default=False).ask():
-                generate_talos_configs = False
-                console.print("[yellow]Skipping Talos configuration generation.[/yellow]")
-        
-        if generate_talos_configs:
-            if not questionary.confirm("Proceed with generating Talos configurations?", default=True).ask():
-                console.print("[yellow]Talos configuration generation skipped by user. Aborting.[/yellow]")
-                return False
-            if not self._generate_talos_configs(cluster_info):
-                console.print("[bold red]Failed to generate Talos configurations. Aborting.[/bold red]")
-                return False
-            console.print("[green]Talos configurations generated successfully.[/green]")
+        if not self._journaled(journal, "configs", self._talos_configs_digest(cluster_info), "generating Talos configurations"):
+            generate_talos_configs = True
+            if os.path.exists(os.path.join(self.repo_path, "infrastructure", "talos", "controlplane", f"{self._bootstrap_node(cluster_info)['name']}.yaml")):
+                if not confirm("Talos configurations might already exist. Do you want to re-generate them?", default=False):
+                    generate_talos_configs = False
+                    console.print("[yellow]Skipping Talos configuration generation.[/yellow]")
+            
+            if generate_talos_configs:
+                if not confirm("Proceed with generating Talos configurations?", default=True):
+                    console.print("[yellow]Talos configuration generation skipped by user. Aborting.[/yellow]")
+                    return False
+                if not self._generate_talos_configs(cluster_info):
+                    console.print("[bold red]Failed to generate Talos configurations. Aborting.[/bold red]")
+                    return False
+                console.print("[green]Talos configurations generated successfully.[/green]")
+            journal.record("configs", self._talos_configs_digest(cluster_info))
 
         # 2. Apply Talos configurations to nodes
         console.print("\n[bold blue]Step 2: Applying Talos Configurations to Nodes[/bold blue]")
-        if not questionary.confirm("Continue with applying Talos configurations to nodes?", default=True).ask():
-            console.print("[yellow]Applying Talos configurations skipped by user. Aborting.[/yellow]")
-            return False
-        if not self._apply_talos_configs(cluster_info):
-            console.print("[bold red]Failed to apply Talos configurations to nodes. Aborting.[/bold red]")
-            return False
-        console.print("[green]Talos configurations applied to nodes successfully.[/green]")
+        configs_digest = self._talos_configs_digest(cluster_info)
+        if not self._journaled(journal, "apply", configs_digest, "applying Talos configurations"):
+            if not confirm("Continue with applying Talos configurations to nodes?", default=True):
+                console.print("[yellow]Applying Talos configurations skipped by user. Aborting.[/yellow]")
+                return False
+            # When resuming, nodes that already run their configuration are skipped
+            if not self._apply_talos_configs(cluster_info, concurrency=apply_concurrency,
+                                             serial_control_plane=serial_control_plane, only_changed=resume):
+                console.print("[bold red]Failed to apply Talos configurations to nodes. Aborting.[/bold red]")
+                return False
+            journal.record("apply", configs_digest)
+            console.print("[green]Talos configurations applied to nodes successfully.[/green]")
 
         # 3. Bootstrap the cluster
         console.print("\n[bold blue]Step 3: Bootstrapping the Cluster[/bold blue]")
-        if not questionary.confirm("Continue with bootstrapping the cluster?", default=True).ask():
-            console.print("[yellow]Cluster bootstrapping skipped by user. Aborting.[/yellow]")
-            return False
-        if not self._bootstrap_cluster(cluster_info):
+        if not (journal.done("bootstrap", cluster_digest) and journal.done("kubeconfig", self._kubeconfig_digest())):
+            if not confirm("Continue with bootstrapping the cluster?", default=True):
+                console.print("[yellow]Cluster bootstrapping skipped by user. Aborting.[/yellow]")
+                return False
+        if not self._bootstrap_cluster(cluster_info, journal):
             console.print("[bold red]Failed to bootstrap the cluster. Aborting.[/bold red]")
             return False
         console.print("[green]Cluster bootstrapped successfully.[/green]")
@@ -88,28 +244,40 @@ class ClusterManager:
 
         # 4. Setup Flux CD
         console.print("\n[bold blue]Step 4: Setting up Flux CD[/bold blue]")
-        if not questionary.confirm("Continue with creating initial Flux directory structure and files?", default=True).ask():
+        if self._journaled(journal, "flux_directories", cluster_digest, "creating Flux directories"):
+            pass
+        elif not confirm("Continue with creating initial Flux directory structure and files?", default=True):
             console.print("[yellow]Flux directory creation skipped by user.[/yellow]")
         elif not self._create_flux_directories_and_files(cluster_info):
             console.print("[bold red]Failed to create Flux directories/files. Flux setup might be incomplete.[/bold red]")
         else:
+            journal.record("flux_directories", cluster_digest)
             console.print("[green]Flux directories and kustomization files created successfully.[/green]")
 
-        if not questionary.confirm("Continue with bootstrapping Flux (running `flux bootstrap github`)?", default=True).ask():
+        if self._journaled(journal, "flux", cluster_digest, "bootstrapping Flux"):
+            pass
+        elif not interactive and not self._flux_settings_complete(cluster_info):
+            console.print("[yellow]Flux bootstrapping skipped: the inventory needs flux.repository and "
+                          "flux.owner (or the git.user_name setting).[/yellow]")
+        elif not confirm("Continue with bootstrapping Flux (running `flux bootstrap github`)?", default=True):
             console.print("[yellow]Flux bootstrapping skipped by user.[/yellow]")
         elif not self._setup_flux(cluster_info): # _setup_flux already handles KUBECONFIG
             console.print("[bold red]Failed to set up Flux. Aborting further GitOps setup.[/bold red]")
             # Allow to continue to core components if user wants
         else:
+            journal.record("flux", cluster_digest)
             console.print("[green]Flux bootstrapped successfully.[/green]")
             
         # 5. Setup core components
         console.print("\n[bold blue]Step 5: Setting up Core Component Manifest Stubs[/bold blue]")
-        if not questionary.confirm("Continue with creating directory structure for core components?", default=True).ask():
+        if self._journaled(journal, "core_components", cluster_digest, "creating core component directories"):
+            pass
+        elif not confirm("Continue with creating directory structure for core components?", default=True):
             console.print("[yellow]Core component directory creation skipped by user.[/yellow]")
         elif not self._create_core_component_directories_and_files(cluster_info):
             console.print("[bold red]Failed to create core component directories/files.[/bold red]")
         else:
+            journal.record("core_components", cluster_digest)
             console.print("[green]Core component directory structure created successfully.[/green]")
             console.print("[yellow]You'll need to add actual manifests for each component in 'cluster/core/...'[/yellow]")
 
@@ -127,8 +295,29 @@ class ClusterManager:
         ))
         return True
 
-    def upgrade(self) -> bool:
+    def upgrade(self, apply_concurrency: Optional[int] = None, serial_control_plane: Optional[bool] = None,
+                rolling: Optional[bool] = None, max_unavailable: Optional[int] = None,
+                dry_run: bool = False, force: bool = False, pool: Optional[str] = None,
+                from_file: Optional[str] = None) -> bool:
         """Upgrade an existing Kubernetes cluster.
+
+        Args:
+            apply_concurrency: Maximum number of nodes configured at the same time.
+            serial_control_plane: Configure control plane nodes one at a time.
+            rolling: Upgrade node by node, draining each node and waiting for it to be
+                healthy before moving on. If None, uses `cluster.upgrade_strategy`.
+            max_unavailable: Maximum number of workers upgraded at the same time in a
+                rolling upgrade. If None, uses `cluster.upgrade_max_unavailable`.
+            dry_run: Render the configurations in memory and list the nodes they
+                would be applied to, without asking for confirmation, touching any
+                node, the working tree or the CLI configuration. The target
+                versions are still asked for, since the configurations depend on them.
+            force: Apply the configuration to every node, even if it is unchanged
+                since it was last applied.
+            pool: Only configure, upgrade and wait for the workers of this pool,
+                leaving the control plane and all other nodes untouched.
+            from_file: Inventory file listing the nodes, used instead of the
+                discovered nodes, e.g. to configure the workers of a new pool.
         
         Returns:
             True if successful, False otherwise.
@@ -136,26 +325,48 @@ class ClusterManager:
         console.print(Panel.fit("Upgrading Kubernetes cluster", title="Cluster Upgrade"))
         
         # Get cluster information
-        cluster_info = self._get_current_cluster_info()
+        if from_file:
+            try:
+                cluster_info = load_inventory_file(from_file)
+            except InventoryFileError as e:
+                console.print(f"[bold red]Error: {e}[/bold red]")
+                return False
+        else:
+            cluster_info = self._get_current_cluster_info()
         if not cluster_info:
             return False
+
+        if pool:
+            members = [node for node in cluster_info['nodes'] if node.get('pool') == pool]
+            if not members:
+                console.print(f"[bold red]Error: No worker nodes in pool '{pool}'.[/bold red]")
+                return False
+            console.print(f"Upgrading {len(members)} node(s) of pool {pool}: {', '.join(node['name'] for node in members)}")
+            cluster_info = dict(cluster_info, nodes=members)
         
-        # Confirm upgrade
-        if not questionary.confirm("Are you sure you want to upgrade the cluster?").ask():
-            console.print("[yellow]Upgrade cancelled.[/yellow]")
-            return False
+        # Confirm upgrade; a dry run changes nothing that needs confirming
+        if not dry_run:
+            if not questionary.confirm("Are you sure you want to upgrade the cluster?").ask():
+                console.print("[yellow]Upgrade cancelled.[/yellow]")
+                return False
+            if from_file and cluster_info.get('pools'):
+                self.config.set('cluster.pools', cluster_info['pools'])
         
-        # Get upgrade targets
+        # Get upgrade targets; empty answers keep the versions the cluster runs now
+        current = self._with_target_versions(cluster_info, "", "")
         k8s_version = questionary.text(
-            "Kubernetes version to upgrade to (leave empty for latest):",
+            f"Kubernetes version to upgrade to (leave empty to keep {current['kubernetes_version']}):",
             default=""
         ).ask()
         
         talos_version = questionary.text(
-            "Talos version to upgrade to (leave empty for latest):",
+            f"Talos version to upgrade to (leave empty to keep {current['talos_version']}):",
             default=""
         ).ask()
         
+        if rolling is None:
+            rolling = self.config.get('cluster.upgrade_strategy', 'all') == 'rolling'
+
         # Perform upgrade
         with Progress(
             SpinnerColumn(),
@@ -163,29 +374,44 @@ class ClusterManager:
             console=console
         ) as progress:
             task = progress.add_task("Upgrading cluster...", total=None)
-            
+
+            if dry_run:
+                progress.stop()
+                return self._preview_upgrade(cluster_info, k8s_version, talos_version)
+
             # Update Talos configurations
             if not self._update_talos_configs(cluster_info, k8s_version, talos_version):
                 progress.stop()
                 return False
-            
-            # Apply updated configurations
-            if not self._apply_talos_configs(cluster_info, is_upgrade=True):
-                progress.stop()
-                return False
-            
-            # Wait for upgrade to complete
-            if not self._wait_for_upgrade(cluster_info):
-                progress.stop()
-                return False
+
+            if rolling:
+                # Upgrade node by node, each gated on its own health
+                if not self._rolling_upgrade(cluster_info, talos_version, max_unavailable, only_changed=not force):
+                    progress.stop()
+                    return False
+            else:
+                # Apply updated configurations
+                if not self._apply_talos_configs(cluster_info, is_upgrade=True, concurrency=apply_concurrency,
+                                                 serial_control_plane=serial_control_plane, only_changed=not force):
+                    progress.stop()
+                    return False
+
+                # Wait for upgrade to complete
+                if not self._wait_for_upgrade(cluster_info):
+                    progress.stop()
+                    return False
             
             progress.update(task, completed=True)
         
         console.print("[bold green]Cluster upgraded successfully![/bold green]")
         return True
     
-    def delete(self) -> bool:
+    def delete(self, concurrency: Optional[int] = None, timeout: Optional[float] = None) -> bool:
         """Delete an existing Kubernetes cluster.
+
+        Args:
+            concurrency: Maximum number of nodes reset at the same time.
+            timeout: Seconds to wait for each node reset.
         
         Returns:
             True if successful, False otherwise.
@@ -215,7 +441,7 @@ class ClusterManager:
             task = progress.add_task("Deleting cluster...", total=None)
             
             # Reset nodes
-            if not self._reset_nodes(cluster_info):
+            if not self._reset_nodes(cluster_info, concurrency=concurrency, timeout=timeout):
                 progress.stop()
                 return False
             
@@ -229,12 +455,36 @@ class ClusterManager:
         console.print("[bold green]Cluster deleted successfully![/bold green]")
         return True
     
-    def status(self) -> bool:
+    def status(self, max_concurrency: Optional[int] = None, backend: Optional[str] = None, output: Optional[str] = None,
+               pod_query: Optional[PodQuery] = None, refresh: bool = False) -> bool:
         """Show the status of the Kubernetes cluster.
 
+        All checks run concurrently; their sections are still printed in a fixed order.
+        A run within `cluster.status_cache_ttl` seconds of an earlier one with the
+        same kubeconfig, cluster and pod filters is rendered from the status cache.
+
+        Args:
+            max_concurrency: Maximum number of checks to run at once (with `output`, of
+                list calls in flight). If None, uses `cluster.status_concurrency` from
+                the configuration.
+            backend: How to read cluster state: `auto`, `api` (in-process client) or
+                `kubectl`. If None, uses `cluster.kube_backend` from the configuration.
+            output: Machine-readable format (`json`, `yaml` or `ndjson`). If set, typed
+                records are written to stdout instead of tables.
+            pod_query: Filters and view of the pods section. If None or without a view,
+                uses the view configured as `cluster.status_pod_view` (default: summary).
+            refresh: Query the cluster even if a cached run is fresh.
+
         Returns:
             True if successful, False otherwise.
         """
+        pod_query = pod_query or PodQuery(view=None)
+        if pod_query.view is None:
+            pod_query = dataclasses.replace(pod_query, view=self.config.get('cluster.status_pod_view', 'summary'))
+
+        if output:
+            return self._status_output(output, backend, pod_query=pod_query, refresh=refresh, max_concurrency=max_concurrency)
+
         console.print(Panel.fit("Kubernetes Cluster Status", title="[bold cyan]Cluster Status[/bold cyan]"))
 
         kubeconfig_path = os.path.join(self.repo_path, "kubeconfig")
@@ -246,294 +496,653 @@ class ClusterManager:
         env = os.environ.copy()
         env["KUBECONFIG"] = kubeconfig_path
 
+        if max_concurrency is None:
+            max_concurrency = self.config.get('cluster.status_concurrency', DEFAULT_STATUS_CONCURRENCY)
+
+        cache = self._status_cache()
+        cache_key = self._status_cache_key(kubeconfig_path, "tables", pod_query)
+        cached = None if refresh else cache.get(cache_key)
+        if cached:
+            kube = None
+            snapshot, results = cached.snapshot(), cached.status_results()
+            console.print(f"[dim]Showing the cluster status from {cached.age():.0f}s ago (cached); use --refresh to query the cluster.[/dim]")
+        else:
+            try:
+                kube = self._get_kube_backend(env, backend)
+            except KubeApiError as e:
+                console.print(f"[bold red]Error: {e}[/bold red]")
+                return False
+            logger.debug(f"Reading cluster state through the {kube.name} backend")
+
+            # One list call per kind, shared by every section
+            snapshot = self._status_snapshot(kube, pod_query)
+            results = StatusResults()
+        # Resolved here so discovery messages are not printed from a worker thread
+        cluster_info = None if cached else self._get_current_cluster_info()
+
+        checks = [
+            StatusCheck("nodes", lambda out: self._check_node_status(env, out=out, snapshot=snapshot)),
+            StatusCheck("pods", lambda out: self._check_pod_status(env, out=out, snapshot=snapshot, kube=kube, query=pod_query, results=results)),
+            StatusCheck("flux", lambda out: self._check_flux_status(env, out=out, snapshot=snapshot)),
+            StatusCheck("storage", lambda out: self._check_storage_status(env, out=out, snapshot=snapshot)),
+            StatusCheck("kube-vip", lambda out: self._check_kube_vip_status(env, out=out, snapshot=snapshot)),
+            StatusCheck("vip", lambda out: self._check_endpoint_reachability(kubeconfig_path, out=out, results=results,
+                                                                                cluster_info=cluster_info)),
+            StatusCheck("etcd", lambda out: self._check_etcd_health(env, out=out, snapshot=snapshot, results=results)),
+        ]
+
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=console,
             transient=True # Clears progress on exit
         ) as progress:
-            # Total tasks: nodes, pods, flux (kustomizations+sources is one logical step for progress), storage, kube-vip, vip-ping, etcd
-            num_tasks = 7
-            task = progress.add_task("Fetching cluster status...", total=num_tasks)
-
-            # 1. Node Status
-            progress.update(task, description="Fetching node status...")
-            self._check_node_status(env)
-            progress.advance(task)
-
-            # 2. Pod Status
-            progress.update(task, description="Fetching pod status...")
-            self._check_pod_status(env)
-            progress.advance(task)
-
-            # 3. Flux Status
-            progress.update(task, description="Fetching Flux status...")
-            self._check_flux_status(env)
-            progress.advance(task)
-
-            # 4. Storage Status (CubeFS & Generic)
-            progress.update(task, description="Fetching storage status...")
-            self._check_storage_status(env) # This will handle CubeFS and generic storage
-            progress.advance(task)
-
-            # 5. Kube-vip Status
-            progress.update(task, description="Fetching kube-vip status...")
-            self._check_kube_vip_status(env)
-            progress.advance(task)
-            
-            # 6. Virtual IP Accessibility
-            cluster_info = self._get_current_cluster_info()
-            vip_to_check = "192.168.1.100" # Default from script
-            if cluster_info and cluster_info.get('control_plane_vip'):
-                vip_to_check = cluster_info['control_plane_vip']
+            task = progress.add_task("Fetching cluster status...", total=len(checks))
+
+            def on_progress(finished: int, pending: List[str]):
+                progress.update(task, completed=finished, description=f"Waiting for: {', '.join(pending)}..." if pending else "Done.")
+
+            try:
+                StatusEngine(checks, max_concurrency=max_concurrency).run(on_progress=on_progress)
+            finally:
+                snapshot.close()
+                if kube is not None:
+                    kube.close()
+
+        if not cached:
+            self._cache_status(cache, cache_key, snapshot, results)
+        console.print("\n[bold green]Cluster status check complete.[/bold green]")
+        return True
+
+    def _status_cache(self) -> StatusCache:
+        """Return the cache of recent status runs."""
+        return StatusCache(ttl=float(self.config.get('cluster.status_cache_ttl', DEFAULT_STATUS_CACHE_TTL)))
+
+    def _status_cache_key(self, kubeconfig_path: str, mode: str, pod_query: PodQuery) -> str:
+        """Return the status cache key of a run rendering `mode` (tables or records) for a pod query."""
+        return StatusCache.key(kubeconfig_path, self.config.get('cluster.name', 'homelab'), mode=mode,
+                               pods=dataclasses.asdict(pod_query))
+
+    @staticmethod
+    def _cache_status(cache: StatusCache, key: str, snapshot: ClusterSnapshot, results: StatusResults) -> None:
+        """Store a live status run; the status itself does not depend on the cache being writable."""
+        try:
+            cache.put(key, snapshot, results)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not cache the cluster status: {e}")
+
+    def _status_snapshot(self, kube: Any, pod_query: PodQuery, max_concurrency: Optional[int] = None) -> ClusterSnapshot:
+        """Start the snapshot for a status run.
+
+        Unless every pod is shown in full, the pods section pages through the
+        pods on its own, so the snapshot only holds the system pods the
+        kube-vip, etcd and CubeFS sections need. `max_concurrency` caps the list
+        calls in flight; by default every kind is listed at once.
+        """
+        limit = {} if max_concurrency is None else {"max_concurrency": max_concurrency}
+        if pod_query.view == "full" and not pod_query.filtered:
+            return ClusterSnapshot(kube, **limit)
+        return ClusterSnapshot(kube, scopes={"pods": SYSTEM_POD_NAMESPACES}, **limit)
+
+    def _status_output(self, output: str, backend: Optional[str] = None, pod_query: Optional[PodQuery] = None,
+                       refresh: bool = False, max_concurrency: Optional[int] = None) -> bool:
+        """Write the cluster status as typed records in a machine-readable format.
+
+        Anything the collection prints (warnings, log messages) goes to stderr so
+        stdout only carries the serialized report. A report answered from the
+        status cache keeps the `generated_at` time of the run that queried the cluster.
+
+        Args:
+            output: One of `json`, `yaml` or `ndjson`.
+            backend: How to read cluster state; see `status`.
+            pod_query: Pod filters; see `status`.
+            refresh: Query the cluster even if a cached run is fresh.
+            max_concurrency: Maximum number of list calls in flight. If None, uses
+                `cluster.status_concurrency` from the configuration.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        kubeconfig_path = os.path.join(self.repo_path, "kubeconfig")
+        if not os.path.exists(kubeconfig_path):
+            sys.stderr.write(f"Error: Kubeconfig not found at {kubeconfig_path}. Cluster may not be initialized.\n")
+            return False
+
+        env = os.environ.copy()
+        env["KUBECONFIG"] = kubeconfig_path
+        pod_query = pod_query or PodQuery()
+        if max_concurrency is None:
+            max_concurrency = self.config.get('cluster.status_concurrency', DEFAULT_STATUS_CONCURRENCY)
+        cache = self._status_cache()
+        cache_key = self._status_cache_key(kubeconfig_path, "records", pod_query)
+        cached = None if refresh else cache.get(cache_key)
+
+        with console.capture() as capture:
+            kube, error = None, None
+            if cached:
+                snapshot, results = cached.snapshot(), cached.status_results()
+                console.print(f"[dim]Cluster status from {cached.age():.0f}s ago (cached); use --refresh to query the cluster.[/dim]")
             else:
-                # Attempt to get VIP from kubeconfig if not in CLI config
                 try:
-                    with open(kubeconfig_path, 'r') as f_kc:
-                        kc_data = yaml.safe_load(f_kc)
-                        if kc_data and 'clusters' in kc_data and kc_data['clusters']:
-                            server_url = kc_data['clusters'][0].get('cluster', {}).get('server', '')
-                            if server_url:
-                                # Extract IP from https://IP:PORT
-                                vip_from_kc = server_url.split('//')[-1].split(':')[0]
-                                # Validate if it's an IP before using
-                                if all(c.isdigit() or c == '.' for c in vip_from_kc) and vip_from_kc.count('.') == 3: # Basic IP check
-                                    vip_to_check = vip_from_kc
-                                    console.print(f"[dim]Using VIP {vip_to_check} from kubeconfig for ping test.[/dim]")
-                                else:
-                                    console.print(f"[yellow]Could not parse valid IP from kubeconfig server URL ('{server_url}'). Using default {vip_to_check} for ping test.[/yellow]")
-                except FileNotFoundError:
-                     console.print(f"[yellow]Kubeconfig file not found at {kubeconfig_path} for VIP check. Using default {vip_to_check}.[/yellow]")
-                except Exception as e:
-                    console.print(f"[yellow]Could not read VIP from kubeconfig ({e}). Using default {vip_to_check} for ping test.[/yellow]")
-                
-                if vip_to_check == "192.168.1.100": # If still default after trying kubeconfig
-                     console.print(f"[yellow]Control plane VIP not found in CLI config or kubeconfig. Using default {vip_to_check} for ping test.[/yellow]")
+                    kube = self._get_kube_backend(env, backend)
+                except KubeApiError as e:
+                    error = str(e)
+                if kube is not None:
+                    # Records always describe every selected pod, whatever the table view
+                    snapshot = self._status_snapshot(kube, dataclasses.replace(pod_query, view="full"), max_concurrency)
+                    results = StatusResults()
+            if error is None:
+                try:
+                    report = self._status_report(env, kubeconfig_path, snapshot, results)
+                    if pod_query.filtered:
+                        try:
+                            report.pods = [PodRecord(**pod) for pod in results.get("pod_records", lambda: [
+                                dataclasses.asdict(pod_record(pod))
+                                for page in kube.iter_pages("pods", namespace=pod_query.namespace, label_selector=pod_query.label_selector,
+                                                            field_selector=pod_query.field_selector)
+                                for pod in page
+                            ])]
+                        except KubeApiError as e:
+                            report.pods = []
+                            report.errors["pods"] = str(e)
+                finally:
+                    snapshot.close()
+                    if kube is not None:
+                        kube.close()
+                if cached:
+                    report.generated_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(cached.created_at))
+                else:
+                    self._cache_status(cache, cache_key, snapshot, results)
+        diagnostics = capture.get()
+        if diagnostics.strip():
+            sys.stderr.write(diagnostics)
+        if error is not None:
+            sys.stderr.write(f"Error: {error}\n")
+            return False
 
+        sys.stdout.write(render_report(report, output))
+        sys.stdout.flush()
+        return True
 
-            progress.update(task, description=f"Checking Virtual IP ({vip_to_check}) accessibility...")
-            self._check_vip_accessibility(vip_to_check)
-            progress.advance(task)
+    def watch_status(self, backend: Optional[str] = None, refresh_interval: float = 10.0) -> bool:
+        """Show a live view of nodes, pods, Flux Kustomizations and PVCs.
 
-            # 7. Etcd Health
-            progress.update(task, description="Fetching etcd health...")
-            self._check_etcd_health(env)
-            progress.advance(task)
+        Each kind is listed once and then followed through watch streams, so
+        network traffic is proportional to the changes in the cluster rather
+        than to its size. With the kubectl backend the kinds are relisted
+        periodically instead. Runs until interrupted.
 
-        console.print("\n[bold green]Cluster status check complete.[/bold green]")
+        Args:
+            backend: How to read cluster state: `auto`, `api` (in-process client) or
+                `kubectl`. If None, uses `cluster.kube_backend` from the configuration.
+            refresh_interval: Re-render at least this often (in seconds) so ages stay current.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        kubeconfig_path = os.path.join(self.repo_path, "kubeconfig")
+        if not os.path.exists(kubeconfig_path):
+            console.print("[bold red]Error: Kubeconfig not found. Cluster may not be initialized.[/bold red]")
+            console.print(f"Expected kubeconfig at: {kubeconfig_path}")
+            return False
+
+        env = os.environ.copy()
+        env["KUBECONFIG"] = kubeconfig_path
+
+        try:
+            kube = self._get_kube_backend(env, backend)
+        except KubeApiError as e:
+            console.print(f"[bold red]Error: {e}[/bold red]")
+            return False
+        logger.debug(f"Watching cluster state through the {kube.name} backend")
+
+        watch = ClusterWatch(kube).start()
+        try:
+            with Live(self._render_watch(watch, kube.name), console=console, auto_refresh=False) as live:
+                while True:
+                    watch.wait_for_change(timeout=refresh_interval)
+                    live.update(self._render_watch(watch, kube.name), refresh=True)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watch.stop()
+            kube.close()
         return True
 
-    def _print_command_output_table(self, title: str, command_output: str, error_message: Optional[str] = None, success_message: Optional[str] = None):
+    def _render_watch(self, watch: ClusterWatch, backend_name: str) -> Group:
+        """Render the current state of a ClusterWatch as a group of tables."""
+        snapshot = watch.snapshot()
+        errors = watch.errors()
+        mode = "watch streams" if backend_name == "api" else "periodic relist"
+        parts: List[Any] = [Text(f"Cluster status ({mode}, updated {time.strftime('%H:%M:%S')}) - press Ctrl+C to exit", style="dim")]
+        for title, kind, to_rows in (
+            ("Node Status", "nodes", node_rows),
+            ("Pod Status (All Namespaces)", "pods", pod_rows),
+            ("Flux Kustomizations", "kustomizations", kustomization_rows),
+            ("Persistent Volume Claims (All Namespaces)", "persistentvolumeclaims", pvc_rows),
+        ):
+            parts.append(Text(f"\n--- {title} ---", style="bold blue"))
+            watcher = watch.watchers[kind]
+            if kind in errors:
+                parts.append(Text(f"Error: {errors[kind]}", style="yellow"))
+            if not watcher.synced:
+                parts.append(Text("Loading...", style="dim"))
+                continue
+            headers, rows = to_rows(snapshot.items(kind))
+            parts.append(self._build_status_table(headers, rows) if rows else Text("No resources found.", style="yellow"))
+        return Group(*parts)
+
+    def _resolve_vip(self, kubeconfig_path: str, out=None, cluster_info: Optional[Dict[str, Any]] = None) -> str:
+        """Determine the control plane VIP to probe.
+
+        Uses the CLI configuration first and falls back to the kubeconfig server URL.
+
+        Args:
+            kubeconfig_path: Path to the kubeconfig file.
+            out: Console or section buffer to print to.
+            cluster_info: Current cluster information, if the caller already has it.
+
+        Returns:
+            The VIP address.
+        """
+        out = out or console
+        if cluster_info is None:
+            cluster_info = self._get_current_cluster_info()
+        vip_to_check = "192.168.1.100" # Default from script
+        if cluster_info and cluster_info.get('control_plane_vip'):
+            return cluster_info['control_plane_vip']
+
+        # Attempt to get VIP from kubeconfig if not in CLI config
+        try:
+            with open(kubeconfig_path, 'r') as f_kc:
+                kc_data = yaml.safe_load(f_kc)
+                if kc_data and 'clusters' in kc_data and kc_data['clusters']:
+                    server_url = kc_data['clusters'][0].get('cluster', {}).get('server', '')
+                    if server_url:
+                        # Extract IP from https://IP:PORT
+                        vip_from_kc = server_url.split('//')[-1].split(':')[0]
+                        # Validate if it's an IP before using
+                        if all(c.isdigit() or c == '.' for c in vip_from_kc) and vip_from_kc.count('.') == 3: # Basic IP check
+                            vip_to_check = vip_from_kc
+                            out.print(f"[dim]Using VIP {vip_to_check} from kubeconfig for the reachability probe.[/dim]")
+                        else:
+                            out.print(f"[yellow]Could not parse valid IP from kubeconfig server URL ('{server_url}'). Using default {vip_to_check} for the reachability probe.[/yellow]")
+        except FileNotFoundError:
+             out.print(f"[yellow]Kubeconfig file not found at {kubeconfig_path} for VIP check. Using default {vip_to_check}.[/yellow]")
+        except Exception as e:
+            out.print(f"[yellow]Could not read VIP from kubeconfig ({e}). Using default {vip_to_check} for the reachability probe.[/yellow]")
+
+        if vip_to_check == "192.168.1.100": # If still default after trying kubeconfig
+             out.print(f"[yellow]Control plane VIP not found in CLI config or kubeconfig. Using default {vip_to_check} for the reachability probe.[/yellow]")
+        return vip_to_check
+
+    def _print_command_output_table(self, title: str, command_output: str, error_message: Optional[str] = None, success_message: Optional[str] = None, out=None):
         """Helper to print command output in a Rich table or as error/success message."""
-        console.print(f"\n[bold blue]--- {title} ---[/bold blue]")
+        out = out or console
+        out.print(f"\n[bold blue]--- {title} ---[/bold blue]")
 
         if error_message:
-            console.print(f"[yellow]{error_message}[/yellow]")
+            out.print(f"[yellow]{error_message}[/yellow]")
             return
 
-        if success_message: # For simple success messages like ping
-            console.print(f"[green]{success_message}[/green]")
+        if success_message: # For simple one-line success messages
+            out.print(f"[green]{success_message}[/green]")
             return
 
         if not command_output or not command_output.strip():
-            console.print("[yellow]No resources found or command returned empty output.[/yellow]")
+            out.print("[yellow]No resources found or command returned empty output.[/yellow]")
             return
 
-        lines = command_output.strip().split('\n')
-        if not lines: # Should be caught by previous check, but as a safeguard
-            console.print("[yellow]No output to display.[/yellow]")
+        headers, rows = parse_kubectl_table(command_output)
+        if not headers:
+            out.print("[yellow]No output to display.[/yellow]")
             return
-            
-        table = Table(show_header=True, header_style="bold magenta", show_lines=False, row_styles=["none", "dim"])
-        
-        headers = [header.strip() for header in lines[0].split(None)]
-        
-        processed_headers = []
-        header_counts: Dict[str, int] = {}
-        for header in headers:
-            if header in header_counts:
-                header_counts[header] += 1
-                processed_headers.append(f"{header}({header_counts[header]})") # No space for uniqueness
-            else:
-                header_counts[header] = 0
-                processed_headers.append(header)
-        
-        for header_text in processed_headers:
-            table.add_column(header_text)
-
-        for line_content in lines[1:]:
-            # Split row by multiple spaces, up to number of headers minus one for the last column
-            row_values = [val.strip() for val in line_content.split(None, len(processed_headers) - 1)]
-            # Pad if necessary, ensuring we don't exceed the number of headers
-            if len(row_values) < len(processed_headers):
-                row_values.extend([""] * (len(processed_headers) - len(row_values)))
-            elif len(row_values) > len(processed_headers): # Truncate if too many values (less likely with split(None, N-1))
-                row_values = row_values[:len(processed_headers)]
-
-            styled_row = []
-            for val in row_values:
-                val_lower = val.lower()
-                # Prioritize critical failure states
-                if "crashloopbackoff" in val_lower or "errimagepull" in val_lower or "imagepullbackoff" in val_lower or "failed" in val_lower or "error" in val_lower or "notready" in val_lower or val_lower == "false":
-                    styled_row.append(f"[red]{val}[/red]")
-                elif "running" in val_lower or "ready" in val_lower or "healthy" in val_lower or "bound" in val_lower or "available" in val_lower or val_lower == "true" or "active" in val_lower or "succeeded" in val_lower:
-                    styled_row.append(f"[green]{val}[/green]")
-                elif "pending" in val_lower or "unknown" in val_lower or "progressing" in val_lower or "terminating" in val_lower or "creating" in val_lower or "containercreating" in val_lower:
-                    styled_row.append(f"[yellow]{val}[/yellow]")
-                else:
-                    styled_row.append(val)
-            table.add_row(*styled_row)
-        
-        console.print(table)
 
-    def _check_node_status(self, env: Dict[str, str]):
-        returncode, stdout, stderr = run_command("kubectl get nodes -o wide", cwd=self.repo_path, env=env, suppress_output=True)
-        if returncode != 0:
-            self._print_command_output_table("Node Status", "", error_message=f"Error: {stderr.strip()}")
-        else:
-            self._print_command_output_table("Node Status", stdout)
+        out.print(self._build_status_table(headers, rows))
 
-    def _check_pod_status(self, env: Dict[str, str]):
-        returncode, stdout, stderr = run_command("kubectl get pods -A -o wide", cwd=self.repo_path, env=env, suppress_output=True)
-        if returncode != 0:
-            self._print_command_output_table("Pod Status (All Namespaces)", "", error_message=f"Error: {stderr.strip()}")
-        else:
-            self._print_command_output_table("Pod Status (All Namespaces)", stdout)
-
-    def _check_flux_status(self, env: Dict[str, str]):
-        ret_ns, ns_check_out, err_ns = run_command("kubectl get ns flux-system --no-headers --output=name", cwd=self.repo_path, env=env, suppress_output=True)
-        if ret_ns != 0 or not ns_check_out.strip():
-            self._print_command_output_table("Flux Kustomizations", "", error_message="Flux (flux-system namespace) not found.")
-            if err_ns and ret_ns !=0 : console.print(f"[dim red]Detail: {err_ns.strip()}[/dim red]")
-            self._print_command_output_table("Flux Sources", "", error_message="Flux (flux-system namespace) not found, skipping sources.")
+    def _print_rows_table(self, title: str, headers: List[str], rows: List[List[str]], error_message: Optional[str] = None, out=None):
+        """Helper to print structured rows in a Rich table or an error message."""
+        out = out or console
+        if error_message or not rows:
+            self._print_command_output_table(title, "", error_message=error_message, out=out)
             return
+        out.print(f"\n[bold blue]--- {title} ---[/bold blue]")
+        out.print(self._build_status_table(headers, rows))
 
-        returncode_ks, stdout_ks, stderr_ks = run_command("kubectl get kustomizations -A -o wide", cwd=self.repo_path, env=env, suppress_output=True)
-        if returncode_ks != 0:
-            self._print_command_output_table("Flux Kustomizations", "", error_message=f"Error: {stderr_ks.strip()}")
-        else:
-            self._print_command_output_table("Flux Kustomizations", stdout_ks)
+    def _build_status_table(self, headers: List[str], rows: List[List[str]]) -> Table:
+        """Build a Rich table with status-aware colouring of the status columns."""
+        return StatusTable.from_rows(headers, rows).render()
 
-        returncode_flux_sources, stdout_flux_sources, stderr_flux_sources = run_command("flux get sources all -A --server-side", cwd=self.repo_path, env=env, suppress_output=True)
-        if returncode_flux_sources != 0:
-             self._print_command_output_table("Flux Sources (git, helm, etc.)", "", error_message=f"Error: {stderr_flux_sources.strip()}")
-        else:
-            self._print_command_output_table("Flux Sources (git, helm, etc.)", stdout_flux_sources)
-            
-    def _check_storage_status(self, env: Dict[str, str]):
-        # Check for CubeFS first
-        ret_ns_cubefs, ns_cubefs_out, err_ns_cubefs = run_command("kubectl get ns cubefs --no-headers --output=name", cwd=self.repo_path, env=env, suppress_output=True)
-        if ret_ns_cubefs == 0 and ns_cubefs_out.strip():
-            console.print(Text("\n--- CubeFS Specific Storage ---", style="bold blue")) # Changed from _print_command_output_table for section header
-            returncode_pods, stdout_pods, stderr_pods = run_command("kubectl get pods -n cubefs -o wide", cwd=self.repo_path, env=env, suppress_output=True)
-            if returncode_pods != 0:
-                self._print_command_output_table("CubeFS Pods", "", error_message=f"Error: {stderr_pods.strip()}")
-            else:
-                self._print_command_output_table("CubeFS Pods", stdout_pods)
-        else:
-            # Use a simpler message if CubeFS namespace is not found, not an error table for "CubeFS Pods"
-            console.print(f"\n[bold blue]--- CubeFS Pods ---[/bold blue]")
-            console.print("[yellow]CubeFS (cubefs namespace) not found.[/yellow]")
-            if err_ns_cubefs and ret_ns_cubefs !=0 : console.print(f"[dim red]Detail checking namespace: {err_ns_cubefs.strip()}[/dim red]")
-        
-        self._check_generic_storage(env)
+    def _get_kube_backend(self, env: Dict[str, str], backend: Optional[str] = None):
+        """Create the backend used to read cluster state.
 
-    def _check_generic_storage(self, env: Dict[str, str]):
-        console.print(Text("\n--- Generic Storage Components ---", style="bold blue")) # Changed from _print_command_output_table for section header
-        returncode_sc, stdout_sc, stderr_sc = run_command("kubectl get sc -o wide", cwd=self.repo_path, env=env, suppress_output=True)
-        if returncode_sc != 0:
-            self._print_command_output_table("Storage Classes", "", error_message=f"Error: {stderr_sc.strip()}")
-        else:
-            self._print_command_output_table("Storage Classes", stdout_sc)
+        Args:
+            env: Environment carrying KUBECONFIG, used by the kubectl fallback.
+            backend: `auto`, `api` or `kubectl`. If None, uses `cluster.kube_backend` from the configuration.
 
-        returncode_pv, stdout_pv, stderr_pv = run_command("kubectl get pv -o wide", cwd=self.repo_path, env=env, suppress_output=True)
-        if returncode_pv != 0:
-            self._print_command_output_table("Persistent Volumes", "", error_message=f"Error: {stderr_pv.strip()}")
-        else:
-            self._print_command_output_table("Persistent Volumes", stdout_pv)
-        
-        returncode_pvc, stdout_pvc, stderr_pvc = run_command("kubectl get pvc -A -o wide", cwd=self.repo_path, env=env, suppress_output=True)
-        if returncode_pvc != 0:
-            self._print_command_output_table("Persistent Volume Claims (All Namespaces)", "", error_message=f"Error: {stderr_pvc.strip()}")
-        else:
-            self._print_command_output_table("Persistent Volume Claims (All Namespaces)", stdout_pvc)
+        Returns:
+            A KubeApiClient or KubectlBackend.
+        """
+        backend = backend or self.config.get('cluster.kube_backend', 'auto')
+        return get_kube_backend(os.path.join(self.repo_path, "kubeconfig"), backend, cwd=self.repo_path, env=env)
 
-    def _check_kube_vip_status(self, env: Dict[str, str]):
-        returncode, stdout, stderr = run_command("kubectl get pods -n kube-system -l name=kube-vip -o wide", cwd=self.repo_path, env=env, suppress_output=True)
-        if returncode != 0 or not stdout.strip() or (stdout.strip() and len(stdout.strip().split('\n')) <= 1):
-            msg = f"Error: {stderr.strip()}" if returncode !=0 and stderr.strip() else "Kube-vip not installed or no pods found."
-            self._print_command_output_table("Kube-vip Pods", "", error_message=msg)
-        else:
-            self._print_command_output_table("Kube-vip Pods", stdout)
+    def _take_snapshot(self, env: Dict[str, str], kinds: Tuple[str, ...] = SNAPSHOT_KINDS, backend: Optional[str] = None) -> ClusterSnapshot:
+        """Start fetching a cluster snapshot of the given kinds.
 
-    def _check_vip_accessibility(self, vip_address: str):
-        title = f"Virtual IP ({vip_address}) Accessibility"
-        if sys.platform == "win32":
-            ping_command = f"ping -n 1 -w 1000 {vip_address}"
-        else:
-            ping_command = f"ping -c 1 -W 1 {vip_address}"
+        The snapshot owns the backend created for it; close it (or use it as a
+        context manager) to release both.
+        """
+        return ClusterSnapshot(self._get_kube_backend(env, backend), kinds=kinds, close_backend=True)
 
-        returncode, stdout, stderr = run_command(ping_command, cwd=self.repo_path, suppress_output=True)
-        
-        if returncode == 0:
-            self._print_command_output_table(title, "", success_message="Responded successfully.")
-        else:
-            err_detail = stderr.strip() or stdout.strip()
-            self._print_command_output_table(title, "", error_message=f"NOT responding. Detail: {err_detail if err_detail else 'No output from ping command.'}")
-
-    def _check_etcd_health(self, env: Dict[str, str]):
-        returncode_pods, stdout_pods, stderr_pods = run_command("kubectl get pods -n kube-system -l component=etcd -o wide", cwd=self.repo_path, env=env, suppress_output=True)
-        if returncode_pods != 0 or not stdout_pods.strip() or (stdout_pods.strip() and len(stdout_pods.strip().split('\n')) <=1 ):
-            msg = f"Error: {stderr_pods.strip()}" if returncode_pods !=0 and stderr_pods.strip() else "No etcd pods found."
-            self._print_command_output_table("etcd Pods", "", error_message=msg)
-            self._print_command_output_table("etcd Cluster Health", "", error_message="Skipped: No etcd pods or error fetching them.")
+    @contextmanager
+    def _snapshot_or_take(self, env: Dict[str, str], snapshot: Optional[ClusterSnapshot], kinds: Tuple[str, ...]):
+        """Yield `snapshot`, or a snapshot of `kinds` taken for the block and closed after it if there is none."""
+        if snapshot is not None:
+            yield snapshot
             return
-        
-        self._print_command_output_table("etcd Pods", stdout_pods)
-        
-        jsonpath_expr = "\"{.items[?(@.status.phase=='Running')].metadata.name} {.items[?(@.status.phase!='Running')].metadata.name}\"" # Get running first, then others
-        ret_etcd_name, out_etcd_name, err_etcd_name = run_command(
-            f"kubectl get pods -n kube-system -l component=etcd -o jsonpath={jsonpath_expr} --ignore-not-found",
-            cwd=self.repo_path, env=env, suppress_output=True
+        with self._take_snapshot(env, kinds) as taken:
+            yield taken
+
+    def _check_node_status(self, env: Dict[str, str], out=None, snapshot=None):
+        out = out or console
+        with self._snapshot_or_take(env, snapshot, ("nodes",)) as snapshot:
+            try:
+                nodes = snapshot.items("nodes")
+            except KubeApiError as e:
+                self._print_rows_table("Node Status", [], [], error_message=f"Error: {e}", out=out)
+                return
+            headers, rows = node_rows(nodes)
+            self._print_rows_table("Node Status", headers, rows, out=out)
+
+    def _check_pod_status(self, env: Dict[str, str], out=None, snapshot=None, kube=None, query: Optional[PodQuery] = None,
+                          results: Optional[StatusResults] = None):
+        out = out or console
+        query = query or PodQuery(view="full")
+        if query.view == "full" and not query.filtered:
+            try:
+                with self._snapshot_or_take(env, snapshot, ("pods",)) as snapshot:
+                    pods = snapshot.items("pods")
+            except KubeApiError as e:
+                self._print_rows_table("Pod Status (All Namespaces)", [], [], error_message=f"Error: {e}", out=out)
+                return
+            headers, rows = pod_rows(pods)
+            self._print_rows_table("Pod Status (All Namespaces)", headers, rows, out=out)
+            return
+
+        # Page through the pods with the filters applied by the API server
+        def page_pods() -> Any:
+            backend = kube or self._get_kube_backend(env)
+            try:
+                pages = backend.iter_pages(
+                    "pods", namespace=query.namespace, label_selector=query.label_selector, field_selector=query.field_selector)
+                if query.view != "summary":
+                    return [status_fields(pod) for page in pages for pod in page]
+                summary = PodSummary()
+                for page in pages:
+                    summary.add(page)
+                return summary.to_dict()
+            finally:
+                if kube is None:
+                    backend.close()
+
+        title = f"Pod Status ({query.describe()})"
+        try:
+            pods = (results or StatusResults()).get("pods", page_pods)
+        except KubeApiError as e:
+            self._print_rows_table(title, [], [], error_message=f"Error: {e}", out=out)
+            return
+
+        if query.view != "summary":
+            headers, rows = pod_rows(pods, with_namespace=not query.namespace)
+            self._print_rows_table(title, headers, rows, out=out)
+            return
+
+        summary = PodSummary.from_dict(pods)
+        headers, rows = summary.rows()
+        self._print_rows_table(f"Pod Summary ({query.describe()})", headers, rows, out=out)
+        if summary.unhealthy:
+            headers, rows = pod_rows(summary.unhealthy)
+            self._print_rows_table(f"Unhealthy Pods ({len(summary.unhealthy)} of {summary.total})", headers, rows, out=out)
+        elif summary.total:
+            out.print(f"[green]All {summary.total} pods are healthy.[/green]")
+
+    def _check_flux_status(self, env: Dict[str, str], out=None, snapshot=None):
+        out = out or console
+        with self._snapshot_or_take(env, snapshot, ("namespaces", "kustomizations") + FLUX_SOURCE_KINDS) as snapshot:
+            try:
+                flux_installed = snapshot.has_namespace("flux-system")
+            except KubeApiError as e:
+                flux_installed = False
+                out.print(f"[dim red]Detail: {e}[/dim red]")
+            if not flux_installed:
+                self._print_command_output_table("Flux Kustomizations", "", error_message="Flux (flux-system namespace) not found.", out=out)
+                self._print_command_output_table("Flux Sources", "", error_message="Flux (flux-system namespace) not found, skipping sources.", out=out)
+                return
+
+            try:
+                headers, rows = kustomization_rows(snapshot.items("kustomizations"))
+                self._print_rows_table("Flux Kustomizations", headers, rows, out=out)
+            except KubeApiError as e:
+                self._print_rows_table("Flux Kustomizations", [], [], error_message=f"Error: {e}", out=out)
+
+            try:
+                sources = [source for kind in FLUX_SOURCE_KINDS for source in snapshot.items(kind)]
+                headers, rows = flux_source_rows(sources)
+                self._print_rows_table("Flux Sources (git, helm, etc.)", headers, rows, out=out)
+            except KubeApiError as e:
+                self._print_rows_table("Flux Sources (git, helm, etc.)", [], [], error_message=f"Error: {e}", out=out)
+
+    def _check_storage_status(self, env: Dict[str, str], out=None, snapshot=None):
+        out = out or console
+        with self._snapshot_or_take(env, snapshot, ("namespaces", "pods", "storageclasses", "persistentvolumes", "persistentvolumeclaims")) as snapshot:
+            # Check for CubeFS first
+            try:
+                cubefs_installed = snapshot.has_namespace("cubefs")
+                cubefs_error = None
+            except KubeApiError as e:
+                cubefs_installed = False
+                cubefs_error = str(e)
+            if cubefs_installed:
+                out.print(Text("\n--- CubeFS Specific Storage ---", style="bold blue")) # Changed from _print_command_output_table for section header
+                try:
+                    headers, rows = pod_rows(snapshot.in_namespace("pods", "cubefs"), with_namespace=False)
+                    self._print_rows_table("CubeFS Pods", headers, rows, out=out)
+                except KubeApiError as e:
+                    self._print_rows_table("CubeFS Pods", [], [], error_message=f"Error: {e}", out=out)
+            else:
+                # Use a simpler message if CubeFS namespace is not found, not an error table for "CubeFS Pods"
+                out.print(f"\n[bold blue]--- CubeFS Pods ---[/bold blue]")
+                out.print("[yellow]CubeFS (cubefs namespace) not found.[/yellow]")
+                if cubefs_error: out.print(f"[dim red]Detail checking namespace: {cubefs_error}[/dim red]")
+        
+            self._check_generic_storage(env, out=out, snapshot=snapshot)
+
+    def _check_generic_storage(self, env: Dict[str, str], out=None, snapshot=None):
+        out = out or console
+        with self._snapshot_or_take(env, snapshot, ("storageclasses", "persistentvolumes", "persistentvolumeclaims")) as snapshot:
+            out.print(Text("\n--- Generic Storage Components ---", style="bold blue")) # Changed from _print_command_output_table for section header
+            for title, kind, to_rows in (
+                ("Storage Classes", "storageclasses", storage_class_rows),
+                ("Persistent Volumes", "persistentvolumes", pv_rows),
+                ("Persistent Volume Claims (All Namespaces)", "persistentvolumeclaims", pvc_rows),
+            ):
+                try:
+                    items = snapshot.items(kind)
+                except KubeApiError as e:
+                    self._print_rows_table(title, [], [], error_message=f"Error: {e}", out=out)
+                    continue
+                headers, rows = to_rows(items)
+                self._print_rows_table(title, headers, rows, out=out)
+
+    def _check_kube_vip_status(self, env: Dict[str, str], out=None, snapshot=None):
+        out = out or console
+        with self._snapshot_or_take(env, snapshot, ("pods",)) as snapshot:
+            try:
+                kube_vip_pods = snapshot.select("pods", {"name": "kube-vip"}, namespace="kube-system")
+            except KubeApiError as e:
+                self._print_rows_table("Kube-vip Pods", [], [], error_message=f"Error: {e}", out=out)
+                return
+            if not kube_vip_pods:
+                self._print_rows_table("Kube-vip Pods", [], [], error_message="Kube-vip not installed or no pods found.", out=out)
+                return
+            headers, rows = pod_rows(kube_vip_pods, with_namespace=False)
+            self._print_rows_table("Kube-vip Pods", headers, rows, out=out)
+
+    def _check_endpoint_reachability(self, kubeconfig_path: str, out=None, results: Optional[StatusResults] = None,
+                                     cluster_info: Optional[Dict[str, Any]] = None):
+        """Print how the API server and Talos API answer on the VIP and every node."""
+        out = out or console
+        vip, records = self._endpoint_probes(kubeconfig_path, results or StatusResults(), out=out, cluster_info=cluster_info)
+        title = f"Endpoint Reachability (VIP {vip.address})"
+        headers, rows = probe_rows(records)
+        self._print_rows_table(title, headers, rows, out=out)
+        if not vip.reachable:
+            out.print(f"[bold red]Virtual IP {vip.address} is NOT accepting API server connections: {vip.detail}[/bold red]")
+
+    def _endpoint_probes(self, kubeconfig_path: str, results: StatusResults, out=None,
+                         cluster_info: Optional[Dict[str, Any]] = None) -> Tuple[VipProbeRecord, List[TcpProbeRecord]]:
+        """Return the endpoint probes of a status run, probing the endpoints unless `results` already holds them."""
+        def compute() -> Dict[str, Any]:
+            vip, records = self._probe_endpoints(kubeconfig_path, out=out, cluster_info=cluster_info)
+            return {"vip": dataclasses.asdict(vip), "probes": [dataclasses.asdict(record) for record in records]}
+
+        data = results.get("probes", compute)
+        return VipProbeRecord(**data["vip"]), [TcpProbeRecord(**record) for record in data["probes"]]
+
+    def _probe_endpoints(self, kubeconfig_path: str, out=None,
+                         cluster_info: Optional[Dict[str, Any]] = None) -> Tuple[VipProbeRecord, List[TcpProbeRecord]]:
+        """Open TCP connections to the VIP and every node concurrently.
+
+        The VIP is probed on the API server port, control plane nodes on the API
+        server and Talos API ports and workers on the Talos API port, each
+        `cluster.probe_attempts` times.
+
+        Args:
+            kubeconfig_path: Path to the kubeconfig file, used to find the VIP.
+            out: Console or section buffer to print to.
+            cluster_info: Current cluster information. If None, it is discovered here,
+                which prints to the console; status runs resolve it before fanning out.
+
+        Returns:
+            The VIP summary and one record per probed endpoint.
+        """
+        if cluster_info is None:
+            cluster_info = self._get_current_cluster_info()
+        vip_address = self._resolve_vip(kubeconfig_path, out=out, cluster_info=cluster_info)
+        # Guessed default nodes would only add unreachable rows
+        nodes = cluster_info['nodes'] if cluster_info and cluster_info.get('source') != 'defaults' else []
+        records = probe(
+            probe_targets(vip_address, nodes),
+            attempts=int(self.config.get('cluster.probe_attempts', DEFAULT_PROBE_ATTEMPTS)),
+            timeout=float(self.config.get('cluster.probe_timeout', DEFAULT_PROBE_TIMEOUT)),
         )
-        
-        # Process output: it might be 'pod1 pod2' or just 'pod1' or empty. We want the first one.
-        etcd_pod_names = out_etcd_name.strip().replace("'", "").split()
-        etcd_pod_name = etcd_pod_names[0] if etcd_pod_names else None
+        vip = records[0]
+        if vip.connected:
+            return VipProbeRecord(address=vip_address, reachable=True), records
+        return VipProbeRecord(address=vip_address, reachable=False, detail=vip.error or ""), records
 
-        if ret_etcd_name == 0 and etcd_pod_name:
-            health_title = "etcd Cluster Health" # Define title once
-            console.print(f"\n[blue]Checking {health_title} via pod: {etcd_pod_name}...[/blue]")
-            
-            # Attempt with -w table first
-            etcd_health_cmd_table = f"kubectl -n kube-system exec {etcd_pod_name} -- etcdctl endpoint health --cluster -w table"
-            returncode_health, stdout_health, stderr_health = run_command(etcd_health_cmd_table, cwd=self.repo_path, env=env, suppress_output=True)
-            
-            if returncode_health == 0 and stdout_health.strip(): # Success with table
-                console.print(f"\n[bold blue]--- {health_title} ---[/bold blue]")
-                console.print(stdout_health)
-                if stderr_health.strip(): console.print(f"[dim yellow]stderr (table): {stderr_health.strip()}[/dim yellow]")
-            else: # Table failed or empty output, try raw
-                if returncode_health != 0 : # Log why table might have failed before trying raw
-                    console.print(f"[dim yellow]etcdctl table output failed (code {returncode_health}): {stderr_health.strip()}. Trying raw output...[/dim yellow]")
-                else: # Table succeeded but empty output
-                     console.print(f"[dim yellow]etcdctl table output was empty. Trying raw output...[/dim yellow]")
-
-                etcd_health_cmd_raw = f"kubectl -n kube-system exec {etcd_pod_name} -- etcdctl endpoint health --cluster"
-                returncode_health_raw, stdout_health_raw, stderr_health_raw = run_command(etcd_health_cmd_raw, cwd=self.repo_path, env=env, suppress_output=True)
-
-                if returncode_health_raw == 0:
-                    console.print(f"\n[bold blue]--- {health_title} (Raw Output) ---[/bold blue]")
-                    if stdout_health_raw.strip(): console.print(stdout_health_raw)
-                    else: console.print("[yellow]No health information returned (raw).[/yellow]")
-                    if stderr_health_raw.strip(): console.print(f"[dim yellow]stderr (raw): {stderr_health_raw.strip()}[/dim yellow]")
-                else: # Both failed
-                    self._print_command_output_table(health_title, "", error_message=f"Error (raw): {stderr_health_raw.strip()}")
-
-        elif err_etcd_name.strip() and ret_etcd_name != 0 :
-            self._print_command_output_table("etcd Cluster Health", "", error_message=f"Could not query etcd pod names: {err_etcd_name.strip()}")
-        else:
-            self._print_command_output_table("etcd Cluster Health", "", error_message="No etcd pod name found to check cluster health.")
+    @staticmethod
+    def _etcd_pod(snapshot: ClusterSnapshot) -> str:
+        """Return the etcd pod to run etcdctl in, preferring a running one.
+
+        Raises:
+            KubeApiError: If no etcd pod can be found.
+        """
+        etcd_pods = snapshot.select("pods", {"component": "etcd"}, namespace="kube-system")
+        if not etcd_pods:
+            raise KubeApiError("No etcd pods found.")
+        etcd_pods = sorted(etcd_pods, key=lambda pod: pod.get('status', {}).get('phase') != "Running")
+        return etcd_pods[0]['metadata']['name']
+
+    def _etcd_members(self, env: Dict[str, str], pod_name: str) -> List[EtcdMemberRecord]:
+        """Query the status, health and request latency of every etcd member through an etcd pod.
+
+        Raises:
+            KubeApiError: If etcdctl reports neither status nor health.
+        """
+        command = f"kubectl -n kube-system exec {pod_name} -- etcdctl endpoint"
+        reports = {}
+        errors = []
+        for request in ("status", "health"):
+            returncode, stdout, stderr = run_command(f"{command} {request} --cluster -w json",
+                                                     cwd=self.repo_path, env=env, suppress_output=True)
+            # etcdctl exits non-zero when a member is unhealthy but still prints the JSON report
+            try:
+                reports[request] = json.loads(stdout)
+            except ValueError:
+                errors.append(stderr.strip() or f"etcdctl endpoint {request} exited with code {returncode}")
+        if not reports:
+            raise KubeApiError("; ".join(errors))
+        try:
+            return member_records(
+                reports.get('status') or [], reports.get('health'),
+                fragmentation_threshold=float(self.config.get('cluster.etcd_fragmentation_threshold', DEFAULT_FRAGMENTATION_THRESHOLD)),
+                lag_threshold=int(self.config.get('cluster.etcd_raft_lag_threshold', DEFAULT_RAFT_LAG_THRESHOLD)),
+                latency_threshold_ms=float(self.config.get('cluster.etcd_latency_threshold_ms', DEFAULT_LATENCY_THRESHOLD_MS)),
+            )
+        except (TypeError, AttributeError):
+            raise KubeApiError("Unexpected etcdctl endpoint output")
+
+    def _etcd_member_health(self, env: Dict[str, str], snapshot: ClusterSnapshot) -> List[EtcdMemberRecord]:
+        """Query the status and health of every etcd member through one of the etcd pods.
+
+        Raises:
+            KubeApiError: If no etcd pod can be found or etcdctl fails.
+        """
+        return self._etcd_members(env, self._etcd_pod(snapshot))
+
+    def _status_report(self, env: Dict[str, str], kubeconfig_path: str, snapshot: ClusterSnapshot,
+                       results: Optional[StatusResults] = None) -> StatusReport:
+        """Collect the typed records of a status run without rendering any tables."""
+        results = results or StatusResults()
+        errors: Dict[str, str] = {}
+        vip, probes = self._endpoint_probes(kubeconfig_path, results, out=SectionBuffer())
+        try:
+            etcd = self._etcd_member_results(results, lambda: self._etcd_member_health(env, snapshot))
+        except KubeApiError as e:
+            etcd = []
+            errors["etcd"] = str(e)
+        return build_report(snapshot, vip=vip, etcd=etcd, errors=errors, probes=probes)
+
+    @staticmethod
+    def _etcd_member_results(results: StatusResults, query: Callable[[], List[EtcdMemberRecord]]) -> List[EtcdMemberRecord]:
+        """Return the etcd members of a status run, querying them unless `results` already holds them."""
+        data = results.get("etcd", lambda: [dataclasses.asdict(record) for record in query()])
+        return [EtcdMemberRecord(**record) for record in data]
+
+    def _check_etcd_health(self, env: Dict[str, str], out=None, snapshot=None, results: Optional[StatusResults] = None):
+        out = out or console
+        with self._snapshot_or_take(env, snapshot, ("pods",)) as snapshot:
+            try:
+                etcd_pods = snapshot.select("pods", {"component": "etcd"}, namespace="kube-system")
+            except KubeApiError as e:
+                self._print_rows_table("etcd Pods", [], [], error_message=f"Error: {e}", out=out)
+                self._print_command_output_table("etcd Members", "", error_message="Skipped: No etcd pods or error fetching them.", out=out)
+                return
+            if not etcd_pods:
+                self._print_rows_table("etcd Pods", [], [], error_message="No etcd pods found.", out=out)
+                self._print_command_output_table("etcd Members", "", error_message="Skipped: No etcd pods or error fetching them.", out=out)
+                return
+
+            headers, rows = pod_rows(etcd_pods, with_namespace=False)
+            self._print_rows_table("etcd Pods", headers, rows, out=out)
+
+            etcd_pod_name = self._etcd_pod(snapshot)
+            out.print(f"\n[blue]Checking etcd members via pod: {etcd_pod_name}...[/blue]")
+            try:
+                records = self._etcd_member_results(results or StatusResults(), lambda: self._etcd_members(env, etcd_pod_name))
+            except KubeApiError as e:
+                self._print_command_output_table("etcd Members", "", error_message=f"Error: {e}", out=out)
+                return
+            headers, rows = member_rows(records)
+            self._print_rows_table("etcd Members", headers, rows, out=out)
+            flagged = [record for record in records if record.warnings]
+            if flagged:
+                out.print(f"[yellow]{len(flagged)} of {len(records)} etcd member(s) need attention:[/yellow]")
+                for record in flagged:
+                    out.print(f"[yellow]  {record.endpoint}: {'; '.join(record.warnings)}[/yellow]")
+                if any(warning.startswith("fragmented") for record in flagged for warning in record.warnings):
+                    out.print("[dim]Run `hm-cli cluster etcd defrag` to reclaim the unused space.[/dim]")
 
     def _collect_cluster_info(self) -> Dict[str, Any]:
         """Collect information needed to create a cluster.
@@ -621,17 +1230,7 @@ class ClusterManager:
                 'hardware': hw_default
             })
         
-        # Save to config
-        config.set('cluster.name', cluster_name)
-        config.set('cluster.network_prefix', network_prefix)
-        config.set('cluster.control_plane_vip', control_plane_vip)
-        config.set('cluster.talos_version', talos_version)
-        config.set('cluster.kubernetes_version', kubernetes_version)
-        # Node IPs are not typically saved in general config this way, but rather used directly.
-        # The bootstrap script also prompts for them each time.
-        
-        # Return collected information
-        return {
+        cluster_info = {
             'name': cluster_name,
             'network_prefix': network_prefix,
             'control_plane_vip': control_plane_vip,
@@ -639,9 +1238,26 @@ class ClusterManager:
             'kubernetes_version': kubernetes_version,
             'nodes': nodes
         }
+        # Node IPs are not typically saved in general config this way, but rather used directly.
+        # The bootstrap script also prompts for them each time.
+        self._save_cluster_settings(cluster_info)
+        
+        # Return collected information
+        return cluster_info
+
+    def _save_cluster_settings(self, cluster_info: Dict[str, Any]) -> None:
+        """Save the cluster-wide settings of a new cluster to the config."""
+        with self.config.batch():
+            for key in ('name', 'network_prefix', 'control_plane_vip', 'talos_version', 'kubernetes_version'):
+                self.config.set(f'cluster.{key}', cluster_info[key])
+            if cluster_info.get('pools'):
+                self.config.set('cluster.pools', cluster_info['pools'])
     
     def _generate_talos_configs(self, cluster_info: Dict[str, Any]) -> bool:
         """Generate Talos configurations for the cluster.
+
+        Uses the in-process renderer unless `cluster.talos_renderer` is `script`,
+        which runs `bootstrap/talos/gen-config.sh` instead.
         
         Args:
             cluster_info: Cluster information.
@@ -649,6 +1265,9 @@ class ClusterManager:
         Returns:
             True if successful, False otherwise.
         """
+        if self.config.get('cluster.talos_renderer', 'python') != 'script':
+            return self._render_talos_configs(cluster_info)
+
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -724,142 +1343,359 @@ class ClusterManager:
         console.print("[green]Talos configurations generated successfully.[/green]")
         return True
     
-    def _apply_talos_configs(self, cluster_info: Dict[str, Any], is_upgrade: bool = False) -> bool:
-        """Apply Talos configurations to nodes.
+    def _render_talos_configs(self, cluster_info: Dict[str, Any], force: bool = False) -> bool:
+        """Render the Talos configuration of every node in-process.
+
+        Only nodes whose inputs (secrets bundle, patches, node and cluster
+        settings) changed since the last render are written. A secrets bundle is
+        created with `talosctl gen secrets` if none exists yet.
+
+        Args:
+            cluster_info: Cluster information, including `talos_version` and `kubernetes_version`.
+            force: Render every node regardless of the cache.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        project_root = self._talos_project_root()
+        secrets_file = os.path.expanduser(self.config.get('cluster.talos_secrets', DEFAULT_SECRETS_FILE))
+        if not os.path.exists(secrets_file):
+            console.print(f"Creating Talos secrets bundle at {secrets_file}...")
+            os.makedirs(os.path.dirname(secrets_file), exist_ok=True)
+            returncode, _, stderr = run_command(f"talosctl gen secrets -o \"{secrets_file}\"", cwd=project_root)
+            if returncode != 0:
+                console.print(f"[bold red]Error creating Talos secrets bundle: {stderr}[/bold red]")
+                return False
+
+        renderer = TalosRenderer(os.path.join(project_root, "infrastructure", "talos"), secrets_file)
+        try:
+            result = renderer.render(cluster_info, force=force)
+        except TalosRenderError as e:
+            console.print(f"[bold red]Error rendering Talos configurations: {e}[/bold red]")
+            return False
+
+        for name in result.rendered:
+            console.print(f"[dim]Rendered {result.files[name]}[/dim]")
+        console.print(f"[green]Rendered {len(result.rendered)} Talos configuration(s), "
+                      f"{len(result.unchanged)} already up to date.[/green]")
+        return True
+
+    def _talos_project_root(self) -> str:
+        """Return the project root holding the generated Talos configurations."""
+        # Determine the correct project root, similar to _generate_talos_configs
+        try:
+            current_file_dir = os.path.dirname(os.path.abspath(__file__))
+            # Assuming this file is at <project_root>/cli/hm_cli/cluster.py
+            project_root = os.path.abspath(os.path.join(current_file_dir, "..", ".."))
+        except NameError: # pragma: no cover
+            logger.warning("__file__ not defined when trying to determine project root for applying Talos configs. Falling back to self.repo_path.")
+            project_root = self.repo_path # Fallback
+
+        logger.info(f"Using project root for applying Talos configs: {project_root}. (Original self.repo_path: {self.repo_path})")
+        return project_root
+
+    @staticmethod
+    def _talos_config_file(node: Dict[str, Any], project_root: str) -> str:
+        """Return the path of a node's Talos configuration file."""
+        role_dir = ROLE_DIRS.get(node.get('type', 'controlplane'), "controlplane")
+        return os.path.join(project_root, "infrastructure", "talos", role_dir, f"{node['name']}.yaml")
+
+    def _apply_talos_configs(self, cluster_info: Dict[str, Any], is_upgrade: bool = False,
+                             concurrency: Optional[int] = None, serial_control_plane: Optional[bool] = None,
+                             only_changed: bool = False) -> bool:
+        """Apply Talos configurations to nodes.
+
+        Nodes are configured in parallel, each with its own progress bar. A
+        failing node does not stop the others; all failures are reported
+        together once every node has finished. The digest of every applied
+        configuration is recorded in the repository.
+        
+        Args:
+            cluster_info: Cluster information.
+            is_upgrade: Whether this is an upgrade operation.
+            concurrency: Maximum number of nodes configured at the same time.
+                If None, uses `cluster.apply_concurrency`.
+            serial_control_plane: Configure control plane nodes one at a time
+                (stopping at the first failure) before the workers are
+                configured in parallel. If None, uses
+                `cluster.apply_serial_control_plane`.
+            only_changed: Skip nodes whose configuration file is unchanged
+                since it was last applied to them.
+
+        Workers of a pool are configured after all other nodes, one pool at a
+        time, with at most the pool's `max_parallel` nodes at once.
+            
+        Returns:
+            True if successful, False otherwise.
+        """
+        project_root = self._talos_project_root()
+
+        if concurrency is None:
+            concurrency = int(self.config.get('cluster.apply_concurrency', DEFAULT_APPLY_CONCURRENCY))
+        if serial_control_plane is None:
+            serial_control_plane = bool(self.config.get('cluster.apply_serial_control_plane', False))
+        nodes = cluster_info['nodes']
+
+        # Check every configuration file before touching any node
+        config_files = {}
+        for node in nodes:
+            config_file = self._talos_config_file(node, project_root)
+            config_file_relative_path = os.path.relpath(config_file, project_root)
+            logger.debug(f"Attempting to apply Talos config from: {config_file}")
+            if not os.path.exists(config_file):
+                console.print(f"[bold red]Error: Configuration file not found at {config_file}[/bold red]")
+                # Log details about paths for debugging
+                console.print(f"[dim]Project root used: {project_root}[/dim]")
+                console.print(f"[dim]self.repo_path was: {self.repo_path}[/dim]")
+                console.print(f"[dim]Original path attempted (using self.repo_path): {os.path.join(self.repo_path, config_file_relative_path)}[/dim]")
+                return False
+            config_files[node['name']] = config_file
+
+        applied = self._applied_configs()
+        digests = {name: file_digest(path) for name, path in config_files.items()}
+        if only_changed:
+            unchanged = [node['name'] for node in nodes if not applied.changed(node, digests[node['name']])]
+            nodes = [node for node in nodes if node['name'] not in unchanged]
+            if unchanged:
+                console.print(f"[dim]Skipping {len(unchanged)} node(s) already running their configuration: {', '.join(unchanged)}[/dim]")
+            if not nodes:
+                console.print("[green]All nodes already run their current Talos configuration.[/green]")
+                return True
+
+        # Waves run one after another, each as (nodes, one at a time, concurrency)
+        pools = self._worker_pools(cluster_info)
+        unpooled = [node for node in nodes if not node.get('pool')]
+        if serial_control_plane:
+            control_plane = [node for node in unpooled if is_control_plane(node)]
+            workers = [node for node in unpooled if not is_control_plane(node)]
+            waves = [(control_plane, True, concurrency), (workers, False, concurrency)]
+        else:
+            waves = [(unpooled, False, concurrency)]
+        for pool, members in group_by_pool([node for node in nodes if node.get('pool')]):
+            limit = pools[pool].max_parallel if pool in pools else None
+            waves.append((members, False, limit or concurrency))
+
+        results: Dict[str, Tuple[int, str, str]] = {}
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TimeElapsedColumn(),
+            console=console
+        ) as progress:
+            tasks = {
+                node['name']: progress.add_task(f"{node['name']} ({node['ip']}): waiting", total=1)
+                for node in nodes
+            }
+
+            def apply(node: Dict[str, Any]) -> Tuple[int, str, str]:
+                task = tasks[node['name']]
+                progress.update(task, description=f"{node['name']} ({node['ip']}): applying configuration...")
+                # project_root is used as CWD in case the config files contain paths relative to it
+                result = run_command(
+                    f"talosctl apply-config --insecure --nodes {node['ip']} --file \"{config_files[node['name']]}\"", # Quote config_file for safety
+                    cwd=project_root # Use determined project_root as CWD
+                )
+                state = "[green]applied[/green]" if result[0] == 0 else "[red]failed[/red]"
+                progress.update(task, completed=1, description=f"{node['name']} ({node['ip']}): {state}")
+                return result
+
+            stopped = False
+            for wave, serial, limit in waves:
+                if not wave:
+                    continue
+                with ThreadPoolExecutor(max_workers=max(1, limit)) as executor:
+                    if serial:
+                        for node in wave:
+                            results[node['name']] = self._node_result(executor.submit(apply, node))
+                            if results[node['name']][0] != 0:
+                                # Leave the remaining control plane nodes and the workers untouched
+                                stopped = True
+                                break
+                    else:
+                        futures = {executor.submit(apply, node): node['name'] for node in wave}
+                        for future in as_completed(futures):
+                            results[futures[future]] = self._node_result(future)
+                if stopped:
+                    break
+            for node in nodes:
+                if node['name'] not in results:
+                    progress.update(tasks[node['name']], description=f"{node['name']} ({node['ip']}): [yellow]skipped[/yellow]")
+
+        for node in nodes:
+            if results.get(node['name'], (1,))[0] == 0:
+                applied.record(node, digests[node['name']])
+        applied.save()
+
+        # Print command output once the progress display is gone, in node order
+        failures = []
+        for node in nodes:
+            if node['name'] not in results:
+                continue
+            returncode, stdout, stderr = results[node['name']]
+            if stdout: # Log stdout for apply-config
+                console.print(f"[dim]talosctl apply-config stdout for {node['name']}:\n{stdout}[/dim]")
+            if returncode != 0:
+                failures.append((node, stderr))
+
+        not_applied = [node['name'] for node in nodes if node['name'] not in results]
+        if failures or not_applied:
+            console.print(f"[bold red]Error applying configuration to {len(failures)} of {len(nodes)} node(s):[/bold red]")
+            for node, stderr in failures:
+                console.print(f"[red]  {node['name']} ({node['ip']}): {stderr.strip() or 'talosctl apply-config failed'}[/red]")
+            if not_applied:
+                console.print(f"[yellow]Not applied after a control plane failure: {', '.join(not_applied)}[/yellow]")
+            return False
+        
+        console.print("[green]Talos configurations applied successfully.[/green]")
+        return True
+
+    def _worker_pools(self, cluster_info: Dict[str, Any]) -> Dict[str, WorkerPool]:
+        """Return the worker pools of the cluster, from its cluster information or `cluster.pools`."""
+        return load_pools(cluster_info.get('pools') or self.config.get('cluster.pools', {}))
+
+    def _applied_configs(self) -> AppliedConfigs:
+        """Return the digests of the configurations last applied to the nodes."""
+        return AppliedConfigs(os.path.join(self.repo_path, APPLIED_CONFIGS_FILE))
+
+    def _preview_upgrade(self, cluster_info: Dict[str, Any], k8s_version: str, talos_version: str) -> bool:
+        """Show which nodes an upgrade would give a new configuration, without writing anything.
+
+        The in-process renderer renders every configuration in memory. The
+        `script` renderer can only write into the working tree, so its dry run
+        compares the configuration files as they are.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        if self.config.get('cluster.talos_renderer', 'python') == 'script':
+            console.print("[dim]The script renderer cannot render without writing; comparing the current configuration files.[/dim]")
+            return self._show_config_changes(cluster_info)
+
+        secrets_file = os.path.expanduser(self.config.get('cluster.talos_secrets', DEFAULT_SECRETS_FILE))
+        if not os.path.exists(secrets_file):
+            console.print(f"[bold red]Error: Talos secrets bundle {secrets_file} not found; a dry run does not create one.[/bold red]")
+            return False
+        renderer = TalosRenderer(os.path.join(self._talos_project_root(), "infrastructure", "talos"), secrets_file)
+        try:
+            rendered = renderer.preview(self._with_target_versions(cluster_info, k8s_version, talos_version))
+        except TalosRenderError as e:
+            console.print(f"[bold red]Error rendering Talos configurations: {e}[/bold red]")
+            return False
+        return self._show_config_changes(cluster_info, {name: text_digest(data) for name, data in rendered.items()})
+
+    def _show_config_changes(self, cluster_info: Dict[str, Any], digests: Optional[Dict[str, str]] = None) -> bool:
+        """List the nodes whose configuration would be applied, without applying anything.
+
+        Args:
+            cluster_info: Cluster information.
+            digests: Digests of configurations rendered in memory, by node name.
+                If None, the configuration files in the working tree are compared.
+
+        Returns:
+            True if every configuration file exists, False otherwise.
+        """
+        project_root = self._talos_project_root()
+        applied = self._applied_configs()
+        rows = []
+        for node in cluster_info['nodes']:
+            config_file = self._talos_config_file(node, project_root)
+            if digests is not None:
+                digest = digests[node['name']]
+            elif os.path.exists(config_file):
+                digest = file_digest(config_file)
+            else:
+                rows.append([node['name'], node['ip'], "Missing", config_file])
+                continue
+            if applied.changed(node, digest):
+                last = (applied.entries.get(node['name']) or {}).get('applied_at', "never")
+                rows.append([node['name'], node['ip'], "Changed", f"Last applied: {last}"])
+            else:
+                rows.append([node['name'], node['ip'], "Unchanged", ""])
+
+        console.print(self._build_status_table(["NODE", "IP", "STATUS", "DETAIL"], rows))
+        changed = sum(1 for row in rows if row[2] == "Changed")
+        console.print(f"Dry run: {changed} of {len(rows)} node(s) would receive a new configuration.")
+        return not any(row[2] == "Missing" for row in rows)
+
+    @staticmethod
+    def _node_result(future: Future) -> Tuple[int, str, str]:
+        """Return the run_command result of a node, turning an exception into a failed result."""
+        try:
+            return future.result()
+        except Exception as e:
+            return -1, "", str(e)
+    
+    @staticmethod
+    def _bootstrap_node(cluster_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the control plane node etcd is bootstrapped on: the first one listed."""
+        return next((node for node in cluster_info['nodes'] if is_control_plane(node)), cluster_info['nodes'][0])
+
+    def _kubeconfig_digest(self) -> Optional[str]:
+        """Return the digest of the repository's kubeconfig, or None if there is none."""
+        kubeconfig_path = os.path.join(self.repo_path, "kubeconfig")
+        return file_digest(kubeconfig_path) if os.path.exists(kubeconfig_path) else None
+
+    def _bootstrap_cluster(self, cluster_info: Dict[str, Any], journal: Optional[CreateJournal] = None) -> bool:
+        """Bootstrap the Kubernetes cluster.
         
         Args:
             cluster_info: Cluster information.
-            is_upgrade: Whether this is an upgrade operation.
+            journal: Journal of the cluster creation. The bootstrap and the kubeconfig
+                retrieval are skipped if it records them as done, and recorded once done.
             
         Returns:
             True if successful, False otherwise.
         """
-        # Determine the correct project root, similar to _generate_talos_configs
-        try:
-            current_file_dir = os.path.dirname(os.path.abspath(__file__))
-            # Assuming this file is at <project_root>/cli/hm_cli/cluster.py
-            project_root = os.path.abspath(os.path.join(current_file_dir, "..", ".."))
-        except NameError: # pragma: no cover
-            logger.warning("__file__ not defined when trying to determine project root for applying Talos configs. Falling back to self.repo_path.")
-            project_root = self.repo_path # Fallback
-
-        logger.info(f"Using project root for applying Talos configs: {project_root}. (Original self.repo_path: {self.repo_path})")
-
+        cluster_digest = input_digest(cluster_info)
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=console
         ) as progress:
-            task = progress.add_task("Applying Talos configurations to nodes...", total=len(cluster_info['nodes']))
+            task = progress.add_task("Bootstrapping cluster...", total=None)
             
-            for node in cluster_info['nodes']:
-                progress.update(task, description=f"Applying configuration to {node['name']} ({node['ip']})...")
-                
-                # Get the configuration file path using the determined project_root
-                config_file_relative_path = os.path.join(
-                    "infrastructure",
-                    "talos",
-                    "controlplane",
-                    f"{node['name']}.yaml"
+            # Bootstrap the first control plane node; etcd must only be bootstrapped once
+            first_node = self._bootstrap_node(cluster_info)
+            
+            if journal is not None and journal.done("bootstrap", cluster_digest):
+                progress.console.print(f"[dim]Skipping the bootstrap of {first_node['name']}: completed at {journal.completed_at('bootstrap')}.[/dim]")
+            else:
+                returncode, stdout, stderr = run_command(
+                    f"talosctl bootstrap --nodes {first_node['ip']}",
+                    cwd=self.repo_path
                 )
-                config_file = os.path.join(project_root, config_file_relative_path)
                 
-                logger.debug(f"Attempting to apply Talos config from: {config_file}")
-
-                if not os.path.exists(config_file):
+                if returncode != 0:
                     progress.stop()
-                    console.print(f"[bold red]Error: Configuration file not found at {config_file}[/bold red]")
-                    # Log details about paths for debugging
-                    console.print(f"[dim]Project root used: {project_root}[/dim]")
-                    console.print(f"[dim]self.repo_path was: {self.repo_path}[/dim]")
-                    console.print(f"[dim]Original path attempted (using self.repo_path): {os.path.join(self.repo_path, config_file_relative_path)}[/dim]")
+                    console.print(f"[bold red]Error bootstrapping cluster: {stderr}[/bold red]")
                     return False
+                if journal is not None:
+                    journal.record("bootstrap", cluster_digest)
+            
+            # Get kubeconfig, so the wait below can ask the API server directly
+            if journal is not None and journal.done("kubeconfig", self._kubeconfig_digest()):
+                progress.console.print("[dim]Skipping the kubeconfig retrieval: the recorded kubeconfig is unchanged.[/dim]")
+            else:
+                progress.update(task, description="Retrieving kubeconfig...")
                 
-                # Apply the configuration
-                # The cwd for talosctl should ideally be where talosctl can resolve any relative paths within the config file itself,
-                # or if the config file uses absolute paths.
-                # Using project_root as cwd seems safest if config files might have relative paths based on project root.
-                # If talosctl apply-config --file expects the file path to be absolute or relative to its CWD,
-                # and we provide an absolute path for config_file, CWD might be less critical for --file.
-                # However, consistency with _generate_talos_configs (which uses script_execution_cwd) is good.
-                # Let's use project_root as CWD.
                 returncode, stdout, stderr = run_command(
-                    f"talosctl apply-config --insecure --nodes {node['ip']} --file \"{config_file}\"", # Quote config_file for safety
-                    cwd=project_root # Use determined project_root as CWD
+                    f"talosctl kubeconfig --nodes {first_node['ip']} -f ./kubeconfig",
+                    cwd=self.repo_path
                 )
                 
-                if stdout: # Log stdout for apply-config
-                    console.print(f"[dim]talosctl apply-config stdout for {node['name']}:\n{stdout}[/dim]")
-                if stderr and returncode != 0: # Log stderr only on error
-                     console.print(f"[yellow]talosctl apply-config stderr for {node['name']}:\n{stderr}[/yellow]")
-
                 if returncode != 0:
                     progress.stop()
-                    console.print(f"[bold red]Error applying configuration to {node['name']}: {stderr}[/bold red]")
+                    console.print(f"[bold red]Error retrieving kubeconfig: {stderr}[/bold red]")
                     return False
-                
-                progress.advance(task)
-            
-            progress.update(task, completed=True)
-        
-        console.print("[green]Talos configurations applied successfully.[/green]")
-        return True
-    
-    def _bootstrap_cluster(self, cluster_info: Dict[str, Any]) -> bool:
-        """Bootstrap the Kubernetes cluster.
-        
-        Args:
-            cluster_info: Cluster information.
-            
-        Returns:
-            True if successful, False otherwise.
-        """
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
-            task = progress.add_task("Bootstrapping cluster...", total=None)
-            
-            # Bootstrap the first control plane node
-            first_node = cluster_info['nodes'][0]
-            
-            returncode, stdout, stderr = run_command(
-                f"talosctl bootstrap --nodes {first_node['ip']}",
-                cwd=self.repo_path
-            )
-            
-            if returncode != 0:
-                progress.stop()
-                console.print(f"[bold red]Error bootstrapping cluster: {stderr}[/bold red]")
-                return False
-            
-            # Wait for the Kubernetes API to be available
-            progress.update(task, description="Waiting for Kubernetes API...")
-            
-            node_ips = ",".join([node['ip'] for node in cluster_info['nodes']])
-            
-            returncode, stdout, stderr = run_command(
-                f"talosctl health --nodes {node_ips} --wait-timeout 15m",
-                cwd=self.repo_path
-            )
-            
-            if returncode != 0:
-                progress.stop()
-                console.print(f"[bold red]Error waiting for Kubernetes API: {stderr}[/bold red]")
-                return False
-            
-            # Get kubeconfig
-            progress.update(task, description="Retrieving kubeconfig...")
-            
-            returncode, stdout, stderr = run_command(
-                f"talosctl kubeconfig --nodes {first_node['ip']} -f ./kubeconfig",
-                cwd=self.repo_path
-            )
-            
-            if returncode != 0:
+                if journal is not None and self._kubeconfig_digest():
+                    journal.record("kubeconfig", self._kubeconfig_digest())
+
+            # Wait for the Kubernetes API, the nodes and etcd
+            timeout = float(self.config.get('cluster.bootstrap_timeout', DEFAULT_BOOTSTRAP_TIMEOUT))
+            if not self._wait_for_cluster(cluster_info, timeout, on_update=self._wait_reporter(progress, task)):
                 progress.stop()
-                console.print(f"[bold red]Error retrieving kubeconfig: {stderr}[/bold red]")
+                console.print("[bold red]Error waiting for the cluster to become healthy.[/bold red]")
                 return False
             
             progress.update(task, completed=True)
@@ -868,6 +1704,11 @@ class ClusterManager:
         console.print(f"[blue]Kubeconfig saved to {os.path.join(self.repo_path, 'kubeconfig')}[/blue]")
         return True
     
+    def _flux_settings_complete(self, cluster_info: Dict[str, Any]) -> bool:
+        """Return True if Flux can be bootstrapped without asking for the GitHub owner or repository."""
+        flux = cluster_info.get('flux') or {}
+        return bool(flux.get('repository') and (flux.get('owner') or self.config.get('git.user_name')))
+
     def _setup_flux(self, cluster_info: Dict[str, Any]) -> bool:
         """Set up Flux CD for GitOps.
         
@@ -884,18 +1725,19 @@ class ClusterManager:
         ) as progress:
             task = progress.add_task("Setting up Flux CD...", total=None)
             
-            # Get Git information
-            git_user = self.config.get('git.user_name')
+            # Get Git information, preferring the flux section of an inventory file
+            flux = cluster_info.get('flux') or {}
+            git_user = flux.get('owner') or self.config.get('git.user_name')
             if not git_user:
                 git_user = questionary.text("GitHub username:").ask()
                 self.config.set('git.user_name', git_user)
             
-            git_repo = questionary.text(
+            git_repo = flux.get('repository') or questionary.text(
                 "GitHub repository name:",
                 default="homelab"
             ).ask()
             
-            git_branch = self.config.get('git.branch', 'main')
+            git_branch = flux.get('branch') or self.config.get('git.branch', 'main')
             
             # Set KUBECONFIG environment variable
             env = os.environ.copy()
@@ -1065,8 +1907,19 @@ resources:
             
         return True
     
-    def _get_current_cluster_info(self) -> Dict[str, Any]:
+    def _inventory_cache(self) -> InventoryCache:
+        """Return the cache of discovered cluster inventories."""
+        return InventoryCache(ttl=float(self.config.get('cluster.inventory_ttl', DEFAULT_INVENTORY_TTL)))
+
+    def _get_current_cluster_info(self, refresh: bool = False) -> Dict[str, Any]:
         """Get information about the current cluster.
+
+        A cached inventory is used while it is younger than `cluster.inventory_ttl`
+        and agrees with the configured cluster name and VIP; otherwise the
+        cluster is discovered again and the result cached.
+
+        Args:
+            refresh: Ignore the cached inventory.
         
         Returns:
             Dict containing cluster information, or None if not found.
@@ -1075,7 +1928,32 @@ resources:
         if not os.path.exists(self.repo_path):
             console.print(f"[bold red]Error: Repository not found at {self.repo_path}[/bold red]")
             return None
-        
+
+        cache = self._inventory_cache()
+        if not refresh:
+            inventory = cache.get(self.repo_path)
+            if inventory and all(
+                self.config.get(key) in (None, value)
+                for key, value in (('cluster.name', inventory.name), ('cluster.control_plane_vip', inventory.control_plane_vip))
+            ):
+                logger.debug(f"Using cluster inventory cached {inventory.age():.0f}s ago")
+                return inventory.cluster_info()
+
+        cluster_info = self._discover_cluster_info()
+        # Guessed default nodes are not worth keeping
+        if cluster_info and cluster_info.get('source') != 'defaults':
+            try:
+                cache.put(self.repo_path, Inventory.from_cluster_info(cluster_info))
+            except OSError as e:
+                logger.warning(f"Could not cache the cluster inventory: {e}")
+        return cluster_info
+
+    def _discover_cluster_info(self) -> Dict[str, Any]:
+        """Discover the current cluster from the configuration, talosctl or the Talos files.
+
+        Returns:
+            Dict containing cluster information with its `source`, or None if not found.
+        """
         # Get cluster information from config
         config = self.config
         cluster_name = config.get('cluster.name')
@@ -1087,12 +1965,14 @@ resources:
             
             # Try to get information from infrastructure files
             try:
-                # Check for talos configurations
-                talos_dir = os.path.join(self.repo_path, "infrastructure", "talos", "controlplane")
-                if os.path.exists(talos_dir):
+                # Check for talos configurations; the directory of a file gives the node's role
+                nodes = []
+                for node_type, role_dir in ROLE_DIRS.items():
+                    talos_dir = os.path.join(self.repo_path, "infrastructure", "talos", role_dir)
+                    if not os.path.exists(talos_dir):
+                        continue
                     # Get node information from file names
-                    nodes = []
-                    for file_name in os.listdir(talos_dir):
+                    for file_name in sorted(os.listdir(talos_dir)):
                         if file_name.endswith(".yaml"):
                             node_name = file_name.replace(".yaml", "")
                             
@@ -1102,12 +1982,7 @@ resources:
                                 # This is a simplistic approach, would need more robust parsing
                                 ip_match = re.search(r'# Node: \w+ \((\d+\.\d+\.\d+\.\d+)\)', content)
                                 ip = ip_match.group(1) if ip_match else "unknown"
-                            
-                            # Determine type and hardware
-                            if "cp" in node_name:
-                                node_type = "controlplane"
-                            else:
-                                node_type = "worker"
+                            pool = self._config_file_pool(content) if node_type == "worker" else None
                             
                             if "cp1" in node_name:
                                 hardware = "ryzen"
@@ -1118,32 +1993,33 @@ resources:
                             else:
                                 hardware = "unknown"
                             
-                            nodes.append({
+                            nodes.append(dict({
                                 'name': node_name,
                                 'ip': ip,
                                 'type': node_type,
                                 'hardware': hardware
-                            })
+                            }, **({'pool': pool} if pool else {})))
+                    
+                if nodes:
+                    # Extract network prefix from first IP
+                    if nodes[0]['ip'] != "unknown":
+                        network_prefix = '.'.join(nodes[0]['ip'].split('.')[:3])
+                    
+                    # Use default VIP if not found
+                    if not control_plane_vip:
+                        control_plane_vip = f"{network_prefix}.100"
+                    
+                    # Use default name if not found
+                    if not cluster_name:
+                        cluster_name = "homelab"
                     
-                    if nodes:
-                        # Extract network prefix from first IP
-                        if nodes[0]['ip'] != "unknown":
-                            network_prefix = '.'.join(nodes[0]['ip'].split('.')[:3])
-                        
-                        # Use default VIP if not found
-                        if not control_plane_vip:
-                            control_plane_vip = f"{network_prefix}.100"
-                        
-                        # Use default name if not found
-                        if not cluster_name:
-                            cluster_name = "homelab"
-                        
-                        return {
-                            'name': cluster_name,
-                            'network_prefix': network_prefix,
-                            'control_plane_vip': control_plane_vip,
-                            'nodes': nodes
-                        }
+                    return {
+                        'name': cluster_name,
+                        'network_prefix': network_prefix,
+                        'control_plane_vip': control_plane_vip,
+                        'nodes': nodes,
+                        'source': 'files'
+                    }
             except Exception as e:
                 console.print(f"[bold red]Error extracting cluster information: {e}[/bold red]")
             
@@ -1152,6 +2028,7 @@ resources:
         
         # Try to get node information
         nodes = []
+        source = 'talosctl'
         
         # Check if we can get node information from talosctl
         returncode, stdout, stderr = run_command(
@@ -1163,14 +2040,16 @@ resources:
             try:
                 nodes_data = yaml.safe_load(stdout)
                 for node in nodes_data:
-                    nodes.append({
+                    labels = node['metadata']['labels']
+                    nodes.append(dict({
                         'name': node['metadata']['hostname'],
                         'ip': node['spec']['addresses'][0]['address'],
-                        'type': 'controlplane' if 'controlplane' in node['metadata']['labels'] else 'worker',
-                        'hardware': node['metadata']['labels'].get('hardware', 'unknown')
-                    })
+                        'type': 'controlplane' if 'controlplane' in labels else 'worker',
+                        'hardware': labels.get('hardware', 'unknown')
+                    }, **({'pool': labels[POOL_LABEL]} if labels.get(POOL_LABEL) else {})))
             except Exception:
                 # Fall back to default node structure
+                source = 'defaults'
                 nodes = [
                     {
                         'name': 'talos-cp1',
@@ -1193,6 +2072,7 @@ resources:
                 ]
         else:
             # Fall back to default node structure
+            source = 'defaults'
             nodes = [
                 {
                     'name': 'talos-cp1',
@@ -1218,9 +2098,230 @@ resources:
             'name': cluster_name,
             'network_prefix': network_prefix,
             'control_plane_vip': control_plane_vip,
-            'nodes': nodes
+            'nodes': nodes,
+            'source': source
         }
+
+    def defrag_etcd(self, yes: bool = False, allow_quorum_loss: bool = False) -> bool:
+        """Defragment every etcd member, followers one at a time and the leader last.
+
+        Commands run through the same etcd pod as the etcd section of
+        `cluster status`. Quorum health is checked before every member and the
+        run stops at the first problem; the bytes reclaimed and the time taken
+        are reported after every member.
+
+        Args:
+            yes: Skip the confirmation prompt.
+            allow_quorum_loss: Defragment even if etcd has fewer than three members,
+                so that the control plane blocks while a member is defragmented.
+
+        Returns:
+            True if every member was defragmented, False otherwise.
+        """
+        console.print(Panel.fit("Defragmenting etcd", title="etcd Defragmentation"))
+
+        kubeconfig_path = os.path.join(self.repo_path, "kubeconfig")
+        if not os.path.exists(kubeconfig_path):
+            console.print("[bold red]Error: Kubeconfig not found. Cluster may not be initialized.[/bold red]")
+            return False
+        env = os.environ.copy()
+        env["KUBECONFIG"] = kubeconfig_path
+
+        try:
+            with self._take_snapshot(env, ("pods",)) as snapshot:
+                pod_name = self._etcd_pod(snapshot)
+            records = self._etcd_members(env, pod_name)
+        except KubeApiError as e:
+            console.print(f"[bold red]Error reading etcd member status: {e}[/bold red]")
+            return False
+        headers, rows = member_rows(records)
+        self._print_rows_table("etcd Members", headers, rows)
+        if records and len(records) < MIN_DEFRAG_MEMBERS:
+            if not allow_quorum_loss:
+                console.print(f"[bold red]Error: etcd has {len(records)} member(s) and loses quorum while one of them is "
+                              f"defragmented. Use --allow-quorum-loss to defragment anyway.[/bold red]")
+                return False
+            console.print(f"[bold yellow]Warning: etcd has {len(records)} member(s); the control plane blocks while "
+                          f"each member is defragmented.[/bold yellow]")
+
+        if not yes and not questionary.confirm(
+            f"Defragment {len(records)} etcd member(s), one at a time? Each member blocks while it is defragmented."
+        ).ask():
+            console.print("[yellow]Defragmentation cancelled.[/yellow]")
+            return False
+
+        timeout = int(self.config.get('cluster.etcd_defrag_timeout', DEFAULT_DEFRAG_TIMEOUT))
+
+        def defrag(endpoint: str) -> Tuple[int, str, str]:
+            console.print(f"Defragmenting {endpoint}...")
+            return run_command(
+                f"kubectl -n kube-system exec {pod_name} -- etcdctl defrag --endpoints={endpoint} --command-timeout={timeout}s",
+                cwd=self.repo_path, env=env, suppress_output=True
+            )
+
+        def report(result: DefragResult) -> None:
+            role = " (leader)" if result.leader else ""
+            if not result.ok:
+                console.print(f"[bold red]{result.endpoint}{role}: {result.detail}[/bold red]")
+            elif result.reclaimed is not None:
+                console.print(f"[green]{result.endpoint}{role}: reclaimed {format_bytes(result.reclaimed)} "
+                              f"({format_bytes(result.size_before)} -> {format_bytes(result.size_after)}) "
+                              f"in {result.seconds:.1f}s[/green]")
+            else:
+                console.print(f"[green]{result.endpoint}{role}: defragmented in {result.seconds:.1f}s[/green]")
+
+        defragmenter = EtcdDefrag(status=lambda: self._etcd_members(env, pod_name), defrag=defrag, on_result=report,
+                                  allow_quorum_loss=allow_quorum_loss)
+        succeeded = defragmenter.run(records)
+
+        done = [result for result in defragmenter.results if result.ok]
+        reclaimed = sum(result.reclaimed or 0 for result in done)
+        if not succeeded:
+            console.print(f"[bold red]Defragmentation stopped after {len(done)} of {len(records)} member(s); "
+                          f"the remaining members were not touched.[/bold red]")
+            return False
+        console.print(f"[bold green]Defragmented {len(done)} etcd member(s), reclaimed {format_bytes(reclaimed)} "
+                      f"in {sum(result.seconds for result in done):.1f}s.[/bold green]")
+        return True
+
+    def backup_etcd(self, output_dir: Optional[str] = None, keep: Optional[int] = None,
+                    node: Optional[str] = None, verify: bool = True) -> bool:
+        """Take a compressed etcd snapshot and rotate old ones.
+
+        `talosctl etcd snapshot` writes the snapshot to a temporary file next to
+        the backups, which is then compressed chunk by chunk, so the snapshot
+        never passes through memory as a whole. Control plane nodes are tried
+        in order until one delivers a snapshot.
+
+        Args:
+            output_dir: Directory for the snapshots. If None, uses `backup.etcd_dir`.
+            keep: Number of snapshots to keep. If None, uses `backup.etcd_retention`.
+            node: Name or IP of the control plane node to snapshot. If None, tries each in turn.
+            verify: Check the SHA-256 checksum etcd appends to the snapshot.
+
+        Returns:
+            True if a snapshot was written, False otherwise.
+        """
+        console.print(Panel.fit("Backing up etcd", title="etcd Backup"))
+
+        cluster_info = self._get_current_cluster_info()
+        if not cluster_info:
+            return False
+        nodes = [item for item in cluster_info['nodes'] if is_control_plane(item)]
+        if node:
+            nodes = [item for item in nodes if node in (item['name'], item['ip'])]
+        if not nodes:
+            console.print(f"[bold red]Error: No control plane node {node or ''} to take a snapshot from.[/bold red]")
+            return False
+
+        output_dir = os.path.expanduser(output_dir or self.config.get('backup.etcd_dir', DEFAULT_BACKUP_DIR))
+        if keep is None:
+            keep = int(self.config.get('backup.etcd_retention', DEFAULT_RETENTION))
+        max_age_days = self.config.get('backup.etcd_max_age_days')
+        os.makedirs(output_dir, exist_ok=True)
+        dest = os.path.join(output_dir, snapshot_name(cluster_info['name']))
+
+        # The raw snapshot lands on the same file system as the backups and is removed once compressed
+        raw_file = os.path.join(output_dir, f".{os.path.basename(dest)[:-len('.gz')]}")
+        try:
+            snapshot = None
+            for candidate in nodes:
+                console.print(f"Taking etcd snapshot on {candidate['name']} ({candidate['ip']})...")
+                returncode, _, stderr = run_command(
+                    f"talosctl --nodes {candidate['ip']} etcd snapshot \"{raw_file}\"",
+                    cwd=self.repo_path, suppress_output=True
+                )
+                if returncode != 0 or not os.path.exists(raw_file):
+                    console.print(f"[yellow]Snapshot on {candidate['name']} failed: "
+                                  f"{stderr.strip() or f'talosctl exited with {returncode}'}[/yellow]")
+                    continue
+                try:
+                    snapshot = compress_snapshot(raw_file, dest, verify=verify)
+                except SnapshotError as e:
+                    console.print(f"[yellow]{e}[/yellow]")
+                    continue
+                break
+        finally:
+            for leftover in (raw_file, f"{raw_file}.part"):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+
+        if snapshot is None:
+            console.print("[bold red]Error: No control plane node delivered a valid etcd snapshot.[/bold red]")
+            return False
+        console.print(f"[green]Wrote {snapshot.path}: {format_bytes(snapshot.size)} snapshot compressed to "
+                      f"{format_bytes(snapshot.compressed_size)} in {snapshot.seconds:.1f}s[/green]")
+        console.print(f"[dim]sha256 {snapshot.sha256}[/dim]")
+
+        removed = rotate_snapshots(output_dir, cluster_info['name'], keep=keep,
+                                   max_age_days=float(max_age_days) if max_age_days is not None else None)
+        for path in removed:
+            console.print(f"[dim]Removed old snapshot {path}[/dim]")
+        return True
+
+    def refresh_inventory(self) -> bool:
+        """Discover the cluster again and replace the cached inventory.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        cluster_info = self._get_current_cluster_info(refresh=True)
+        if not cluster_info:
+            return False
+        self._print_inventory(cluster_info)
+        if cluster_info.get('source') == 'defaults':
+            console.print("[bold yellow]Warning: talosctl returned no nodes; showing the default nodes, which were not cached.[/bold yellow]")
+        return True
+
+    def show_inventory(self) -> bool:
+        """Print the cached inventory, discovering the cluster if there is none.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        inventory = self._inventory_cache().get(self.repo_path, include_stale=True)
+        if inventory is None:
+            return self.refresh_inventory()
+        self._print_inventory(inventory.cluster_info())
+        state = "stale" if inventory.age() >= self._inventory_cache().ttl else "fresh"
+        console.print(f"[dim]Discovered from {inventory.source} {inventory.age():.0f}s ago ({state}). "
+                      f"Run `hm-cli cluster inventory refresh` to update it.[/dim]")
+        return True
+
+    def _print_inventory(self, cluster_info: Dict[str, Any]) -> None:
+        """Print the nodes and addresses of a cluster."""
+        console.print(f"Cluster [bold]{cluster_info.get('name')}[/bold], control plane VIP {cluster_info.get('control_plane_vip')}")
+        console.print(self._build_status_table(
+            ["NAME", "IP", "ROLE", "HARDWARE", "POOL"],
+            [[node.get('name'), node.get('ip'), node.get('type'), node.get('hardware'), node.get('pool') or "-"]
+             for node in cluster_info['nodes']]
+        ))
+
+    @staticmethod
+    def _config_file_pool(content: str) -> Optional[str]:
+        """Return the pool recorded in the node labels of a rendered Talos configuration, if any."""
+        try:
+            documents = list(yaml.safe_load_all(content))
+        except yaml.YAMLError:
+            return None
+        for document in documents:
+            if isinstance(document, dict):
+                labels = (document.get('machine') or {}).get('nodeLabels') or {}
+                if labels.get(POOL_LABEL):
+                    return str(labels[POOL_LABEL])
+        return None
     
+    def _with_target_versions(self, cluster_info: Dict[str, Any], k8s_version: str, talos_version: str) -> Dict[str, Any]:
+        """Return the cluster information with the versions to upgrade to.
+
+        Empty versions keep the ones the cluster runs now.
+        """
+        return dict(
+            cluster_info,
+            talos_version=talos_version or cluster_info.get('talos_version') or self.config.get('cluster.talos_version', 'v1.7.0'),
+            kubernetes_version=k8s_version or cluster_info.get('kubernetes_version') or self.config.get('cluster.kubernetes_version', 'v1.29.0'),
+        )
+
     def _update_talos_configs(self, cluster_info: Dict[str, Any], k8s_version: str, talos_version: str) -> bool:
         """Update Talos configurations for upgrade.
         
@@ -1232,6 +2333,15 @@ resources:
         Returns:
             True if successful, False otherwise.
         """
+        if self.config.get('cluster.talos_renderer', 'python') != 'script':
+            target = self._with_target_versions(cluster_info, k8s_version, talos_version)
+            if not self._render_talos_configs(target):
+                return False
+            with self.config.batch():
+                self.config.set('cluster.talos_version', target['talos_version'])
+                self.config.set('cluster.kubernetes_version', target['kubernetes_version'])
+            return True
+
         # Build command with versions if provided
         cmd = os.path.join(self.repo_path, "bootstrap", "talos", "gen-config.sh")
         
@@ -1253,6 +2363,95 @@ resources:
         
         return True
     
+    def _rolling_upgrade(self, cluster_info: Dict[str, Any], talos_version: Optional[str] = None,
+                         max_unavailable: Optional[int] = None, only_changed: bool = False) -> bool:
+        """Upgrade the nodes one batch at a time.
+
+        Every node is cordoned, drained, given its new configuration (and Talos
+        version) and uncordoned once it is Ready again; control plane nodes also
+        wait for their etcd member to be healthy. The elapsed time of every phase
+        is printed as it finishes. The digest of a node's configuration is
+        recorded as soon as it has been applied, as `_apply_talos_configs` does.
+
+        Args:
+            cluster_info: Cluster information.
+            talos_version: Talos version to install. If empty, only the configuration is applied.
+            max_unavailable: Maximum number of workers upgraded at the same time.
+                If None, uses `cluster.upgrade_max_unavailable`. Workers of a pool
+                use the pool's `max_unavailable` instead, if it sets one.
+            only_changed: Leave out nodes whose configuration file is unchanged
+                since it was last applied to them.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        kubeconfig_path = os.path.join(self.repo_path, "kubeconfig")
+        if not os.path.exists(kubeconfig_path):
+            console.print("[bold red]Error: Kubeconfig not found. A rolling upgrade needs access to the cluster.[/bold red]")
+            return False
+
+        env = os.environ.copy()
+        env["KUBECONFIG"] = kubeconfig_path
+        project_root = self._talos_project_root()
+        if max_unavailable is None:
+            max_unavailable = int(self.config.get('cluster.upgrade_max_unavailable', DEFAULT_MAX_UNAVAILABLE))
+
+        operations = NodeOperations(
+            run=lambda command: run_command(command, cwd=self.repo_path, env=env),
+            config_file=lambda node: self._talos_config_file(node, project_root),
+            talos_version=talos_version or None,
+            drain_timeout=int(self.config.get('cluster.drain_timeout', DEFAULT_DRAIN_TIMEOUT)),
+            ready_timeout=float(self.config.get('cluster.node_ready_timeout', DEFAULT_NODE_READY_TIMEOUT)),
+        )
+
+        nodes = cluster_info['nodes']
+        applied = self._applied_configs()
+        config_files = {node['name']: self._talos_config_file(node, project_root) for node in nodes}
+        digests = {name: file_digest(path) if os.path.exists(path) else None for name, path in config_files.items()}
+        if only_changed:
+            unchanged = [node['name'] for node in nodes if not applied.changed(node, digests[node['name']])]
+            nodes = [node for node in nodes if node['name'] not in unchanged]
+            if unchanged:
+                console.print(f"[dim]Skipping {len(unchanged)} node(s) already running their configuration: {', '.join(unchanged)}[/dim]")
+            if not nodes:
+                console.print("[green]All nodes already run their current Talos configuration.[/green]")
+                return True
+        nodes_by_name = {node['name']: node for node in nodes}
+        # Phases are reported from the worker threads of a batch
+        applied_lock = threading.Lock()
+
+        def report(result: PhaseResult) -> None:
+            if result.ok:
+                console.print(f"[dim]{result.node}: {result.phase} done in {result.seconds:.1f}s[/dim]")
+            else:
+                console.print(f"[bold red]{result.node}: {result.phase} failed after {result.seconds:.1f}s: {result.detail}[/bold red]")
+            if result.ok and result.phase == "apply":
+                with applied_lock:
+                    applied.record(nodes_by_name[result.node], digests[result.node])
+                    applied.save()
+
+        pool_limits = {name: pool.max_unavailable for name, pool in self._worker_pools(cluster_info).items()}
+        batches = plan_batches(nodes, max_unavailable, pool_limits)
+        console.print(f"Upgrading {len(nodes)} node(s) in {len(batches)} batch(es), up to {max(1, max_unavailable)} worker(s) at a time...")
+        rollout = RollingUpgrade(operations, max_unavailable=max_unavailable, on_phase=report, pool_limits=pool_limits)
+        succeeded = rollout.run(nodes)
+
+        # Elapsed seconds per node and phase
+        timings: Dict[str, Dict[str, str]] = {}
+        for result in rollout.results:
+            timings.setdefault(result.node, {})[result.phase] = f"{result.seconds:.1f}" if result.ok else "Failed"
+        console.print(self._build_status_table(
+            ["NODE"] + [phase.upper() for phase in UPGRADE_PHASES],
+            [[name] + [phases.get(phase, "-") for phase in UPGRADE_PHASES] for name, phases in timings.items()]
+        ))
+
+        if not succeeded:
+            failed = [result.node for result in rollout.results if not result.ok]
+            console.print(f"[bold red]Rolling upgrade stopped. {', '.join(failed)} may still be cordoned; "
+                          f"nodes of later batches were not touched.[/bold red]")
+            return False
+        return True
+
     def _wait_for_upgrade(self, cluster_info: Dict[str, Any]) -> bool:
         """Wait for cluster upgrade to complete.
         
@@ -1262,42 +2461,117 @@ resources:
         Returns:
             True if successful, False otherwise.
         """
-        node_ips = ",".join([node['ip'] for node in cluster_info['nodes']])
-        
-        returncode, stdout, stderr = run_command(
-            f"talosctl health --nodes {node_ips} --wait-timeout 30m",
-            cwd=self.repo_path
-        )
+        timeout = float(self.config.get('cluster.upgrade_wait_timeout', DEFAULT_UPGRADE_WAIT_TIMEOUT))
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console
+        ) as progress:
+            task = progress.add_task("Waiting for the upgrade to complete...", total=None)
+            if not self._wait_for_cluster(cluster_info, timeout, on_update=self._wait_reporter(progress, task)):
+                progress.stop()
+                console.print("[bold red]Error waiting for upgrade to complete.[/bold red]")
+                return False
+            progress.update(task, completed=True)
         
-        if returncode != 0:
-            console.print(f"[bold red]Error waiting for upgrade to complete: {stderr}[/bold red]")
+        return True
+
+    @staticmethod
+    def _wait_reporter(progress: Progress, task: Any) -> Callable[[str, str, float], None]:
+        """Return a waiter callback showing the condition still waited on in a progress task."""
+        def update(name: str, detail: str, elapsed: float) -> None:
+            progress.update(task, description=f"Waiting for {name}: {detail} ({elapsed:.0f}s)")
+        return update
+
+    def _wait_for_cluster(self, cluster_info: Dict[str, Any], timeout: float,
+                          on_update: Optional[Callable[[str, str, float], None]] = None) -> bool:
+        """Wait until the Kubernetes API answers, every node is Ready and etcd is healthy.
+
+        Returns as soon as all conditions hold instead of sleeping for a fixed
+        time. Without a kubeconfig only etcd can be checked.
+
+        Args:
+            cluster_info: Cluster information.
+            timeout: Seconds to wait in total.
+            on_update: Called with (condition, detail, elapsed seconds) after every poll.
+
+        Returns:
+            True if the cluster became healthy within the timeout, False otherwise.
+        """
+        kubeconfig_path = os.path.join(self.repo_path, "kubeconfig")
+        env = os.environ.copy()
+        env["KUBECONFIG"] = kubeconfig_path
+
+        def run(command: str) -> Tuple[int, str, str]:
+            return run_command(command, cwd=self.repo_path, env=env, suppress_output=True)
+
+        nodes = cluster_info['nodes']
+        conditions = []
+        if os.path.exists(kubeconfig_path):
+            conditions += [api_reachable(run), nodes_ready(run, [node['name'] for node in nodes])]
+        conditions.append(etcd_healthy(run, [node['ip'] for node in nodes if is_control_plane(node)]))
+
+        result = Waiter(conditions, timeout, on_update=on_update).wait()
+        if not result.ok:
+            console.print(f"[bold red]Timed out after {result.elapsed:.0f}s waiting for {result.pending}: {result.detail}[/bold red]")
             return False
-        
+        console.print("[dim]Cluster healthy after {:.0f}s ({})[/dim]".format(
+            result.elapsed, ", ".join(f"{name} at {seconds:.0f}s" for name, seconds in result.met.items())
+        ))
         return True
     
-    def _reset_nodes(self, cluster_info: Dict[str, Any]) -> bool:
+    def _reset_nodes(self, cluster_info: Dict[str, Any], concurrency: Optional[int] = None,
+                     timeout: Optional[float] = None) -> bool:
         """Reset Talos nodes.
+
+        All nodes are reset concurrently. A node that fails or times out does
+        not stop the others; a summary table shows the outcome of every node.
+        If any node was not wiped, the deletion stops before the local files
+        (kubeconfig, talosconfig, state) are removed, so it can be retried.
         
         Args:
             cluster_info: Cluster information.
+            concurrency: Maximum number of nodes reset at the same time.
+                If None, uses `cluster.reset_concurrency`.
+            timeout: Seconds to wait for each node. If None, uses `cluster.reset_timeout`.
             
         Returns:
-            True if successful, False otherwise.
+            True if every node was wiped, False otherwise.
         """
-        for node in cluster_info['nodes']:
-            console.print(f"Resetting node {node['name']} ({node['ip']})...")
-            
-            returncode, stdout, stderr = run_command(
-                f"talosctl reset --graceful=false --reboot --system-labels-to-wipe STATE --system-labels-to-wipe EPHEMERAL --nodes {node['ip']}",
-                cwd=self.repo_path
-            )
-            
-            if returncode != 0:
-                console.print(f"[bold yellow]Warning: Error resetting node {node['name']}: {stderr}[/bold yellow]")
-                
-                # Continue with other nodes even if one fails
-                continue
-        
+        nodes = cluster_info['nodes']
+        concurrency = concurrency or int(self.config.get('cluster.reset_concurrency', DEFAULT_RESET_CONCURRENCY))
+        timeout = timeout or float(self.config.get('cluster.reset_timeout', DEFAULT_RESET_TIMEOUT))
+
+        console.print(f"Resetting {len(nodes)} node(s), up to {concurrency} at a time ({timeout:g}s timeout per node)...")
+        results = run_commands(
+            [
+                f"talosctl reset --graceful=false --reboot --system-labels-to-wipe STATE --system-labels-to-wipe EPHEMERAL --nodes {node['ip']}"
+                for node in nodes
+            ],
+            cwd=self.repo_path,
+            limit=concurrency,
+            timeout=timeout
+        )
+
+        rows = []
+        for node, (returncode, _, stderr) in zip(nodes, results):
+            if returncode == 0:
+                rows.append([node['name'], node['ip'], "Wiped", ""])
+            elif returncode == COMMAND_TIMEOUT_RETURNCODE:
+                rows.append([node['name'], node['ip'], "TimedOut", f"No response within {timeout:g}s"])
+            else:
+                rows.append([node['name'], node['ip'], "Failed", stderr.strip()])
+
+        console.print(self._build_status_table(["NODE", "IP", "STATUS", "DETAIL"], rows))
+        outcomes = [row[2] for row in rows]
+        console.print(
+            f"Wiped: {outcomes.count('Wiped')}, timed out: {outcomes.count('TimedOut')}, failed: {outcomes.count('Failed')}"
+        )
+        if outcomes.count('Wiped') != len(nodes):
+            console.print("[bold red]Error: Not all nodes were reset. Local files were kept; "
+                          "run `cluster delete` again or reset the remaining nodes with `talosctl reset`.[/bold red]")
+            return False
+
         return True
     
     def _cleanup_local_files(self, cluster_info: Dict[str, Any]) -> bool:
@@ -1309,6 +2583,20 @@ resources:
         Returns:
             True if successful, False otherwise.
         """
+        # Reset nodes no longer run any of the recorded configurations
+        try:
+            self._applied_configs().clear()
+        except OSError as e:
+            console.print(f"[bold yellow]Warning: Error removing applied configuration digests: {e}[/bold yellow]")
+        try:
+            self._create_journal().clear()
+        except OSError as e:
+            console.print(f"[bold yellow]Warning: Error removing the cluster creation journal: {e}[/bold yellow]")
+        try:
+            self._inventory_cache().remove(self.repo_path)
+        except OSError as e:
+            console.print(f"[bold yellow]Warning: Error removing the cached cluster inventory: {e}[/bold yellow]")
+
         # Remove kubeconfig
         kubeconfig_path = os.path.join(self.repo_path, "kubeconfig")
         if os.path.exists(kubeconfig_path):
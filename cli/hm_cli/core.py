@@ -5,34 +5,169 @@ Contains shared utilities and base functionality.
 
 import os
 import sys
+import signal
+import shutil
 import logging
+import tempfile
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple # Added Tuple
+from typing import Dict, Any, Optional, Tuple, List, Iterable, Awaitable, Sequence
 
 import yaml
 from rich.console import Console
-from rich.logging import RichHandler
 
 # Set up rich console for output
 console = Console()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(message)s",
-    datefmt="[%X]",
-    handlers=[RichHandler(console=console, rich_tracebacks=True)]
-)
 logger = logging.getLogger("hm-cli")
 
+
+class _DeferredRichHandler(logging.Handler):
+    """Logging handler that builds the RichHandler on the first record.
+
+    Importing rich.logging (and its traceback renderer) costs more than most
+    commands spend logging, so it only happens once something is logged.
+    """
+
+    def __init__(self, level: int = logging.NOTSET):
+        super().__init__(level)
+        self._handler: Optional[logging.Handler] = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._handler is None:
+            from rich.logging import RichHandler
+            self._handler = RichHandler(console=console, rich_tracebacks=True)
+            self._handler.setFormatter(self.formatter)
+        self._handler.emit(record)
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Configure logging for the CLI.
+
+    Called by the entry point rather than at import time, so importing hm_cli
+    modules has no side effects on the logging setup of the importing program.
+    Does nothing if the root logger already has handlers.
+
+    Args:
+        level: Root log level.
+    """
+    handler = _DeferredRichHandler()
+    handler.setFormatter(logging.Formatter("%(message)s", datefmt="[%X]"))
+    logging.basicConfig(level=level, handlers=[handler])
+
 # Constants
 DEFAULT_CONFIG_DIR = os.path.expanduser("~/.config/hm-cli")
 DEFAULT_CONFIG_FILE = os.path.join(DEFAULT_CONFIG_DIR, "config.yaml")
 DEFAULT_REPO_PATH = os.path.expanduser("~/hm.hnnl.eu")
+DEFAULT_COMMAND_CONCURRENCY = 4
+# Return code reported when a command is killed after exceeding its timeout (same as coreutils `timeout`)
+COMMAND_TIMEOUT_RETURNCODE = 124
+
+
+class _ConfigStore:
+    """Parsed contents of one configuration file, shared by every ConfigManager in the process.
+
+    The file is parsed once and only re-read when its stat signature (mtime,
+    size, inode) changes. Writes go to a temporary file in the same directory
+    that is renamed over the original, so readers never see a partial file.
+    """
+
+    _stores: Dict[str, "_ConfigStore"] = {}
+    _stores_lock = threading.Lock()
+
+    def __init__(self, path: str):
+        self.path = path
+        self.data: Dict[str, Any] = {}
+        self.signature: Optional[Tuple[int, int, int]] = None
+        self.pending: List[Tuple[str, Any]] = []
+        self.batch_depth = 0
+        self.lock = threading.RLock()
+
+    @classmethod
+    def for_path(cls, path: str) -> "_ConfigStore":
+        """Return the store of a configuration file, creating it on first use."""
+        key = os.path.abspath(path)
+        with cls._stores_lock:
+            store = cls._stores.get(key)
+            if store is None:
+                store = cls._stores[key] = cls(path)
+            return store
+
+    @classmethod
+    def clear(cls) -> None:
+        """Forget all cached configurations."""
+        with cls._stores_lock:
+            cls._stores.clear()
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        """Return the stat signature of the file, or None if it does not exist."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def current(self, create_default) -> Dict[str, Any]:
+        """Return the configuration, reloading it if the file changed on disk.
+
+        Args:
+            create_default: Called to create the file if it does not exist.
+        """
+        with self.lock:
+            if self.signature is not None and self._stat() == self.signature:
+                return self.data
+            if not os.path.exists(self.path):
+                create_default()
+            self.signature = self._stat()
+            try:
+                with open(self.path, 'r') as f:
+                    self.data = yaml.safe_load(f) or {}
+            except Exception as e:
+                logger.error(f"Error loading configuration: {e}")
+                self.data = {}
+            # Changes not yet written survive a reload
+            for key, value in self.pending:
+                _set_nested(self.data, key, value)
+            return self.data
+
+    def write(self, data: Dict[str, Any]) -> None:
+        """Atomically replace the file with the given configuration."""
+        with self.lock:
+            directory = os.path.dirname(self.path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=".config-", suffix=".yaml.tmp", dir=directory)
+            os.close(fd)
+            try:
+                with open(tmp_path, 'w') as f:
+                    yaml.dump(data, f, default_flow_style=False)
+                if os.path.exists(self.path):
+                    shutil.copymode(self.path, tmp_path)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+            self.data = data
+            self.signature = self._stat()
+
+
+def _set_nested(config: Dict[str, Any], key: str, value: Any) -> None:
+    """Set a dot-notation key in a nested dict, creating intermediate dicts."""
+    keys = key.split('.')
+    for k in keys[:-1]:
+        if not isinstance(config.get(k), dict):
+            config[k] = {}
+        config = config[k]
+    config[keys[-1]] = value
 
 
 class ConfigManager:
-    """Manages configuration for the CLI tool."""
+    """Manages configuration for the CLI tool.
+
+    All instances for the same file share one parsed copy, which is re-read
+    only when the file changes on disk.
+    """
     
     def __init__(self, config_file: Optional[str] = None):
         """Initialize the configuration manager.
@@ -41,23 +176,25 @@ class ConfigManager:
             config_file: Path to the configuration file. If None, uses the default.
         """
         self.config_file = config_file or DEFAULT_CONFIG_FILE
-        self.config = self._load_config()
-    
+        self._store = _ConfigStore.for_path(self.config_file)
+        self._store.current(self._create_default_config)
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """The current configuration values."""
+        return self._store.current(self._create_default_config)
+
+    @config.setter
+    def config(self, value: Dict[str, Any]) -> None:
+        self._store.data = value
+
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from file.
         
         Returns:
             Dict containing configuration values.
         """
-        if not os.path.exists(self.config_file):
-            self._create_default_config()
-        
-        try:
-            with open(self.config_file, 'r') as f:
-                return yaml.safe_load(f) or {}
-        except Exception as e:
-            logger.error(f"Error loading configuration: {e}")
-            return {}
+        return self.config
     
     def _create_default_config(self) -> None:
         """Create default configuration file."""
@@ -76,10 +213,7 @@ class ConfigManager:
             }
         }
         
-        os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
-        
-        with open(self.config_file, 'w') as f:
-            yaml.dump(default_config, f, default_flow_style=False)
+        self._store.write(default_config)
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get a configuration value.
@@ -104,28 +238,52 @@ class ConfigManager:
     
     def set(self, key: str, value: Any) -> None:
         """Set a configuration value.
+
+        The file is written immediately, or once at the end of the enclosing
+        `batch()`.
         
         Args:
             key: Configuration key, can use dot notation for nested keys.
             value: Value to set.
         """
-        keys = key.split('.')
-        config = self.config
-        
-        for i, k in enumerate(keys[:-1]):
-            if k not in config:
-                config[k] = {}
-            config = config[k]
-        
-        config[keys[-1]] = value
-        self._save_config()
+        store = self._store
+        with store.lock:
+            _set_nested(self.config, key, value)
+            store.pending.append((key, value))
+            if store.batch_depth == 0:
+                self._save_config()
+
+    @contextmanager
+    def batch(self):
+        """Collect all `set()` calls in the block into a single write.
+
+        Example:
+            with config.batch():
+                config.set('cluster.name', name)
+                config.set('cluster.control_plane_vip', vip)
+        """
+        store = self._store
+        with store.lock:
+            store.batch_depth += 1
+        try:
+            yield self
+        finally:
+            with store.lock:
+                store.batch_depth -= 1
+                if store.batch_depth == 0 and store.pending:
+                    self._save_config()
     
     def _save_config(self) -> None:
-        """Save configuration to file."""
-        os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
-        
-        with open(self.config_file, 'w') as f:
-            yaml.dump(self.config, f, default_flow_style=False)
+        """Save configuration to file.
+
+        If another process changed the file since it was read, its version is
+        loaded first and the pending changes are applied on top of it.
+        """
+        store = self._store
+        with store.lock:
+            data = self.config  # Reloads (keeping pending changes) if the file changed
+            store.write(data)
+            store.pending = []
 
 
 def ensure_repo_exists(repo_path: str) -> bool:
@@ -187,6 +345,133 @@ def run_command(command: str, cwd: Optional[str] = None, env: Optional[Dict[str,
         return -1, "", str(e)
 
 
+async def run_command_async(command: str, cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None, suppress_output: bool = False, timeout: Optional[float] = None) -> Tuple[int, str, str]:
+    """Run a shell command without blocking the event loop.
+
+    Same contract as `run_command`. The command runs in its own process group,
+    which is killed if the timeout expires or the awaiting task is cancelled.
+
+    Args:
+        command: Command to run.
+        cwd: Working directory for the command.
+        env: Environment variables for the command.
+        suppress_output: If True, suppress stdout/stderr from being printed by this function's logger.
+        timeout: Seconds to wait before killing the command. If None, waits indefinitely.
+
+    Returns:
+        Tuple of (return_code, stdout, stderr). A timed out command returns
+        COMMAND_TIMEOUT_RETURNCODE.
+    """
+    import asyncio # Imported on use; asyncio dominates the CLI start-up time otherwise
+
+    effective_env = os.environ.copy()
+    if env:
+        effective_env.update(env)
+
+    try:
+        process = await asyncio.create_subprocess_shell(
+            command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd,
+            env=effective_env,
+            start_new_session=sys.platform != "win32"
+        )
+    except FileNotFoundError:
+        if not suppress_output:
+            logger.error(f"Command not found: {command.split()[0]}")
+        return -1, "", f"Command not found: {command.split()[0]}"
+    except Exception as e:
+        if not suppress_output:
+            logger.error(f"Error running command {command}: {e}")
+        return -1, "", str(e)
+
+    try:
+        stdout_bytes, stderr_bytes = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        await _kill_process(process)
+        if not suppress_output:
+            logger.error(f"Command '{command}' timed out after {timeout}s")
+        return COMMAND_TIMEOUT_RETURNCODE, "", f"Command timed out after {timeout}s: {command}"
+    except asyncio.CancelledError:
+        await _kill_process(process)
+        raise
+
+    stdout = stdout_bytes.decode(errors="replace")
+    stderr = stderr_bytes.decode(errors="replace")
+    if not suppress_output:
+        if stdout:
+            logger.debug(f"Command '{command}' STDOUT: {stdout.strip()}")
+        if stderr:
+            logger.debug(f"Command '{command}' STDERR: {stderr.strip()}")
+
+    return process.returncode, stdout.strip(), stderr.strip()
+
+
+async def _kill_process(process: "asyncio.subprocess.Process") -> None:
+    """Kill a subprocess started by `run_command_async` together with its children."""
+    if process.returncode is not None:
+        return
+    try:
+        if sys.platform != "win32":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+    await process.wait()
+
+
+async def gather_limited(aws: Iterable[Awaitable[Any]], limit: int = DEFAULT_COMMAND_CONCURRENCY) -> List[Any]:
+    """Await several awaitables with at most `limit` of them in flight.
+
+    A failing awaitable does not affect the others: its exception is returned in
+    its slot instead of being raised.
+
+    Args:
+        aws: Awaitables to run.
+        limit: Maximum number of awaitables running at the same time.
+
+    Returns:
+        Results (or exceptions) in the order of `aws`.
+    """
+    import asyncio
+
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def _bounded(aw: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(_bounded(aw) for aw in aws), return_exceptions=True)
+
+
+def run_commands(commands: Sequence[str], cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None, limit: int = DEFAULT_COMMAND_CONCURRENCY, timeout: Optional[float] = None, suppress_output: bool = False) -> List[Tuple[int, str, str]]:
+    """Run several shell commands concurrently.
+
+    Args:
+        commands: Commands to run.
+        cwd: Working directory for the commands.
+        env: Environment variables for the commands.
+        limit: Maximum number of commands running at the same time.
+        timeout: Per-command timeout in seconds.
+        suppress_output: If True, suppress stdout/stderr from being printed by the logger.
+
+    Returns:
+        List of (return_code, stdout, stderr) tuples in the order of `commands`.
+    """
+    import asyncio
+
+    async def _run_all() -> List[Any]:
+        return await gather_limited(
+            [run_command_async(command, cwd=cwd, env=env, suppress_output=suppress_output, timeout=timeout) for command in commands],
+            limit=limit
+        )
+
+    results = asyncio.run(_run_all())
+    return [(-1, "", str(result)) if isinstance(result, BaseException) else result for result in results]
+
+
 def validate_ip_address(ip: str) -> bool:
     """Validate an IP address.
     
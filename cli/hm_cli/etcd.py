@@ -0,0 +1,274 @@
+"""
+etcd module for the hm-cli tool.
+Turns `etcdctl endpoint status` and `endpoint health` JSON into per-member
+records with DB size, fragmentation, raft progress and request latency, flags
+members that are fragmented, lagging or slow, and defragments members one at
+a time without risking quorum.
+"""
+
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+from hm_cli.core import logger
+from hm_cli.kube import KubeApiError
+from hm_cli.report import EtcdMemberRecord
+
+
+# Share of the DB file not in use above which a member counts as fragmented
+DEFAULT_FRAGMENTATION_THRESHOLD = 0.5
+# Raft entries a member may be behind the leader (or its own applied index) before it counts as lagging
+DEFAULT_RAFT_LAG_THRESHOLD = 100
+# Milliseconds a health check request may take before a member counts as slow
+DEFAULT_LATENCY_THRESHOLD_MS = 100.0
+# Seconds etcdctl allows the defragmentation of one member to take
+DEFAULT_DEFRAG_TIMEOUT = 120
+# Members needed to keep quorum while one of them is blocked by a defragmentation
+MIN_DEFRAG_MEMBERS = 3
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ns|us|µs|μs|ms|s|m|h)")
+_DURATION_MS = {"ns": 1e-6, "us": 1e-3, "µs": 1e-3, "μs": 1e-3, "ms": 1.0, "s": 1e3, "m": 60e3, "h": 3600e3}
+
+
+def parse_duration_ms(duration: Optional[str]) -> Optional[float]:
+    """Parse a Go duration such as `12.5ms` or `1m2s` into milliseconds, or None if it is not one."""
+    if not duration:
+        return None
+    parts = _DURATION_PART.findall(duration)
+    if not parts or "".join(value + unit for value, unit in parts) != duration.strip():
+        return None
+    return sum(float(value) * _DURATION_MS[unit] for value, unit in parts)
+
+
+def format_bytes(size: Optional[int]) -> str:
+    """Format a byte count with a binary unit, e.g. `118.3 MiB`."""
+    if size is None:
+        return "-"
+    value = float(size)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024 or unit == "GiB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
+
+
+def member_records(status: List[Dict[str, Any]], health: Optional[List[Dict[str, Any]]] = None,
+                   fragmentation_threshold: float = DEFAULT_FRAGMENTATION_THRESHOLD,
+                   lag_threshold: int = DEFAULT_RAFT_LAG_THRESHOLD,
+                   latency_threshold_ms: float = DEFAULT_LATENCY_THRESHOLD_MS) -> List[EtcdMemberRecord]:
+    """Build one record per member endpoint and flag the members that need attention.
+
+    Args:
+        status: `etcdctl endpoint status --cluster -w json` output.
+        health: `etcdctl endpoint health --cluster -w json` output, giving health and latency.
+        fragmentation_threshold: Unused share of the DB file above which a member is flagged.
+        lag_threshold: Raft entries behind the leader, or not yet applied, above which a member is flagged.
+        latency_threshold_ms: Health check latency above which a member is flagged.
+
+    Returns:
+        Records in the order etcdctl listed the endpoints; endpoints that only
+        answered the health check come last.
+    """
+    health_by_endpoint = {entry.get('endpoint', ''): entry for entry in health or []}
+    statuses = [(entry.get('Endpoint', ''), entry.get('Status') or {}) for entry in status]
+    leader_ids = {item.get('leader') for _, item in statuses if item.get('leader')}
+    leader_index = max((item.get('raftIndex') or 0 for _, item in statuses
+                        if item.get('header', {}).get('member_id') in leader_ids), default=None)
+
+    records = []
+    for endpoint, item in statuses:
+        member_id = item.get('header', {}).get('member_id')
+        db_size = item.get('dbSize')
+        in_use = item.get('dbSizeInUse')
+        raft_index = item.get('raftIndex')
+        applied_index = item.get('raftAppliedIndex')
+        record = EtcdMemberRecord(
+            endpoint=endpoint,
+            healthy=not item.get('errors'),
+            member_id=f"{member_id:x}" if isinstance(member_id, int) else None,
+            version=item.get('version'),
+            is_leader=member_id is not None and member_id in leader_ids,
+            is_learner=bool(item.get('isLearner')),
+            db_size=db_size,
+            db_size_in_use=in_use,
+            fragmentation=round(1 - in_use / db_size, 3) if db_size and in_use is not None else None,
+            raft_term=item.get('raftTerm'),
+            raft_index=raft_index,
+            raft_applied_index=applied_index,
+            raft_lag=leader_index - raft_index if leader_index is not None and raft_index is not None else None,
+        )
+        record.warnings.extend(str(error) for error in item.get('errors') or [])
+        _add_health(record, health_by_endpoint.pop(endpoint, None))
+        if not leader_ids:
+            record.warnings.append("no leader")
+        if record.fragmentation is not None and record.fragmentation > fragmentation_threshold:
+            record.warnings.append(f"fragmented: {record.fragmentation:.0%} of {format_bytes(db_size)} unused")
+        if record.raft_lag is not None and record.raft_lag > lag_threshold:
+            record.warnings.append(f"raft index {record.raft_lag} behind the leader")
+        if raft_index is not None and applied_index is not None and raft_index - applied_index > lag_threshold:
+            record.warnings.append(f"{raft_index - applied_index} raft entries not applied yet")
+        if record.latency_ms is not None and record.latency_ms > latency_threshold_ms:
+            record.warnings.append(f"slow: health check took {record.latency_ms:.0f}ms")
+        records.append(record)
+
+    # Members that did not answer the status request
+    for endpoint, entry in health_by_endpoint.items():
+        record = EtcdMemberRecord(endpoint=endpoint, healthy=True)
+        _add_health(record, entry)
+        record.warnings.append("no endpoint status")
+        records.append(record)
+    return records
+
+
+def _add_health(record: EtcdMemberRecord, entry: Optional[Dict[str, Any]]) -> None:
+    """Copy health and latency from an `endpoint health` entry into a record."""
+    if entry is None:
+        return
+    record.took = entry.get('took')
+    record.latency_ms = parse_duration_ms(entry.get('took'))
+    if not entry.get('health'):
+        record.healthy = False
+        record.error = entry.get('error') or "unhealthy"
+        record.warnings.append(f"unhealthy: {record.error}")
+
+
+def member_rows(records: List[EtcdMemberRecord]) -> Tuple[List[str], List[List[str]]]:
+    """Return the headers and rows of the etcd member table."""
+    headers = ["ENDPOINT", "ID", "LEADER", "DB SIZE", "IN USE", "FRAGMENTED", "RAFT TERM", "RAFT INDEX", "LAG",
+               "LATENCY", "HEALTH", "WARNINGS"]
+    rows = []
+    for record in records:
+        rows.append([
+            record.endpoint,
+            record.member_id or "-",
+            "yes" if record.is_leader else ("learner" if record.is_learner else "no"),
+            format_bytes(record.db_size),
+            format_bytes(record.db_size_in_use),
+            f"{record.fragmentation:.0%}" if record.fragmentation is not None else "-",
+            str(record.raft_term) if record.raft_term is not None else "-",
+            str(record.raft_index) if record.raft_index is not None else "-",
+            str(record.raft_lag) if record.raft_lag is not None else "-",
+            f"{record.latency_ms:.1f}ms" if record.latency_ms is not None else "-",
+            "healthy" if record.healthy else "unhealthy",
+            "; ".join(record.warnings) or "-",
+        ])
+    return headers, rows
+
+
+def quorum_healthy(records: List[EtcdMemberRecord], allow_quorum_loss: bool = False) -> Tuple[bool, str]:
+    """Return whether every member is healthy and follows a leader, with the reason if not.
+
+    Defragmenting a member blocks it, so it is only safe while all other
+    members are healthy and quorum survives losing one of them for a while.
+    With fewer than MIN_DEFRAG_MEMBERS members it does not, so such clusters
+    only pass with `allow_quorum_loss`.
+    """
+    if not records:
+        return False, "no etcd members found"
+    unhealthy = [record.endpoint for record in records if not record.healthy]
+    if unhealthy:
+        return False, f"unhealthy: {', '.join(unhealthy)}"
+    if not any(record.is_leader for record in records):
+        return False, "no leader"
+    if len(records) < MIN_DEFRAG_MEMBERS and not allow_quorum_loss:
+        return False, (f"only {len(records)} member(s); etcd loses quorum while one of them is defragmented, "
+                       f"which blocks the control plane")
+    return True, f"{len(records)}/{len(records)} members healthy"
+
+
+@dataclass
+class DefragResult:
+    """Outcome of defragmenting one member."""
+    endpoint: str
+    leader: bool
+    ok: bool
+    seconds: float
+    size_before: Optional[int] = None
+    size_after: Optional[int] = None
+    detail: str = ""
+
+    @property
+    def reclaimed(self) -> Optional[int]:
+        """Bytes the DB file shrank by, or None if a size is unknown."""
+        if self.size_before is None or self.size_after is None:
+            return None
+        return self.size_before - self.size_after
+
+
+class EtcdDefrag:
+    """Defragments etcd members one at a time, followers first and the leader last.
+
+    Quorum health is checked before every member, and the run stops at the
+    first failed check or defragmentation, leaving the remaining members
+    untouched. The leader is determined again before every member, so a
+    leader change during the run still leaves the current leader for last.
+    """
+
+    def __init__(self, status: Callable[[], List[EtcdMemberRecord]],
+                 defrag: Callable[[str], Tuple[int, str, str]],
+                 on_result: Optional[Callable[[DefragResult], None]] = None,
+                 clock: Callable[[], float] = time.monotonic, allow_quorum_loss: bool = False):
+        """Initialize the defragmentation.
+
+        Args:
+            status: Returns the current member records; may raise KubeApiError.
+            defrag: Defragments the member at an endpoint, returning (returncode, stdout, stderr).
+            on_result: Called with the result of every member as it finishes.
+            clock: Monotonic clock, replaceable in tests.
+            allow_quorum_loss: Also defragment clusters of fewer than MIN_DEFRAG_MEMBERS
+                members, whose control plane blocks while a member is defragmented.
+        """
+        self.status = status
+        self.defrag = defrag
+        self.on_result = on_result or (lambda result: None)
+        self.clock = clock
+        self.allow_quorum_loss = allow_quorum_loss
+        self.results: List[DefragResult] = []
+
+    def run(self, records: Optional[List[EtcdMemberRecord]] = None) -> bool:
+        """Defragment every member.
+
+        Args:
+            records: Current member records, if the caller already has them.
+
+        Returns:
+            True if every member was defragmented, False otherwise.
+        """
+        done = set()
+        while True:
+            try:
+                records = records if records is not None else self.status()
+            except KubeApiError as e:
+                self._record(DefragResult("-", False, False, 0.0, detail=f"quorum check failed: {e}"))
+                return False
+            pending = [record for record in records if record.endpoint not in done]
+            if not pending:
+                return True
+            ok, detail = quorum_healthy(records, self.allow_quorum_loss)
+            member = next((record for record in pending if not record.is_leader), pending[0])
+            if not ok:
+                self._record(DefragResult(member.endpoint, member.is_leader, False, 0.0,
+                                          member.db_size, detail=f"quorum check failed: {detail}"))
+                return False
+
+            started = self.clock()
+            returncode, _, stderr = self.defrag(member.endpoint)
+            seconds = self.clock() - started
+            done.add(member.endpoint)
+            if returncode != 0:
+                self._record(DefragResult(member.endpoint, member.is_leader, False, seconds, member.db_size,
+                                          detail=stderr.strip() or f"etcdctl defrag exited with {returncode}"))
+                return False
+            try:
+                records = self.status()
+            except KubeApiError:
+                records = None
+            size_after = next((record.db_size for record in records or [] if record.endpoint == member.endpoint), None)
+            self._record(DefragResult(member.endpoint, member.is_leader, True, seconds, member.db_size, size_after))
+
+    def _record(self, result: DefragResult) -> None:
+        """Keep and report the result of a member."""
+        logger.info(f"Defragmentation of {result.endpoint}: {'done' if result.ok else 'failed'} after {result.seconds:.1f}s")
+        self.results.append(result)
+        self.on_result(result)
@@ -5,8 +5,7 @@ Handles Git operations and Flux synchronization.
 
 import os
 import sys
-import time
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 import git
 import questionary
@@ -14,6 +13,11 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.panel import Panel
 
 from hm_cli.core import logger, console, ConfigManager, run_command, get_repo_path
+from hm_cli.waiter import Waiter, git_revision, kustomization_ready
+
+
+# Seconds `gitops sync` waits for Flux to apply the fetched revision
+DEFAULT_SYNC_TIMEOUT = 300
 
 
 class GitOpsManager:
@@ -219,21 +223,24 @@ class GitOpsManager:
                 console.print(f"[bold red]Error triggering Flux reconciliation: {stderr}[/bold red]")
                 return False
             
-            # Wait for reconciliation to complete
-            progress.update(task, description="Waiting for reconciliation to complete...")
-            
-            # Sleep for a moment to allow reconciliation to start
-            time.sleep(2)
-            
-            # Check reconciliation status
-            returncode, stdout, stderr = run_command(
-                "flux get kustomizations --watch",
-                cwd=self.repo_path
-            )
+            # Wait until the Kustomization has applied the fetched revision
+            def run(command: str) -> Tuple[int, str, str]:
+                return run_command(command, cwd=self.repo_path, env=env, suppress_output=True)
+
+            def update(name: str, detail: str, elapsed: float) -> None:
+                progress.update(task, description=f"Waiting for {name}: {detail} ({elapsed:.0f}s)")
+
+            revision = git_revision(run)
+            timeout = float(self.config.get('gitops.sync_timeout', DEFAULT_SYNC_TIMEOUT))
+            result = Waiter([kustomization_ready(run, "flux-system", revision=revision)], timeout, on_update=update).wait()
+            if not result.ok:
+                progress.stop()
+                console.print(f"[bold red]Timed out after {result.elapsed:.0f}s waiting for {result.pending}: {result.detail}[/bold red]")
+                return False
             
             progress.update(task, completed=True)
         
-        console.print("[green]Flux synchronization triggered successfully.[/green]")
+        console.print(f"[green]Flux synchronization completed in {result.elapsed:.0f}s.[/green]")
         console.print("[blue]Check the status with: flux get all[/blue]")
         return True
     
@@ -0,0 +1,295 @@
+"""
+Inventory module for the hm-cli tool.
+Persists the discovered cluster inventory (nodes, IPs, roles, hardware
+profiles and the VIP) so commands can start without a talosctl round trip,
+and loads the declarative inventory files `cluster create --from` reads.
+"""
+
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, List, Optional
+
+import yaml
+
+from hm_cli.core import validate_ip_address
+from hm_cli.pools import POOL_LABEL, WorkerPool
+
+
+DEFAULT_INVENTORY_FILE = os.path.join(os.path.expanduser("~"), ".cache", "hm-cli", "inventory.json")
+# Seconds a cached inventory is used before it is discovered again
+DEFAULT_INVENTORY_TTL = 3600
+# Node settings kept only if a node has them; with name, IP, type and hardware
+# they are everything the Talos configuration of a node is rendered from
+OPTIONAL_NODE_KEYS = ('pool', 'install_disk', 'labels')
+
+
+@dataclass
+class Inventory:
+    """Nodes and addresses of a cluster, as discovered at `refreshed_at`."""
+    name: str
+    network_prefix: str
+    control_plane_vip: str
+    nodes: List[Dict[str, Any]] = field(default_factory=list)
+    source: str = "talosctl"
+    refreshed_at: float = 0.0
+    pools: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    talos_version: str = ""
+    kubernetes_version: str = ""
+
+    @classmethod
+    def from_cluster_info(cls, cluster_info: Dict[str, Any], source: Optional[str] = None) -> "Inventory":
+        """Build an inventory from the cluster information used by ClusterManager."""
+        return cls(
+            name=cluster_info.get('name') or "",
+            network_prefix=cluster_info.get('network_prefix') or "",
+            control_plane_vip=cluster_info.get('control_plane_vip') or "",
+            nodes=[
+                dict({key: node.get(key) for key in ('name', 'ip', 'type', 'hardware')},
+                     **{key: node[key] for key in OPTIONAL_NODE_KEYS if node.get(key) is not None})
+                for node in cluster_info.get('nodes') or []
+            ],
+            source=source or cluster_info.get('source') or "talosctl",
+            refreshed_at=time.time(),
+            pools=dict(cluster_info.get('pools') or {}),
+            talos_version=cluster_info.get('talos_version') or "",
+            kubernetes_version=cluster_info.get('kubernetes_version') or "",
+        )
+
+    def cluster_info(self) -> Dict[str, Any]:
+        """Return the inventory in the cluster information format."""
+        cluster_info = {
+            'name': self.name,
+            'network_prefix': self.network_prefix,
+            'control_plane_vip': self.control_plane_vip,
+            'nodes': [dict(node) for node in self.nodes],
+            'source': self.source,
+        }
+        for key in ('talos_version', 'kubernetes_version'):
+            if getattr(self, key):
+                cluster_info[key] = getattr(self, key)
+        if self.pools:
+            cluster_info['pools'] = {name: dict(pool) for name, pool in self.pools.items()}
+        return cluster_info
+
+    def age(self) -> float:
+        """Seconds since the inventory was discovered."""
+        return max(0.0, time.time() - self.refreshed_at)
+
+
+class InventoryCache:
+    """Inventories of all known repositories, stored in one JSON file."""
+
+    def __init__(self, path: Optional[str] = None, ttl: float = DEFAULT_INVENTORY_TTL):
+        """Initialize the cache.
+
+        Args:
+            path: JSON file holding the inventories. If None, uses DEFAULT_INVENTORY_FILE.
+            ttl: Seconds an inventory stays fresh.
+        """
+        self.path = path or DEFAULT_INVENTORY_FILE
+        self.ttl = ttl
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_file = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, self.path)
+
+    def get(self, repo_path: str, include_stale: bool = False) -> Optional[Inventory]:
+        """Return the inventory of a repository.
+
+        Args:
+            repo_path: Repository the inventory belongs to.
+            include_stale: Also return inventories older than the TTL.
+
+        Returns:
+            The inventory, or None if there is no (fresh) inventory.
+        """
+        entry = self._read().get(os.path.abspath(repo_path))
+        if not entry:
+            return None
+        try:
+            inventory = Inventory(**entry)
+        except TypeError:
+            return None
+        if not include_stale and inventory.age() >= self.ttl:
+            return None
+        return inventory
+
+    def put(self, repo_path: str, inventory: Inventory) -> None:
+        """Store the inventory of a repository."""
+        entries = self._read()
+        entries[os.path.abspath(repo_path)] = asdict(inventory)
+        self._write(entries)
+
+    def remove(self, repo_path: str) -> None:
+        """Forget the inventory of a repository."""
+        entries = self._read()
+        if entries.pop(os.path.abspath(repo_path), None) is not None:
+            self._write(entries)
+
+
+NODE_ROLES = ("controlplane", "worker")
+DEFAULT_TALOS_VERSION = "v1.7.0"
+DEFAULT_KUBERNETES_VERSION = "v1.29.0"
+
+_NODE_NAME = re.compile(r"^[a-z0-9]([-a-z0-9]*[a-z0-9])?$")
+
+
+class InventoryFileError(Exception):
+    """An inventory file is missing, unreadable or invalid."""
+
+
+def load_inventory_file(path: str) -> Dict[str, Any]:
+    """Load a declarative cluster inventory.
+
+    The file lists any number of nodes; `defaults` fills in settings a node
+    does not set itself::
+
+        cluster:
+          name: homelab
+          control_plane_vip: 192.168.1.100
+          talos_version: v1.7.0
+          kubernetes_version: v1.29.0
+        flux:
+          owner: my-github-user
+          repository: homelab
+        defaults:
+          install_disk: /dev/sda
+        pools:
+          compute:
+            max_parallel: 4
+            max_unavailable: 2
+            labels:
+              node-role.kubernetes.io/compute: ""
+        nodes:
+          - name: talos-cp1
+            ip: 192.168.1.101
+            role: controlplane
+            hardware: ryzen
+            labels:
+              topology.kubernetes.io/zone: rack-1
+          - name: talos-w1
+            ip: 192.168.1.111
+            role: worker
+            pool: compute
+            install_disk: /dev/nvme0n1
+
+    Worker nodes of a pool get the pool's labels and its
+    `<pool>-pool-patch.yaml`, and are applied and upgraded with the pool's limits.
+
+    Args:
+        path: YAML inventory file.
+
+    Returns:
+        Cluster information in the format `ClusterManager` uses.
+
+    Raises:
+        InventoryFileError: If the file cannot be read or lists invalid nodes.
+    """
+    try:
+        with open(path) as f:
+            data = yaml.safe_load(f) or {}
+    except OSError as e:
+        raise InventoryFileError(f"Cannot read inventory {path}: {e}") from e
+    except yaml.YAMLError as e:
+        raise InventoryFileError(f"Invalid YAML in inventory {path}: {e}") from e
+    if not isinstance(data, dict):
+        raise InventoryFileError(f"Inventory {path} must be a mapping")
+
+    cluster = data.get('cluster') or {}
+    defaults = data.get('defaults') or {}
+    errors: List[str] = []
+
+    vip = str(cluster.get('control_plane_vip') or "")
+    if not validate_ip_address(vip):
+        errors.append(f"cluster.control_plane_vip '{vip}' is not an IPv4 address")
+
+    pools: Dict[str, WorkerPool] = {}
+    pool_entries = data.get('pools') or {}
+    if not isinstance(pool_entries, dict):
+        errors.append("pools must be a mapping")
+        pool_entries = {}
+    for pool_name, entry in pool_entries.items():
+        pool_name = str(pool_name)
+        if not _NODE_NAME.match(pool_name):
+            errors.append(f"pools.{pool_name}: name must be a lowercase DNS label")
+            continue
+        try:
+            pools[pool_name] = WorkerPool.from_dict(pool_name, entry if isinstance(entry, dict) else {})
+        except ValueError as e:
+            errors.append(str(e))
+
+    nodes = []
+    for index, entry in enumerate(data.get('nodes') or []):
+        if not isinstance(entry, dict):
+            errors.append(f"nodes[{index}] must be a mapping")
+            continue
+        node = dict(defaults, **entry)
+        name = str(node.get('name') or "")
+        label = f"nodes[{index}] ({name or 'unnamed'})"
+        role = node.pop('role', None) or node.get('type') or "controlplane"
+        if not _NODE_NAME.match(name):
+            errors.append(f"{label}: name must be a lowercase DNS label")
+        if not validate_ip_address(str(node.get('ip') or "")):
+            errors.append(f"{label}: ip '{node.get('ip')}' is not an IPv4 address")
+        if role not in NODE_ROLES:
+            errors.append(f"{label}: role must be one of {', '.join(NODE_ROLES)}")
+        if not isinstance(node.get('labels') or {}, dict):
+            errors.append(f"{label}: labels must be a mapping")
+        pool = node.get('pool')
+        labels = {}
+        if pool:
+            pool = str(pool)
+            if role != "worker":
+                errors.append(f"{label}: only worker nodes can join a pool")
+            elif pool not in pools:
+                errors.append(f"{label}: pool '{pool}' is not defined under pools")
+            else:
+                labels.update(pools[pool].labels, **{POOL_LABEL: pool})
+        if isinstance(node.get('labels') or {}, dict):
+            labels.update({str(key): str(value) for key, value in (node.get('labels') or {}).items()})
+        nodes.append(dict({
+            'name': name,
+            'ip': str(node.get('ip') or ""),
+            'type': role,
+            'hardware': node.get('hardware') or "unknown",
+            'install_disk': node.get('install_disk'),
+            'labels': labels,
+        }, **({'pool': pool} if pool else {})))
+
+    for key in ('name', 'ip'):
+        seen = set()
+        for node in nodes:
+            if node[key] and node[key] in seen:
+                errors.append(f"Duplicate node {key} '{node[key]}'")
+            seen.add(node[key])
+    if not any(node['type'] == "controlplane" for node in nodes):
+        errors.append("At least one controlplane node is required")
+    if errors:
+        raise InventoryFileError(f"Invalid inventory {path}:\n  " + "\n  ".join(errors))
+
+    cluster_info = {
+        'name': str(cluster.get('name') or "homelab"),
+        'network_prefix': str(cluster.get('network_prefix') or vip.rsplit('.', 1)[0]),
+        'control_plane_vip': vip,
+        'talos_version': str(cluster.get('talos_version') or DEFAULT_TALOS_VERSION),
+        'kubernetes_version': str(cluster.get('kubernetes_version') or DEFAULT_KUBERNETES_VERSION),
+        'nodes': nodes,
+    }
+    if pools:
+        cluster_info['pools'] = {name: pool.to_dict() for name, pool in pools.items()}
+    if data.get('flux'):
+        cluster_info['flux'] = dict(data['flux'])
+    return cluster_info
@@ -0,0 +1,91 @@
+"""
+Journal module for the hm-cli tool.
+Records the steps of `cluster create` that completed, each with a digest of
+its inputs, so an interrupted creation can resume from the step that failed.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+
+
+# Journal of the current `cluster create`, relative to the repository
+CREATE_JOURNAL_FILE = os.path.join(".hm-cli", "create-journal.json")
+
+# Steps of `cluster create`, in order
+CREATE_STEPS = ("configs", "apply", "bootstrap", "kubeconfig", "flux_directories", "flux", "core_components")
+
+
+def input_digest(*inputs: Any) -> str:
+    """Return the SHA-256 digest of JSON-serializable step inputs."""
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class CreateJournal:
+    """Completed steps of a `cluster create`, with the cluster information they used.
+
+    A step counts as done only if it was recorded with the same input digest
+    that the caller computes now, so a step whose inputs or outputs changed
+    since (e.g. an edited configuration file) runs again.
+    """
+
+    def __init__(self, path: str):
+        """Initialize the journal.
+
+        Args:
+            path: JSON file holding the journal.
+        """
+        self.path = path
+        try:
+            with open(path) as f:
+                self.entries: Dict[str, Any] = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    @property
+    def cluster_info(self) -> Optional[Dict[str, Any]]:
+        """Cluster information the creation was started with, or None if there is none to resume."""
+        return self.entries.get('cluster_info')
+
+    def start(self, cluster_info: Dict[str, Any]) -> None:
+        """Begin a new creation, forgetting the steps of any earlier one."""
+        self.entries = {'cluster_info': cluster_info, 'started_at': self._now(), 'steps': {}}
+        self.save()
+
+    def done(self, step: str, digest: Optional[str]) -> bool:
+        """Return True if a step completed with the given input digest."""
+        entry = self.entries.get('steps', {}).get(step)
+        return bool(entry) and entry.get('digest') == digest
+
+    def completed_at(self, step: str) -> Optional[str]:
+        """Return when a step completed, or None if it did not."""
+        return (self.entries.get('steps', {}).get(step) or {}).get('completed_at')
+
+    def finished(self) -> bool:
+        """Return True if every step of the creation completed."""
+        return all(step in self.entries.get('steps', {}) for step in CREATE_STEPS)
+
+    def record(self, step: str, digest: str) -> None:
+        """Remember that a step completed with the given input digest, writing the journal at once."""
+        self.entries.setdefault('steps', {})[step] = {'digest': digest, 'completed_at': self._now()}
+        self.save()
+
+    def save(self) -> None:
+        """Write the journal."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_file = f"{self.path}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, self.path)
+
+    def clear(self) -> None:
+        """Forget the creation, e.g. once it has finished."""
+        self.entries = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
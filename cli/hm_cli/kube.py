@@ -0,0 +1,507 @@
+"""
+Kubernetes API module for the hm-cli tool.
+Provides an in-process API client with a pooled keep-alive connection and
+watch support, and a kubectl-based fallback backend exposing the same list
+interface.
+"""
+
+import os
+import json
+import ssl
+import base64
+import queue
+import shlex
+import socket
+import threading
+import shutil
+import tempfile
+import http.client
+from urllib.parse import urlsplit, urlencode
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+import yaml
+
+from hm_cli.core import logger, run_command
+
+
+# kind -> (API group path, resource plural, namespaced)
+RESOURCES: Dict[str, Tuple[str, str, bool]] = {
+    "nodes": ("/api/v1", "nodes", False),
+    "pods": ("/api/v1", "pods", True),
+    "namespaces": ("/api/v1", "namespaces", False),
+    "persistentvolumes": ("/api/v1", "persistentvolumes", False),
+    "persistentvolumeclaims": ("/api/v1", "persistentvolumeclaims", True),
+    "storageclasses": ("/apis/storage.k8s.io/v1", "storageclasses", False),
+    "kustomizations": ("/apis/kustomize.toolkit.fluxcd.io/v1", "kustomizations", True),
+    "gitrepositories": ("/apis/source.toolkit.fluxcd.io/v1", "gitrepositories", True),
+    "helmrepositories": ("/apis/source.toolkit.fluxcd.io/v1", "helmrepositories", True),
+    "ocirepositories": ("/apis/source.toolkit.fluxcd.io/v1beta2", "ocirepositories", True),
+}
+
+KUBE_BACKENDS = ("auto", "api", "kubectl")
+DEFAULT_POOL_SIZE = 8
+DEFAULT_REQUEST_TIMEOUT = 15
+# Objects per list request when paginating with limit/continue
+DEFAULT_PAGE_SIZE = 500
+# Server-side duration of one watch request; the watch is resumed afterwards
+DEFAULT_WATCH_TIMEOUT = 300
+
+
+class KubeApiError(Exception):
+    """Raised when a Kubernetes API request fails."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        """Initialize the error.
+
+        Args:
+            message: Human readable error message.
+            status: HTTP status code, if the API server answered.
+        """
+        super().__init__(message)
+        self.status = status
+
+    @property
+    def missing_kind(self) -> bool:
+        """Whether the error means the resource kind is not served (e.g. CRD not installed)."""
+        return self.status == 404 or "doesn't have a resource type" in str(self)
+
+    @property
+    def expired(self) -> bool:
+        """Whether a watch resourceVersion is too old and the kind must be relisted."""
+        return self.status == 410
+
+
+class KubeConfig:
+    """Connection settings of the current context of a kubeconfig file."""
+
+    def __init__(self, server: str, ca_data: Optional[bytes] = None, cert_data: Optional[bytes] = None,
+                 key_data: Optional[bytes] = None, token: Optional[str] = None, insecure: bool = False):
+        """Initialize the connection settings.
+
+        Args:
+            server: API server URL.
+            ca_data: PEM encoded cluster CA.
+            cert_data: PEM encoded client certificate.
+            key_data: PEM encoded client key.
+            token: Bearer token.
+            insecure: Skip TLS verification of the API server.
+        """
+        self.server = server
+        self.ca_data = ca_data
+        self.cert_data = cert_data
+        self.key_data = key_data
+        self.token = token
+        self.insecure = insecure
+
+    @classmethod
+    def load(cls, path: str, context: Optional[str] = None) -> "KubeConfig":
+        """Load connection settings from a kubeconfig file.
+
+        Args:
+            path: Path to the kubeconfig file.
+            context: Context to use. If None, uses the current context.
+
+        Returns:
+            The connection settings.
+
+        Raises:
+            KubeApiError: If the kubeconfig cannot be used by the in-process client.
+        """
+        try:
+            with open(path, 'r') as f:
+                data = yaml.safe_load(f) or {}
+        except (OSError, yaml.YAMLError) as e:
+            raise KubeApiError(f"Cannot read kubeconfig {path}: {e}")
+
+        base_dir = os.path.dirname(os.path.abspath(path))
+        context_name = context or data.get('current-context')
+        contexts = {c.get('name'): c.get('context', {}) for c in data.get('contexts') or []}
+        clusters = {c.get('name'): c.get('cluster', {}) for c in data.get('clusters') or []}
+        users = {u.get('name'): u.get('user', {}) or {} for u in data.get('users') or []}
+
+        ctx = contexts.get(context_name) or (next(iter(contexts.values())) if len(contexts) == 1 else None)
+        if ctx is None:
+            raise KubeApiError(f"Context '{context_name}' not found in {path}")
+        cluster = clusters.get(ctx.get('cluster'))
+        if not cluster or not cluster.get('server'):
+            raise KubeApiError(f"Cluster '{ctx.get('cluster')}' has no server in {path}")
+        user = users.get(ctx.get('user'), {})
+        if 'exec' in user or 'auth-provider' in user:
+            raise KubeApiError("Exec and auth-provider credentials are only supported through kubectl")
+
+        return cls(
+            server=cluster['server'],
+            ca_data=_read_data(cluster, 'certificate-authority', base_dir),
+            cert_data=_read_data(user, 'client-certificate', base_dir),
+            key_data=_read_data(user, 'client-key', base_dir),
+            token=user.get('token'),
+            insecure=bool(cluster.get('insecure-skip-tls-verify', False)),
+        )
+
+    def ssl_context(self) -> ssl.SSLContext:
+        """Build the TLS context for this configuration."""
+        if self.ca_data:
+            context = ssl.create_default_context(cadata=self.ca_data.decode())
+        else:
+            context = ssl.create_default_context()
+        if self.insecure:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        if self.cert_data and self.key_data:
+            # ssl only loads client credentials from files; keep them in a private temp dir just long enough
+            temp_dir = tempfile.mkdtemp(prefix="hm-cli-")
+            try:
+                cert_file = os.path.join(temp_dir, "client.crt")
+                key_file = os.path.join(temp_dir, "client.key")
+                for file_path, content in ((cert_file, self.cert_data), (key_file, self.key_data)):
+                    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(content)
+                context.load_cert_chain(cert_file, key_file)
+            finally:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+        return context
+
+
+def _read_data(section: Dict[str, Any], key: str, base_dir: str) -> Optional[bytes]:
+    """Read inline `<key>-data` or the file referenced by `<key>` from a kubeconfig section."""
+    if section.get(f"{key}-data"):
+        return base64.b64decode(section[f"{key}-data"])
+    if section.get(key):
+        file_path = os.path.join(base_dir, os.path.expanduser(section[key]))
+        with open(file_path, 'rb') as f:
+            return f.read()
+    return None
+
+
+def resource_path(kind: str, namespace: Optional[str] = None) -> str:
+    """Build the API path listing a resource kind.
+
+    Args:
+        kind: Resource kind, a key of RESOURCES.
+        namespace: Namespace to restrict namespaced kinds to.
+
+    Returns:
+        The request path, relative to the API server URL.
+    """
+    if kind not in RESOURCES:
+        raise KubeApiError(f"Unsupported resource kind: {kind}")
+    group_path, plural, namespaced = RESOURCES[kind]
+    if namespace and namespaced:
+        return f"{group_path}/namespaces/{namespace}/{plural}"
+    return f"{group_path}/{plural}"
+
+
+class KubeApiClient:
+    """Minimal Kubernetes API client keeping a pool of keep-alive connections.
+
+    The kubeconfig is parsed and the TLS context built once; every request then
+    reuses an idle connection, skipping the process start, kubeconfig parsing,
+    TLS handshake and API discovery that each `kubectl` call pays for.
+    """
+
+    name = "api"
+
+    def __init__(self, kubeconfig: KubeConfig, pool_size: int = DEFAULT_POOL_SIZE, timeout: float = DEFAULT_REQUEST_TIMEOUT):
+        """Initialize the API client.
+
+        Args:
+            kubeconfig: Connection settings.
+            pool_size: Maximum number of idle connections kept open.
+            timeout: Socket timeout for requests, in seconds.
+        """
+        url = urlsplit(kubeconfig.server)
+        if url.scheme not in ("https", "http"):
+            raise KubeApiError(f"Unsupported API server URL: {kubeconfig.server}")
+        self.kubeconfig = kubeconfig
+        self.timeout = timeout
+        self._scheme = url.scheme
+        self._host = url.hostname
+        self._port = url.port or (443 if url.scheme == "https" else 80)
+        self._base_path = url.path.rstrip('/')
+        self._ssl_context = kubeconfig.ssl_context() if url.scheme == "https" else None
+        self._headers = {"Accept": "application/json", "User-Agent": "hm-cli"}
+        if kubeconfig.token:
+            self._headers["Authorization"] = f"Bearer {kubeconfig.token}"
+        self._pool: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize=pool_size)
+        self._watches: set = set()
+        self._watches_lock = threading.Lock()
+
+    @classmethod
+    def from_kubeconfig(cls, path: str, **kwargs: Any) -> "KubeApiClient":
+        """Create a client for the current context of a kubeconfig file."""
+        return cls(KubeConfig.load(path), **kwargs)
+
+    def list(self, kind: str, namespace: Optional[str] = None, label_selector: Optional[str] = None,
+             field_selector: Optional[str] = None, limit: Optional[int] = None,
+             continue_token: Optional[str] = None) -> Dict[str, Any]:
+        """List objects of a resource kind.
+
+        Args:
+            kind: Resource kind, a key of RESOURCES.
+            namespace: Namespace to list in. If None, lists across all namespaces.
+            label_selector: Label selector, e.g. `component=etcd`.
+            field_selector: Field selector, e.g. `status.phase=Running`.
+            limit: Maximum number of objects to return; the List then carries
+                `metadata.continue` if more objects remain.
+            continue_token: `metadata.continue` of the previous page.
+
+        Returns:
+            The decoded List object.
+        """
+        query: Dict[str, Any] = {}
+        if label_selector:
+            query["labelSelector"] = label_selector
+        if field_selector:
+            query["fieldSelector"] = field_selector
+        if limit:
+            query["limit"] = limit
+        if continue_token:
+            query["continue"] = continue_token
+        return self.get(resource_path(kind, namespace), query)
+
+    def iter_pages(self, kind: str, namespace: Optional[str] = None, label_selector: Optional[str] = None,
+                   field_selector: Optional[str] = None, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """List objects of a resource kind page by page.
+
+        Filtering happens on the API server and only one page is held in memory
+        at a time. Arguments are as for `list`.
+
+        Yields:
+            The objects of each page.
+        """
+        continue_token = None
+        while True:
+            listing = self.list(kind, namespace=namespace, label_selector=label_selector, field_selector=field_selector,
+                                limit=page_size, continue_token=continue_token)
+            yield listing.get('items') or []
+            continue_token = listing.get('metadata', {}).get('continue')
+            if not continue_token:
+                return
+
+    def get(self, path: str, query: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Send a GET request and decode the JSON response.
+
+        Args:
+            path: Request path relative to the API server URL.
+            query: Query parameters.
+
+        Returns:
+            The decoded response body.
+
+        Raises:
+            KubeApiError: On connection errors and non-2xx responses.
+        """
+        url = self._base_path + path + (f"?{urlencode(query)}" if query else "")
+        status, body = self._request("GET", url)
+        if status >= 400:
+            raise KubeApiError(_status_message(status, body), status=status)
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            raise KubeApiError(f"Invalid JSON from {url}: {e}", status=status)
+
+    def watch(self, kind: str, resource_version: str, namespace: Optional[str] = None,
+              timeout_seconds: int = DEFAULT_WATCH_TIMEOUT) -> Iterator[Dict[str, Any]]:
+        """Stream change events of a resource kind.
+
+        Each watch holds its own connection, outside the pool, for as long as the
+        server keeps the stream open. Bookmark events are requested so that the
+        resourceVersion stays fresh on quiet kinds.
+
+        Args:
+            kind: Resource kind, a key of RESOURCES.
+            resource_version: Resource version to start from, usually the
+                `metadata.resourceVersion` of a preceding list.
+            namespace: Namespace to watch in. If None, watches all namespaces.
+            timeout_seconds: Server-side duration of the watch.
+
+        Yields:
+            Watch events, dicts with `type` (ADDED, MODIFIED, DELETED, BOOKMARK) and `object`.
+
+        Raises:
+            KubeApiError: On connection errors, non-2xx responses and ERROR events.
+                A resourceVersion that is too old is reported with status 410.
+        """
+        query = {
+            "watch": "1",
+            "resourceVersion": resource_version,
+            "allowWatchBookmarks": "true",
+            "timeoutSeconds": timeout_seconds,
+        }
+        url = self._base_path + resource_path(kind, namespace) + f"?{urlencode(query)}"
+        connection = self._connect(timeout=timeout_seconds + self.timeout)
+        with self._watches_lock:
+            self._watches.add(connection)
+        try:
+            connection.request("GET", url, headers=self._headers)
+            response = connection.getresponse()
+            if response.status >= 400:
+                raise KubeApiError(_status_message(response.status, response.read()), status=response.status)
+            while True:
+                line = response.readline()
+                if not line:
+                    return
+                if not line.strip():
+                    continue
+                try:
+                    event = json.loads(line)
+                except ValueError as e:
+                    raise KubeApiError(f"Invalid watch event from {url}: {e}")
+                if event.get('type') == "ERROR":
+                    status = event.get('object') or {}
+                    raise KubeApiError(f"Watch of {kind} failed: {status.get('message', 'unknown error')}", status=status.get('code'))
+                yield event
+        except (OSError, http.client.HTTPException) as e:
+            raise KubeApiError(f"Watch of {kind} on {self._host}:{self._port} failed: {e}")
+        finally:
+            with self._watches_lock:
+                self._watches.discard(connection)
+            connection.close()
+
+    def close(self) -> None:
+        """Close all idle pooled connections and interrupt open watches."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._watches_lock:
+            watches = list(self._watches)
+        for connection in watches:
+            # Shutting the socket down wakes up the thread blocked reading the stream
+            if connection.sock is not None:
+                try:
+                    connection.sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+    def _request(self, method: str, url: str) -> Tuple[int, bytes]:
+        """Send a request over a pooled connection, retrying once on a stale connection."""
+        for attempt in range(2):
+            connection, reused = self._acquire()
+            try:
+                connection.request(method, url, headers=self._headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException) as e:
+                connection.close()
+                if reused and attempt == 0:
+                    # The server may have closed an idle keep-alive connection; retry on a fresh one
+                    logger.debug(f"Retrying {url} on a new connection after: {e}")
+                    continue
+                raise KubeApiError(f"Request to {self._host}:{self._port}{url} failed: {e}")
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(connection)
+            return response.status, body
+        raise KubeApiError(f"Request to {self._host}:{self._port}{url} failed")  # pragma: no cover
+
+    def _acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """Take an idle connection from the pool or open a new one."""
+        try:
+            return self._pool.get_nowait(), True
+        except queue.Empty:
+            pass
+        return self._connect(), False
+
+    def _connect(self, timeout: Optional[float] = None) -> http.client.HTTPConnection:
+        """Open a new connection to the API server."""
+        timeout = timeout or self.timeout
+        if self._scheme == "https":
+            return http.client.HTTPSConnection(self._host, self._port, timeout=timeout, context=self._ssl_context)
+        return http.client.HTTPConnection(self._host, self._port, timeout=timeout)
+
+    def _release(self, connection: http.client.HTTPConnection) -> None:
+        """Return a connection to the pool, closing it if the pool is full."""
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+
+def _status_message(status: int, body: bytes) -> str:
+    """Extract the message of a Kubernetes Status response."""
+    try:
+        message = json.loads(body).get('message')
+    except (ValueError, AttributeError):
+        message = None
+    return f"API server returned {status}: {message or body[:200].decode(errors='replace')}"
+
+
+class KubectlBackend:
+    """Fallback backend running `kubectl get -o json` for each list call."""
+
+    name = "kubectl"
+
+    def __init__(self, cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None):
+        """Initialize the kubectl backend.
+
+        Args:
+            cwd: Working directory for kubectl.
+            env: Environment for kubectl, usually carrying KUBECONFIG.
+        """
+        self.cwd = cwd
+        self.env = env
+
+    def list(self, kind: str, namespace: Optional[str] = None, label_selector: Optional[str] = None,
+             field_selector: Optional[str] = None) -> Dict[str, Any]:
+        """List objects of a resource kind. See KubeApiClient.list."""
+        if kind not in RESOURCES:
+            raise KubeApiError(f"Unsupported resource kind: {kind}")
+        command = f"kubectl get {kind}"
+        if RESOURCES[kind][2]:
+            command += f" -n {shlex.quote(namespace)}" if namespace else " -A"
+        # Selectors may contain spaces, parentheses and `!`, which the shell must not interpret
+        if label_selector:
+            command += f" -l {shlex.quote(label_selector)}"
+        if field_selector:
+            command += f" --field-selector {shlex.quote(field_selector)}"
+        command += " -o json"
+
+        returncode, stdout, stderr = run_command(command, cwd=self.cwd, env=self.env, suppress_output=True)
+        if returncode != 0:
+            raise KubeApiError(stderr.strip() or f"kubectl exited with code {returncode}")
+        try:
+            return json.loads(stdout)
+        except ValueError as e:
+            raise KubeApiError(f"Invalid JSON from '{command}': {e}")
+
+    def iter_pages(self, kind: str, namespace: Optional[str] = None, label_selector: Optional[str] = None,
+                   field_selector: Optional[str] = None, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """List objects of a resource kind as a single page.
+
+        kubectl already requests the objects in chunks of `--chunk-size` but
+        prints one List, so everything arrives at once.
+        """
+        yield self.list(kind, namespace=namespace, label_selector=label_selector, field_selector=field_selector).get('items') or []
+
+    def close(self) -> None:
+        """Nothing to release; present for interface parity with KubeApiClient."""
+
+
+def get_kube_backend(kubeconfig_path: str, backend: str = "auto", cwd: Optional[str] = None,
+                     env: Optional[Dict[str, str]] = None):
+    """Create the backend used to read cluster state.
+
+    Args:
+        kubeconfig_path: Path to the kubeconfig file.
+        backend: One of KUBE_BACKENDS. `auto` uses the in-process client when the
+            kubeconfig supports it and falls back to kubectl otherwise.
+        cwd: Working directory for the kubectl backend.
+        env: Environment for the kubectl backend.
+
+    Returns:
+        A KubeApiClient or KubectlBackend.
+    """
+    if backend not in KUBE_BACKENDS:
+        raise KubeApiError(f"Unknown Kubernetes backend '{backend}', expected one of: {', '.join(KUBE_BACKENDS)}")
+    if backend in ("auto", "api"):
+        try:
+            return KubeApiClient.from_kubeconfig(kubeconfig_path)
+        except (KubeApiError, OSError, ssl.SSLError, ValueError) as e:
+            if backend == "api":
+                raise KubeApiError(f"In-process Kubernetes client unavailable: {e}")
+            logger.debug(f"Falling back to kubectl backend: {e}")
+    return KubectlBackend(cwd=cwd, env=env)
@@ -0,0 +1,69 @@
+"""
+Worker pool module for the hm-cli tool.
+Worker pools are named groups of worker nodes that share a Talos patch and
+node labels, and are configured and upgraded as batches with their own
+concurrency limits, separately from the control plane.
+"""
+
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, List, Optional, Tuple
+
+
+# Node label carrying the pool of a worker, so discovered nodes keep their pool
+POOL_LABEL = "hm.hnnl.eu/pool"
+# Talos patch shared by the nodes of a pool, in `infrastructure/talos`
+POOL_PATCH = "{pool}-pool-patch.yaml"
+
+
+@dataclass
+class WorkerPool:
+    """Settings shared by the nodes of a pool."""
+    name: str
+    # Nodes of the pool configured at the same time; None uses `cluster.apply_concurrency`
+    max_parallel: Optional[int] = None
+    # Nodes of the pool upgraded at the same time; None uses `cluster.upgrade_max_unavailable`
+    max_unavailable: Optional[int] = None
+    labels: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, name: str, data: Optional[Dict[str, Any]]) -> "WorkerPool":
+        """Build a pool from its inventory file or config entry.
+
+        Raises:
+            ValueError: If a limit is not a positive integer or labels is not a mapping.
+        """
+        data = data or {}
+        limits = {}
+        for key in ('max_parallel', 'max_unavailable'):
+            value = data.get(key)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 1):
+                raise ValueError(f"pool {name}: {key} must be a positive integer")
+            limits[key] = value
+        labels = data.get('labels') or {}
+        if not isinstance(labels, dict):
+            raise ValueError(f"pool {name}: labels must be a mapping")
+        return cls(name, labels={str(key): str(value) for key, value in labels.items()}, **limits)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the pool as stored in cluster information and the config."""
+        data = asdict(self)
+        del data['name']
+        return data
+
+
+def load_pools(data: Optional[Dict[str, Any]]) -> Dict[str, WorkerPool]:
+    """Return the pools of cluster information or the `cluster.pools` config value."""
+    return {name: WorkerPool.from_dict(name, entry) for name, entry in (data or {}).items()}
+
+
+def group_by_pool(nodes: List[Dict[str, Any]]) -> List[Tuple[Optional[str], List[Dict[str, Any]]]]:
+    """Group worker nodes by pool.
+
+    Returns:
+        (pool, nodes) pairs; workers outside any pool come first under None,
+        then the pools in the order their first node is listed.
+    """
+    groups: Dict[Optional[str], List[Dict[str, Any]]] = {None: []}
+    for node in nodes:
+        groups.setdefault(node.get('pool') or None, []).append(node)
+    return [(pool, members) for pool, members in groups.items() if members]
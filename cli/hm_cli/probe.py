@@ -0,0 +1,182 @@
+"""
+Probe module for the hm-cli tool.
+Checks that the Kubernetes API server and the Talos API answer on the control
+plane VIP and on every node by opening TCP connections to them concurrently,
+and reports connect latency percentiles over several attempts per endpoint.
+"""
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+
+from hm_cli.core import gather_limited
+from hm_cli.report import TcpProbeRecord
+from hm_cli.rolling import is_control_plane
+
+
+# Kubernetes API server port, served by control plane nodes and the VIP
+API_SERVER_PORT = 6443
+# Talos API port, served by every node
+TALOS_API_PORT = 50000
+# Connections opened per endpoint
+DEFAULT_PROBE_ATTEMPTS = 5
+# Seconds a single connection attempt may take
+DEFAULT_PROBE_TIMEOUT = 1.0
+# Endpoints probed at the same time
+DEFAULT_PROBE_CONCURRENCY = 32
+
+_SERVICES = {API_SERVER_PORT: "kube-apiserver", TALOS_API_PORT: "talos-api"}
+
+
+@dataclass
+class ProbeTarget:
+    """An endpoint to probe."""
+    name: str
+    address: str
+    port: int
+
+    @property
+    def service(self) -> str:
+        return _SERVICES.get(self.port, str(self.port))
+
+
+def probe_targets(vip: Optional[str], nodes: List[Dict[str, Any]]) -> List[ProbeTarget]:
+    """Return the endpoints of a cluster worth probing.
+
+    The VIP is probed on the API server port; control plane nodes on the API
+    server and Talos API ports; workers on the Talos API port.
+
+    Args:
+        vip: Control plane VIP, if known.
+        nodes: cluster_info nodes.
+
+    Returns:
+        The targets, VIP first, then the nodes in order.
+    """
+    targets = [ProbeTarget("vip", vip, API_SERVER_PORT)] if vip else []
+    for node in nodes:
+        if not node.get('ip'):
+            continue
+        ports = (API_SERVER_PORT, TALOS_API_PORT) if is_control_plane(node) else (TALOS_API_PORT,)
+        targets.extend(ProbeTarget(node.get('name') or node['ip'], node['ip'], port) for port in ports)
+    return targets
+
+
+def percentile(values: List[float], share: float) -> Optional[float]:
+    """Return the nearest-rank percentile of `values`, e.g. `share=0.9` for p90, or None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(share * len(ordered)) - 1)]
+
+
+async def _connect(address: str, port: int, timeout: float) -> Tuple[Optional[float], str]:
+    """Open and close one TCP connection.
+
+    Returns:
+        (milliseconds until the connection was established, "") or (None, error).
+    """
+    import asyncio # Imported on use, like run_command_async
+
+    started = time.perf_counter()
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(address, port), timeout=timeout)
+    except asyncio.TimeoutError:
+        return None, f"timed out after {timeout:g}s"
+    except OSError as e:
+        return None, e.strerror or str(e)
+    elapsed = (time.perf_counter() - started) * 1000
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return elapsed, ""
+
+
+async def _probe(target: ProbeTarget, attempts: int, timeout: float) -> TcpProbeRecord:
+    """Connect to a target `attempts` times, one connection after the other."""
+    latencies, errors = [], []
+    for _ in range(max(1, attempts)):
+        elapsed, error = await _connect(target.address, target.port, timeout)
+        if elapsed is None:
+            errors.append(error)
+        else:
+            latencies.append(elapsed)
+    return TcpProbeRecord(
+        name=target.name,
+        address=target.address,
+        port=target.port,
+        service=target.service,
+        attempts=max(1, attempts),
+        connected=len(latencies),
+        p50_ms=_round(percentile(latencies, 0.5)),
+        p90_ms=_round(percentile(latencies, 0.9)),
+        p99_ms=_round(percentile(latencies, 0.99)),
+        max_ms=_round(max(latencies, default=None)),
+        # The most frequent failure is the most telling one
+        error=max(set(errors), key=errors.count) if errors else None,
+    )
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
+
+
+def probe(targets: List[ProbeTarget], attempts: int = DEFAULT_PROBE_ATTEMPTS, timeout: float = DEFAULT_PROBE_TIMEOUT,
+          limit: int = DEFAULT_PROBE_CONCURRENCY) -> List[TcpProbeRecord]:
+    """Probe targets concurrently.
+
+    Attempts against one target run one after the other, so they do not queue
+    behind each other in the target's accept backlog; different targets are
+    probed at the same time, so the probe takes about as long as the slowest
+    target rather than the sum of all of them.
+
+    Args:
+        targets: Endpoints to probe.
+        attempts: Connections opened per target.
+        timeout: Seconds a single connection attempt may take.
+        limit: Targets probed at the same time.
+
+    Returns:
+        One record per target, in the order of `targets`.
+    """
+    import asyncio
+
+    async def _probe_all() -> List[Any]:
+        return await gather_limited([_probe(target, attempts, timeout) for target in targets], limit=limit)
+
+    results = asyncio.run(_probe_all()) if targets else []
+    records = []
+    for target, result in zip(targets, results):
+        if isinstance(result, BaseException):
+            result = TcpProbeRecord(target.name, target.address, target.port, target.service,
+                                    attempts=max(1, attempts), connected=0, error=str(result) or type(result).__name__)
+        records.append(result)
+    return records
+
+
+def probe_rows(records: List[TcpProbeRecord]) -> Tuple[List[str], List[List[str]]]:
+    """Return the headers and rows of the probe table."""
+    headers = ["TARGET", "ADDRESS", "SERVICE", "CONNECTED", "P50", "P90", "P99", "MAX", "STATUS", "ERROR"]
+    rows = []
+    for record in records:
+        rows.append([
+            record.name,
+            f"{record.address}:{record.port}",
+            record.service,
+            f"{record.connected}/{record.attempts}",
+            *(f"{value:.1f}ms" if value is not None else "-"
+              for value in (record.p50_ms, record.p90_ms, record.p99_ms, record.max_ms)),
+            probe_status(record),
+            record.error or "-",
+        ])
+    return headers, rows
+
+
+def probe_status(record: TcpProbeRecord) -> str:
+    """Summarize a probe record as `Reachable`, `Degraded` (some attempts failed) or `Unreachable`."""
+    if record.connected == record.attempts:
+        return "Reachable"
+    return "Degraded" if record.connected else "Unreachable"
@@ -0,0 +1,376 @@
+"""
+Report module for the hm-cli tool.
+Builds typed status records directly from Kubernetes API objects and
+serializes them as JSON, YAML or NDJSON for scripts and monitoring.
+"""
+
+import json
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+
+import yaml
+
+from hm_cli.kube import KubeApiError
+from hm_cli.status import (
+    ClusterSnapshot, FLUX_SOURCE_KINDS, node_status, node_roles, node_address, pod_status, pod_restarts, ready_condition
+)
+
+
+OUTPUT_FORMATS = ("json", "yaml", "ndjson")
+
+# Kind names for Flux objects; list items from the API may omit `kind`
+FLUX_KIND_NAMES = {
+    "kustomizations": "Kustomization",
+    "gitrepositories": "GitRepository",
+    "helmrepositories": "HelmRepository",
+    "ocirepositories": "OCIRepository",
+}
+
+
+@dataclass
+class NodeRecord:
+    """Status of a Kubernetes node."""
+    name: str
+    ready: bool
+    status: str
+    roles: List[str]
+    version: str
+    internal_ip: Optional[str]
+    external_ip: Optional[str]
+    os_image: str
+    kernel_version: str
+    container_runtime: str
+    created: Optional[str]
+
+
+@dataclass
+class PodRecord:
+    """Status of a pod."""
+    namespace: str
+    name: str
+    phase: str
+    status: str
+    ready_containers: int
+    total_containers: int
+    restarts: int
+    node: Optional[str]
+    ip: Optional[str]
+    created: Optional[str]
+
+
+@dataclass
+class FluxRecord:
+    """Status of a Flux Kustomization or source."""
+    kind: str
+    namespace: str
+    name: str
+    ready: Optional[bool]
+    message: str
+    revision: Optional[str]
+    suspended: bool
+
+
+@dataclass
+class StorageClassRecord:
+    """A storage class."""
+    name: str
+    provisioner: str
+    reclaim_policy: str
+    volume_binding_mode: str
+    allow_volume_expansion: bool
+    default: bool
+
+
+@dataclass
+class VolumeRecord:
+    """Status of a persistent volume."""
+    name: str
+    phase: str
+    capacity: Optional[str]
+    access_modes: List[str]
+    reclaim_policy: str
+    claim: Optional[str]
+    storage_class: Optional[str]
+
+
+@dataclass
+class ClaimRecord:
+    """Status of a persistent volume claim."""
+    namespace: str
+    name: str
+    phase: str
+    volume: Optional[str]
+    capacity: Optional[str]
+    access_modes: List[str]
+    storage_class: Optional[str]
+
+
+@dataclass
+class VipProbeRecord:
+    """Result of probing the control plane VIP."""
+    address: str
+    reachable: bool
+    detail: str = ""
+
+
+@dataclass
+class TcpProbeRecord:
+    """TCP connect latency to one service endpoint of the VIP or a node."""
+    name: str
+    address: str
+    port: int
+    service: str
+    attempts: int
+    connected: int
+    # Nearest-rank connect latency percentiles over the successful attempts
+    p50_ms: Optional[float] = None
+    p90_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    max_ms: Optional[float] = None
+    # Most frequent error of the failed attempts
+    error: Optional[str] = None
+
+
+@dataclass
+class EtcdMemberRecord:
+    """Health, storage and raft progress of one etcd member endpoint."""
+    endpoint: str
+    healthy: bool
+    took: Optional[str] = None
+    error: Optional[str] = None
+    member_id: Optional[str] = None
+    version: Optional[str] = None
+    is_leader: bool = False
+    is_learner: bool = False
+    # Bytes allocated by the DB file, and bytes of it holding live data
+    db_size: Optional[int] = None
+    db_size_in_use: Optional[int] = None
+    # Share of the DB file not in use, reclaimable by a defragmentation
+    fragmentation: Optional[float] = None
+    raft_term: Optional[int] = None
+    raft_index: Optional[int] = None
+    raft_applied_index: Optional[int] = None
+    # Raft entries behind the leader
+    raft_lag: Optional[int] = None
+    # Duration of the health check request
+    latency_ms: Optional[float] = None
+    warnings: List[str] = field(default_factory=list)
+
+
+@dataclass
+class StatusReport:
+    """All status records of one `cluster status` run."""
+    generated_at: str
+    nodes: List[NodeRecord] = field(default_factory=list)
+    pods: List[PodRecord] = field(default_factory=list)
+    flux: List[FluxRecord] = field(default_factory=list)
+    storage_classes: List[StorageClassRecord] = field(default_factory=list)
+    volumes: List[VolumeRecord] = field(default_factory=list)
+    claims: List[ClaimRecord] = field(default_factory=list)
+    vip: Optional[VipProbeRecord] = None
+    probes: List[TcpProbeRecord] = field(default_factory=list)
+    etcd: List[EtcdMemberRecord] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+def _address(node: Dict[str, Any], address_type: str) -> Optional[str]:
+    """Return a node address, or None if it has none of that type."""
+    address = node_address(node, address_type)
+    return None if address == "<none>" else address
+
+
+def _ready_flag(status: str) -> Optional[bool]:
+    """Map a condition status (`True`, `False`, `Unknown`) to a boolean or None."""
+    return {"True": True, "False": False}.get(status)
+
+
+def node_record(node: Dict[str, Any]) -> NodeRecord:
+    """Build a NodeRecord from a Node object."""
+    metadata = node.get('metadata', {})
+    info = node.get('status', {}).get('nodeInfo') or {}
+    roles = node_roles(node)
+    status = node_status(node)
+    return NodeRecord(
+        name=metadata.get('name', ''),
+        ready=status.split(',')[0] == "Ready",
+        status=status,
+        roles=[] if roles == "<none>" else roles.split(','),
+        version=info.get('kubeletVersion', ''),
+        internal_ip=_address(node, "InternalIP"),
+        external_ip=_address(node, "ExternalIP"),
+        os_image=info.get('osImage', ''),
+        kernel_version=info.get('kernelVersion', ''),
+        container_runtime=info.get('containerRuntimeVersion', ''),
+        created=metadata.get('creationTimestamp'),
+    )
+
+
+def pod_record(pod: Dict[str, Any]) -> PodRecord:
+    """Build a PodRecord from a Pod object."""
+    metadata = pod.get('metadata', {})
+    status = pod.get('status', {})
+    return PodRecord(
+        namespace=metadata.get('namespace', ''),
+        name=metadata.get('name', ''),
+        phase=status.get('phase', 'Unknown'),
+        status=pod_status(pod),
+        ready_containers=sum(1 for c in status.get('containerStatuses') or [] if c.get('ready')),
+        total_containers=len(pod.get('spec', {}).get('containers') or []),
+        restarts=pod_restarts(pod),
+        node=pod.get('spec', {}).get('nodeName'),
+        ip=status.get('podIP'),
+        created=metadata.get('creationTimestamp'),
+    )
+
+
+def flux_record(obj: Dict[str, Any], kind: str) -> FluxRecord:
+    """Build a FluxRecord from a Flux object listed as `kind` (a RESOURCES key)."""
+    metadata = obj.get('metadata', {})
+    ready, message = ready_condition(obj)
+    status = obj.get('status', {})
+    return FluxRecord(
+        kind=obj.get('kind') or FLUX_KIND_NAMES.get(kind, kind),
+        namespace=metadata.get('namespace', ''),
+        name=metadata.get('name', ''),
+        ready=_ready_flag(ready),
+        message=message,
+        revision=(status.get('artifact') or {}).get('revision') or status.get('lastAppliedRevision'),
+        suspended=bool(obj.get('spec', {}).get('suspend', False)),
+    )
+
+
+def storage_class_record(sc: Dict[str, Any]) -> StorageClassRecord:
+    """Build a StorageClassRecord from a StorageClass object."""
+    metadata = sc.get('metadata', {})
+    return StorageClassRecord(
+        name=metadata.get('name', ''),
+        provisioner=sc.get('provisioner', ''),
+        reclaim_policy=sc.get('reclaimPolicy', 'Delete'),
+        volume_binding_mode=sc.get('volumeBindingMode', 'Immediate'),
+        allow_volume_expansion=bool(sc.get('allowVolumeExpansion', False)),
+        default=(metadata.get('annotations') or {}).get("storageclass.kubernetes.io/is-default-class") == "true",
+    )
+
+
+def volume_record(pv: Dict[str, Any]) -> VolumeRecord:
+    """Build a VolumeRecord from a PersistentVolume object."""
+    spec = pv.get('spec', {})
+    claim = spec.get('claimRef') or {}
+    return VolumeRecord(
+        name=pv.get('metadata', {}).get('name', ''),
+        phase=pv.get('status', {}).get('phase', ''),
+        capacity=(spec.get('capacity') or {}).get('storage'),
+        access_modes=list(spec.get('accessModes') or []),
+        reclaim_policy=spec.get('persistentVolumeReclaimPolicy', ''),
+        claim=f"{claim.get('namespace')}/{claim['name']}" if claim.get('name') else None,
+        storage_class=spec.get('storageClassName'),
+    )
+
+
+def claim_record(pvc: Dict[str, Any]) -> ClaimRecord:
+    """Build a ClaimRecord from a PersistentVolumeClaim object."""
+    metadata = pvc.get('metadata', {})
+    status = pvc.get('status', {})
+    return ClaimRecord(
+        namespace=metadata.get('namespace', ''),
+        name=metadata.get('name', ''),
+        phase=status.get('phase', ''),
+        volume=pvc.get('spec', {}).get('volumeName'),
+        capacity=(status.get('capacity') or {}).get('storage'),
+        access_modes=list(status.get('accessModes') or []),
+        storage_class=pvc.get('spec', {}).get('storageClassName'),
+    )
+
+
+def etcd_member_records(endpoint_health: List[Dict[str, Any]]) -> List[EtcdMemberRecord]:
+    """Build EtcdMemberRecords from `etcdctl endpoint health -w json` output."""
+    return [
+        EtcdMemberRecord(
+            endpoint=entry.get('endpoint', ''),
+            healthy=bool(entry.get('health')),
+            took=entry.get('took'),
+            error=entry.get('error') or None,
+        )
+        for entry in endpoint_health
+    ]
+
+
+def build_report(snapshot: ClusterSnapshot, vip: Optional[VipProbeRecord] = None,
+                 etcd: Optional[List[EtcdMemberRecord]] = None, errors: Optional[Dict[str, str]] = None,
+                 probes: Optional[List[TcpProbeRecord]] = None) -> StatusReport:
+    """Build a StatusReport from a cluster snapshot.
+
+    Kinds that could not be listed are left empty and their error is recorded
+    under `errors`, so a partial report is still produced.
+
+    Args:
+        snapshot: Snapshot holding the listed objects.
+        vip: Result of the VIP probe.
+        etcd: etcd member health.
+        errors: Errors collected before building the report, keyed by section.
+        probes: TCP probes of the VIP and node endpoints.
+
+    Returns:
+        The report.
+    """
+    report = StatusReport(
+        generated_at=datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        vip=vip,
+        probes=list(probes or []),
+        etcd=list(etcd or []),
+        errors=dict(errors or {}),
+    )
+
+    def collect(kind: str, build) -> List[Any]:
+        try:
+            return [build(obj) for obj in snapshot.items(kind)]
+        except KubeApiError as e:
+            report.errors[kind] = str(e)
+            return []
+
+    report.nodes = collect("nodes", node_record)
+    report.pods = collect("pods", pod_record)
+    for kind in ("kustomizations",) + FLUX_SOURCE_KINDS:
+        report.flux.extend(collect(kind, lambda obj, kind=kind: flux_record(obj, kind)))
+    report.storage_classes = collect("storageclasses", storage_class_record)
+    report.volumes = collect("persistentvolumes", volume_record)
+    report.claims = collect("persistentvolumeclaims", claim_record)
+    return report
+
+
+def render_report(report: StatusReport, output: str) -> str:
+    """Serialize a report.
+
+    Args:
+        report: The report.
+        output: One of OUTPUT_FORMATS. `ndjson` writes one record per line,
+            each tagged with its `type` (e.g. `node`, `pod`, `etcd_member`).
+
+    Returns:
+        The serialized report, ending with a newline.
+    """
+    if output not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{output}', expected one of: {', '.join(OUTPUT_FORMATS)}")
+    if output == "json":
+        return json.dumps(asdict(report), indent=2) + "\n"
+    if output == "yaml":
+        return yaml.safe_dump(asdict(report), sort_keys=False)
+
+    lines = []
+    for record_type, records in (
+        ("node", report.nodes),
+        ("pod", report.pods),
+        ("flux", report.flux),
+        ("storage_class", report.storage_classes),
+        ("volume", report.volumes),
+        ("claim", report.claims),
+        ("vip", [report.vip] if report.vip else []),
+        ("tcp_probe", report.probes),
+        ("etcd_member", report.etcd),
+    ):
+        for record in records:
+            lines.append(json.dumps({"type": record_type, **asdict(record)}))
+    for section, message in report.errors.items():
+        lines.append(json.dumps({"type": "error", "section": section, "message": message}))
+    return "".join(line + "\n" for line in lines)
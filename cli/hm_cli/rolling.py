@@ -0,0 +1,237 @@
+"""
+Rolling upgrade module for the hm-cli tool.
+Upgrades nodes one batch at a time: each node is cordoned, drained and
+upgraded, then must report Ready (and, on control plane nodes, a healthy etcd
+member) before the next batch starts.
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+from hm_cli.core import logger
+from hm_cli.pools import group_by_pool
+from hm_cli.talos import TALOS_INSTALLER_IMAGE
+
+
+# Nodes of one worker batch taken out of service at the same time
+DEFAULT_MAX_UNAVAILABLE = 1
+# Seconds allowed for `kubectl drain`
+DEFAULT_DRAIN_TIMEOUT = 300
+# Seconds a node may take to become Ready (or healthy in etcd) after its upgrade
+DEFAULT_NODE_READY_TIMEOUT = 900
+# Seconds between readiness polls
+DEFAULT_POLL_INTERVAL = 10.0
+
+
+# Phases of a node upgrade, in order; `etcd` only runs on control plane nodes
+UPGRADE_PHASES = ("cordon", "drain", "apply", "upgrade", "ready", "etcd", "uncordon")
+
+
+class UpgradeError(Exception):
+    """A node upgrade phase failed."""
+
+
+@dataclass
+class PhaseResult:
+    """Outcome and duration of one upgrade phase on one node."""
+    node: str
+    phase: str
+    seconds: float
+    ok: bool
+    detail: str = ""
+
+
+def is_control_plane(node: Dict[str, Any]) -> bool:
+    """Return True if the cluster_info node is a control plane node."""
+    return node.get('type', 'controlplane') == 'controlplane'
+
+
+def plan_batches(nodes: List[Dict[str, Any]], max_unavailable: int = DEFAULT_MAX_UNAVAILABLE,
+                 pool_limits: Optional[Dict[str, Optional[int]]] = None) -> List[List[Dict[str, Any]]]:
+    """Split nodes into upgrade batches.
+
+    Control plane nodes always go one at a time so etcd keeps its quorum;
+    workers follow in batches of up to `max_unavailable` nodes. Workers of a
+    pool are batched separately, after the workers outside any pool, and never
+    share a batch with another pool.
+
+    Args:
+        nodes: cluster_info nodes.
+        max_unavailable: Maximum number of workers upgraded at the same time.
+        pool_limits: Maximum number of workers of a pool upgraded at the same
+            time; pools without a limit use `max_unavailable`.
+
+    Returns:
+        Batches in upgrade order.
+    """
+    pool_limits = pool_limits or {}
+    batches = [[node] for node in nodes if is_control_plane(node)]
+    for pool, workers in group_by_pool([node for node in nodes if not is_control_plane(node)]):
+        size = max(1, pool_limits.get(pool) or max_unavailable) if pool else max(1, max_unavailable)
+        batches.extend(workers[i:i + size] for i in range(0, len(workers), size))
+    return batches
+
+
+def node_ready(node: Dict[str, Any]) -> bool:
+    """Return True if a Node object reports the Ready condition."""
+    for condition in node.get('status', {}).get('conditions') or []:
+        if condition.get('type') == "Ready":
+            return condition.get('status') == "True"
+    return False
+
+
+def service_healthy(output: str) -> bool:
+    """Return True if `talosctl service <id>` output reports the service as healthy."""
+    for line in output.splitlines():
+        fields = line.split()
+        if len(fields) >= 2 and fields[0] == "HEALTH":
+            return fields[1] == "OK"
+    return False
+
+
+class NodeOperations:
+    """Commands that take a single node through its upgrade."""
+
+    def __init__(self, run: Callable[[str], Tuple[int, str, str]], config_file: Callable[[Dict[str, Any]], str],
+                 talos_version: Optional[str] = None, drain_timeout: int = DEFAULT_DRAIN_TIMEOUT,
+                 ready_timeout: float = DEFAULT_NODE_READY_TIMEOUT, poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 sleep: Callable[[float], None] = time.sleep, clock: Callable[[], float] = time.monotonic):
+        """Initialize the node operations.
+
+        Args:
+            run: Runs a shell command with KUBECONFIG set, returning (returncode, stdout, stderr).
+            config_file: Returns the Talos configuration file of a node.
+            talos_version: Talos version to install. If None, only the configuration is applied.
+            drain_timeout: Seconds allowed for draining a node.
+            ready_timeout: Seconds a node may take to become Ready and healthy.
+            poll_interval: Seconds between readiness polls.
+            sleep: Sleep function, replaceable in tests.
+            clock: Monotonic clock, replaceable in tests.
+        """
+        self.run = run
+        self.config_file = config_file
+        self.talos_version = talos_version
+        self.drain_timeout = drain_timeout
+        self.ready_timeout = ready_timeout
+        self.poll_interval = poll_interval
+        self.sleep = sleep
+        self.clock = clock
+
+    def _check(self, command: str) -> str:
+        """Run a command, raising UpgradeError if it fails."""
+        returncode, stdout, stderr = self.run(command)
+        if returncode != 0:
+            raise UpgradeError(stderr.strip() or f"'{command}' exited with {returncode}")
+        return stdout
+
+    def _poll(self, condition: Callable[[], bool], what: str) -> None:
+        """Call `condition` until it returns True, raising UpgradeError after the ready timeout."""
+        deadline = self.clock() + self.ready_timeout
+        while not condition():
+            if self.clock() >= deadline:
+                raise UpgradeError(f"{what} not reached within {self.ready_timeout:g}s")
+            self.sleep(self.poll_interval)
+
+    def cordon(self, node: Dict[str, Any]) -> None:
+        self._check(f"kubectl cordon {node['name']}")
+
+    def drain(self, node: Dict[str, Any]) -> None:
+        self._check(
+            f"kubectl drain {node['name']} --ignore-daemonsets --delete-emptydir-data --timeout={self.drain_timeout}s"
+        )
+
+    def apply(self, node: Dict[str, Any]) -> None:
+        self._check(f"talosctl apply-config --nodes {node['ip']} --file \"{self.config_file(node)}\"")
+
+    def upgrade(self, node: Dict[str, Any]) -> None:
+        if self.talos_version:
+            self._check(f"talosctl upgrade --nodes {node['ip']} --image {TALOS_INSTALLER_IMAGE}:{self.talos_version} --wait")
+
+    def ready(self, node: Dict[str, Any]) -> None:
+        def is_ready() -> bool:
+            returncode, stdout, _ = self.run(f"kubectl get node {node['name']} -o json")
+            try:
+                return returncode == 0 and node_ready(json.loads(stdout))
+            except ValueError:
+                return False
+
+        self._poll(is_ready, f"Node {node['name']} Ready")
+
+    def etcd(self, node: Dict[str, Any]) -> None:
+        def is_healthy() -> bool:
+            returncode, stdout, _ = self.run(f"talosctl --nodes {node['ip']} service etcd")
+            return returncode == 0 and service_healthy(stdout)
+
+        self._poll(is_healthy, f"Healthy etcd member on {node['name']}")
+
+    def uncordon(self, node: Dict[str, Any]) -> None:
+        self._check(f"kubectl uncordon {node['name']}")
+
+
+class RollingUpgrade:
+    """Upgrades nodes batch by batch, gating each batch on the health of its nodes.
+
+    The rollout stops at the first failed batch; nodes of later batches are
+    left untouched and the failed node stays cordoned for inspection.
+    """
+
+    def __init__(self, operations: NodeOperations, max_unavailable: int = DEFAULT_MAX_UNAVAILABLE,
+                 on_phase: Optional[Callable[[PhaseResult], None]] = None,
+                 pool_limits: Optional[Dict[str, Optional[int]]] = None):
+        """Initialize the rollout.
+
+        Args:
+            operations: Node operations run for every phase.
+            max_unavailable: Maximum number of workers upgraded at the same time.
+            on_phase: Called with the result of every finished phase.
+            pool_limits: Maximum number of workers of each pool upgraded at the same time.
+        """
+        self.operations = operations
+        self.max_unavailable = max_unavailable
+        self.pool_limits = pool_limits or {}
+        self.on_phase = on_phase or (lambda result: None)
+        self.results: List[PhaseResult] = []
+
+    def run(self, nodes: List[Dict[str, Any]]) -> bool:
+        """Upgrade the nodes.
+
+        Args:
+            nodes: cluster_info nodes.
+
+        Returns:
+            True if every node was upgraded, False otherwise.
+        """
+        for batch in plan_batches(nodes, self.max_unavailable, self.pool_limits):
+            with ThreadPoolExecutor(max_workers=len(batch)) as executor:
+                outcomes = list(executor.map(self.upgrade_node, batch))
+            if not all(outcomes):
+                return False
+        return True
+
+    def upgrade_node(self, node: Dict[str, Any]) -> bool:
+        """Run all upgrade phases on one node, stopping at the first failure.
+
+        Returns:
+            True if the node was upgraded, False otherwise.
+        """
+        for phase in UPGRADE_PHASES:
+            if phase == "etcd" and not is_control_plane(node):
+                continue
+            started = time.monotonic()
+            try:
+                getattr(self.operations, phase)(node)
+            except UpgradeError as e:
+                self._record(PhaseResult(node['name'], phase, time.monotonic() - started, False, str(e)))
+                return False
+            self._record(PhaseResult(node['name'], phase, time.monotonic() - started, True))
+        return True
+
+    def _record(self, result: PhaseResult) -> None:
+        """Keep and report the result of a phase."""
+        logger.info(f"Upgrade of {result.node}: {result.phase} {'done' if result.ok else 'failed'} "
+                    f"after {result.seconds:.1f}s")
+        self.results.append(result)
+        self.on_phase(result)
@@ -0,0 +1,944 @@
+"""
+Status module for the hm-cli tool.
+Runs cluster status checks concurrently and renders their sections in a fixed order,
+as typed rows with status-aware colouring.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from rich.table import Table
+from rich.text import Text
+
+from hm_cli.core import logger, console
+from hm_cli.kube import KubeApiError
+
+
+# Number of checks `cluster status` runs side by side unless configured otherwise
+DEFAULT_STATUS_CONCURRENCY = 7
+
+# Resource kinds listed once per status run; every section is derived from these
+SNAPSHOT_KINDS = (
+    "nodes",
+    "pods",
+    "namespaces",
+    "kustomizations",
+    "gitrepositories",
+    "helmrepositories",
+    "ocirepositories",
+    "storageclasses",
+    "persistentvolumes",
+    "persistentvolumeclaims",
+)
+FLUX_SOURCE_KINDS = ("gitrepositories", "helmrepositories", "ocirepositories")
+
+DEFAULT_STATUS_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "hm-cli", "status")
+# Seconds a status run is answered from the cache instead of querying the cluster again; 0 disables the cache
+DEFAULT_STATUS_CACHE_TTL = 15
+
+_CONTAINER_STATUS_FIELDS = {'ready': True, 'restartCount': True, 'state': True}
+# Fields of listed objects the status sections and records read. A mapping keeps
+# only the listed keys of a value (of every entry, for lists); True keeps it whole.
+STATUS_FIELDS: Dict[str, Any] = {
+    'kind': True,
+    'metadata': {
+        'name': True,
+        'namespace': True,
+        'labels': True,
+        'creationTimestamp': True,
+        'deletionTimestamp': True,
+        'annotations': {'storageclass.kubernetes.io/is-default-class': True},
+    },
+    'spec': {
+        'unschedulable': True,
+        'nodeName': True,
+        'containers': {'name': True},
+        'suspend': True,
+        'capacity': True,
+        'accessModes': True,
+        'claimRef': {'namespace': True, 'name': True},
+        'persistentVolumeReclaimPolicy': True,
+        'storageClassName': True,
+        'volumeName': True,
+    },
+    'status': {
+        'phase': True,
+        'reason': True,
+        'podIP': True,
+        'conditions': {'type': True, 'status': True, 'message': True},
+        'addresses': True,
+        'nodeInfo': {'kubeletVersion': True, 'osImage': True, 'kernelVersion': True, 'containerRuntimeVersion': True},
+        'initContainerStatuses': _CONTAINER_STATUS_FIELDS,
+        'containerStatuses': _CONTAINER_STATUS_FIELDS,
+        'capacity': True,
+        'accessModes': True,
+        'artifact': {'revision': True},
+        'lastAppliedRevision': True,
+    },
+    'provisioner': True,
+    'reclaimPolicy': True,
+    'volumeBindingMode': True,
+    'allowVolumeExpansion': True,
+}
+
+
+def status_fields(obj: Any, fields: Dict[str, Any] = STATUS_FIELDS) -> Any:
+    """Return a copy of a listed object holding only the fields in `fields`.
+
+    Keeps container environments, annotations, managedFields and the like out
+    of the status cache and of results kept across pages.
+    """
+    if isinstance(obj, list):
+        return [status_fields(entry, fields) for entry in obj]
+    if not isinstance(obj, dict):
+        return obj
+    kept = {}
+    for key, subfields in fields.items():
+        if key in obj:
+            kept[key] = obj[key] if subfields is True else status_fields(obj[key], subfields)
+    return kept
+
+
+class SectionBuffer:
+    """Records console output of a single status section.
+
+    Checks run in worker threads and must not interleave their output, so they
+    print into a buffer which is replayed on the real console in check order.
+    """
+
+    def __init__(self):
+        """Initialize an empty section buffer."""
+        self._calls: List[Any] = []
+
+    def print(self, *objects: Any, **kwargs: Any) -> None:
+        """Record a `console.print` call for later replay."""
+        self._calls.append((objects, kwargs))
+
+    def flush(self, target: Optional[Any] = None) -> None:
+        """Replay recorded output.
+
+        Args:
+            target: Console to print to. If None, uses the shared console.
+        """
+        target = target or console
+        for objects, kwargs in self._calls:
+            target.print(*objects, **kwargs)
+        self._calls = []
+
+
+@dataclass
+class StatusCheck:
+    """A single section of the cluster status report."""
+
+    name: str
+    run: Callable[[SectionBuffer], None]
+
+
+class StatusEngine:
+    """Runs status checks concurrently and prints them in declaration order."""
+
+    def __init__(self, checks: List[StatusCheck], max_concurrency: int = DEFAULT_STATUS_CONCURRENCY):
+        """Initialize the status engine.
+
+        Args:
+            checks: Checks to run, in the order their sections should be printed.
+            max_concurrency: Maximum number of checks running at the same time.
+        """
+        self.checks = checks
+        self.max_concurrency = max(1, int(max_concurrency))
+
+    def run(self, on_progress: Optional[Callable[[int, List[str]], None]] = None, target: Optional[Any] = None) -> List[SectionBuffer]:
+        """Run all checks and print their sections.
+
+        Sections are printed as soon as they and every section before them
+        have completed, so output order never depends on check timing.
+
+        Args:
+            on_progress: Called with the number of finished checks and the names
+                of the checks still running after each completion.
+            target: Console to print to. If None, uses the shared console.
+
+        Returns:
+            The section buffers, in check order (already flushed).
+        """
+        buffers = [SectionBuffer() for _ in self.checks]
+        done = [False] * len(self.checks)
+        next_to_print = 0
+        lock = threading.Lock()
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, max(1, len(self.checks)))) as executor:
+            futures = {
+                executor.submit(self._run_check, check, buffers[index]): index
+                for index, check in enumerate(self.checks)
+            }
+            for future in as_completed(futures):
+                with lock:
+                    done[futures[future]] = True
+                    while next_to_print < len(self.checks) and done[next_to_print]:
+                        buffers[next_to_print].flush(target)
+                        next_to_print += 1
+                    if on_progress:
+                        pending = [check.name for check, finished in zip(self.checks, done) if not finished]
+                        on_progress(sum(done), pending)
+
+        return buffers
+
+    @staticmethod
+    def _run_check(check: StatusCheck, buffer: SectionBuffer) -> None:
+        """Run one check, turning unexpected errors into section output."""
+        try:
+            check.run(buffer)
+        except Exception as e:
+            logger.debug(f"Status check '{check.name}' failed: {e}")
+            buffer.print(f"\n[bold blue]--- {check.name} ---[/bold blue]")
+            buffer.print(f"[yellow]Error: {e}[/yellow]")
+
+
+class ClusterSnapshot:
+    """Point-in-time view of the cluster built from a single list call per kind.
+
+    All kinds are fetched concurrently as soon as the snapshot is created.
+    Readers block only on the kinds they need, and namespace/label lookups are
+    answered from in-memory indexes instead of further API calls.
+    """
+
+    def __init__(self, kube: Any = None, kinds: Tuple[str, ...] = SNAPSHOT_KINDS, max_concurrency: int = len(SNAPSHOT_KINDS),
+                 scopes: Optional[Dict[str, Tuple[str, ...]]] = None, close_backend: bool = False):
+        """Start fetching a snapshot.
+
+        Args:
+            kube: Backend with a `list(kind)` method (KubeApiClient or KubectlBackend).
+                If None, the snapshot starts empty; see `from_items`.
+            kinds: Resource kinds to fetch.
+            max_concurrency: Maximum number of list calls in flight.
+            scopes: Namespaces to restrict some kinds to, e.g. `{"pods": ("kube-system",)}`.
+                Kinds not listed here are fetched across all namespaces.
+            close_backend: Close `kube` together with the snapshot, for a backend
+                created only to take it.
+        """
+        self._kube = kube if close_backend else None
+        self._futures: Dict[str, Future] = {}
+        self._namespace_index: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        self._label_index: Dict[str, Dict[Tuple[str, str], List[int]]] = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        if kube is not None and kinds:
+            self._executor = ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(kinds))))
+            for kind in kinds:
+                self._futures[kind] = self._executor.submit(self._fetch, kube, kind, (scopes or {}).get(kind))
+
+    @classmethod
+    def from_items(cls, items: Dict[str, List[Dict[str, Any]]], errors: Optional[Dict[str, str]] = None) -> "ClusterSnapshot":
+        """Build a snapshot from already fetched objects, keyed by kind.
+
+        Kinds listed in `errors` raise a KubeApiError with the recorded message when read.
+        """
+        snapshot = cls()
+        for kind, objects in items.items():
+            future: Future = Future()
+            future.set_result(list(objects))
+            snapshot._futures[kind] = future
+        for kind, message in (errors or {}).items():
+            future = Future()
+            future.set_exception(KubeApiError(message))
+            snapshot._futures[kind] = future
+        return snapshot
+
+    def export(self) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, str]]:
+        """Return the objects of every kind and the errors of the kinds that could not be listed.
+
+        Waits for outstanding fetches. The result can be passed back to `from_items`.
+        """
+        items: Dict[str, List[Dict[str, Any]]] = {}
+        errors: Dict[str, str] = {}
+        for kind, future in self._futures.items():
+            try:
+                items[kind] = future.result()
+            except KubeApiError as e:
+                errors[kind] = str(e)
+        return items, errors
+
+    @staticmethod
+    def _fetch(kube: Any, kind: str, namespaces: Optional[Tuple[str, ...]] = None) -> List[Dict[str, Any]]:
+        """List one kind; kinds the cluster does not serve yield no objects."""
+        try:
+            if namespaces is None:
+                return kube.list(kind).get('items') or []
+            return [obj for namespace in namespaces for obj in kube.list(kind, namespace=namespace).get('items') or []]
+        except KubeApiError as e:
+            if e.missing_kind:
+                logger.debug(f"Resource kind {kind} not served by the cluster: {e}")
+                return []
+            raise
+
+    def items(self, kind: str) -> List[Dict[str, Any]]:
+        """Return all objects of a kind, waiting for the fetch if needed.
+
+        Raises:
+            KubeApiError: If listing the kind failed or it was not fetched.
+        """
+        if kind not in self._futures:
+            raise KubeApiError(f"{kind} not part of this snapshot")
+        return self._futures[kind].result()
+
+    def in_namespace(self, kind: str, namespace: str) -> List[Dict[str, Any]]:
+        """Return the objects of a kind in one namespace."""
+        return self._namespaces(kind).get(namespace, [])
+
+    def select(self, kind: str, labels: Dict[str, str], namespace: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return the objects of a kind matching all given labels (equality selector).
+
+        Args:
+            kind: Resource kind.
+            labels: Label key/value pairs that must all match.
+            namespace: Restrict matches to this namespace.
+        """
+        objects = self.items(kind)
+        index = self._labels(kind)
+        matches: Optional[set] = None
+        for pair in labels.items():
+            positions = set(index.get(pair, ()))
+            matches = positions if matches is None else matches & positions
+        positions = sorted(matches) if matches is not None else range(len(objects))
+        selected = [objects[i] for i in positions]
+        if namespace is not None:
+            selected = [obj for obj in selected if obj.get('metadata', {}).get('namespace') == namespace]
+        return selected
+
+    def has_namespace(self, name: str) -> bool:
+        """Whether the namespace exists."""
+        return any(ns.get('metadata', {}).get('name') == name for ns in self.items("namespaces"))
+
+    def close(self) -> None:
+        """Wait for outstanding fetches and release the worker threads (and the backend, if owned)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        if self._kube is not None:
+            self._kube.close()
+            self._kube = None
+
+    def __enter__(self) -> "ClusterSnapshot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _namespaces(self, kind: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Build (once) and return the namespace index of a kind."""
+        objects = self.items(kind)
+        with self._lock:
+            if kind not in self._namespace_index:
+                index: Dict[str, List[Dict[str, Any]]] = {}
+                for obj in objects:
+                    index.setdefault(obj.get('metadata', {}).get('namespace', ''), []).append(obj)
+                self._namespace_index[kind] = index
+            return self._namespace_index[kind]
+
+    def _labels(self, kind: str) -> Dict[Tuple[str, str], List[int]]:
+        """Build (once) and return the label index of a kind."""
+        objects = self.items(kind)
+        with self._lock:
+            if kind not in self._label_index:
+                index: Dict[Tuple[str, str], List[int]] = {}
+                for position, obj in enumerate(objects):
+                    for pair in (obj.get('metadata', {}).get('labels') or {}).items():
+                        index.setdefault(pair, []).append(position)
+                self._label_index[kind] = index
+            return self._label_index[kind]
+
+
+class StatusResults:
+    """Results of the status queries that are not part of the snapshot.
+
+    Sections ask for a result by name together with a function computing it.
+    The first request computes the result and keeps it; a KubeApiError is kept
+    as well and raised again on every request. Results are plain JSON data, so
+    a status run can be cached and replayed without querying the cluster.
+    """
+
+    def __init__(self, values: Optional[Dict[str, Dict[str, Any]]] = None):
+        """Initialize the results.
+
+        Args:
+            values: Results kept by an earlier run, as returned by `export`.
+        """
+        self._values: Dict[str, Dict[str, Any]] = dict(values or {})
+        self._lock = threading.Lock()
+
+    def get(self, name: str, compute: Callable[[], Any]) -> Any:
+        """Return a result, computing it unless it is already known.
+
+        Raises:
+            KubeApiError: If computing the result failed, now or in the run that kept it.
+        """
+        with self._lock:
+            entry = self._values.get(name)
+        if entry is None:
+            try:
+                entry = {"value": compute()}
+            except KubeApiError as e:
+                entry = {"error": str(e)}
+            with self._lock:
+                self._values[name] = entry
+        if "error" in entry:
+            raise KubeApiError(entry["error"])
+        return entry["value"]
+
+    def export(self) -> Dict[str, Dict[str, Any]]:
+        """Return every result computed so far."""
+        with self._lock:
+            return dict(self._values)
+
+
+@dataclass
+class CachedStatus:
+    """A status run read back from the status cache."""
+    created_at: float
+    items: Dict[str, List[Dict[str, Any]]]
+    errors: Dict[str, str]
+    results: Dict[str, Dict[str, Any]]
+
+    def age(self) -> float:
+        """Seconds since the cluster was queried."""
+        return max(0.0, time.time() - self.created_at)
+
+    def snapshot(self) -> ClusterSnapshot:
+        """Return the cached snapshot."""
+        return ClusterSnapshot.from_items(self.items, self.errors)
+
+    def status_results(self) -> StatusResults:
+        """Return the cached query results."""
+        return StatusResults(self.results)
+
+
+class StatusCache:
+    """Status runs stored on disk, one JSON file per kubeconfig, cluster and view.
+
+    Repeated status runs within the TTL are rendered from the stored snapshot
+    and query results instead of querying the cluster again.
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttl: float = DEFAULT_STATUS_CACHE_TTL):
+        """Initialize the cache.
+
+        Args:
+            directory: Directory holding the cached runs. If None, uses DEFAULT_STATUS_CACHE_DIR.
+            ttl: Seconds a cached run stays fresh; 0 disables the cache.
+        """
+        self.directory = directory or DEFAULT_STATUS_CACHE_DIR
+        self.ttl = ttl
+
+    @staticmethod
+    def key(kubeconfig_path: str, cluster: str, **scope: Any) -> str:
+        """Return the cache key of a status run.
+
+        The key covers the kubeconfig (path and modification time, so a new
+        kubeconfig is never answered from the cache of the old one), the
+        cluster name and anything else that changes what the run fetches.
+        """
+        try:
+            mtime = os.path.getmtime(kubeconfig_path)
+        except OSError:
+            mtime = None
+        data = {"kubeconfig": os.path.abspath(kubeconfig_path), "mtime": mtime, "cluster": cluster, **scope}
+        return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()[:32]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[CachedStatus]:
+        """Return the cached run for a key, or None if there is no fresh one."""
+        if self.ttl <= 0:
+            return None
+        try:
+            with open(self._path(key)) as f:
+                cached = CachedStatus(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+        if cached.age() >= self.ttl:
+            return None
+        return cached
+
+    def put(self, key: str, snapshot: ClusterSnapshot, results: StatusResults) -> None:
+        """Store a finished status run.
+
+        Runs in which a kind could not be listed are not stored, so a failing
+        API server is queried again on the next run. Objects are reduced to
+        `STATUS_FIELDS`, and the directory and file are readable by the owner only.
+        """
+        if self.ttl <= 0:
+            return
+        items, errors = snapshot.export()
+        if errors:
+            logger.debug(f"Not caching the status run: {', '.join(errors)} could not be listed")
+            return
+        items = {kind: status_fields(objects) for kind, objects in items.items()}
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        os.chmod(self.directory, 0o700)
+        path = self._path(key)
+        tmp_file = f"{path}.{os.getpid()}.tmp"
+        with os.fdopen(os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+            json.dump({"created_at": time.time(), "items": items, "errors": errors, "results": results.export()}, f)
+        os.replace(tmp_file, path)
+
+
+# Short forms kubectl uses for PV/PVC access modes
+ACCESS_MODE_ABBREVIATIONS = {
+    "ReadWriteOnce": "RWO",
+    "ReadOnlyMany": "ROX",
+    "ReadWriteMany": "RWX",
+    "ReadWriteOncePod": "RWOP",
+}
+
+
+def format_age(timestamp: Optional[str], now: Optional[datetime] = None) -> str:
+    """Format a Kubernetes timestamp as a kubectl-style age (e.g. `45s`, `12m`, `5h`, `3d`).
+
+    Args:
+        timestamp: RFC 3339 timestamp such as `metadata.creationTimestamp`.
+        now: Reference time. If None, uses the current time.
+
+    Returns:
+        The age, or `<unknown>` if the timestamp cannot be parsed.
+    """
+    if not timestamp:
+        return "<unknown>"
+    try:
+        created = datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return "<unknown>"
+    seconds = max(0, int(((now or datetime.now(timezone.utc)) - created).total_seconds()))
+    if seconds < 120:
+        return f"{seconds}s"
+    if seconds < 120 * 60:
+        return f"{seconds // 60}m"
+    if seconds < 48 * 3600:
+        return f"{seconds // 3600}h"
+    return f"{seconds // 86400}d"
+
+
+def node_roles(node: Dict[str, Any]) -> str:
+    """Return the comma separated roles of a node, as shown by kubectl."""
+    labels = node.get('metadata', {}).get('labels') or {}
+    roles = sorted(key.split('/', 1)[1] for key in labels if key.startswith("node-role.kubernetes.io/") and '/' in key)
+    return ",".join(roles) or "<none>"
+
+
+def node_status(node: Dict[str, Any]) -> str:
+    """Return the kubectl STATUS column of a node."""
+    ready = next((c for c in node.get('status', {}).get('conditions') or [] if c.get('type') == "Ready"), None)
+    status = "Unknown" if ready is None else ("Ready" if ready.get('status') == "True" else "NotReady")
+    if node.get('spec', {}).get('unschedulable'):
+        status += ",SchedulingDisabled"
+    return status
+
+
+def node_address(node: Dict[str, Any], address_type: str) -> str:
+    """Return the first address of the given type (e.g. `InternalIP`) of a node."""
+    for address in node.get('status', {}).get('addresses') or []:
+        if address.get('type') == address_type:
+            return address.get('address', '')
+    return "<none>"
+
+
+def pod_status(pod: Dict[str, Any]) -> str:
+    """Return the kubectl STATUS column of a pod (e.g. `Running`, `CrashLoopBackOff`)."""
+    status = pod.get('status', {})
+    reason = status.get('reason') or status.get('phase') or "Unknown"
+    init_statuses = status.get('initContainerStatuses') or []
+    for index, container in enumerate(init_statuses):
+        state = container.get('state') or {}
+        terminated = state.get('terminated')
+        if terminated and terminated.get('exitCode') == 0:
+            continue
+        if terminated:
+            reason = f"Init:{terminated.get('reason') or 'Error'}"
+        elif (state.get('waiting') or {}).get('reason') not in (None, "PodInitializing"):
+            reason = f"Init:{state['waiting']['reason']}"
+        else:
+            reason = f"Init:{index}/{len(init_statuses)}"
+        break
+    else:
+        for container in status.get('containerStatuses') or []:
+            state = container.get('state') or {}
+            if (state.get('waiting') or {}).get('reason'):
+                reason = state['waiting']['reason']
+            elif (state.get('terminated') or {}).get('reason'):
+                reason = state['terminated']['reason']
+    if pod.get('metadata', {}).get('deletionTimestamp'):
+        reason = "Terminating"
+    return reason
+
+
+def pod_ready(pod: Dict[str, Any]) -> str:
+    """Return the kubectl READY column (`ready/total` containers) of a pod."""
+    total = len(pod.get('spec', {}).get('containers') or [])
+    ready = sum(1 for c in pod.get('status', {}).get('containerStatuses') or [] if c.get('ready'))
+    return f"{ready}/{total}"
+
+
+def pod_restarts(pod: Dict[str, Any]) -> int:
+    """Return the total restart count of a pod's containers."""
+    return sum(c.get('restartCount', 0) for c in pod.get('status', {}).get('containerStatuses') or [])
+
+
+# Pod views of `cluster status`: per-namespace phase counts plus unhealthy pods, or every pod
+POD_VIEWS = ("summary", "full")
+POD_PHASES = ("Running", "Pending", "Succeeded", "Failed", "Unknown")
+# Namespaces whose pods the kube-vip, etcd and CubeFS sections read
+SYSTEM_POD_NAMESPACES = ("kube-system", "cubefs")
+
+
+@dataclass
+class PodQuery:
+    """Which pods the pods section shows and how.
+
+    Selectors are passed to the API server, so filtering happens server-side.
+    """
+    namespace: Optional[str] = None
+    label_selector: Optional[str] = None
+    field_selector: Optional[str] = None
+    view: Optional[str] = "summary"
+
+    @property
+    def filtered(self) -> bool:
+        """Whether any server-side filter is set."""
+        return bool(self.namespace or self.label_selector or self.field_selector)
+
+    def describe(self) -> str:
+        """Return a short description of the filters, for section titles."""
+        parts = [f"namespace={self.namespace}" if self.namespace else "All Namespaces"]
+        if self.label_selector:
+            parts.append(f"-l {self.label_selector}")
+        if self.field_selector:
+            parts.append(f"--field-selector {self.field_selector}")
+        return ", ".join(parts)
+
+
+def pod_healthy(pod: Dict[str, Any]) -> bool:
+    """Whether a pod is Succeeded, or Running with all containers ready."""
+    phase = pod.get('status', {}).get('phase')
+    if phase == "Succeeded":
+        return True
+    if phase != "Running" or pod_status(pod) != "Running":
+        return False
+    ready, total = pod_ready(pod).split('/')
+    return ready == total
+
+
+class PodSummary:
+    """Streaming aggregate of pod phases per namespace.
+
+    Only unhealthy pods are retained, so memory stays bounded by the page size
+    plus the number of unhealthy pods, however large the cluster is.
+    """
+
+    def __init__(self):
+        """Initialize an empty summary."""
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self.unhealthy: List[Dict[str, Any]] = []
+        self.total = 0
+
+    def add(self, pods: List[Dict[str, Any]]) -> None:
+        """Add one page of pods."""
+        for pod in pods:
+            namespace = pod.get('metadata', {}).get('namespace', '')
+            phase = pod.get('status', {}).get('phase') or "Unknown"
+            counts = self.counts.setdefault(namespace, {})
+            counts[phase] = counts.get(phase, 0) + 1
+            self.total += 1
+            if not pod_healthy(pod):
+                counts["Unhealthy"] = counts.get("Unhealthy", 0) + 1
+                self.unhealthy.append(status_fields(pod))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the summary as plain data, e.g. for the status cache."""
+        return {"counts": self.counts, "unhealthy": self.unhealthy, "total": self.total}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PodSummary":
+        """Rebuild a summary returned by `to_dict`."""
+        summary = cls()
+        summary.counts = data.get('counts') or {}
+        summary.unhealthy = data.get('unhealthy') or []
+        summary.total = data.get('total') or 0
+        return summary
+
+    def rows(self) -> Tuple[List[str], List[List[str]]]:
+        """Build per-namespace rows: total, one column per phase and unhealthy."""
+        headers = ["NAMESPACE", "TOTAL"] + [phase.upper() for phase in POD_PHASES] + ["UNHEALTHY"]
+        rows = []
+        for namespace in sorted(self.counts):
+            counts = self.counts[namespace]
+            rows.append(
+                [namespace, str(sum(counts.get(phase, 0) for phase in counts if phase != "Unhealthy"))]
+                + [str(counts.get(phase, 0)) for phase in POD_PHASES]
+                + [str(counts.get("Unhealthy", 0))]
+            )
+        return headers, rows
+
+
+def node_rows(items: List[Dict[str, Any]]) -> Tuple[List[str], List[List[str]]]:
+    """Build `kubectl get nodes -o wide` style columns from Node objects."""
+    headers = ["NAME", "STATUS", "ROLES", "AGE", "VERSION", "INTERNAL-IP", "EXTERNAL-IP", "OS-IMAGE", "KERNEL-VERSION", "CONTAINER-RUNTIME"]
+    rows = []
+    for node in items:
+        info = node.get('status', {}).get('nodeInfo') or {}
+        rows.append([
+            node['metadata']['name'],
+            node_status(node),
+            node_roles(node),
+            format_age(node['metadata'].get('creationTimestamp')),
+            info.get('kubeletVersion', ''),
+            node_address(node, "InternalIP"),
+            node_address(node, "ExternalIP"),
+            info.get('osImage', ''),
+            info.get('kernelVersion', ''),
+            info.get('containerRuntimeVersion', ''),
+        ])
+    return headers, rows
+
+
+def pod_rows(items: List[Dict[str, Any]], with_namespace: bool = True) -> Tuple[List[str], List[List[str]]]:
+    """Build `kubectl get pods -o wide` style columns from Pod objects."""
+    headers = ["NAME", "READY", "STATUS", "RESTARTS", "AGE", "IP", "NODE"]
+    if with_namespace:
+        headers.insert(0, "NAMESPACE")
+    rows = []
+    for pod in items:
+        metadata = pod.get('metadata', {})
+        row = [
+            metadata.get('name', ''),
+            pod_ready(pod),
+            pod_status(pod),
+            str(pod_restarts(pod)),
+            format_age(metadata.get('creationTimestamp')),
+            pod.get('status', {}).get('podIP') or "<none>",
+            pod.get('spec', {}).get('nodeName') or "<none>",
+        ]
+        if with_namespace:
+            row.insert(0, metadata.get('namespace', ''))
+        rows.append(row)
+    return headers, rows
+
+
+def storage_class_rows(items: List[Dict[str, Any]]) -> Tuple[List[str], List[List[str]]]:
+    """Build `kubectl get sc` style columns from StorageClass objects."""
+    headers = ["NAME", "PROVISIONER", "RECLAIMPOLICY", "VOLUMEBINDINGMODE", "ALLOWVOLUMEEXPANSION", "AGE"]
+    rows = []
+    for sc in items:
+        metadata = sc.get('metadata', {})
+        name = metadata.get('name', '')
+        if (metadata.get('annotations') or {}).get("storageclass.kubernetes.io/is-default-class") == "true":
+            name += " (default)"
+        rows.append([
+            name,
+            sc.get('provisioner', ''),
+            sc.get('reclaimPolicy', 'Delete'),
+            sc.get('volumeBindingMode', 'Immediate'),
+            str(sc.get('allowVolumeExpansion', False)).lower(),
+            format_age(metadata.get('creationTimestamp')),
+        ])
+    return headers, rows
+
+
+def _access_modes(modes: Optional[List[str]]) -> str:
+    """Abbreviate a list of access modes the way kubectl does."""
+    return ",".join(ACCESS_MODE_ABBREVIATIONS.get(mode, mode) for mode in modes or [])
+
+
+def pv_rows(items: List[Dict[str, Any]]) -> Tuple[List[str], List[List[str]]]:
+    """Build `kubectl get pv` style columns from PersistentVolume objects."""
+    headers = ["NAME", "CAPACITY", "ACCESS MODES", "RECLAIM POLICY", "STATUS", "CLAIM", "STORAGECLASS", "AGE"]
+    rows = []
+    for pv in items:
+        spec = pv.get('spec', {})
+        claim = spec.get('claimRef') or {}
+        rows.append([
+            pv.get('metadata', {}).get('name', ''),
+            (spec.get('capacity') or {}).get('storage', ''),
+            _access_modes(spec.get('accessModes')),
+            spec.get('persistentVolumeReclaimPolicy', ''),
+            pv.get('status', {}).get('phase', ''),
+            f"{claim['namespace']}/{claim['name']}" if claim.get('name') else "",
+            spec.get('storageClassName', ''),
+            format_age(pv.get('metadata', {}).get('creationTimestamp')),
+        ])
+    return headers, rows
+
+
+def pvc_rows(items: List[Dict[str, Any]]) -> Tuple[List[str], List[List[str]]]:
+    """Build `kubectl get pvc -A` style columns from PersistentVolumeClaim objects."""
+    headers = ["NAMESPACE", "NAME", "STATUS", "VOLUME", "CAPACITY", "ACCESS MODES", "STORAGECLASS", "AGE"]
+    rows = []
+    for pvc in items:
+        metadata = pvc.get('metadata', {})
+        status = pvc.get('status', {})
+        rows.append([
+            metadata.get('namespace', ''),
+            metadata.get('name', ''),
+            status.get('phase', ''),
+            pvc.get('spec', {}).get('volumeName', ''),
+            (status.get('capacity') or {}).get('storage', ''),
+            _access_modes(status.get('accessModes')),
+            pvc.get('spec', {}).get('storageClassName', ''),
+            format_age(metadata.get('creationTimestamp')),
+        ])
+    return headers, rows
+
+
+def ready_condition(obj: Dict[str, Any]) -> Tuple[str, str]:
+    """Return the status and message of an object's `Ready` condition."""
+    for condition in obj.get('status', {}).get('conditions') or []:
+        if condition.get('type') == "Ready":
+            return condition.get('status', 'Unknown'), condition.get('message', '')
+    return "Unknown", ""
+
+
+def kustomization_rows(items: List[Dict[str, Any]]) -> Tuple[List[str], List[List[str]]]:
+    """Build `kubectl get kustomizations -A` style columns from Flux Kustomization objects."""
+    headers = ["NAMESPACE", "NAME", "AGE", "READY", "STATUS"]
+    rows = []
+    for ks in items:
+        metadata = ks.get('metadata', {})
+        ready, message = ready_condition(ks)
+        rows.append([
+            metadata.get('namespace', ''),
+            metadata.get('name', ''),
+            format_age(metadata.get('creationTimestamp')),
+            ready,
+            message,
+        ])
+    return headers, rows
+
+
+def flux_source_rows(items: List[Dict[str, Any]]) -> Tuple[List[str], List[List[str]]]:
+    """Build `flux get sources all -A` style columns from Flux source objects."""
+    headers = ["KIND", "NAMESPACE", "NAME", "REVISION", "SUSPENDED", "READY", "MESSAGE"]
+    rows = []
+    for source in items:
+        metadata = source.get('metadata', {})
+        ready, message = ready_condition(source)
+        rows.append([
+            source.get('kind', ''),
+            metadata.get('namespace', ''),
+            metadata.get('name', ''),
+            (source.get('status', {}).get('artifact') or {}).get('revision', ''),
+            str(source.get('spec', {}).get('suspend', False)),
+            ready,
+            message,
+        ])
+    return headers, rows
+
+
+# Styles for status values, most severe first. Values are matched as whole
+# tokens, so names like "error-pages" are never coloured.
+STATUS_STYLES: Dict[str, Tuple[str, ...]] = {
+    "red": (
+        "crashloopbackoff", "errimagepull", "imagepullbackoff", "invalidimagename", "createcontainerconfigerror",
+        "createcontainererror", "runcontainererror", "containercannotrun", "oomkilled", "error", "failed",
+        "evicted", "lost", "notready", "unhealthy", "unreachable", "false",
+    ),
+    "yellow": (
+        "pending", "unknown", "progressing", "terminating", "containercreating", "podinitializing",
+        "creating", "released", "schedulingdisabled", "timedout", "degraded",
+    ),
+    "green": ("running", "ready", "healthy", "bound", "available", "active", "succeeded", "completed", "true", "wiped", "reachable"),
+}
+_STYLE_SEVERITY = {style: rank for rank, style in enumerate(STATUS_STYLES)}
+_STYLE_LOOKUP: Dict[str, str] = {token: style for style, tokens in STATUS_STYLES.items() for token in tokens}
+_STATUS_TOKEN_SEPARATORS = re.compile(r"[,:()\s]+")
+
+# Columns holding status values; every other column is rendered unstyled
+STATUS_HEADERS: FrozenSet[str] = frozenset({"STATUS", "READY", "PHASE", "HEALTH"})
+
+
+@lru_cache(maxsize=4096)
+def status_style(value: str) -> Optional[str]:
+    """Return the style of a status value, or None if it is not a known status.
+
+    Compound values such as `Ready,SchedulingDisabled` or `Init:CrashLoopBackOff`
+    take the style of their most severe token.
+    """
+    style = _STYLE_LOOKUP.get(value.lower())
+    if style is not None:
+        return style
+    styles = [_STYLE_LOOKUP[token] for token in _STATUS_TOKEN_SEPARATORS.split(value.lower()) if token in _STYLE_LOOKUP]
+    return min(styles, key=_STYLE_SEVERITY.__getitem__) if styles else None
+
+
+@dataclass
+class StatusTable:
+    """Typed rows of one status section, ready to render.
+
+    Only the columns listed in `status_columns` are classified, each cell with
+    a single dictionary lookup, so rendering cost grows linearly with the rows.
+    """
+    headers: List[str]
+    rows: List[Sequence[str]]
+    status_columns: FrozenSet[int]
+
+    @classmethod
+    def from_rows(cls, headers: List[str], rows: List[Sequence[str]]) -> "StatusTable":
+        """Build a table, treating the columns named in STATUS_HEADERS as status columns."""
+        return cls(headers, rows, frozenset(i for i, header in enumerate(headers) if header in STATUS_HEADERS))
+
+    def render(self) -> Table:
+        """Build a Rich table with status-aware colouring of the status cells."""
+        table = Table(show_header=True, header_style="bold magenta", show_lines=False, row_styles=["none", "dim"])
+        header_counts: Dict[str, int] = {}
+        for header in self.headers:
+            if header in header_counts:
+                header_counts[header] += 1
+                table.add_column(f"{header}({header_counts[header]})") # No space for uniqueness
+            else:
+                header_counts[header] = 0
+                table.add_column(header)
+
+        width = len(self.headers)
+        status_columns = self.status_columns
+        for row in self.rows:
+            cells = [Text(value, style=status_style(value) or "") if index in status_columns else Text(value)
+                     for index, value in enumerate(row[:width])]
+            cells.extend(Text("") for _ in range(width - len(cells)))
+            table.add_row(*cells)
+        return table
+
+
+def parse_kubectl_table(output: str) -> Tuple[List[str], List[List[str]]]:
+    """Split kubectl's human-readable table output into headers and rows.
+
+    kubectl left-aligns every column under its header, so cells are cut at the
+    header offsets rather than split on whitespace. This keeps empty cells and
+    multi-word values (e.g. `NOMINATED NODE`, `Init:0/1`) in their columns.
+
+    Args:
+        output: Output of a `kubectl get` command without `-o json`.
+
+    Returns:
+        The headers and the rows, each row with one cell per header.
+    """
+    lines = [line for line in output.splitlines() if line.strip()]
+    if not lines:
+        return [], []
+    header_line = lines[0]
+    spans = [match.span() for match in re.finditer(r"\S+(?: \S+)*", header_line)]
+    headers = [header_line[start:end] for start, end in spans]
+    starts = [start for start, _ in spans]
+    rows = []
+    for line in lines[1:]:
+        row = []
+        for index, start in enumerate(starts):
+            end = starts[index + 1] if index + 1 < len(starts) else None
+            row.append(line[start:end].strip())
+        rows.append(row)
+    return headers, rows
@@ -0,0 +1,412 @@
+"""
+Talos module for the hm-cli tool.
+Renders per-node Talos machine configurations by merging the patches in
+`infrastructure/talos` in-process into the base configurations `talosctl gen
+config` writes for a secrets bundle, re-rendering only the nodes whose inputs
+changed since the last run.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import re
+import shlex
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+
+import yaml
+
+from hm_cli.core import DEFAULT_CONFIG_DIR, run_command
+from hm_cli.pools import POOL_PATCH
+
+
+# Bump when the rendering logic changes so cached outputs are rebuilt
+RENDERER_VERSION = 3
+
+DEFAULT_SECRETS_FILE = os.path.join(DEFAULT_CONFIG_DIR, "talos-secrets.yaml")
+DEFAULT_RENDER_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "hm-cli", "talos-render.json")
+# Base configurations written by `talosctl gen config`, one directory per input hash
+DEFAULT_BASE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "hm-cli", "talos-base")
+# Digests of the last-applied configurations, relative to the repository
+APPLIED_CONFIGS_FILE = os.path.join(".hm-cli", "applied-configs.json")
+
+TALOS_INSTALLER_IMAGE = "ghcr.io/siderolabs/installer"
+# Roles `talosctl gen config` writes a base configuration for
+BASE_ROLES = ("controlplane", "worker")
+
+# Patch applied to every node, then the role patch, then the pool and hardware patches
+# if present; the install disk and labels of the node itself come last
+COMMON_PATCH = "common.yaml"
+ROLE_PATCHES = {"controlplane": "controlplane-patch.yaml", "worker": "worker-patch.yaml"}
+# Output directory of each role, relative to the Talos directory
+ROLE_DIRS = {"controlplane": "controlplane", "worker": "workers"}
+
+_TEMPLATE_VARIABLE = re.compile(r"\{\{\s*\.(\w+)\s*\}\}")
+
+
+class TalosRenderError(Exception):
+    """A machine configuration could not be rendered."""
+
+
+@dataclass
+class RenderResult:
+    """Outcome of rendering the configurations of a cluster."""
+    rendered: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    files: Dict[str, str] = field(default_factory=dict)
+
+
+def merge_config(base: Dict[str, Any], patch: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge a patch into a machine configuration, like a Talos strategic merge patch.
+
+    Mappings are merged recursively, lists are extended with the entries they
+    do not contain yet, and any other value in the patch replaces the base.
+
+    Returns:
+        The merged configuration; the arguments are left unchanged.
+    """
+    merged = copy.deepcopy(base)
+    for key, value in patch.items():
+        current = merged.get(key)
+        if isinstance(current, dict) and isinstance(value, dict):
+            merged[key] = merge_config(current, value)
+        elif isinstance(current, list) and isinstance(value, list):
+            merged[key] = current + [item for item in copy.deepcopy(value) if item not in current]
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def render_template(text: str, variables: Dict[str, str]) -> str:
+    """Substitute `{{ .name }}` placeholders in a patch.
+
+    Raises:
+        TalosRenderError: If a placeholder has no value.
+    """
+    def substitute(match: "re.Match[str]") -> str:
+        name = match.group(1)
+        if name not in variables:
+            raise TalosRenderError(f"Unknown template variable '{name}'")
+        return variables[name]
+
+    return _TEMPLATE_VARIABLE.sub(substitute, text)
+
+
+def gen_config_command(cluster: Dict[str, Any], secrets_file: str, output_dir: str) -> str:
+    """Return the `talosctl gen config` command writing the base configurations of a cluster.
+
+    Args:
+        cluster: Cluster information with `name`, `control_plane_vip`,
+            `talos_version` and `kubernetes_version`.
+        secrets_file: Secrets bundle created by `talosctl gen secrets`.
+        output_dir: Directory receiving `controlplane.yaml` and `worker.yaml`.
+    """
+    try:
+        talos_version = cluster['talos_version']
+        endpoint = f"https://{cluster['control_plane_vip']}:6443"
+        return (
+            f"talosctl gen config {shlex.quote(cluster['name'])} {shlex.quote(endpoint)} "
+            f"--with-secrets {shlex.quote(secrets_file)} "
+            f"--output-types {','.join(BASE_ROLES)} "
+            f"--kubernetes-version {shlex.quote(cluster['kubernetes_version'])} "
+            f"--talos-version {shlex.quote(talos_version)} "
+            f"--install-image {shlex.quote(f'{TALOS_INSTALLER_IMAGE}:{talos_version}')} "
+            f"--output {shlex.quote(output_dir)}"
+        )
+    except KeyError as e:
+        raise TalosRenderError(f"Incomplete cluster information: missing {e}") from e
+
+
+def node_patch(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the patch for the settings of a single node: its install disk and node labels."""
+    machine: Dict[str, Any] = {}
+    if node.get('install_disk'):
+        machine['install'] = {'disk': node['install_disk']}
+    if node.get('labels'):
+        machine['nodeLabels'] = dict(node['labels'])
+    return {'machine': machine} if machine else {}
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class TalosRenderer:
+    """Renders node configurations and remembers the inputs of every output.
+
+    An output is only rebuilt when the hash of its inputs (secrets bundle,
+    patches, node and cluster settings) differs from the one recorded for it,
+    or when the file on disk no longer matches what was rendered. The base
+    configurations come from `talosctl gen config`, which runs once per
+    secrets bundle, cluster name, endpoint and versions; only the patches are
+    merged in-process.
+    """
+
+    def __init__(self, talos_dir: str, secrets_file: str = DEFAULT_SECRETS_FILE,
+                 cache_file: str = DEFAULT_RENDER_CACHE, base_dir: str = DEFAULT_BASE_DIR):
+        """Initialize the renderer.
+
+        Args:
+            talos_dir: Directory holding the patches; outputs go to its role subdirectories.
+            secrets_file: Secrets bundle created by `talosctl gen secrets`.
+            cache_file: JSON file recording the input hash of every output.
+            base_dir: Directory keeping the base configurations `talosctl gen config` wrote.
+        """
+        self.talos_dir = talos_dir
+        self.secrets_file = secrets_file
+        self.cache_file = cache_file
+        self.base_dir = base_dir
+        self._texts: Dict[str, Optional[bytes]] = {}
+
+    def output_file(self, node: Dict[str, Any]) -> str:
+        """Return the configuration file of a node."""
+        role = node.get('type', 'controlplane')
+        return os.path.join(self.talos_dir, ROLE_DIRS.get(role, role), f"{node['name']}.yaml")
+
+    def patch_files(self, node: Dict[str, Any]) -> List[str]:
+        """Return the patches applied to a node, in merge order."""
+        role = node.get('type', 'controlplane')
+        names = [COMMON_PATCH, ROLE_PATCHES.get(role, f"{role}-patch.yaml")]
+        if node.get('pool'):
+            names.append(POOL_PATCH.format(pool=node['pool']))
+        if node.get('hardware'):
+            names.append(f"{node['hardware']}-{role}-patch.yaml")
+        return [name for name in names if self._read(name) is not None]
+
+    def _read(self, name: str) -> Optional[bytes]:
+        """Read a file of the Talos directory once, returning None if it does not exist."""
+        if name not in self._texts:
+            try:
+                with open(os.path.join(self.talos_dir, name), 'rb') as f:
+                    self._texts[name] = f.read()
+            except FileNotFoundError:
+                self._texts[name] = None
+        return self._texts[name]
+
+    @staticmethod
+    def base_hash(cluster: Dict[str, Any], secrets: bytes) -> str:
+        """Hash everything `talosctl gen config` is run with."""
+        inputs = {
+            'renderer': RENDERER_VERSION,
+            'cluster': {key: cluster.get(key) for key in ('name', 'control_plane_vip', 'talos_version', 'kubernetes_version')},
+            'secrets': _sha256(secrets),
+        }
+        return _sha256(json.dumps(inputs, sort_keys=True).encode())
+
+    def base_configs(self, cluster: Dict[str, Any], secrets: bytes) -> Dict[str, Dict[str, Any]]:
+        """Return the base configuration of every role, running `talosctl gen config` if needed.
+
+        Generated configurations are kept under `base_dir`, keyed by `base_hash`,
+        so they are generated again only when the secrets bundle, the cluster
+        name, the endpoint or a version changes.
+
+        Returns:
+            The parsed configurations by role.
+
+        Raises:
+            TalosRenderError: If `talosctl gen config` fails.
+        """
+        output_dir = os.path.join(self.base_dir, self.base_hash(cluster, secrets))
+        if not all(os.path.exists(os.path.join(output_dir, f"{role}.yaml")) for role in BASE_ROLES):
+            os.makedirs(self.base_dir, exist_ok=True)
+            tmp_dir = tempfile.mkdtemp(dir=self.base_dir, prefix=".gen-")
+            try:
+                returncode, _, stderr = run_command(gen_config_command(cluster, self.secrets_file, tmp_dir),
+                                                    suppress_output=True)
+                if returncode != 0:
+                    raise TalosRenderError(f"talosctl gen config failed: {stderr.strip()}")
+                shutil.rmtree(output_dir, ignore_errors=True)
+                os.replace(tmp_dir, output_dir)
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        configs = {}
+        for role in BASE_ROLES:
+            with open(os.path.join(output_dir, f"{role}.yaml")) as f:
+                configs[role] = yaml.safe_load(f) or {}
+        return configs
+
+    def input_hash(self, node: Dict[str, Any], cluster: Dict[str, Any], secrets: bytes) -> str:
+        """Hash everything the configuration of a node is rendered from."""
+        inputs = {
+            'renderer': RENDERER_VERSION,
+            'cluster': {key: cluster.get(key) for key in ('name', 'control_plane_vip', 'talos_version', 'kubernetes_version')},
+            'node': {key: node.get(key) for key in ('name', 'ip', 'type', 'hardware', 'pool', 'install_disk', 'labels')},
+            'secrets': _sha256(secrets),
+            'patches': {name: _sha256(self._read(name)) for name in self.patch_files(node)},
+        }
+        return _sha256(json.dumps(inputs, sort_keys=True).encode())
+
+    def render_node(self, node: Dict[str, Any], bases: Dict[str, Dict[str, Any]]) -> str:
+        """Render the configuration of one node.
+
+        Args:
+            node: The node.
+            bases: Base configurations by role, as returned by `base_configs`.
+
+        Returns:
+            The configuration as YAML, headed by the node comments `gen-config.sh` wrote.
+        """
+        role = node.get('type', 'controlplane')
+        if role not in bases:
+            raise TalosRenderError(f"Unknown node type '{role}' of node {node['name']}")
+        config = bases[role]
+        variables = {'hostname': node['name'], 'nodeIP': node['ip']}
+        for name in self.patch_files(node):
+            try:
+                patch = yaml.safe_load(render_template(self._read(name).decode(), variables)) or {}
+            except yaml.YAMLError as e:
+                raise TalosRenderError(f"Invalid patch {name}: {e}") from e
+            config = merge_config(config, patch)
+        config = merge_config(config, node_patch(node))
+        header = f"# Node: {node['name']} ({node['ip']})\n# Hardware: {node.get('hardware', 'unknown')}\n"
+        return header + yaml.safe_dump(config, sort_keys=False)
+
+    def render(self, cluster: Dict[str, Any], force: bool = False) -> RenderResult:
+        """Render the configurations of all cluster nodes whose inputs changed.
+
+        Args:
+            cluster: Cluster information with `nodes`.
+            force: Render every node regardless of the cache.
+
+        Returns:
+            Which nodes were rendered and which were already up to date.
+
+        Raises:
+            TalosRenderError: If the secrets bundle is missing or a node cannot be rendered.
+        """
+        secrets_text = self._read_secrets()
+        bases: Optional[Dict[str, Dict[str, Any]]] = None
+        self._texts = {}
+        cache = self._load_cache()
+        result = RenderResult()
+
+        for node in cluster['nodes']:
+            path = os.path.abspath(self.output_file(node))
+            digest = self.input_hash(node, cluster, secrets_text)
+            entry = cache.get(path) or {}
+            result.files[node['name']] = path
+            if not force and entry.get('inputs') == digest and self._output_hash(path) == entry.get('output'):
+                result.unchanged.append(node['name'])
+                continue
+
+            if bases is None:
+                bases = self.base_configs(cluster, secrets_text)
+            rendered = self.render_node(node, bases).encode()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(rendered)
+            cache[path] = {'inputs': digest, 'output': _sha256(rendered)}
+            result.rendered.append(node['name'])
+
+        if result.rendered:
+            self._save_cache(cache)
+        return result
+
+    def preview(self, cluster: Dict[str, Any]) -> Dict[str, bytes]:
+        """Render the configurations of all cluster nodes in memory.
+
+        Neither the outputs nor the render cache are written, e.g. for a dry run.
+
+        Returns:
+            The rendered configuration of every node, by node name.
+
+        Raises:
+            TalosRenderError: If the secrets bundle is missing or a node cannot be rendered.
+        """
+        secrets_text = self._read_secrets()
+        self._texts = {}
+        bases = self.base_configs(cluster, secrets_text)
+        return {node['name']: self.render_node(node, bases).encode() for node in cluster['nodes']}
+
+    def _read_secrets(self) -> bytes:
+        try:
+            with open(self.secrets_file, 'rb') as f:
+                return f.read()
+        except OSError as e:
+            raise TalosRenderError(f"Cannot read Talos secrets bundle {self.secrets_file}: {e}") from e
+
+    @staticmethod
+    def _output_hash(path: str) -> Optional[str]:
+        try:
+            with open(path, 'rb') as f:
+                return _sha256(f.read())
+        except OSError:
+            return None
+
+    def _load_cache(self) -> Dict[str, Dict[str, str]]:
+        try:
+            with open(self.cache_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self, cache: Dict[str, Dict[str, str]]) -> None:
+        os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+        tmp_file = f"{self.cache_file}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, self.cache_file)
+
+
+def file_digest(path: str) -> str:
+    """Return the SHA-256 digest of a file."""
+    with open(path, 'rb') as f:
+        return _sha256(f.read())
+
+
+def text_digest(data: bytes) -> str:
+    """Return the SHA-256 digest of rendered content, equal to `file_digest` of a file holding it."""
+    return _sha256(data)
+
+
+class AppliedConfigs:
+    """Digests of the configurations last applied to each node.
+
+    Kept in `.hm-cli/applied-configs.json` in the repository, so a node whose
+    configuration file did not change since it was last applied can be skipped.
+    """
+
+    def __init__(self, path: str):
+        """Initialize the state.
+
+        Args:
+            path: JSON file holding the digests.
+        """
+        self.path = path
+        try:
+            with open(path) as f:
+                self.entries: Dict[str, Dict[str, str]] = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def changed(self, node: Dict[str, Any], digest: str) -> bool:
+        """Return True if a node was never given this configuration, or has moved to another IP."""
+        entry = self.entries.get(node['name']) or {}
+        return entry.get('digest') != digest or entry.get('ip') != node['ip']
+
+    def record(self, node: Dict[str, Any], digest: str) -> None:
+        """Remember that a node now runs the configuration with this digest."""
+        self.entries[node['name']] = {
+            'ip': node['ip'],
+            'digest': digest,
+            'applied_at': datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }
+
+    def save(self) -> None:
+        """Write the state."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_file = f"{self.path}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, self.path)
+
+    def clear(self) -> None:
+        """Forget all nodes, e.g. after they were reset."""
+        self.entries = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,207 @@
+"""
+Waiter module for the hm-cli tool.
+Polls readiness conditions (API reachable, nodes Ready, etcd healthy,
+Kustomization applied) with exponential backoff and jitter, returning as soon
+as all of them hold.
+"""
+
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+from hm_cli.core import logger
+from hm_cli.rolling import node_ready, service_healthy
+
+
+# Seconds before the first retry of an unmet condition
+DEFAULT_INITIAL_DELAY = 1.0
+# Upper bound of the delay between two polls
+DEFAULT_MAX_DELAY = 15.0
+# Growth factor of the delay after every unmet poll
+DEFAULT_BACKOFF_FACTOR = 2.0
+# Fraction of the delay randomly added or removed, so concurrent waiters spread out
+DEFAULT_JITTER = 0.2
+# Nodes probed at the same time by a single poll
+DEFAULT_PROBE_CONCURRENCY = 8
+
+Run = Callable[[str], Tuple[int, str, str]]
+
+
+@dataclass
+class Condition:
+    """A named check returning whether it holds and a short detail for the user."""
+    name: str
+    check: Callable[[], Tuple[bool, str]]
+
+
+@dataclass
+class WaitResult:
+    """Outcome of a wait."""
+    ok: bool
+    elapsed: float
+    # Seconds after the start at which each condition was first met
+    met: Dict[str, float] = field(default_factory=dict)
+    # Condition still unmet when the wait gave up, with its last detail
+    pending: Optional[str] = None
+    detail: str = ""
+
+
+class Waiter:
+    """Polls conditions in order until all hold or the timeout expires.
+
+    Conditions are checked in the given order and only the first unmet one is
+    polled, so cheap prerequisites (e.g. the API answering) gate the more
+    expensive checks. A met condition is not checked again. The delay between
+    polls grows exponentially and starts over whenever a condition is met.
+    """
+
+    def __init__(self, conditions: List[Condition], timeout: float,
+                 initial_delay: float = DEFAULT_INITIAL_DELAY, max_delay: float = DEFAULT_MAX_DELAY,
+                 factor: float = DEFAULT_BACKOFF_FACTOR, jitter: float = DEFAULT_JITTER,
+                 on_update: Optional[Callable[[str, str, float], None]] = None,
+                 sleep: Callable[[float], None] = time.sleep, clock: Callable[[], float] = time.monotonic,
+                 rng: Optional[random.Random] = None):
+        """Initialize the waiter.
+
+        Args:
+            conditions: Conditions that must all hold, in the order they are checked.
+            timeout: Seconds to wait in total.
+            initial_delay: Seconds before the first retry of an unmet condition.
+            max_delay: Upper bound of the delay between two polls.
+            factor: Growth factor of the delay after every unmet poll.
+            jitter: Fraction of the delay randomly added or removed.
+            on_update: Called with (condition, detail, elapsed seconds) after every poll.
+            sleep: Sleep function, replaceable in tests.
+            clock: Monotonic clock, replaceable in tests.
+            rng: Random source for the jitter.
+        """
+        self.conditions = conditions
+        self.timeout = timeout
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.jitter = jitter
+        self.on_update = on_update or (lambda name, detail, elapsed: None)
+        self.sleep = sleep
+        self.clock = clock
+        self.rng = rng or random.Random()
+
+    def _delay(self, attempt: int) -> float:
+        """Return the jittered delay before retry number `attempt` (starting at 0)."""
+        delay = min(self.max_delay, self.initial_delay * self.factor ** attempt)
+        return max(0.0, delay * (1 + self.rng.uniform(-self.jitter, self.jitter)))
+
+    def wait(self) -> WaitResult:
+        """Poll the conditions until all hold or the timeout expires.
+
+        Returns:
+            The result, with `pending` naming the condition that was not met in time.
+        """
+        started = self.clock()
+        deadline = started + self.timeout
+        met: Dict[str, float] = {}
+        for condition in self.conditions:
+            attempt = 0
+            while True:
+                try:
+                    ok, detail = condition.check()
+                except Exception as e:  # A failing probe only means "not yet"
+                    ok, detail = False, str(e)
+                now = self.clock()
+                self.on_update(condition.name, detail, now - started)
+                if ok:
+                    met[condition.name] = now - started
+                    logger.debug(f"{condition.name} after {now - started:.1f}s")
+                    break
+                if now >= deadline:
+                    return WaitResult(False, now - started, met, condition.name, detail)
+                self.sleep(min(self._delay(attempt), max(0.0, deadline - now)))
+                attempt += 1
+        return WaitResult(True, self.clock() - started, met)
+
+
+def _json(run: Run, command: str) -> Tuple[Optional[Any], str]:
+    """Run a command printing JSON, returning the parsed output or None and an error."""
+    returncode, stdout, stderr = run(command)
+    if returncode != 0:
+        return None, stderr.strip() or f"'{command}' exited with {returncode}"
+    try:
+        return json.loads(stdout), ""
+    except ValueError:
+        return None, "unparseable output"
+
+
+def api_reachable(run: Run) -> Condition:
+    """Condition: the Kubernetes API server reports itself ready."""
+    def check() -> Tuple[bool, str]:
+        returncode, stdout, stderr = run("kubectl get --raw /readyz")
+        if returncode == 0:
+            return True, stdout.strip() or "ok"
+        return False, stderr.strip() or "no answer"
+
+    return Condition("Kubernetes API reachable", check)
+
+
+def nodes_ready(run: Run, names: List[str]) -> Condition:
+    """Condition: every named node is registered and Ready."""
+    def check() -> Tuple[bool, str]:
+        data, error = _json(run, "kubectl get nodes -o json")
+        if data is None:
+            return False, error
+        ready = {item['metadata']['name'] for item in data.get('items', []) if node_ready(item)}
+        waiting = [name for name in names if name not in ready]
+        if waiting:
+            return False, f"{len(names) - len(waiting)}/{len(names)} Ready, waiting for {', '.join(waiting)}"
+        return True, f"{len(names)}/{len(names)} Ready"
+
+    return Condition("Nodes Ready", check)
+
+
+def etcd_healthy(run: Run, ips: List[str]) -> Condition:
+    """Condition: the etcd service on every control plane node is healthy."""
+    def healthy(ip: str) -> bool:
+        returncode, stdout, _ = run(f"talosctl --nodes {ip} service etcd")
+        return returncode == 0 and service_healthy(stdout)
+
+    def check() -> Tuple[bool, str]:
+        # Members are queried in parallel, so large control planes do not slow down a poll
+        with ThreadPoolExecutor(max_workers=max(1, min(len(ips), DEFAULT_PROBE_CONCURRENCY))) as executor:
+            unhealthy = [ip for ip, ok in zip(ips, executor.map(healthy, ips)) if not ok]
+        if unhealthy:
+            return False, f"{len(ips) - len(unhealthy)}/{len(ips)} healthy, waiting for {', '.join(unhealthy)}"
+        return True, f"{len(ips)}/{len(ips)} healthy"
+
+    return Condition("etcd members healthy", check)
+
+
+def kustomization_ready(run: Run, name: str, namespace: str = "flux-system",
+                        revision: Optional[str] = None) -> Condition:
+    """Condition: a Flux Kustomization is Ready, at `revision` if one is given."""
+    def check() -> Tuple[bool, str]:
+        data, error = _json(run, f"kubectl get kustomizations.kustomize.toolkit.fluxcd.io {name} -n {namespace} -o json")
+        if data is None:
+            return False, error
+        status = data.get('status', {})
+        applied = status.get('lastAppliedRevision') or ""
+        if revision and applied != revision:
+            return False, f"at {applied or 'no revision'}, waiting for {revision}"
+        for condition in status.get('conditions') or []:
+            if condition.get('type') == "Ready":
+                if condition.get('status') == "True":
+                    return True, f"Ready at {applied}"
+                return False, condition.get('message') or condition.get('reason') or "not Ready"
+        return False, "no Ready condition yet"
+
+    label = f"Kustomization {namespace}/{name} Ready" + (f" at {revision}" if revision else "")
+    return Condition(label, check)
+
+
+def git_revision(run: Run, name: str = "flux-system", namespace: str = "flux-system") -> Optional[str]:
+    """Return the revision of the last artifact of a Flux GitRepository, or None if unknown."""
+    data, _ = _json(run, f"kubectl get gitrepositories.source.toolkit.fluxcd.io {name} -n {namespace} -o json")
+    if not isinstance(data, dict):
+        return None
+    return (data.get('status', {}).get('artifact') or {}).get('revision')
@@ -0,0 +1,188 @@
+"""
+Watch module for the hm-cli tool.
+Keeps a local copy of selected resource kinds up to date by following
+Kubernetes watch streams after one initial list.
+"""
+
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+from hm_cli.core import logger
+from hm_cli.kube import KubeApiError, DEFAULT_WATCH_TIMEOUT
+from hm_cli.status import ClusterSnapshot
+
+
+# Kinds shown by `cluster status --watch`
+WATCH_KINDS = ("nodes", "pods", "kustomizations", "persistentvolumeclaims")
+# Relist period for backends without watch support (kubectl)
+DEFAULT_RELIST_INTERVAL = 5.0
+# Pause before retrying after a failed list or watch
+DEFAULT_RETRY_DELAY = 2.0
+
+
+def _object_key(obj: Dict[str, Any]) -> Tuple[str, str]:
+    """Identify an object by namespace and name."""
+    metadata = obj.get('metadata', {})
+    return metadata.get('namespace', ''), metadata.get('name', '')
+
+
+class ResourceWatcher:
+    """Local copy of one resource kind, kept current by a list followed by watches.
+
+    After the initial list only change events travel over the network. Expired
+    resource versions (410 Gone) trigger a fresh list; backends without watch
+    support are relisted periodically instead.
+    """
+
+    def __init__(self, kube: Any, kind: str, on_change=None, stop: Optional[threading.Event] = None,
+                 relist_interval: float = DEFAULT_RELIST_INTERVAL, retry_delay: float = DEFAULT_RETRY_DELAY,
+                 watch_timeout: int = DEFAULT_WATCH_TIMEOUT):
+        """Initialize the watcher.
+
+        Args:
+            kube: Backend with `list(kind)` and optionally `watch(kind, resource_version)`.
+            kind: Resource kind to follow.
+            on_change: Called without arguments whenever the local copy changes.
+            stop: Event that ends `run` when set.
+            relist_interval: Relist period for backends without watch support, in seconds.
+            retry_delay: Pause after a failed list or watch, in seconds.
+            watch_timeout: Server-side duration of one watch request, in seconds.
+        """
+        self.kube = kube
+        self.kind = kind
+        self.on_change = on_change or (lambda: None)
+        self.stop = stop or threading.Event()
+        self.relist_interval = relist_interval
+        self.retry_delay = retry_delay
+        self.watch_timeout = watch_timeout
+        self.error: Optional[str] = None
+        self.synced = False
+        self.lists = 0
+        self.events = 0
+        self._objects: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def items(self) -> List[Dict[str, Any]]:
+        """Return the current objects ordered by namespace and name."""
+        with self._lock:
+            return [self._objects[key] for key in sorted(self._objects)]
+
+    def run(self) -> None:
+        """List and watch until stopped."""
+        resource_version: Optional[str] = None
+        can_watch = hasattr(self.kube, "watch")
+        while not self.stop.is_set():
+            try:
+                if resource_version is None or not can_watch:
+                    resource_version = self._relist()
+                    if not can_watch:
+                        self.stop.wait(self.relist_interval)
+                        continue
+                for event in self.kube.watch(self.kind, resource_version, timeout_seconds=self.watch_timeout):
+                    if self.stop.is_set():
+                        return
+                    resource_version = self._apply(event) or resource_version
+                # The server ended the watch; resume from the last seen version
+            except KubeApiError as e:
+                if self.stop.is_set():
+                    return
+                if e.missing_kind:
+                    logger.debug(f"Resource kind {self.kind} not served by the cluster: {e}")
+                    self._replace([])
+                    return
+                resource_version = None
+                if e.expired:
+                    logger.debug(f"Watch of {self.kind} expired, relisting")
+                    continue
+                self._set_error(str(e))
+                self.stop.wait(self.retry_delay)
+
+    def _relist(self) -> str:
+        """Replace the local copy with a fresh list and return its resourceVersion."""
+        listing = self.kube.list(self.kind)
+        self.lists += 1
+        self._replace(listing.get('items') or [])
+        return listing.get('metadata', {}).get('resourceVersion', '')
+
+    def _replace(self, objects: List[Dict[str, Any]]) -> None:
+        """Swap in a complete object set."""
+        with self._lock:
+            self._objects = {_object_key(obj): obj for obj in objects}
+            self.synced = True
+            self.error = None
+        self.on_change()
+
+    def _apply(self, event: Dict[str, Any]) -> Optional[str]:
+        """Apply one watch event and return the resourceVersion it carries."""
+        obj = event.get('object') or {}
+        event_type = event.get('type')
+        self.events += 1
+        if event_type in ("ADDED", "MODIFIED", "DELETED"):
+            with self._lock:
+                if event_type == "DELETED":
+                    self._objects.pop(_object_key(obj), None)
+                else:
+                    self._objects[_object_key(obj)] = obj
+                self.error = None
+            self.on_change()
+        return obj.get('metadata', {}).get('resourceVersion')
+
+    def _set_error(self, message: str) -> None:
+        """Record a failure to reach the API server."""
+        with self._lock:
+            self.error = message
+        self.on_change()
+
+
+class ClusterWatch:
+    """Live view of several resource kinds, one watcher thread per kind."""
+
+    def __init__(self, kube: Any, kinds: Tuple[str, ...] = WATCH_KINDS, **watcher_options: Any):
+        """Initialize the watch.
+
+        Args:
+            kube: Backend used by every watcher.
+            kinds: Resource kinds to follow.
+            **watcher_options: Passed on to each ResourceWatcher.
+        """
+        self.kube = kube
+        self._stop = threading.Event()
+        self._changed = threading.Event()
+        self.watchers: Dict[str, ResourceWatcher] = {
+            kind: ResourceWatcher(kube, kind, on_change=self._changed.set, stop=self._stop, **watcher_options)
+            for kind in kinds
+        }
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> "ClusterWatch":
+        """Start one daemon thread per kind."""
+        for kind, watcher in self.watchers.items():
+            thread = threading.Thread(target=watcher.run, name=f"watch-{kind}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def wait_for_change(self, timeout: Optional[float] = None) -> bool:
+        """Block until any kind changed or the timeout expired.
+
+        Returns:
+            True if a change was seen since the previous call.
+        """
+        changed = self._changed.wait(timeout)
+        self._changed.clear()
+        return changed
+
+    def snapshot(self) -> ClusterSnapshot:
+        """Return the current objects as a ClusterSnapshot."""
+        return ClusterSnapshot.from_items({kind: watcher.items() for kind, watcher in self.watchers.items()})
+
+    def errors(self) -> Dict[str, str]:
+        """Return the last error of every kind that is currently failing."""
+        return {kind: watcher.error for kind, watcher in self.watchers.items() if watcher.error}
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Stop all watchers and close the backend to interrupt open streams."""
+        self._stop.set()
+        self.kube.close()
+        for thread in self._threads:
+            thread.join(timeout)
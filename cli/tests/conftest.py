@@ -3,6 +3,7 @@ Fixtures and configuration for pytest.
 """
 
 import os
+import json
 import sys
 import tempfile
 import shutil
@@ -21,6 +22,41 @@ original_progress = rich.progress.Progress
 rich.progress.Progress = MagicMock()
 
 from hm_cli.core import ConfigManager, run_command as actual_run_command
+from hm_cli.core import _ConfigStore
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: timing assertion, run only with HM_CLI_BENCHMARKS=1")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip benchmarks unless HM_CLI_BENCHMARKS=1; their timings vary too much on shared machines."""
+    if os.environ.get("HM_CLI_BENCHMARKS") == "1":
+        return
+    skip = pytest.mark.skip(reason="benchmark; set HM_CLI_BENCHMARKS=1 to run")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True)
+def reset_config_cache():
+    """Start every test without configuration cached by earlier tests."""
+    _ConfigStore.clear()
+    yield
+    _ConfigStore.clear()
+
+
+@pytest.fixture(autouse=True)
+def isolated_inventory(tmp_path, monkeypatch):
+    """Keep the cluster inventory cache of every test in its own directory."""
+    monkeypatch.setattr('hm_cli.inventory.DEFAULT_INVENTORY_FILE', str(tmp_path / "inventory.json"))
+
+
+@pytest.fixture(autouse=True)
+def isolated_status_cache(tmp_path, monkeypatch):
+    """Keep the status cache of every test in its own directory."""
+    monkeypatch.setattr('hm_cli.status.DEFAULT_STATUS_CACHE_DIR', str(tmp_path / "status"))
 
 
 @pytest.fixture
@@ -135,15 +171,37 @@ def mock_run_command(monkeypatch):
                     except OSError as e:
                         with open(side_effect_debug_file, "a") as f: # Log errors to file too
                             f.write(f"SIDE_EFFECT_ERROR creating dummy files: {e}\n")
+        if args and args[0].endswith(" service etcd"):
+            return 0, "STATE    Running\nHEALTH   OK\n", ""
+        if args and args[0].startswith("kubectl get gitrepositories"):
+            return 0, json.dumps({'status': {'artifact': {'revision': "main@sha1:abc123"}}}), ""
+        if args and args[0].startswith("kubectl get kustomizations"):
+            return 0, json.dumps({'status': {
+                'lastAppliedRevision': "main@sha1:abc123",
+                'conditions': [{'type': 'Ready', 'status': 'True'}]
+            }}), ""
         return 0, "minimal_mocked_stdout", "minimal_mocked_stderr"
 
     mock = MagicMock(side_effect=simple_side_effect)
     
     monkeypatch.setattr('hm_cli.core.run_command', mock)
     monkeypatch.setattr('hm_cli.cluster.run_command', mock)
+    monkeypatch.setattr('hm_cli.kube.run_command', mock)
+    monkeypatch.setattr('hm_cli.talos.run_command', mock)
     # Also patch for gitops if it uses run_command directly from core or its own import
     monkeypatch.setattr('hm_cli.gitops.run_command', mock, raising=False) # Add raising=False in case gitops doesn't have it
 
+    def run_commands_via_mock(commands, cwd=None, env=None, limit=None, timeout=None, suppress_output=False):
+        """Run batched commands one by one through the run_command mock."""
+        kwargs = {'cwd': cwd}
+        if env:
+            kwargs['env'] = env
+        if suppress_output:
+            kwargs['suppress_output'] = suppress_output
+        return [mock(command, **kwargs) for command in commands]
+
+    monkeypatch.setattr('hm_cli.cluster.run_commands', run_commands_via_mock)
+
     print(f"CONFTEST_DEBUG: mock_run_command.side_effect is: {mock.side_effect}")
     print(f"CONFTEST_DEBUG: Side effect debug file will be at: {side_effect_debug_file}")
         
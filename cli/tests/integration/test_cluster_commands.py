@@ -3,12 +3,14 @@ Integration tests for cluster commands.
 """
 
 import os
+import json
 import sys
 import pytest
 from unittest.mock import patch, MagicMock, ANY
 
 from click.testing import CliRunner
 from hm_cli.cli import cli
+from hm_cli.report import TcpProbeRecord
 
 
 class TestClusterCommandsIntegration:
@@ -70,11 +72,10 @@ class TestClusterCommandsIntegration:
                     cwd=mock_repo_path
                 )
                 
-                # Verify talosctl was called for health check
-                mock_run_command.assert_any_call( # Changed mock name
-                    "talosctl health --nodes 192.168.1.101,192.168.1.102,192.168.1.103 --wait-timeout 15m", # Corrected timeout
-                    cwd=mock_repo_path
-                )
+                # Verify the bootstrap waited for etcd on every control plane node
+                commands = [call.args[0] for call in mock_run_command.call_args_list]
+                for node_ip in ("192.168.1.101", "192.168.1.102", "192.168.1.103"):
+                    assert f"talosctl --nodes {node_ip} service etcd" in commands
                 
                 # Verify flux was called for bootstrap
                 mock_run_command.assert_any_call( # Changed mock name
@@ -101,7 +102,8 @@ class TestClusterCommandsIntegration:
                             'cluster': {
                                 'name': 'test-cluster',
                                 'network_prefix': '192.168.1',
-                                'control_plane_vip': '192.168.1.100'
+                                'control_plane_vip': '192.168.1.100',
+                                'talos_renderer': 'script'  # This workflow covers gen-config.sh
                             },
                             'nodes': [
                                 {'name': 'talos-cp1', 'ip': '192.168.1.101', 'type': 'controlplane', 'hardware': 'ryzen'},
@@ -109,6 +111,17 @@ class TestClusterCommandsIntegration:
                                 {'name': 'talos-cp3', 'ip': '192.168.1.103', 'type': 'controlplane', 'hardware': 'mac-mini'}
                             ]
                         }):
+                            # Every node reports Ready once the configurations are applied
+                            run_command_side_effect = mock_run_command.side_effect
+                            ready_nodes = json.dumps({'items': [
+                                {'metadata': {'name': name}, 'status': {'conditions': [{'type': 'Ready', 'status': 'True'}]}}
+                                for name in ('talos-cp1', 'talos-cp2', 'talos-cp3')
+                            ]})
+                            mock_run_command.side_effect = lambda command, **kwargs: (
+                                (0, ready_nodes, "") if command == "kubectl get nodes -o json"
+                                else run_command_side_effect(command, **kwargs)
+                            )
+
                             # Run the command
                             result = cli_runner.invoke(cli, ['cluster', 'upgrade'])
                             
@@ -158,11 +171,11 @@ class TestClusterCommandsIntegration:
                                     cwd=mock_repo_path
                                 )
                             
-                            # Verify talosctl was called for health check
-                            mock_run_command.assert_any_call(
-                                "talosctl health --nodes 192.168.1.101,192.168.1.102,192.168.1.103 --wait-timeout 30m", # Changed 15m to 30m
-                                cwd=mock_repo_path
-                            )
+                            # Verify the upgrade waited for the nodes and etcd
+                            commands = [call.args[0] for call in mock_run_command.call_args_list]
+                            assert "kubectl get nodes -o json" in commands
+                            for node_info in nodes_info:
+                                assert f"talosctl --nodes {node_info['ip']} service etcd" in commands
     
     def test_cluster_delete_workflow(self, cli_runner, mock_repo_path, mock_run_command): # Changed fixture
         """Test the complete cluster deletion workflow."""
@@ -208,7 +221,9 @@ class TestClusterCommandsIntegration:
 
     def test_cluster_status_workflow(self, cli_runner, mock_repo_path, mock_run_command): # Changed fixture
         """Test the cluster status workflow."""
-        with patch('hm_cli.cluster.get_repo_path', return_value=mock_repo_path):
+        vip_probe = TcpProbeRecord('vip', '192.168.1.100', 6443, 'kube-apiserver', 5, 5, 1.0, 1.2, 1.3, 1.3)
+        with patch('hm_cli.cluster.get_repo_path', return_value=mock_repo_path), \
+             patch('hm_cli.cluster.probe', return_value=[vip_probe]):
             # Mock kubeconfig existence
             with patch('os.path.exists', return_value=True):
                 # Run the command
@@ -218,13 +233,37 @@ class TestClusterCommandsIntegration:
                 
                 # Verify kubectl was called to get nodes and pods
                 mock_run_command.assert_any_call( # Changed mock name
-                    "kubectl get nodes -o wide",
+                    "kubectl get nodes -o json",
                     cwd=mock_repo_path,
                     env=ANY, # KUBECONFIG is added by ClusterManager.run_command
                     suppress_output=True
                 )
                 mock_run_command.assert_any_call(
-                    "kubectl get pods -A -o wide", # Corrected command
+                    "kubectl get pods -A -o json", # Corrected command
+                    cwd=mock_repo_path,
+                    env=ANY,
+                    suppress_output=True
+                )
+
+    def test_cluster_status_json_output(self, cli_runner, mock_repo_path, mock_run_command):
+        """Test cluster status writes a parseable JSON report."""
+        vip_probe = TcpProbeRecord('vip', '192.168.1.100', 6443, 'kube-apiserver', 5, 0, error='Connection refused')
+        with patch('hm_cli.cluster.get_repo_path', return_value=mock_repo_path), \
+             patch('hm_cli.cluster.probe', return_value=[vip_probe]) as mock_probe:
+            with patch('os.path.exists', return_value=True):
+                result = cli_runner.invoke(cli, ['cluster', 'status', '--output', 'json'])
+
+                assert result.exit_code == 0
+                # The run_command mock prints its own debug lines; the report starts at the first '{'
+                report = json.loads(result.stdout[result.stdout.index("{\n"):])
+                assert set(report) >= {'nodes', 'pods', 'flux', 'vip', 'probes', 'etcd', 'errors'}
+                assert report['vip'] == {'address': '192.168.1.100', 'reachable': False, 'detail': 'Connection refused'}
+                assert report['probes'][0]['connected'] == 0
+                assert mock_probe.call_args[0][0][0].port == 6443
+                # The mocked kubectl returns no JSON, so every kind is reported as an error
+                assert 'nodes' in report['errors']
+                mock_run_command.assert_any_call(
+                    "kubectl get nodes -o json",
                     cwd=mock_repo_path,
                     env=ANY,
                     suppress_output=True
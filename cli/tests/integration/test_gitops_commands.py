@@ -178,11 +178,10 @@ class TestGitOpsCommandsIntegration:
                     cwd=mock_repo_path
                 )
                 
-                # Verify flux was called to get status
-                mock_run_command.assert_any_call( # Changed mock name
-                    "flux get kustomizations --watch",
-                    cwd=mock_repo_path
-                )
+                # Verify the sync waited for the Kustomization to apply the fetched revision
+                commands = [call.args[0] for call in mock_run_command.call_args_list]
+                assert "kubectl get gitrepositories.source.toolkit.fluxcd.io flux-system -n flux-system -o json" in commands
+                assert "kubectl get kustomizations.kustomize.toolkit.fluxcd.io flux-system -n flux-system -o json" in commands
     
     def test_gitops_sync_no_kubeconfig_workflow(self, cli_runner, mock_repo_path):
         """Test the gitops sync workflow when kubeconfig doesn't exist."""
@@ -200,7 +199,7 @@ class TestGitOpsCommandsIntegration:
             # Mock kubeconfig exists
             with patch('os.path.exists', return_value=True):
                 # Mock flux not installed
-                with patch('hm_cli.core.run_command') as mock_run:
+                with patch('hm_cli.gitops.run_command') as mock_run:
                     mock_run.return_value = (1, "", "flux: command not found")
                     
                     # Run the command
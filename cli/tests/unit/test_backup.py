@@ -0,0 +1,79 @@
+"""
+Unit tests for the backup module.
+"""
+
+import gzip
+import hashlib
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from hm_cli.backup import SnapshotError, compress_snapshot, rotate_snapshots, snapshot_name
+
+
+def _write_snapshot(temp_dir, data, corrupt=False):
+    """Write a raw snapshot with the SHA-256 checksum etcd appends."""
+    checksum = hashlib.sha256(data).digest()
+    if corrupt:
+        checksum = bytes(32)
+    path = os.path.join(temp_dir, "snapshot.db")
+    with open(path, 'wb') as f:
+        f.write(data + checksum)
+    return path
+
+
+@pytest.mark.parametrize("chunk_size", [7, 32, 1024 * 1024])
+def test_compress_snapshot(temp_dir, chunk_size):
+    """Test the snapshot is compressed and verified whatever the chunk boundaries."""
+    data = os.urandom(1000) * 3
+    source = _write_snapshot(temp_dir, data)
+    dest = os.path.join(temp_dir, "etcd-homelab-20260101T000000Z.db.gz")
+
+    snapshot = compress_snapshot(source, dest, chunk_size=chunk_size)
+
+    with gzip.open(dest, 'rb') as f:
+        assert f.read() == data + hashlib.sha256(data).digest()
+    with open(dest, 'rb') as f:
+        assert snapshot.sha256 == hashlib.sha256(f.read()).hexdigest()
+    assert (snapshot.size, snapshot.compressed_size) == (len(data) + 32, os.path.getsize(dest))
+    with open(f"{dest}.sha256") as f:
+        assert f.read() == f"{snapshot.sha256}  etcd-homelab-20260101T000000Z.db.gz\n"
+
+
+def test_compress_snapshot_rejects_bad_checksum(temp_dir):
+    """Test a snapshot failing its checksum leaves no compressed file behind."""
+    source = _write_snapshot(temp_dir, b"etcd data" * 100, corrupt=True)
+    dest = os.path.join(temp_dir, "etcd-homelab-20260101T000000Z.db.gz")
+
+    with pytest.raises(SnapshotError):
+        compress_snapshot(source, dest, chunk_size=64)
+    assert os.listdir(temp_dir) == ["snapshot.db"]
+
+    compress_snapshot(source, dest, verify=False)
+    assert os.path.exists(dest)
+
+
+def test_rotate_snapshots(temp_dir):
+    """Test only the newest snapshots of the cluster within the maximum age are kept."""
+    now = datetime(2026, 3, 10, tzinfo=timezone.utc)
+    names = [snapshot_name("homelab", now - timedelta(days=days)) for days in range(5)]
+    for name in names + [snapshot_name("other", now - timedelta(days=9)), "notes.txt"]:
+        open(os.path.join(temp_dir, name), 'w').close()
+    open(os.path.join(temp_dir, f"{names[4]}.sha256"), 'w').close()
+
+    removed = rotate_snapshots(temp_dir, "homelab", keep=3, now=now)
+    assert [os.path.basename(path) for path in removed] == [names[4], names[3]]
+    assert not os.path.exists(os.path.join(temp_dir, f"{names[4]}.sha256"))
+
+    removed = rotate_snapshots(temp_dir, "homelab", keep=3, max_age_days=1.5, now=now)
+    assert [os.path.basename(path) for path in removed] == [names[2]]
+    assert sorted(os.listdir(temp_dir)) == sorted(names[:2] + [snapshot_name("other", now - timedelta(days=9)), "notes.txt"])
+
+
+def test_rotate_keeps_newest_snapshot(temp_dir):
+    """Test the newest snapshot survives even when it is older than the maximum age."""
+    now = datetime(2026, 3, 10, tzinfo=timezone.utc)
+    name = snapshot_name("homelab", now - timedelta(days=30))
+    open(os.path.join(temp_dir, name), 'w').close()
+    assert rotate_snapshots(temp_dir, "homelab", keep=1, max_age_days=7, now=now) == []
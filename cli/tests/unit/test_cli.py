@@ -89,6 +89,18 @@ class TestCLI:
             
             assert result.exit_code == 1
             mock_instance.create.assert_called_once()
+
+    def test_cluster_create_resume(self, cli_runner):
+        """Test cluster create --resume is passed to the cluster manager."""
+        with patch('hm_cli.cli.ClusterManager') as mock_manager:
+            mock_instance = mock_manager.return_value
+            mock_instance.create.return_value = True
+
+            result = cli_runner.invoke(cli, ['cluster', 'create', '--resume'])
+
+            assert result.exit_code == 0
+            mock_instance.create.assert_called_once_with(apply_concurrency=None, serial_control_plane=None,
+                                                         resume=True, from_file=None)
     
     def test_cluster_upgrade_command(self, cli_runner):
         """Test cluster upgrade command."""
@@ -101,6 +113,59 @@ class TestCLI:
             
             assert result.exit_code == 0
             mock_instance.upgrade.assert_called_once()
+
+    def test_cluster_upgrade_apply_options(self, cli_runner):
+        """Test apply options are passed to the cluster manager."""
+        with patch('hm_cli.cli.ClusterManager') as mock_manager:
+            mock_instance = mock_manager.return_value
+            mock_instance.upgrade.return_value = True
+
+            result = cli_runner.invoke(cli, ['cluster', 'upgrade', '--apply-concurrency', '2', '--serial-control-plane'])
+
+            assert result.exit_code == 0
+            mock_instance.upgrade.assert_called_once_with(apply_concurrency=2, serial_control_plane=True,
+                                                          rolling=None, max_unavailable=None, dry_run=False, force=False,
+                                                          pool=None, from_file=None)
+
+    def test_cluster_upgrade_rolling_options(self, cli_runner):
+        """Test rolling upgrade options are passed to the cluster manager."""
+        with patch('hm_cli.cli.ClusterManager') as mock_manager:
+            mock_instance = mock_manager.return_value
+            mock_instance.upgrade.return_value = True
+
+            result = cli_runner.invoke(cli, ['cluster', 'upgrade', '--rolling', '--max-unavailable', '2'])
+
+            assert result.exit_code == 0
+            mock_instance.upgrade.assert_called_once_with(apply_concurrency=None, serial_control_plane=None,
+                                                          rolling=True, max_unavailable=2, dry_run=False, force=False,
+                                                          pool=None, from_file=None)
+
+    def test_cluster_upgrade_pool(self, cli_runner, temp_dir):
+        """Test --pool and --from are passed to the cluster manager."""
+        inventory = os.path.join(temp_dir, "inventory.yaml")
+        with open(inventory, 'w') as f:
+            f.write("nodes: []\n")
+        with patch('hm_cli.cli.ClusterManager') as mock_manager:
+            mock_instance = mock_manager.return_value
+            mock_instance.upgrade.return_value = True
+
+            result = cli_runner.invoke(cli, ['cluster', 'upgrade', '--pool', 'compute', '--from', inventory])
+
+            assert result.exit_code == 0
+            assert mock_instance.upgrade.call_args.kwargs['pool'] == 'compute'
+            assert mock_instance.upgrade.call_args.kwargs['from_file'] == inventory
+
+    def test_cluster_upgrade_dry_run(self, cli_runner):
+        """Test --dry-run and --force are passed to the cluster manager."""
+        with patch('hm_cli.cli.ClusterManager') as mock_manager:
+            mock_instance = mock_manager.return_value
+            mock_instance.upgrade.return_value = True
+
+            result = cli_runner.invoke(cli, ['cluster', 'upgrade', '--dry-run', '--force'])
+
+            assert result.exit_code == 0
+            assert mock_instance.upgrade.call_args.kwargs['dry_run'] is True
+            assert mock_instance.upgrade.call_args.kwargs['force'] is True
     
     def test_cluster_delete_command(self, cli_runner):
         """Test cluster delete command."""
@@ -113,7 +178,51 @@ class TestCLI:
             
             assert result.exit_code == 0
             mock_instance.delete.assert_called_once()
+
+    def test_cluster_delete_reset_options(self, cli_runner):
+        """Test reset concurrency and timeout are passed to the cluster manager."""
+        with patch('hm_cli.cli.ClusterManager') as mock_manager:
+            mock_instance = mock_manager.return_value
+            mock_instance.delete.return_value = True
+
+            result = cli_runner.invoke(cli, ['cluster', 'delete', '--concurrency', '3', '--timeout', '120'])
+
+            assert result.exit_code == 0
+            mock_instance.delete.assert_called_once_with(concurrency=3, timeout=120.0)
+
+    def test_cluster_inventory_refresh_command(self, cli_runner):
+        """Test cluster inventory refresh command."""
+        with patch('hm_cli.cli.ClusterManager') as mock_manager:
+            mock_instance = mock_manager.return_value
+            mock_instance.refresh_inventory.return_value = False
+
+            result = cli_runner.invoke(cli, ['cluster', 'inventory', 'refresh'])
+
+            assert result.exit_code == 1
+            mock_instance.refresh_inventory.assert_called_once_with()
     
+    def test_cluster_etcd_defrag_command(self, cli_runner):
+        """Test cluster etcd defrag command."""
+        with patch('hm_cli.cli.ClusterManager') as mock_manager:
+            mock_instance = mock_manager.return_value
+            mock_instance.defrag_etcd.return_value = True
+
+            result = cli_runner.invoke(cli, ['cluster', 'etcd', 'defrag', '--yes'])
+
+            assert result.exit_code == 0
+            mock_instance.defrag_etcd.assert_called_once_with(yes=True, allow_quorum_loss=False)
+
+    def test_cluster_backup_etcd_command(self, cli_runner, temp_dir):
+        """Test cluster backup etcd options are passed to the cluster manager."""
+        with patch('hm_cli.cli.ClusterManager') as mock_manager:
+            mock_instance = mock_manager.return_value
+            mock_instance.backup_etcd.return_value = True
+
+            result = cli_runner.invoke(cli, ['cluster', 'backup', 'etcd', '--output-dir', temp_dir, '--keep', '3', '--no-verify'])
+
+            assert result.exit_code == 0
+            mock_instance.backup_etcd.assert_called_once_with(output_dir=temp_dir, keep=3, node=None, verify=False)
+
     def test_cluster_status_command(self, cli_runner):
         """Test cluster status command."""
         with patch('hm_cli.cli.ClusterManager') as mock_manager:
@@ -125,6 +234,63 @@ class TestCLI:
             
             assert result.exit_code == 0
             mock_instance.status.assert_called_once()
+
+    def test_cluster_status_watch_command(self, cli_runner):
+        """Test cluster status --watch command."""
+        with patch('hm_cli.cli.ClusterManager') as mock_manager:
+            mock_instance = mock_manager.return_value
+            mock_instance.watch_status.return_value = True
+
+            result = cli_runner.invoke(cli, ['cluster', 'status', '--watch', '--backend', 'api'])
+
+            assert result.exit_code == 0
+            mock_instance.watch_status.assert_called_once_with(backend='api')
+            mock_instance.status.assert_not_called()
+
+    def test_cluster_status_output_command(self, cli_runner):
+        """Test cluster status --output command."""
+        with patch('hm_cli.cli.ClusterManager') as mock_manager:
+            mock_instance = mock_manager.return_value
+            mock_instance.status.return_value = True
+
+            result = cli_runner.invoke(cli, ['cluster', 'status', '--output', 'ndjson', '--concurrency', '2'])
+
+            assert result.exit_code == 0
+            mock_instance.status.assert_called_once_with(max_concurrency=2, backend=None, output='ndjson', pod_query=None,
+                                                         refresh=False)
+
+            result = cli_runner.invoke(cli, ['cluster', 'status', '--output', 'json', '--watch'])
+            assert result.exit_code != 0
+
+    def test_cluster_status_pod_filters(self, cli_runner):
+        """Test pod filters are passed on as a PodQuery."""
+        with patch('hm_cli.cli.ClusterManager') as mock_manager:
+            mock_instance = mock_manager.return_value
+            mock_instance.status.return_value = True
+
+            result = cli_runner.invoke(cli, ['cluster', 'status', '-n', 'apps', '-l', 'app=web',
+                                             '--field-selector', 'status.phase!=Running', '--pods', 'full'])
+
+            assert result.exit_code == 0
+            query = mock_instance.status.call_args.kwargs['pod_query']
+            assert (query.namespace, query.label_selector, query.field_selector, query.view) == \
+                ('apps', 'app=web', 'status.phase!=Running', 'full')
+
+    def test_cluster_status_refresh(self, cli_runner):
+        """Test --refresh bypasses the status cache."""
+        with patch('hm_cli.cli.ClusterManager') as mock_manager:
+            mock_instance = mock_manager.return_value
+            mock_instance.status.return_value = True
+
+            result = cli_runner.invoke(cli, ['cluster', 'status', '--refresh'])
+
+            assert result.exit_code == 0
+            mock_instance.status.assert_called_once_with(max_concurrency=None, backend=None, pod_query=None, refresh=True)
+
+            result = cli_runner.invoke(cli, ['cluster', 'status', '--refresh', '--watch'])
+            assert result.exit_code == 2
+            assert "--refresh cannot be combined with --watch" in result.output
+            mock_instance.watch_status.assert_not_called()
     
     def test_service_add_command(self, cli_runner):
         """Test service add command."""
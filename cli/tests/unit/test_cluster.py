@@ -2,12 +2,16 @@
 Unit tests for the cluster module.
 """
 
+import json
 import os
 import sys
+import threading
 import pytest
 from unittest.mock import patch, MagicMock, mock_open
 
 from hm_cli.cluster import ClusterManager
+from hm_cli.status import ClusterSnapshot
+from hm_cli.journal import input_digest
 
 
 class TestClusterManager:
@@ -217,3 +221,623 @@ class TestClusterManager:
                     result = manager.status()
                     
                     assert result is False
+
+    def test_pod_summary_pages_with_server_side_filters(self, mock_repo_path):
+        """Test the pods section pages through filtered pods and details only unhealthy ones."""
+        from hm_cli.status import PodQuery, SectionBuffer
+
+        def pod(name, phase, ready):
+            return {
+                'metadata': {'name': name, 'namespace': 'apps'},
+                'spec': {'containers': [{'name': 'app'}]},
+                'status': {'phase': phase, 'containerStatuses': [{'ready': ready, 'restartCount': 0, 'state': {}}]},
+            }
+
+        kube = MagicMock()
+        kube.iter_pages.return_value = iter([[pod('web-1', 'Running', True)], [pod('web-2', 'Pending', False)]])
+        with patch('hm_cli.cluster.ConfigManager'):
+            with patch('hm_cli.cluster.get_repo_path', return_value=mock_repo_path):
+                manager = ClusterManager()
+                out = SectionBuffer()
+                manager._check_pod_status({}, out=out, kube=kube,
+                                          query=PodQuery(namespace='apps', label_selector='app=web', view='summary'))
+
+        kube.iter_pages.assert_called_once_with("pods", namespace='apps', label_selector='app=web', field_selector=None)
+        printed = " ".join(str(args[0]) for args, _ in out._calls)
+        assert "Pod Summary (namespace=apps, -l app=web)" in printed
+        assert "Unhealthy Pods (1 of 2)" in printed
+
+
+class TestApplyTalosConfigs:
+    """Tests for applying Talos configurations to nodes."""
+
+    NODES = [
+        {'name': 'talos-cp1', 'ip': '192.168.1.101', 'type': 'controlplane'},
+        {'name': 'talos-cp2', 'ip': '192.168.1.102', 'type': 'controlplane'},
+        {'name': 'talos-w1', 'ip': '192.168.1.111', 'type': 'worker'},
+        {'name': 'talos-w2', 'ip': '192.168.1.112', 'type': 'worker'},
+    ]
+
+    def _apply(self, mock_repo_path, fake_run, cluster_info=None, **kwargs):
+        cluster_info = cluster_info or {}
+        with patch('hm_cli.cluster.ConfigManager'):
+            with patch('hm_cli.cluster.get_repo_path', return_value=mock_repo_path):
+                manager = ClusterManager()
+                with patch('hm_cli.cluster.os.path.exists', return_value=True):
+                    with patch('hm_cli.cluster.file_digest', side_effect=self._digest):
+                        with patch('hm_cli.cluster.run_command', side_effect=fake_run) as mock_run:
+                            result = manager._apply_talos_configs(dict({'nodes': self.NODES}, **cluster_info), **kwargs)
+        applied = [call.args[0].split('--nodes ')[1].split()[0] for call in mock_run.call_args_list]
+        return result, applied
+
+    # Digest overrides by node name; other config files digest to their path
+    digests = {}
+
+    def _digest(self, path):
+        return next((digest for name, digest in self.digests.items() if f"{name}.yaml" in path), path)
+
+    def test_parallel_apply_collects_all_failures(self, mock_repo_path):
+        """Test every node is configured even when some fail."""
+        def fake_run(command, cwd=None):
+            return (1, "", "connection refused") if "192.168.1.101" in command or "192.168.1.112" in command else (0, "", "")
+
+        result, applied = self._apply(mock_repo_path, fake_run, concurrency=4, serial_control_plane=False)
+        assert result is False
+        assert sorted(applied) == sorted(node['ip'] for node in self.NODES)
+
+    def test_parallel_apply_respects_concurrency(self, mock_repo_path):
+        """Test nodes are configured at the same time, up to the limit."""
+        import threading
+        import time
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def fake_run(command, cwd=None):
+            with lock:
+                running.append(command)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(command)
+            return 0, "", ""
+
+        result, _ = self._apply(mock_repo_path, fake_run, concurrency=2, serial_control_plane=False)
+        assert result is True
+        assert max(peak) == 2
+
+    def test_serial_control_plane_stops_at_first_failure(self, mock_repo_path):
+        """Test control plane nodes go one at a time and a failure leaves the rest untouched."""
+        def fake_run(command, cwd=None):
+            return (1, "", "timeout") if "192.168.1.102" in command else (0, "", "")
+
+        result, applied = self._apply(mock_repo_path, fake_run, concurrency=4, serial_control_plane=True)
+        assert result is False
+        assert applied == ['192.168.1.101', '192.168.1.102']
+
+    def test_serial_control_plane_then_parallel_workers(self, mock_repo_path):
+        """Test workers are configured after all control plane nodes."""
+        result, applied = self._apply(mock_repo_path, lambda command, cwd=None: (0, "", ""),
+                                      concurrency=4, serial_control_plane=True)
+        assert result is True
+        assert applied[:2] == ['192.168.1.101', '192.168.1.102']
+        assert sorted(applied[2:]) == ['192.168.1.111', '192.168.1.112']
+
+    def test_pools_apply_after_other_nodes_with_their_own_limit(self, mock_repo_path):
+        """Test each pool is configured as its own wave, at most max_parallel nodes at once."""
+        import threading
+        import time
+        lock = threading.Lock()
+        running = []
+        peak = {}
+
+        def fake_run(command, cwd=None):
+            ip = command.split('--nodes ')[1].split()[0]
+            with lock:
+                running.append(ip)
+                peak[ip] = len(running)
+            time.sleep(0.05)
+            with lock:
+                running.remove(ip)
+            return 0, "", ""
+
+        pool_nodes = [
+            {'name': f'talos-c{index}', 'ip': f'192.168.1.12{index}', 'type': 'worker', 'pool': 'compute'}
+            for index in range(3)
+        ]
+        cluster_info = {'nodes': self.NODES + pool_nodes, 'pools': {'compute': {'max_parallel': 1}}}
+        result, applied = self._apply(mock_repo_path, fake_run, cluster_info=cluster_info,
+                                      concurrency=4, serial_control_plane=False)
+        assert result is True
+        assert sorted(applied[:4]) == sorted(node['ip'] for node in self.NODES)
+        assert sorted(applied[4:]) == [node['ip'] for node in pool_nodes]
+        assert max(peak[node['ip']] for node in self.NODES) == 4
+        assert all(peak[node['ip']] == 1 for node in pool_nodes)
+
+    def test_only_changed_skips_nodes_running_their_config(self, mock_repo_path):
+        """Test nodes are skipped when their config digest matches the last applied one."""
+        ok = lambda command, cwd=None: (0, "", "")
+        # The first apply records a digest for every node
+        result, applied = self._apply(mock_repo_path, ok, concurrency=4, serial_control_plane=False, only_changed=True)
+        assert result is True
+        assert len(applied) == 4
+
+        result, applied = self._apply(mock_repo_path, ok, concurrency=4, serial_control_plane=False, only_changed=True)
+        assert result is True
+        assert applied == []
+
+        self.digests = {'talos-w2': "new-digest"}
+        result, applied = self._apply(mock_repo_path, ok, concurrency=4, serial_control_plane=False, only_changed=True)
+        assert applied == ['192.168.1.112']
+
+    def test_failed_node_is_not_recorded(self, mock_repo_path):
+        """Test a node whose apply failed is retried on the next run."""
+        def fail_cp2(command, cwd=None):
+            return (1, "", "timeout") if "192.168.1.102" in command else (0, "", "")
+
+        self._apply(mock_repo_path, fail_cp2, concurrency=4, serial_control_plane=False, only_changed=True)
+        _, applied = self._apply(mock_repo_path, lambda command, cwd=None: (0, "", ""), concurrency=4,
+                                 serial_control_plane=False, only_changed=True)
+        assert applied == ['192.168.1.102']
+
+    def test_dry_run_lists_changed_nodes(self, mock_repo_path):
+        """Test the dry run reports changed nodes without running talosctl."""
+        self._apply(mock_repo_path, lambda command, cwd=None: (0, "", ""), concurrency=4, serial_control_plane=False)
+        self.digests = {'talos-cp1': "new-digest"}
+        with patch('hm_cli.cluster.ConfigManager'):
+            with patch('hm_cli.cluster.get_repo_path', return_value=mock_repo_path):
+                manager = ClusterManager()
+                with patch('hm_cli.cluster.os.path.exists', return_value=True):
+                    with patch('hm_cli.cluster.file_digest', side_effect=self._digest):
+                        with patch('hm_cli.cluster.run_command') as mock_run:
+                            with patch.object(manager, '_build_status_table') as mock_table:
+                                assert manager._show_config_changes({'nodes': self.NODES}) is True
+        mock_run.assert_not_called()
+        rows = mock_table.call_args.args[1]
+        assert [row[2] for row in rows] == ["Changed", "Unchanged", "Unchanged", "Unchanged"]
+
+    def _rolling(self, mock_repo_path, **kwargs):
+        with patch('hm_cli.cluster.ConfigManager') as mock_config:
+            mock_config.return_value.get.side_effect = lambda key, default=None: default
+            with patch('hm_cli.cluster.get_repo_path', return_value=mock_repo_path):
+                manager = ClusterManager()
+                with patch('hm_cli.cluster.os.path.exists', return_value=True), \
+                     patch('hm_cli.cluster.file_digest', side_effect=self._digest), \
+                     patch('hm_cli.cluster.NodeOperations') as mock_operations, \
+                     patch.object(manager, '_build_status_table'):
+                    assert manager._rolling_upgrade({'nodes': self.NODES}, **kwargs) is True
+        return [call.args[0]['name'] for call in mock_operations.return_value.apply.call_args_list]
+
+    def test_rolling_upgrade_records_and_skips_unchanged(self, mock_repo_path):
+        """Test a rolling upgrade records applied digests and only upgrades changed nodes next time."""
+        self.digests = {}
+        assert sorted(self._rolling(mock_repo_path, only_changed=True)) == sorted(node['name'] for node in self.NODES)
+        assert self._rolling(mock_repo_path, only_changed=True) == []
+
+        self.digests = {'talos-w2': "new-digest"}
+        assert self._rolling(mock_repo_path, only_changed=True) == ['talos-w2']
+        # --force upgrades every node regardless
+        assert len(self._rolling(mock_repo_path, only_changed=False)) == len(self.NODES)
+        self.digests = {}
+
+
+class TestResetNodes:
+    """Tests for resetting nodes when deleting a cluster."""
+
+    NODES = [
+        {'name': 'talos-cp1', 'ip': '192.168.1.101'},
+        {'name': 'talos-cp2', 'ip': '192.168.1.102'},
+        {'name': 'talos-cp3', 'ip': '192.168.1.103'},
+    ]
+
+    def test_reset_runs_concurrently_and_summarizes(self, mock_repo_path):
+        """Test all nodes are reset in one batch and every outcome is reported."""
+        from hm_cli.core import COMMAND_TIMEOUT_RETURNCODE
+
+        results = [(0, "", ""), (COMMAND_TIMEOUT_RETURNCODE, "", "Command timed out"), (1, "", "connection refused")]
+        with patch('hm_cli.cluster.ConfigManager'):
+            with patch('hm_cli.cluster.get_repo_path', return_value=mock_repo_path):
+                manager = ClusterManager()
+                with patch('hm_cli.cluster.run_commands', return_value=results) as mock_run:
+                    with patch.object(manager, '_build_status_table') as mock_table:
+                        assert manager._reset_nodes({'nodes': self.NODES}, concurrency=3, timeout=60) is False
+
+        commands = mock_run.call_args.args[0]
+        assert [command.split('--nodes ')[1] for command in commands] == ['192.168.1.101', '192.168.1.102', '192.168.1.103']
+        assert mock_run.call_args.kwargs == {'cwd': mock_repo_path, 'limit': 3, 'timeout': 60}
+        headers, rows = mock_table.call_args.args
+        assert headers == ["NODE", "IP", "STATUS", "DETAIL"]
+        assert [row[2] for row in rows] == ["Wiped", "TimedOut", "Failed"]
+        assert rows[2][3] == "connection refused"
+
+    def test_reset_succeeds_only_when_every_node_is_wiped(self, mock_repo_path):
+        """Test deletion stops before the local cleanup unless all nodes were wiped."""
+        with patch('hm_cli.cluster.ConfigManager') as mock_config:
+            mock_config.return_value.get.side_effect = lambda key, default=None: default
+            with patch('hm_cli.cluster.get_repo_path', return_value=mock_repo_path):
+                manager = ClusterManager()
+                with patch('hm_cli.cluster.run_commands', return_value=[(0, "", "")] * 3):
+                    assert manager._reset_nodes({'nodes': self.NODES}) is True
+
+                with patch('hm_cli.cluster.questionary.text') as mock_text, \
+                     patch.object(manager, '_reset_nodes', return_value=False), \
+                     patch.object(manager, '_cleanup_local_files') as mock_cleanup:
+                    mock_text.return_value.ask.return_value = 'homelab'
+                    with patch.object(manager, '_get_current_cluster_info', return_value={'name': 'homelab', 'nodes': self.NODES}):
+                        assert manager.delete() is False
+                mock_cleanup.assert_not_called()
+
+
+def test_update_talos_configs_renders_in_process(mock_repo_path):
+    """Test upgrades render configurations in-process, keeping current versions when none are given."""
+    with patch('hm_cli.cluster.ConfigManager') as mock_config:
+        mock_config.return_value.get.side_effect = lambda key, default=None: default
+        with patch('hm_cli.cluster.get_repo_path', return_value=mock_repo_path):
+            manager = ClusterManager()
+            cluster_info = {'name': 'homelab', 'talos_version': 'v1.7.0', 'kubernetes_version': 'v1.29.0', 'nodes': []}
+            with patch.object(manager, '_render_talos_configs', return_value=True) as mock_render:
+                with patch('hm_cli.cluster.run_command') as mock_run:
+                    assert manager._update_talos_configs(cluster_info, "", "v1.7.5") is True
+
+    rendered = mock_render.call_args.args[0]
+    assert (rendered['talos_version'], rendered['kubernetes_version']) == ('v1.7.5', 'v1.29.0')
+    mock_run.assert_not_called()
+    mock_config.return_value.set.assert_any_call('cluster.talos_version', 'v1.7.5')
+
+
+class TestCreateResume:
+    """Tests for resuming an interrupted cluster creation."""
+
+    CLUSTER_INFO = {
+        'name': 'homelab',
+        'network_prefix': '192.168.1',
+        'control_plane_vip': '192.168.1.100',
+        'nodes': [{'name': 'talos-cp1', 'ip': '192.168.1.101', 'type': 'controlplane', 'hardware': 'ryzen'}],
+    }
+
+    STEPS = ('_collect_cluster_info', '_generate_talos_configs', '_apply_talos_configs', '_bootstrap_cluster',
+             '_test_kube_connection', '_create_flux_directories_and_files', '_setup_flux',
+             '_create_core_component_directories_and_files')
+
+    def _manager(self, mock_repo_path):
+        with patch('hm_cli.cluster.ConfigManager') as mock_config:
+            mock_config.return_value.get.side_effect = lambda key, default=None: default
+            with patch('hm_cli.cluster.get_repo_path', return_value=mock_repo_path):
+                manager = ClusterManager()
+        manager._talos_project_root = MagicMock(return_value=mock_repo_path)
+        for step in self.STEPS:
+            setattr(manager, step, MagicMock(return_value=True))
+        manager._collect_cluster_info.return_value = dict(self.CLUSTER_INFO)
+
+        def bootstrap(cluster_info, journal):
+            journal.record("bootstrap", input_digest(cluster_info))
+            journal.record("kubeconfig", "kubeconfig-digest")
+            return True
+
+        manager._bootstrap_cluster.side_effect = bootstrap
+        return manager
+
+    def test_resume_continues_after_failed_flux_bootstrap(self, mock_repo_path):
+        """Test a resumed creation only repeats the steps that did not complete."""
+        manager = self._manager(mock_repo_path)
+        manager._setup_flux.return_value = False
+        with patch('questionary.confirm') as mock_confirm:
+            mock_confirm.return_value.ask.return_value = True
+            manager.create()
+            assert manager._create_journal().cluster_info == self.CLUSTER_INFO
+
+            manager = self._manager(mock_repo_path)
+            assert manager.create(resume=True) is True
+
+        for step in ('_collect_cluster_info', '_generate_talos_configs', '_apply_talos_configs',
+                     '_create_flux_directories_and_files', '_create_core_component_directories_and_files'):
+            getattr(manager, step).assert_not_called()
+        manager._setup_flux.assert_called_once()
+        # The journal is dropped once every step has completed
+        assert manager._create_journal().cluster_info is None
+
+    def test_resume_reapplies_edited_configs(self, mock_repo_path):
+        """Test configurations changed since they were applied are applied again, to changed nodes only."""
+        manager = self._manager(mock_repo_path)
+        manager._setup_flux.return_value = False
+        with patch('questionary.confirm') as mock_confirm:
+            mock_confirm.return_value.ask.return_value = True
+            manager.create()
+            config_file = os.path.join(mock_repo_path, "infrastructure", "talos", "controlplane", "talos-cp1.yaml")
+            with open(config_file, 'w') as f:
+                f.write("machine: {}\n")
+
+            manager = self._manager(mock_repo_path)
+            manager.create(resume=True)
+
+        assert manager._apply_talos_configs.call_args.kwargs['only_changed'] is True
+
+    def test_create_from_inventory_file_without_prompts(self, mock_repo_path, temp_dir):
+        """Test an inventory file drives every step without asking, bootstrapping its first control plane node."""
+        inventory_file = os.path.join(temp_dir, "inventory.yaml")
+        with open(inventory_file, 'w') as f:
+            f.write("cluster: {name: lab, control_plane_vip: 10.0.0.100}\n"
+                    "flux: {owner: me, repository: lab}\n"
+                    "nodes:\n"
+                    "  - {name: w1, ip: 10.0.0.21, role: worker}\n"
+                    "  - {name: cp1, ip: 10.0.0.11, role: controlplane}\n")
+        manager = self._manager(mock_repo_path)
+        with patch('questionary.confirm', side_effect=AssertionError("prompted")):
+            assert manager.create(from_file=inventory_file) is True
+
+        manager._collect_cluster_info.assert_not_called()
+        cluster_info = manager._apply_talos_configs.call_args.args[0]
+        assert [node['name'] for node in cluster_info['nodes']] == ['w1', 'cp1']
+        assert manager._bootstrap_node(cluster_info)['name'] == 'cp1'
+        manager.config.set.assert_any_call('cluster.name', 'lab')
+
+    def test_bootstrap_is_not_repeated(self, mock_repo_path, mock_run_command):
+        """Test a recorded bootstrap is skipped while the kubeconfig is fetched again."""
+        with patch('hm_cli.cluster.ConfigManager') as mock_config:
+            mock_config.return_value.get.side_effect = lambda key, default=None: default
+            with patch('hm_cli.cluster.get_repo_path', return_value=mock_repo_path):
+                manager = ClusterManager()
+        journal = manager._create_journal()
+        journal.start(self.CLUSTER_INFO)
+        journal.record("bootstrap", input_digest(self.CLUSTER_INFO))
+
+        with patch.object(manager, '_wait_for_cluster', return_value=True):
+            assert manager._bootstrap_cluster(self.CLUSTER_INFO, journal) is True
+
+        commands = [call.args[0] for call in mock_run_command.call_args_list]
+        assert not any(command.startswith("talosctl bootstrap") for command in commands)
+        assert "talosctl kubeconfig --nodes 192.168.1.101 -f ./kubeconfig" in commands
+
+
+def test_defrag_etcd_runs_through_the_etcd_pod(mock_repo_path, mock_run_command):
+    """Test etcdctl defrag runs in the etcd pod for one endpoint at a time, status re-read in between."""
+    from hm_cli.report import EtcdMemberRecord
+    members = [
+        EtcdMemberRecord('https://192.168.1.101:2379', True, is_leader=True, db_size=200),
+        EtcdMemberRecord('https://192.168.1.102:2379', True, db_size=100),
+        EtcdMemberRecord('https://192.168.1.103:2379', True, db_size=100),
+    ]
+    with patch('hm_cli.cluster.ConfigManager') as mock_config:
+        mock_config.return_value.get.side_effect = lambda key, default=None: default
+        with patch('hm_cli.cluster.get_repo_path', return_value=mock_repo_path):
+            manager = ClusterManager()
+    with patch('hm_cli.cluster.os.path.exists', return_value=True), \
+         patch.object(manager, '_take_snapshot'), \
+         patch.object(manager, '_etcd_pod', return_value='etcd-talos-cp1'), \
+         patch.object(manager, '_etcd_members', return_value=members) as mock_members, \
+         patch('questionary.confirm', side_effect=AssertionError("prompted")):
+        assert manager.defrag_etcd(yes=True) is True
+
+    commands = [call.args[0] for call in mock_run_command.call_args_list]
+    assert commands == [
+        "kubectl -n kube-system exec etcd-talos-cp1 -- etcdctl defrag --endpoints=https://192.168.1.102:2379 --command-timeout=120s",
+        "kubectl -n kube-system exec etcd-talos-cp1 -- etcdctl defrag --endpoints=https://192.168.1.103:2379 --command-timeout=120s",
+        "kubectl -n kube-system exec etcd-talos-cp1 -- etcdctl defrag --endpoints=https://192.168.1.101:2379 --command-timeout=120s",
+    ]
+    assert mock_members.call_count == 4
+
+
+@pytest.mark.parametrize("count", [1, 2])
+def test_defrag_etcd_refuses_without_quorum_to_spare(mock_repo_path, mock_run_command, count):
+    """Test clusters of one or two members are only defragmented with allow_quorum_loss."""
+    from hm_cli.report import EtcdMemberRecord
+    members = [EtcdMemberRecord(f'https://192.168.1.10{i + 1}:2379', True, is_leader=i == 0) for i in range(count)]
+    with patch('hm_cli.cluster.ConfigManager') as mock_config:
+        mock_config.return_value.get.side_effect = lambda key, default=None: default
+        with patch('hm_cli.cluster.get_repo_path', return_value=mock_repo_path):
+            manager = ClusterManager()
+    with patch('hm_cli.cluster.os.path.exists', return_value=True), \
+         patch.object(manager, '_take_snapshot'), \
+         patch.object(manager, '_etcd_pod', return_value='etcd-talos-cp1'), \
+         patch.object(manager, '_etcd_members', return_value=members):
+        assert manager.defrag_etcd(yes=True) is False
+        assert not any("etcdctl defrag" in call.args[0] for call in mock_run_command.call_args_list)
+        assert manager.defrag_etcd(yes=True, allow_quorum_loss=True) is True
+    assert sum("etcdctl defrag" in call.args[0] for call in mock_run_command.call_args_list) == count
+
+
+def test_backup_etcd_tries_next_control_plane_node(mock_repo_path, mock_run_command, temp_dir):
+    """Test the snapshot is taken on the next control plane node when one fails, then compressed and rotated."""
+    import gzip
+    import hashlib
+    data = b"etcd snapshot" * 1000
+    cluster_info = {'name': 'homelab', 'nodes': [
+        {'name': 'talos-cp1', 'ip': '192.168.1.101', 'type': 'controlplane'},
+        {'name': 'talos-w1', 'ip': '192.168.1.111', 'type': 'worker'},
+        {'name': 'talos-cp2', 'ip': '192.168.1.102', 'type': 'controlplane'},
+    ]}
+
+    def fake_run(command, **kwargs):
+        if "192.168.1.101" in command:
+            return 1, "", "connection refused"
+        with open(command.split('"')[1], 'wb') as f:
+            f.write(data + hashlib.sha256(data).digest())
+        return 0, "", ""
+
+    mock_run_command.side_effect = fake_run
+    backup_dir = os.path.join(temp_dir, "backups")
+    os.makedirs(backup_dir)
+    old = os.path.join(backup_dir, "etcd-homelab-20200101T000000Z.db.gz")
+    open(old, 'w').close()
+    with patch('hm_cli.cluster.ConfigManager') as mock_config:
+        mock_config.return_value.get.side_effect = lambda key, default=None: default
+        with patch('hm_cli.cluster.get_repo_path', return_value=mock_repo_path):
+            manager = ClusterManager()
+    with patch.object(manager, '_get_current_cluster_info', return_value=cluster_info):
+        assert manager.backup_etcd(output_dir=backup_dir, keep=1) is True
+
+    commands = [call.args[0] for call in mock_run_command.call_args_list]
+    assert [command.split()[2] for command in commands] == ['192.168.1.101', '192.168.1.102']
+    snapshots = [name for name in os.listdir(backup_dir) if name.endswith(".db.gz")]
+    assert len(snapshots) == 1 and snapshots[0] != os.path.basename(old)
+    with gzip.open(os.path.join(backup_dir, snapshots[0])) as f:
+        assert f.read()[:len(data)] == data
+    assert sorted(os.listdir(backup_dir)) == sorted(snapshots + [f"{snapshots[0]}.sha256"])
+
+
+def test_checks_without_a_snapshot_close_what_they_open(mock_repo_path):
+    """Test a check called on its own closes the snapshot and backend it creates, but not a shared one."""
+    backends = []
+
+    def new_backend(env, backend=None):
+        kube = MagicMock()
+        kube.list.return_value = {'items': []}
+        backends.append(kube)
+        return kube
+
+    with patch('hm_cli.cluster.ConfigManager') as mock_config:
+        mock_config.return_value.get.side_effect = lambda key, default=None: default
+        with patch('hm_cli.cluster.get_repo_path', return_value=mock_repo_path):
+            manager = ClusterManager()
+    out = MagicMock()
+    with patch.object(manager, '_get_kube_backend', side_effect=new_backend):
+        for check in (manager._check_node_status, manager._check_pod_status, manager._check_flux_status,
+                      manager._check_storage_status, manager._check_kube_vip_status, manager._check_etcd_health):
+            check({}, out=out)
+        assert len(backends) == 6
+        assert all(kube.close.call_count == 1 for kube in backends)
+
+        shared = new_backend({})
+        snapshot = ClusterSnapshot(shared, kinds=('nodes',))
+        manager._check_node_status({}, out=out, snapshot=snapshot)
+        snapshot.close()
+    shared.close.assert_not_called()
+
+
+def test_probe_endpoints_covers_vip_and_nodes(mock_repo_path):
+    """Test the VIP and every node are probed in one call and the VIP summary follows its API server probe."""
+    from hm_cli.report import TcpProbeRecord
+    cluster_info = {'name': 'homelab', 'control_plane_vip': '192.168.1.100', 'source': 'config', 'nodes': [
+        {'name': 'talos-cp1', 'ip': '192.168.1.101', 'type': 'controlplane'},
+        {'name': 'talos-w1', 'ip': '192.168.1.111', 'type': 'worker'},
+    ]}
+    with patch('hm_cli.cluster.ConfigManager') as mock_config:
+        mock_config.return_value.get.side_effect = lambda key, default=None: default
+        with patch('hm_cli.cluster.get_repo_path', return_value=mock_repo_path):
+            manager = ClusterManager()
+
+    def fake_probe(targets, attempts, timeout):
+        return [TcpProbeRecord(t.name, t.address, t.port, t.service, attempts, 0, error='Connection refused')
+                for t in targets]
+
+    with patch.object(manager, '_get_current_cluster_info') as mock_info, \
+         patch('hm_cli.cluster.probe', side_effect=fake_probe) as mock_probe:
+        vip, records = manager._probe_endpoints("kubeconfig", cluster_info=cluster_info)
+    mock_info.assert_not_called()
+
+    assert [(r.address, r.port) for r in records] == [
+        ('192.168.1.100', 6443), ('192.168.1.101', 6443), ('192.168.1.101', 50000), ('192.168.1.111', 50000),
+    ]
+    assert mock_probe.call_count == 1
+    assert mock_probe.call_args.kwargs == {'attempts': 5, 'timeout': 1.0}
+    assert (vip.address, vip.reachable, vip.detail) == ('192.168.1.100', False, 'Connection refused')
+
+    # Guessed default nodes are left out
+    with patch.object(manager, '_get_current_cluster_info', return_value=dict(cluster_info, source='defaults')), \
+         patch('hm_cli.cluster.probe', side_effect=fake_probe):
+        _, records = manager._probe_endpoints("kubeconfig")
+    assert [r.name for r in records] == ['vip']
+
+
+def test_status_output_caps_list_calls_at_the_concurrency(mock_repo_path, capsys):
+    """Test machine-readable status runs pass --concurrency on to the snapshot list calls."""
+    from hm_cli.report import VipProbeRecord
+    with open(os.path.join(mock_repo_path, "kubeconfig"), 'w') as f:
+        f.write("apiVersion: v1\n")
+    kube = MagicMock()
+    kube.list.return_value = {'items': []}
+    with patch('hm_cli.cluster.ConfigManager') as mock_config:
+        mock_config.return_value.get.side_effect = lambda key, default=None: default
+        with patch('hm_cli.cluster.get_repo_path', return_value=mock_repo_path):
+            manager = ClusterManager()
+
+    with patch.object(manager, '_get_kube_backend', return_value=kube), \
+         patch.object(manager, '_probe_endpoints', return_value=(VipProbeRecord('192.168.1.100', True), [])), \
+         patch('hm_cli.cluster.ClusterSnapshot', wraps=ClusterSnapshot) as mock_snapshot:
+        assert manager.status(output='json', max_concurrency=1) is True
+
+    assert mock_snapshot.call_args.kwargs['max_concurrency'] == 1
+    assert json.loads(capsys.readouterr().out)['vip']['address'] == '192.168.1.100'
+
+
+def test_status_served_from_cache_until_refresh(mock_repo_path):
+    """Test a second status run renders from the cache without querying the cluster, unless refreshed."""
+    from hm_cli.report import VipProbeRecord
+    with open(os.path.join(mock_repo_path, "kubeconfig"), 'w') as f:
+        f.write("apiVersion: v1\n")
+    kube = MagicMock()
+    kube.list.return_value = {'items': []}
+    kube.iter_pages.side_effect = lambda *args, **kwargs: iter([[]])
+    with patch('hm_cli.cluster.ConfigManager') as mock_config:
+        mock_config.return_value.get.side_effect = lambda key, default=None: default
+        with patch('hm_cli.cluster.get_repo_path', return_value=mock_repo_path):
+            manager = ClusterManager()
+
+    cluster_info = {'name': 'homelab', 'control_plane_vip': '192.168.1.100', 'source': 'config', 'nodes': []}
+    lookup_threads = []
+
+    def current_cluster_info(refresh=False):
+        lookup_threads.append(threading.current_thread())
+        return cluster_info
+
+    with patch.object(manager, '_get_kube_backend', return_value=kube) as mock_backend, \
+         patch.object(manager, '_get_current_cluster_info', side_effect=current_cluster_info), \
+         patch.object(manager, '_probe_endpoints', return_value=(VipProbeRecord('192.168.1.100', True), [])) as mock_probe, \
+         patch('hm_cli.cluster.console') as mock_console:
+        assert manager.status() is True
+        # Discovered once, before the checks fan out, and handed to the probes
+        assert lookup_threads == [threading.main_thread()]
+        assert mock_probe.call_args.kwargs['cluster_info'] is cluster_info
+        list_calls = kube.list.call_count
+        assert manager.status() is True
+        assert (mock_backend.call_count, kube.list.call_count, mock_probe.call_count) == (1, list_calls, 1)
+        printed = " ".join(str(call.args[0]) for call in mock_console.print.call_args_list if call.args)
+        assert "(cached); use --refresh" in printed
+
+        assert manager.status(refresh=True) is True
+        assert (mock_backend.call_count, mock_probe.call_count) == (2, 2)
+
+
+def test_upgrade_dry_run_changes_nothing(mock_repo_path, temp_dir):
+    """Test a dry run renders in memory and lists changes without confirming or writing anything."""
+    from hm_cli.talos import TalosRenderer
+
+    inventory_file = os.path.join(temp_dir, "inventory.yaml")
+    with open(inventory_file, 'w') as f:
+        f.write("cluster: {name: lab, control_plane_vip: 10.0.0.100}\n"
+                "pools: {gpu: {max_parallel: 1}}\n"
+                "nodes:\n"
+                "  - {name: cp1, ip: 10.0.0.11, role: controlplane}\n"
+                "  - {name: g1, ip: 10.0.0.31, role: worker, pool: gpu}\n")
+    talos_dir = os.path.join(mock_repo_path, "infrastructure", "talos")
+    os.makedirs(talos_dir, exist_ok=True)
+    with open(os.path.join(talos_dir, "common.yaml"), 'w') as f:
+        f.write("machine:\n  network:\n    hostname: {{ .hostname }}\n")
+    secrets_file = os.path.join(temp_dir, "secrets.yaml")
+    with open(secrets_file, 'w') as f:
+        f.write("cluster: {}\n")
+    settings = {'cluster.talos_secrets': secrets_file}
+    with patch('hm_cli.cluster.ConfigManager') as mock_config:
+        mock_config.return_value.get.side_effect = lambda key, default=None: settings.get(key, default)
+        with patch('hm_cli.cluster.get_repo_path', return_value=mock_repo_path):
+            manager = ClusterManager()
+    bases = {'controlplane': {'machine': {'type': 'controlplane'}}, 'worker': {'machine': {'type': 'worker'}}}
+    before = sorted(os.path.join(root, name) for root, _, files in os.walk(mock_repo_path) for name in files)
+    with patch('questionary.confirm', side_effect=AssertionError("prompted")), \
+         patch('questionary.text') as mock_text, \
+         patch.object(manager, '_talos_project_root', return_value=mock_repo_path), \
+         patch.object(TalosRenderer, 'base_configs', return_value=bases), \
+         patch.object(TalosRenderer, '_save_cache', side_effect=AssertionError("render cache written")), \
+         patch.object(manager, '_build_status_table') as mock_table, \
+         patch.object(manager, '_apply_talos_configs') as mock_apply:
+        mock_text.return_value.ask.return_value = ""
+        assert manager.upgrade(dry_run=True, from_file=inventory_file) is True
+
+    after = sorted(os.path.join(root, name) for root, _, files in os.walk(mock_repo_path) for name in files)
+    assert after == before
+    assert [row[2] for row in mock_table.call_args.args[1]] == ["Changed", "Changed"]
+    prompts = [call.args[0] for call in mock_text.call_args_list]
+    assert prompts == ["Kubernetes version to upgrade to (leave empty to keep v1.29.0):",
+                       "Talos version to upgrade to (leave empty to keep v1.7.0):"]
+    mock_apply.assert_not_called()
+    mock_config.return_value.set.assert_not_called()
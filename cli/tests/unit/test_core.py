@@ -4,6 +4,8 @@ Unit tests for the core module.
 
 import os
 import sys
+import time
+import asyncio
 import pytest
 import yaml
 import logging # Added for caplog
@@ -14,7 +16,11 @@ from hm_cli.core import (
     ConfigManager,
     ensure_repo_exists,
     run_command,
+    run_command_async,
+    run_commands,
+    gather_limited,
     validate_ip_address,
+    COMMAND_TIMEOUT_RETURNCODE,
     get_repo_path
 )
 
@@ -76,6 +82,60 @@ class TestConfigManager:
             assert mock_config_manager.get("cluster.new_key") == "new-value"
             mock_file.assert_called_once()
 
+    def test_instances_share_parsed_config(self, mock_config_file):
+        """Test the file is parsed once and shared by all instances."""
+        first = ConfigManager(config_file=mock_config_file)
+        with patch('yaml.safe_load') as mock_load:
+            second = ConfigManager(config_file=mock_config_file)
+            assert second.get("cluster.name") == "test-cluster"
+            mock_load.assert_not_called()
+        first.set("cluster.name", "shared")
+        assert second.get("cluster.name") == "shared"
+
+    def test_reload_on_external_change(self, mock_config_file):
+        """Test the config is re-read when the file changes on disk."""
+        config_manager = ConfigManager(config_file=mock_config_file)
+        with open(mock_config_file, 'w') as f:
+            yaml.dump({"cluster": {"name": "edited"}, "padding": "x" * 64}, f)
+        assert config_manager.get("cluster.name") == "edited"
+
+    def test_batch_writes_once(self, mock_config_manager):
+        """Test all sets inside a batch are written with a single write."""
+        with patch('yaml.dump') as mock_dump:
+            with mock_config_manager.batch():
+                mock_config_manager.set("cluster.name", "batched")
+                mock_config_manager.set("cluster.network_prefix", "10.0.0")
+                mock_dump.assert_not_called()
+            mock_dump.assert_called_once()
+        assert mock_dump.call_args.args[0]["cluster"]["name"] == "batched"
+
+    def test_atomic_write_leaves_no_temp_files(self, mock_config_manager):
+        """Test writes replace the file and clean up the temporary file."""
+        directory = os.path.dirname(mock_config_manager.config_file)
+        mock_config_manager.set("cluster.name", "atomic")
+        assert os.listdir(directory) == ["config.yaml"]
+        with patch('yaml.dump', side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                mock_config_manager.set("cluster.name", "broken")
+        assert os.listdir(directory) == ["config.yaml"]
+        with open(mock_config_manager.config_file) as f:
+            assert yaml.safe_load(f)["cluster"]["name"] == "atomic"
+
+    def test_batch_keeps_concurrent_changes(self, mock_config_manager):
+        """Test a batch is applied on top of changes written by another process."""
+        with mock_config_manager.batch():
+            mock_config_manager.set("cluster.name", "mine")
+            with open(mock_config_manager.config_file) as f:
+                on_disk = yaml.safe_load(f)
+            on_disk["git"]["branch"] = "theirs"
+            on_disk["padding"] = "x" * 64
+            with open(mock_config_manager.config_file, 'w') as f:
+                yaml.dump(on_disk, f)
+        with open(mock_config_manager.config_file) as f:
+            saved = yaml.safe_load(f)
+        assert saved["cluster"]["name"] == "mine"
+        assert saved["git"]["branch"] == "theirs"
+
 
 def test_ensure_repo_exists_true():
     """Test ensure_repo_exists when repo exists."""
@@ -231,3 +291,94 @@ def test_get_repo_path(mock_config_manager):
     with patch('hm_cli.core.ConfigManager', return_value=mock_config_manager):
         repo_path = get_repo_path()
         assert repo_path == mock_config_manager.get('repo_path')
+
+
+def test_run_command_async_success():
+    """Test run_command_async returns the same tuple contract as run_command."""
+    returncode, stdout, stderr = asyncio.run(run_command_async("echo hello; echo oops >&2"))
+    assert returncode == 0
+    assert stdout == "hello"
+    assert stderr == "oops"
+
+
+def test_run_command_async_error():
+    """Test run_command_async with a failing command."""
+    returncode, stdout, stderr = asyncio.run(run_command_async("exit 3"))
+    assert returncode == 3
+
+
+def test_run_command_async_with_env_and_cwd(temp_dir):
+    """Test run_command_async passes env and cwd to the command."""
+    returncode, stdout, stderr = asyncio.run(run_command_async("echo $CUSTOM_VAR; pwd", cwd=temp_dir, env={"CUSTOM_VAR": "value"}))
+    assert returncode == 0
+    assert stdout.split("\n") == ["value", os.path.realpath(temp_dir)]
+
+
+def test_run_command_async_timeout():
+    """Test run_command_async kills the command when the timeout expires."""
+    start = time.monotonic()
+    returncode, stdout, stderr = asyncio.run(run_command_async("sleep 5", timeout=0.2))
+    assert returncode == COMMAND_TIMEOUT_RETURNCODE
+    assert "timed out" in stderr
+    assert time.monotonic() - start < 2
+
+
+def test_run_command_async_cancellation():
+    """Test cancelling run_command_async kills the underlying process."""
+    async def cancel_soon():
+        task = asyncio.ensure_future(run_command_async("sleep 5"))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    start = time.monotonic()
+    asyncio.run(cancel_soon())
+    assert time.monotonic() - start < 2
+
+
+def test_gather_limited_respects_limit():
+    """Test gather_limited never runs more than `limit` awaitables at once."""
+    active = 0
+    peak = 0
+
+    async def job(i):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return i
+
+    results = asyncio.run(gather_limited([job(i) for i in range(10)], limit=3))
+    assert results == list(range(10))
+    assert peak == 3
+
+
+def test_gather_limited_isolates_failures():
+    """Test an exception in one awaitable is returned instead of raised."""
+    async def fail():
+        raise RuntimeError("boom")
+
+    async def ok():
+        return "ok"
+
+    results = asyncio.run(gather_limited([fail(), ok()]))
+    assert isinstance(results[0], RuntimeError)
+    assert results[1] == "ok"
+
+
+def test_run_commands_concurrent():
+    """Test run_commands overlaps commands and keeps result order."""
+    # Each command prints when it started and finished, so overlap does not depend on machine load
+    clock = f'"{sys.executable}" -c "import time; print(time.time())"'
+    results = run_commands([
+        f"{clock}; sleep 0.3; {clock}; echo a",
+        f"{clock}; sleep 0.3; {clock}; exit 2",
+        "echo c",
+    ], limit=3)
+    spans = [[float(value) for value in out.split()[:2]] for _, out, _ in results[:2]]
+    assert max(start for start, _ in spans) < min(end for _, end in spans)
+    assert results[0][0] == 0 and results[0][1].split()[-1] == "a"
+    assert results[1][0] == 2
+    assert results[2] == (0, "c", "")
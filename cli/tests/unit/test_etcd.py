@@ -0,0 +1,186 @@
+"""
+Unit tests for the etcd module.
+"""
+
+import pytest
+
+from hm_cli.etcd import EtcdDefrag, format_bytes, member_records, member_rows, parse_duration_ms, quorum_healthy
+
+
+MiB = 1024 * 1024
+
+
+def _status(endpoint, member_id, leader, db_size, in_use, raft_index, applied_index=None):
+    return {
+        'Endpoint': endpoint,
+        'Status': {
+            'header': {'cluster_id': 1, 'member_id': member_id, 'revision': 500, 'raft_term': 4},
+            'version': '3.5.12',
+            'dbSize': db_size,
+            'dbSizeInUse': in_use,
+            'leader': leader,
+            'raftIndex': raft_index,
+            'raftTerm': 4,
+            'raftAppliedIndex': raft_index if applied_index is None else applied_index,
+            'isLearner': False,
+        },
+    }
+
+
+STATUS = [
+    _status('https://192.168.1.101:2379', 0xa1, 0xa1, 40 * MiB, 30 * MiB, 9000),
+    _status('https://192.168.1.102:2379', 0xb2, 0xa1, 120 * MiB, 30 * MiB, 8995),
+    _status('https://192.168.1.103:2379', 0xc3, 0xa1, 40 * MiB, 32 * MiB, 8500, applied_index=8100),
+]
+
+HEALTH = [
+    {'endpoint': 'https://192.168.1.101:2379', 'health': True, 'took': '4.2ms'},
+    {'endpoint': 'https://192.168.1.102:2379', 'health': True, 'took': '350.5ms'},
+    {'endpoint': 'https://192.168.1.103:2379', 'health': False, 'took': '5s', 'error': 'context deadline exceeded'},
+]
+
+
+@pytest.mark.parametrize("duration, expected", [
+    ("4.2ms", 4.2), ("850µs", 0.85), ("1m2.5s", 62500.0), ("5s", 5000.0), ("", None), ("fast", None), ("5 s", None),
+])
+def test_parse_duration_ms(duration, expected):
+    """Test Go durations are converted to milliseconds."""
+    if expected is None:
+        assert parse_duration_ms(duration) is None
+    else:
+        assert parse_duration_ms(duration) == pytest.approx(expected)
+
+
+def test_format_bytes():
+    """Test byte counts are shown with binary units."""
+    assert [format_bytes(size) for size in (None, 512, 1536, 120 * MiB)] == ["-", "512 B", "1.5 KiB", "120.0 MiB"]
+
+
+def test_member_records():
+    """Test status and health are joined per endpoint with sizes, raft progress and latency."""
+    leader, fragmented, lagging = member_records(STATUS, HEALTH)
+
+    assert (leader.member_id, leader.is_leader, leader.raft_lag, leader.latency_ms) == ("a1", True, 0, 4.2)
+    assert leader.fragmentation == 0.25
+    assert leader.warnings == []
+
+    assert fragmented.is_leader is False
+    assert fragmented.fragmentation == 0.75
+    assert fragmented.warnings == ["fragmented: 75% of 120.0 MiB unused", "slow: health check took 350ms"]
+
+    assert (lagging.healthy, lagging.raft_lag) == (False, 500)
+    assert lagging.warnings == [
+        "unhealthy: context deadline exceeded",
+        "raft index 500 behind the leader",
+        "400 raft entries not applied yet",
+        "slow: health check took 5000ms",
+    ]
+
+
+def test_member_records_thresholds_and_missing_status():
+    """Test thresholds are configurable and members missing from the status are still listed."""
+    records = member_records(STATUS[:2], HEALTH, fragmentation_threshold=0.9, latency_threshold_ms=1000)
+    assert [record.warnings for record in records[:2]] == [[], []]
+    assert records[2].endpoint == 'https://192.168.1.103:2379'
+    assert records[2].warnings == ["unhealthy: context deadline exceeded", "no endpoint status"]
+
+
+def test_member_records_without_leader():
+    """Test every member is flagged while the cluster has no leader."""
+    status = [_status('https://192.168.1.101:2379', 0xa1, 0, 40 * MiB, 40 * MiB, 9000)]
+    assert member_records(status)[0].warnings == ["no leader"]
+
+
+def test_member_rows():
+    """Test the member table shows the numbers and the warnings."""
+    headers, rows = member_rows(member_records(STATUS, HEALTH))
+    row = dict(zip(headers, rows[1]))
+    assert row['DB SIZE'] == "120.0 MiB"
+    assert row['FRAGMENTED'] == "75%"
+    assert row['LATENCY'] == "350.5ms"
+    assert row['HEALTH'] == "healthy"
+    assert rows[0][headers.index('LEADER')] == "yes"
+
+
+class FakeCluster:
+    """etcd members whose DB shrinks to its in-use size when defragmented."""
+
+    def __init__(self, status, fail=None, new_leader_after=None):
+        self.status_entries = [dict(entry, Status=dict(entry['Status'])) for entry in status]
+        self.fail = fail
+        self.new_leader_after = new_leader_after
+        self.defragmented = []
+
+    def status(self):
+        return member_records(self.status_entries)
+
+    def defrag(self, endpoint):
+        self.defragmented.append(endpoint)
+        if endpoint == self.fail:
+            return 1, "", "context deadline exceeded"
+        entry = next(entry for entry in self.status_entries if entry['Endpoint'] == endpoint)
+        entry['Status']['dbSize'] = entry['Status']['dbSizeInUse']
+        if endpoint == self.new_leader_after:
+            # Leadership moves to the last member
+            for entry in self.status_entries:
+                entry['Status']['leader'] = 0xc3
+        return 0, "Finished defragmenting etcd member", ""
+
+
+def _defrag(cluster):
+    clock = iter(range(100))
+    return EtcdDefrag(cluster.status, cluster.defrag, clock=lambda: next(clock))
+
+
+def test_defrag_followers_first_leader_last():
+    """Test followers are defragmented one at a time before the leader, reporting bytes reclaimed."""
+    cluster = FakeCluster(STATUS)
+    defrag = _defrag(cluster)
+
+    assert defrag.run() is True
+    assert cluster.defragmented == ['https://192.168.1.102:2379', 'https://192.168.1.103:2379',
+                                    'https://192.168.1.101:2379']
+    assert [result.reclaimed for result in defrag.results] == [90 * MiB, 8 * MiB, 10 * MiB]
+    assert [result.leader for result in defrag.results] == [False, False, True]
+    assert all(result.seconds == 1 for result in defrag.results)
+
+
+def test_defrag_leaves_new_leader_last():
+    """Test a leader change during the run still leaves the current leader for last."""
+    cluster = FakeCluster(STATUS, new_leader_after='https://192.168.1.102:2379')
+    _defrag(cluster).run()
+    assert cluster.defragmented[-1] == 'https://192.168.1.103:2379'
+
+
+def test_defrag_stops_without_quorum_health():
+    """Test no member is touched while another member is unhealthy."""
+    status = [dict(entry, Status=dict(entry['Status'])) for entry in STATUS]
+    status[2]['Status']['errors'] = ["etcdserver: no space"]
+    cluster = FakeCluster(status)
+    defrag = _defrag(cluster)
+
+    assert defrag.run() is False
+    assert cluster.defragmented == []
+    assert defrag.results[0].detail == "quorum check failed: unhealthy: https://192.168.1.103:2379"
+
+
+def test_defrag_stops_at_first_failure():
+    """Test a failed defragmentation leaves the remaining members untouched."""
+    cluster = FakeCluster(STATUS, fail='https://192.168.1.102:2379')
+    defrag = _defrag(cluster)
+
+    assert defrag.run() is False
+    assert cluster.defragmented == ['https://192.168.1.102:2379']
+    assert defrag.results[0].detail == "context deadline exceeded"
+
+
+def test_quorum_healthy():
+    """Test quorum needs members, a leader and every member healthy."""
+    assert quorum_healthy([]) == (False, "no etcd members found")
+    assert quorum_healthy(member_records(STATUS)) == (True, "3/3 members healthy")
+    no_leader = [_status('https://192.168.1.101:2379', 0xa1, 0, 40 * MiB, 40 * MiB, 9000)]
+    assert quorum_healthy(member_records(no_leader)) == (False, "no leader")
+    two = member_records(STATUS)[:2]
+    ok, detail = quorum_healthy(two)
+    assert not ok and "loses quorum" in detail
+    assert quorum_healthy(two, allow_quorum_loss=True) == (True, "2/2 members healthy")
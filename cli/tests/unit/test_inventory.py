@@ -0,0 +1,216 @@
+"""
+Unit tests for the inventory module.
+"""
+
+import os
+import pytest
+import yaml
+from unittest.mock import patch
+
+from hm_cli.cluster import ClusterManager
+from hm_cli.inventory import Inventory, InventoryCache, InventoryFileError, load_inventory_file
+
+
+CLUSTER_INFO = {
+    'name': 'homelab',
+    'network_prefix': '192.168.1',
+    'control_plane_vip': '192.168.1.100',
+    'nodes': [
+        {'name': 'talos-cp1', 'ip': '192.168.1.101', 'type': 'controlplane', 'hardware': 'ryzen'},
+        {'name': 'talos-w1', 'ip': '192.168.1.111', 'type': 'worker', 'hardware': 'intel'},
+    ],
+}
+
+TALOS_NODES = yaml.safe_dump([
+    {'metadata': {'hostname': node['name'], 'labels': {node['type']: "", 'hardware': node['hardware']}},
+     'spec': {'addresses': [{'address': node['ip']}]}}
+    for node in CLUSTER_INFO['nodes']
+])
+
+
+@pytest.fixture
+def cache(temp_dir):
+    return InventoryCache(path=os.path.join(temp_dir, "cache", "inventory.json"), ttl=60)
+
+
+@pytest.fixture
+def manager(mock_repo_path):
+    config = {
+        'cluster.name': 'homelab',
+        'cluster.network_prefix': '192.168.1',
+        'cluster.control_plane_vip': '192.168.1.100',
+    }
+    with patch('hm_cli.cluster.ConfigManager') as mock_config:
+        mock_config.return_value.get.side_effect = lambda key, default=None: config.get(key, default)
+        with patch('hm_cli.cluster.get_repo_path', return_value=mock_repo_path):
+            manager = ClusterManager()
+            manager.test_config = config
+            yield manager
+
+
+def test_cache_round_trip(cache, mock_repo_path):
+    """Test an inventory is stored per repository and read back unchanged."""
+    cache.put(mock_repo_path, Inventory.from_cluster_info(CLUSTER_INFO))
+    inventory = cache.get(mock_repo_path)
+    assert inventory.cluster_info() == dict(CLUSTER_INFO, source='talosctl')
+    assert cache.get(os.path.join(mock_repo_path, "other")) is None
+
+    cache.remove(mock_repo_path)
+    assert cache.get(mock_repo_path) is None
+
+
+def test_cache_ttl(cache, mock_repo_path):
+    """Test inventories older than the TTL are only returned on request."""
+    inventory = Inventory.from_cluster_info(CLUSTER_INFO)
+    inventory.refreshed_at -= 120
+    cache.put(mock_repo_path, inventory)
+    assert cache.get(mock_repo_path) is None
+    assert cache.get(mock_repo_path, include_stale=True).name == 'homelab'
+
+
+def test_cache_ignores_corrupt_file(cache, mock_repo_path):
+    """Test an unreadable cache file behaves like an empty cache."""
+    os.makedirs(os.path.dirname(cache.path))
+    with open(cache.path, 'w') as f:
+        f.write("{not json")
+    assert cache.get(mock_repo_path) is None
+    cache.put(mock_repo_path, Inventory.from_cluster_info(CLUSTER_INFO))
+    assert cache.get(mock_repo_path) is not None
+
+
+def test_cluster_info_read_from_cache(manager, mock_run_command):
+    """Test talosctl is only asked once while the cached inventory is fresh."""
+    mock_run_command.side_effect = lambda *args, **kwargs: (0, TALOS_NODES, "")
+
+    first = manager._get_current_cluster_info()
+    second = manager._get_current_cluster_info()
+
+    assert first == second == dict(CLUSTER_INFO, source='talosctl')
+    assert mock_run_command.call_count == 1
+
+    manager._get_current_cluster_info(refresh=True)
+    assert mock_run_command.call_count == 2
+
+
+def test_cluster_info_rediscovered_when_config_changes(manager, mock_run_command):
+    """Test a cached inventory for another VIP is not used."""
+    mock_run_command.side_effect = lambda *args, **kwargs: (0, TALOS_NODES, "")
+    manager._get_current_cluster_info()
+
+    manager.test_config['cluster.control_plane_vip'] = '192.168.1.200'
+    assert manager._get_current_cluster_info()['control_plane_vip'] == '192.168.1.200'
+    assert mock_run_command.call_count == 2
+
+
+def test_default_nodes_not_cached(manager, mock_run_command):
+    """Test the guessed default nodes are not cached when talosctl fails."""
+    mock_run_command.side_effect = lambda *args, **kwargs: (1, "", "connection refused")
+
+    assert manager._get_current_cluster_info()['source'] == 'defaults'
+    manager._get_current_cluster_info()
+    assert mock_run_command.call_count == 2
+
+
+INVENTORY_FILE = """
+cluster:
+  name: lab
+  control_plane_vip: 10.0.0.100
+defaults:
+  install_disk: /dev/sda
+nodes:
+  - {name: cp1, ip: 10.0.0.11, role: controlplane, hardware: ryzen}
+  - {name: cp2, ip: 10.0.0.12, role: controlplane}
+  - {name: cp3, ip: 10.0.0.13, role: controlplane}
+  - {name: w1, ip: 10.0.0.21, role: worker, install_disk: /dev/nvme0n1, labels: {zone: rack-1}}
+  - {name: w2, ip: 10.0.0.22, role: worker}
+"""
+
+
+def _write(temp_dir, text):
+    path = os.path.join(temp_dir, "inventory.yaml")
+    with open(path, 'w') as f:
+        f.write(text)
+    return path
+
+
+def test_load_inventory_file(temp_dir):
+    """Test any number of nodes are loaded with defaults and derived cluster settings."""
+    cluster_info = load_inventory_file(_write(temp_dir, INVENTORY_FILE))
+
+    assert (cluster_info['name'], cluster_info['network_prefix']) == ('lab', '10.0.0')
+    assert [node['type'] for node in cluster_info['nodes']] == ['controlplane'] * 3 + ['worker'] * 2
+    worker = cluster_info['nodes'][3]
+    assert worker == {'name': 'w1', 'ip': '10.0.0.21', 'type': 'worker', 'hardware': 'unknown',
+                      'install_disk': '/dev/nvme0n1', 'labels': {'zone': 'rack-1'}}
+    assert cluster_info['nodes'][1]['install_disk'] == '/dev/sda'
+    assert 'flux' not in cluster_info
+
+
+def test_load_inventory_file_reports_all_errors(temp_dir):
+    """Test invalid nodes are reported together."""
+    path = _write(temp_dir, """
+cluster: {control_plane_vip: 10.0.0.100}
+nodes:
+  - {name: cp1, ip: 10.0.0.11, role: worker}
+  - {name: Bad_Name, ip: 10.0.0.300, role: gpu}
+  - {name: w2, ip: 10.0.0.11}
+""")
+    with pytest.raises(InventoryFileError) as excinfo:
+        load_inventory_file(path)
+    message = str(excinfo.value)
+    for expected in ("name must be a lowercase DNS label", "ip '10.0.0.300'", "role must be one of",
+                     "Duplicate node ip '10.0.0.11'"):
+        assert expected in message
+    # w2 defaults to the controlplane role, so the cluster still has one
+    assert "At least one controlplane node" not in message
+
+
+def test_load_inventory_file_pools(temp_dir):
+    """Test pool workers get the pool's labels and unknown pools are reported."""
+    cluster_info = load_inventory_file(_write(temp_dir, INVENTORY_FILE.replace("""
+nodes:""", """
+pools:
+  compute: {max_parallel: 2, labels: {tier: compute}}
+nodes:""").replace("role: worker}", "role: worker, pool: compute}")))
+
+    assert cluster_info['pools'] == {'compute': {'max_parallel': 2, 'max_unavailable': None, 'labels': {'tier': 'compute'}}}
+    worker = cluster_info['nodes'][4]
+    assert worker['pool'] == 'compute'
+    assert worker['labels'] == {'tier': 'compute', 'hm.hnnl.eu/pool': 'compute'}
+    assert 'pool' not in cluster_info['nodes'][3]
+    assert Inventory.from_cluster_info(cluster_info).cluster_info()['nodes'][4]['pool'] == 'compute'
+
+    path = _write(temp_dir, """
+cluster: {control_plane_vip: 10.0.0.100}
+pools:
+  compute: {max_parallel: 0}
+nodes:
+  - {name: cp1, ip: 10.0.0.11, pool: compute}
+  - {name: w1, ip: 10.0.0.21, role: worker, pool: gpu}
+""")
+    with pytest.raises(InventoryFileError) as excinfo:
+        load_inventory_file(path)
+    message = str(excinfo.value)
+    for expected in ("max_parallel must be a positive integer", "only worker nodes can join a pool",
+                     "pool 'gpu' is not defined"):
+        assert expected in message
+
+
+def test_cached_inventory_renders_like_the_file(temp_dir, cache, mock_repo_path):
+    """Test a cached inventory keeps every setting node configurations are rendered from."""
+    from hm_cli.talos import TalosRenderer, node_patch
+
+    cluster_info = load_inventory_file(_write(temp_dir, INVENTORY_FILE.replace("""
+nodes:""", """
+pools:
+  compute: {labels: {tier: compute}}
+nodes:""").replace("{name: w2, ip: 10.0.0.22, role: worker}", "{name: w2, ip: 10.0.0.22, role: worker, pool: compute}")))
+    cache.put(mock_repo_path, Inventory.from_cluster_info(cluster_info, source="create"))
+    cached = cache.get(mock_repo_path).cluster_info()
+
+    renderer = TalosRenderer(temp_dir)
+    for node, cached_node in zip(cluster_info['nodes'], cached['nodes']):
+        assert renderer.input_hash(cached_node, cached, b"secrets") == renderer.input_hash(node, cluster_info, b"secrets")
+        assert node_patch(cached_node) == node_patch(node)
+    assert cached['nodes'][4]['labels']['hm.hnnl.eu/pool'] == 'compute'
+    assert (cached['talos_version'], cached['kubernetes_version']) == (cluster_info['talos_version'], cluster_info['kubernetes_version'])
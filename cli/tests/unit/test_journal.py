@@ -0,0 +1,39 @@
+"""
+Unit tests for the journal module.
+"""
+
+import os
+
+from hm_cli.journal import CREATE_STEPS, CreateJournal, input_digest
+
+
+CLUSTER_INFO = {'name': 'homelab', 'nodes': [{'name': 'talos-cp1', 'ip': '192.168.1.101'}]}
+
+
+def test_steps_match_their_input_digest(temp_dir):
+    """Test a step only counts as done with the digest it was recorded with."""
+    path = os.path.join(temp_dir, ".hm-cli", "create-journal.json")
+    journal = CreateJournal(path)
+    journal.start(CLUSTER_INFO)
+    journal.record("bootstrap", input_digest(CLUSTER_INFO))
+
+    reloaded = CreateJournal(path)
+    assert reloaded.cluster_info == CLUSTER_INFO
+    assert reloaded.done("bootstrap", input_digest(CLUSTER_INFO)) is True
+    assert reloaded.done("bootstrap", input_digest(dict(CLUSTER_INFO, name='other'))) is False
+    assert reloaded.done("kubeconfig", None) is False
+
+
+def test_start_forgets_earlier_steps(temp_dir):
+    """Test a new creation starts without the steps of the previous one."""
+    journal = CreateJournal(os.path.join(temp_dir, "journal.json"))
+    journal.start(CLUSTER_INFO)
+    for step in CREATE_STEPS:
+        journal.record(step, "digest")
+    assert journal.finished() is True
+
+    journal.start(CLUSTER_INFO)
+    assert journal.finished() is False
+    journal.clear()
+    assert not os.path.exists(journal.path)
+    assert CreateJournal(journal.path).cluster_info is None
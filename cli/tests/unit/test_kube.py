@@ -0,0 +1,265 @@
+"""
+Unit tests for the kube module.
+"""
+
+import json
+import base64
+import shlex
+import threading
+import pytest
+import yaml
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
+
+from hm_cli.kube import (
+    KubeApiClient,
+    KubeApiError,
+    KubeConfig,
+    KubectlBackend,
+    get_kube_backend,
+    resource_path,
+)
+
+
+def _write_kubeconfig(temp_dir, server, user=None, cluster_extra=None):
+    """Write a single-context kubeconfig and return its path."""
+    cluster = {"server": server}
+    cluster.update(cluster_extra or {})
+    data = {
+        "apiVersion": "v1",
+        "kind": "Config",
+        "current-context": "admin@test",
+        "contexts": [{"name": "admin@test", "context": {"cluster": "test", "user": "admin"}}],
+        "clusters": [{"name": "test", "cluster": cluster}],
+        "users": [{"name": "admin", "user": user or {"token": "secret-token"}}],
+    }
+    path = f"{temp_dir}/kubeconfig"
+    with open(path, 'w') as f:
+        yaml.dump(data, f)
+    return path
+
+
+@pytest.fixture
+def api_server():
+    """Serve canned Kubernetes list responses over HTTP/1.1 keep-alive."""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        requests = []
+        client_ports = set()
+
+        def do_GET(self):
+            Handler.requests.append((self.path, self.headers.get("Authorization")))
+            Handler.client_ports.add(self.client_address[1])
+            if "watch=1" in self.path:
+                self._stream_watch()
+                return
+            if "limit=" in self.path:
+                self._send_page()
+                return
+            if self.path.startswith("/api/v1/missing"):
+                body = json.dumps({"kind": "Status", "message": "not found"}).encode()
+                self.send_response(404)
+            else:
+                body = json.dumps({"kind": "List", "items": [{"metadata": {"name": "n1"}}]}).encode()
+                self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_page(self):
+            """Serve five pods in pages of `limit`, chaining pages through `continue`."""
+            query = parse_qs(urlsplit(self.path).query)
+            limit = int(query["limit"][0])
+            start = int(query.get("continue", ["0"])[0])
+            names = [f"p{i}" for i in range(5)]
+            metadata = {"continue": str(start + limit)} if start + limit < len(names) else {}
+            body = json.dumps({"kind": "List", "metadata": metadata,
+                               "items": [{"metadata": {"name": name}} for name in names[start:start + limit]]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _stream_watch(self):
+            """Send watch events as a chunked stream, one JSON object per line."""
+            if "resourceVersion=stale" in self.path:
+                events = [{"type": "ERROR", "object": {"kind": "Status", "code": 410, "message": "too old resource version"}}]
+            else:
+                events = [
+                    {"type": "ADDED", "object": {"metadata": {"name": "n2", "resourceVersion": "11"}}},
+                    {"type": "BOOKMARK", "object": {"metadata": {"resourceVersion": "12"}}},
+                    {"type": "DELETED", "object": {"metadata": {"name": "n1", "resourceVersion": "13"}}},
+                ]
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for event in events:
+                line = json.dumps(event).encode() + b"\n"
+                self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, Handler
+    server.shutdown()
+    server.server_close()
+
+
+class TestKubeConfig:
+    """Tests for the KubeConfig class."""
+
+    def test_load_token_and_inline_ca(self, temp_dir):
+        """Inline data fields are decoded and the current context is used."""
+        ca = base64.b64encode(b"CA-PEM").decode()
+        path = _write_kubeconfig(temp_dir, "https://192.168.1.100:6443", cluster_extra={"certificate-authority-data": ca})
+        config = KubeConfig.load(path)
+        assert config.server == "https://192.168.1.100:6443"
+        assert config.ca_data == b"CA-PEM"
+        assert config.token == "secret-token"
+        assert config.insecure is False
+
+    def test_load_exec_credentials_rejected(self, temp_dir):
+        """Exec credential plugins are left to kubectl."""
+        path = _write_kubeconfig(temp_dir, "https://192.168.1.100:6443", user={"exec": {"command": "aws"}})
+        with pytest.raises(KubeApiError):
+            KubeConfig.load(path)
+
+    def test_load_missing_file(self, temp_dir):
+        """A missing kubeconfig raises KubeApiError."""
+        with pytest.raises(KubeApiError):
+            KubeConfig.load(f"{temp_dir}/nope")
+
+
+class TestKubeApiClient:
+    """Tests for the KubeApiClient class."""
+
+    def test_resource_path(self):
+        """Namespaced kinds get a namespace segment; cluster-scoped kinds ignore it."""
+        assert resource_path("pods") == "/api/v1/pods"
+        assert resource_path("pods", "kube-system") == "/api/v1/namespaces/kube-system/pods"
+        assert resource_path("nodes", "kube-system") == "/api/v1/nodes"
+        assert resource_path("storageclasses") == "/apis/storage.k8s.io/v1/storageclasses"
+
+    def test_list_reuses_connection(self, temp_dir, api_server):
+        """Consecutive requests go over a single keep-alive connection."""
+        server, handler = api_server
+        path = _write_kubeconfig(temp_dir, f"http://127.0.0.1:{server.server_address[1]}")
+        client = KubeApiClient.from_kubeconfig(path)
+        for _ in range(5):
+            assert client.list("nodes")["items"][0]["metadata"]["name"] == "n1"
+        client.close()
+        assert len(handler.requests) == 5
+        assert len(handler.client_ports) == 1
+        assert handler.requests[0][1] == "Bearer secret-token"
+
+    def test_list_with_selectors(self, temp_dir, api_server):
+        """Label and field selectors are sent as query parameters."""
+        server, handler = api_server
+        path = _write_kubeconfig(temp_dir, f"http://127.0.0.1:{server.server_address[1]}")
+        client = KubeApiClient.from_kubeconfig(path)
+        client.list("pods", namespace="kube-system", label_selector="component=etcd", field_selector="status.phase=Running")
+        assert handler.requests[-1][0] == "/api/v1/namespaces/kube-system/pods?labelSelector=component%3Detcd&fieldSelector=status.phase%3DRunning"
+
+    def test_error_status(self, temp_dir, api_server):
+        """Non-2xx responses raise KubeApiError with the Status message."""
+        server, handler = api_server
+        path = _write_kubeconfig(temp_dir, f"http://127.0.0.1:{server.server_address[1]}")
+        client = KubeApiClient.from_kubeconfig(path)
+        with pytest.raises(KubeApiError) as excinfo:
+            client.get("/api/v1/missing")
+        assert excinfo.value.status == 404
+        assert "not found" in str(excinfo.value)
+
+
+    def test_iter_pages_follows_continue(self, temp_dir, api_server):
+        """Pages are requested with limit and chained through continue tokens."""
+        server, handler = api_server
+        path = _write_kubeconfig(temp_dir, f"http://127.0.0.1:{server.server_address[1]}")
+        client = KubeApiClient.from_kubeconfig(path)
+        pages = list(client.iter_pages("pods", label_selector="app=web", page_size=2))
+        client.close()
+        assert [[pod["metadata"]["name"] for pod in page] for page in pages] == [["p0", "p1"], ["p2", "p3"], ["p4"]]
+        assert len(handler.requests) == 3
+        assert all("labelSelector=app%3Dweb" in request[0] for request in handler.requests)
+        assert "continue=2" in handler.requests[1][0]
+
+    def test_watch_streams_events(self, temp_dir, api_server):
+        """Watch events are decoded line by line from the chunked stream."""
+        server, handler = api_server
+        path = _write_kubeconfig(temp_dir, f"http://127.0.0.1:{server.server_address[1]}")
+        client = KubeApiClient.from_kubeconfig(path)
+        events = list(client.watch("nodes", "10", timeout_seconds=5))
+        client.close()
+        assert [event["type"] for event in events] == ["ADDED", "BOOKMARK", "DELETED"]
+        request_path = handler.requests[0][0]
+        assert "watch=1" in request_path
+        assert "resourceVersion=10" in request_path
+        assert "allowWatchBookmarks=true" in request_path
+
+    def test_watch_expired(self, temp_dir, api_server):
+        """An expired resourceVersion surfaces as a 410 error."""
+        server, _ = api_server
+        path = _write_kubeconfig(temp_dir, f"http://127.0.0.1:{server.server_address[1]}")
+        client = KubeApiClient.from_kubeconfig(path)
+        with pytest.raises(KubeApiError) as exc_info:
+            list(client.watch("nodes", "stale", timeout_seconds=5))
+        client.close()
+        assert exc_info.value.expired
+
+
+class TestKubectlBackend:
+    """Tests for the KubectlBackend class."""
+
+    def test_list_builds_command(self):
+        """The kubectl command mirrors the list arguments."""
+        with patch('hm_cli.kube.run_command', return_value=(0, '{"items": []}', "")) as mock_run:
+            backend = KubectlBackend(cwd="/repo", env={"KUBECONFIG": "/repo/kubeconfig"})
+            assert backend.list("pods", namespace="kube-system", label_selector="component=etcd") == {"items": []}
+            mock_run.assert_called_once_with(
+                "kubectl get pods -n kube-system -l component=etcd -o json",
+                cwd="/repo", env={"KUBECONFIG": "/repo/kubeconfig"}, suppress_output=True
+            )
+
+    def test_list_quotes_selectors(self):
+        """Set-based and negated selectors reach kubectl as single arguments, not shell syntax."""
+        with patch('hm_cli.kube.run_command', return_value=(0, '{"items": []}', "")) as mock_run:
+            KubectlBackend().list("pods", label_selector="env in (prod,staging)", field_selector="status.phase!=Running")
+            command = mock_run.call_args[0][0]
+        assert command == "kubectl get pods -A -l 'env in (prod,staging)' --field-selector 'status.phase!=Running' -o json"
+        assert shlex.split(command)[5] == "env in (prod,staging)"
+
+        with patch('hm_cli.kube.run_command', return_value=(0, '{"items": []}', "")) as mock_run:
+            KubectlBackend().list("pods", label_selector="app=web; rm -rf ~")
+        assert shlex.split(mock_run.call_args[0][0])[5] == "app=web; rm -rf ~"
+
+    def test_list_error(self):
+        """A failing kubectl call raises KubeApiError with its stderr."""
+        with patch('hm_cli.kube.run_command', return_value=(1, "", "connection refused")):
+            with pytest.raises(KubeApiError, match="connection refused"):
+                KubectlBackend().list("nodes")
+
+
+def test_get_kube_backend_auto_falls_back(temp_dir):
+    """`auto` falls back to kubectl when the kubeconfig cannot be used in-process."""
+    backend = get_kube_backend(f"{temp_dir}/missing", "auto")
+    assert isinstance(backend, KubectlBackend)
+
+
+def test_get_kube_backend_api_strict(temp_dir):
+    """`api` raises instead of falling back."""
+    with pytest.raises(KubeApiError):
+        get_kube_backend(f"{temp_dir}/missing", "api")
+
+
+def test_get_kube_backend_api(temp_dir):
+    """A usable kubeconfig yields the in-process client."""
+    path = _write_kubeconfig(temp_dir, "https://127.0.0.1:6443", cluster_extra={"insecure-skip-tls-verify": True})
+    assert isinstance(get_kube_backend(path), KubeApiClient)
@@ -0,0 +1,33 @@
+"""
+Unit tests for the pools module.
+"""
+
+import pytest
+
+from hm_cli.pools import WorkerPool, group_by_pool, load_pools
+
+
+def test_load_pools():
+    """Test pools are read with their limits and labels."""
+    pools = load_pools({'compute': {'max_parallel': 3, 'labels': {'tier': 1}}, 'gpu': None})
+    assert pools['compute'] == WorkerPool('compute', max_parallel=3, labels={'tier': '1'})
+    assert pools['gpu'] == WorkerPool('gpu')
+    assert pools['compute'].to_dict() == {'max_parallel': 3, 'max_unavailable': None, 'labels': {'tier': '1'}}
+    assert load_pools(None) == {}
+
+
+@pytest.mark.parametrize("data", [{'max_parallel': 0}, {'max_unavailable': "2"}, {'max_parallel': True},
+                                  {'labels': ["tier"]}])
+def test_invalid_pool(data):
+    """Test limits must be positive integers and labels a mapping."""
+    with pytest.raises(ValueError):
+        WorkerPool.from_dict('compute', data)
+
+
+def test_group_by_pool():
+    """Test workers outside any pool come first, then each pool in order of appearance."""
+    nodes = [{'name': 'c1', 'pool': 'compute'}, {'name': 'w1'}, {'name': 'g1', 'pool': 'gpu'},
+             {'name': 'c2', 'pool': 'compute'}]
+    assert [(pool, [node['name'] for node in members]) for pool, members in group_by_pool(nodes)] == [
+        (None, ['w1']), ('compute', ['c1', 'c2']), ('gpu', ['g1'])
+    ]
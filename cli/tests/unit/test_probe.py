@@ -0,0 +1,115 @@
+"""
+Unit tests for the probe module.
+"""
+
+import socket
+import threading
+import time
+
+import pytest
+
+from hm_cli.probe import (
+    API_SERVER_PORT, TALOS_API_PORT, ProbeTarget, percentile, probe, probe_rows, probe_status, probe_targets
+)
+from hm_cli.report import TcpProbeRecord
+
+
+@pytest.fixture
+def listening_port():
+    """A local port accepting connections until the test ends."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(16)
+    stop = threading.Event()
+
+    def accept():
+        server.settimeout(0.05)
+        while not stop.is_set():
+            try:
+                server.accept()[0].close()
+            except socket.timeout:
+                continue
+
+    thread = threading.Thread(target=accept, daemon=True)
+    thread.start()
+    yield server.getsockname()[1]
+    stop.set()
+    thread.join()
+    server.close()
+
+
+@pytest.fixture
+def closed_port():
+    """A local port nothing listens on."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def test_probe_targets():
+    """Test the VIP is probed on the API server port, control planes on both ports and workers on the Talos API."""
+    nodes = [
+        {'name': 'cp1', 'ip': '192.168.1.101', 'type': 'controlplane'},
+        {'name': 'w1', 'ip': '192.168.1.111', 'type': 'worker'},
+        {'name': 'w2', 'ip': '', 'type': 'worker'},
+    ]
+    targets = probe_targets('192.168.1.100', nodes)
+    assert [(t.name, t.address, t.port) for t in targets] == [
+        ('vip', '192.168.1.100', API_SERVER_PORT),
+        ('cp1', '192.168.1.101', API_SERVER_PORT),
+        ('cp1', '192.168.1.101', TALOS_API_PORT),
+        ('w1', '192.168.1.111', TALOS_API_PORT),
+    ]
+    assert [t.service for t in targets[1:3]] == ['kube-apiserver', 'talos-api']
+    assert probe_targets(None, []) == []
+
+
+def test_percentile():
+    """Test nearest-rank percentiles."""
+    values = [float(v) for v in range(1, 11)]
+    assert percentile(values, 0.5) == 5.0
+    assert percentile(values, 0.9) == 9.0
+    assert percentile(values, 0.99) == 10.0
+    assert percentile([3.0], 0.5) == 3.0
+    assert percentile([], 0.5) is None
+
+
+def test_probe_reachable(listening_port):
+    """Test every attempt against a listening port connects and yields latencies."""
+    [record] = probe([ProbeTarget('local', '127.0.0.1', listening_port)], attempts=4, timeout=1.0)
+    assert (record.attempts, record.connected, record.error) == (4, 4, None)
+    assert 0 <= record.p50_ms <= record.p90_ms <= record.p99_ms <= record.max_ms
+    assert probe_status(record) == "Reachable"
+
+
+def test_probe_refused(closed_port):
+    """Test a closed port is reported unreachable with the connection error."""
+    [record] = probe([ProbeTarget('local', '127.0.0.1', closed_port)], attempts=2, timeout=1.0)
+    assert (record.connected, record.p50_ms) == (0, None)
+    assert record.error
+    assert probe_status(record) == "Unreachable"
+
+
+def test_probe_runs_targets_concurrently(listening_port, closed_port):
+    """Test targets are probed at the same time and reported in order."""
+    targets = [ProbeTarget('down', '127.0.0.1', closed_port), ProbeTarget('up', '127.0.0.1', listening_port)]
+    started = time.monotonic()
+    records = probe(targets, attempts=3, timeout=0.5)
+    assert time.monotonic() - started < 2
+    assert [(r.name, r.connected) for r in records] == [('down', 0), ('up', 3)]
+
+
+def test_probe_rows():
+    """Test the probe table shows connection counts, percentiles and status."""
+    records = [
+        TcpProbeRecord('vip', '192.168.1.100', 6443, 'kube-apiserver', 5, 5, 1.25, 2.0, 3.0, 3.0),
+        TcpProbeRecord('w1', '192.168.1.111', 50000, 'talos-api', 5, 3, 1.0, 1.0, 1.0, 1.0, error='timed out after 1s'),
+        TcpProbeRecord('w2', '192.168.1.112', 50000, 'talos-api', 5, 0, error='Connection refused'),
+    ]
+    headers, rows = probe_rows(records)
+    assert headers[-2:] == ["STATUS", "ERROR"]
+    assert rows[0] == ['vip', '192.168.1.100:6443', 'kube-apiserver', '5/5', '1.2ms', '2.0ms', '3.0ms', '3.0ms', 'Reachable', '-']
+    assert rows[1][3] == '3/5' and rows[1][-2:] == ['Degraded', 'timed out after 1s']
+    assert rows[2][4] == '-' and rows[2][-2:] == ['Unreachable', 'Connection refused']
@@ -0,0 +1,172 @@
+"""
+Unit tests for the report module.
+"""
+
+import json
+import pytest
+import yaml
+
+from hm_cli.kube import KubeApiError
+from hm_cli.status import ClusterSnapshot
+from hm_cli.report import (
+    TcpProbeRecord,
+    VipProbeRecord,
+    build_report,
+    claim_record,
+    etcd_member_records,
+    flux_record,
+    node_record,
+    pod_record,
+    render_report,
+    storage_class_record,
+    volume_record,
+)
+
+
+NODE = {
+    'metadata': {
+        'name': 'talos-cp1',
+        'creationTimestamp': '2024-01-01T00:00:00Z',
+        'labels': {'node-role.kubernetes.io/control-plane': ''},
+    },
+    'status': {
+        'conditions': [{'type': 'Ready', 'status': 'True'}],
+        'addresses': [{'type': 'InternalIP', 'address': '192.168.1.101'}],
+        'nodeInfo': {'kubeletVersion': 'v1.30.0', 'osImage': 'Talos (v1.7.0)'},
+    },
+}
+
+POD = {
+    'metadata': {'name': 'web-1', 'namespace': 'default'},
+    'spec': {'nodeName': 'talos-cp1', 'containers': [{'name': 'web'}, {'name': 'sidecar'}]},
+    'status': {
+        'phase': 'Running',
+        'podIP': '10.244.0.5',
+        'containerStatuses': [
+            {'ready': True, 'restartCount': 1, 'state': {'running': {}}},
+            {'ready': False, 'restartCount': 3, 'state': {'waiting': {'reason': 'CrashLoopBackOff'}}},
+        ],
+    },
+}
+
+
+class TestRecords:
+    """Test cases for the record builders."""
+
+    def test_node_record(self):
+        """Test node fields are taken from the Node object."""
+        record = node_record(NODE)
+        assert record.name == 'talos-cp1'
+        assert record.ready is True
+        assert record.roles == ['control-plane']
+        assert record.internal_ip == '192.168.1.101'
+        assert record.external_ip is None
+        assert record.version == 'v1.30.0'
+
+    def test_pod_record(self):
+        """Test pod fields, including the kubectl-style status reason."""
+        record = pod_record(POD)
+        assert record.phase == 'Running'
+        assert record.status == 'CrashLoopBackOff'
+        assert (record.ready_containers, record.total_containers) == (1, 2)
+        assert record.restarts == 4
+        assert record.node == 'talos-cp1'
+
+    def test_flux_record_kind_fallback(self):
+        """Test the kind is derived from the listed resource when missing."""
+        obj = {
+            'metadata': {'name': 'apps', 'namespace': 'flux-system'},
+            'spec': {'suspend': True},
+            'status': {'lastAppliedRevision': 'main@sha1:abc', 'conditions': [{'type': 'Ready', 'status': 'False', 'message': 'failed'}]},
+        }
+        record = flux_record(obj, 'kustomizations')
+        assert record.kind == 'Kustomization'
+        assert record.ready is False
+        assert record.suspended is True
+        assert record.revision == 'main@sha1:abc'
+
+    def test_storage_records(self):
+        """Test storage class, volume and claim records."""
+        sc = storage_class_record({
+            'metadata': {'name': 'cubefs', 'annotations': {'storageclass.kubernetes.io/is-default-class': 'true'}},
+            'provisioner': 'cubefs.csi',
+        })
+        assert sc.default is True
+        assert sc.reclaim_policy == 'Delete'
+        pv = volume_record({
+            'metadata': {'name': 'pv-1'},
+            'spec': {'capacity': {'storage': '10Gi'}, 'accessModes': ['ReadWriteOnce'], 'claimRef': {'namespace': 'default', 'name': 'data'}},
+            'status': {'phase': 'Bound'},
+        })
+        assert pv.claim == 'default/data'
+        assert pv.access_modes == ['ReadWriteOnce']
+        pvc = claim_record({'metadata': {'name': 'data', 'namespace': 'default'}, 'spec': {'volumeName': 'pv-1'}, 'status': {'phase': 'Bound'}})
+        assert pvc.volume == 'pv-1'
+        assert pvc.capacity is None
+
+    def test_etcd_member_records(self):
+        """Test etcdctl endpoint health JSON is mapped to records."""
+        records = etcd_member_records([
+            {'endpoint': 'https://192.168.1.101:2379', 'health': True, 'took': '5ms'},
+            {'endpoint': 'https://192.168.1.102:2379', 'health': False, 'error': 'context deadline exceeded'},
+        ])
+        assert [r.healthy for r in records] == [True, False]
+        assert records[1].error == 'context deadline exceeded'
+
+
+class TestReport:
+    """Test cases for building and rendering reports."""
+
+    def _snapshot(self):
+        snapshot = ClusterSnapshot.from_items({'nodes': [NODE], 'pods': [POD], 'kustomizations': []})
+        return snapshot
+
+    def test_build_report_records_missing_kinds(self):
+        """Test kinds that were not listed are reported as errors."""
+        report = build_report(self._snapshot(), vip=VipProbeRecord('192.168.1.100', True))
+        assert len(report.nodes) == 1
+        assert len(report.pods) == 1
+        assert 'persistentvolumes' in report.errors
+        assert 'nodes' not in report.errors
+
+    @pytest.mark.parametrize("output, load", [
+        ("json", json.loads),
+        ("yaml", yaml.safe_load),
+    ])
+    def test_render_document(self, output, load):
+        """Test JSON and YAML render one document."""
+        report = build_report(self._snapshot(), vip=VipProbeRecord('192.168.1.100', False, 'timeout'))
+        data = load(render_report(report, output))
+        assert data['nodes'][0]['name'] == 'talos-cp1'
+        assert data['pods'][0]['status'] == 'CrashLoopBackOff'
+        assert data['vip'] == {'address': '192.168.1.100', 'reachable': False, 'detail': 'timeout'}
+
+    def test_render_ndjson(self):
+        """Test NDJSON writes one typed record per line."""
+        report = build_report(self._snapshot(), vip=VipProbeRecord('192.168.1.100', True),
+                              errors={'etcd': 'No etcd pods found.'},
+                              probes=[TcpProbeRecord('vip', '192.168.1.100', 6443, 'kube-apiserver', 5, 5, 1.0, 1.5, 2.0, 2.0)])
+        lines = [json.loads(line) for line in render_report(report, "ndjson").splitlines()]
+        types = [line['type'] for line in lines]
+        assert types[:4] == ['node', 'pod', 'vip', 'tcp_probe']
+        assert lines[3]['p90_ms'] == 1.5
+        assert {'type': 'error', 'section': 'etcd', 'message': 'No etcd pods found.'} in lines
+
+    def test_render_unknown_format(self):
+        """Test unknown formats are rejected."""
+        report = build_report(self._snapshot())
+        with pytest.raises(ValueError):
+            render_report(report, "xml")
+
+
+def test_build_report_list_error():
+    """Test a failed list is recorded instead of aborting the report."""
+    class FailingKube:
+        def list(self, kind, **kwargs):
+            raise KubeApiError("connection refused")
+
+    snapshot = ClusterSnapshot(FailingKube(), kinds=('nodes',))
+    report = build_report(snapshot)
+    snapshot.close()
+    assert report.nodes == []
+    assert report.errors['nodes'] == 'connection refused'
@@ -0,0 +1,146 @@
+"""
+Unit tests for the rolling upgrade module.
+"""
+
+import json
+import threading
+import pytest
+
+from hm_cli.rolling import (
+    NodeOperations,
+    RollingUpgrade,
+    UpgradeError,
+    node_ready,
+    plan_batches,
+    service_healthy,
+)
+
+
+NODES = [
+    {'name': 'talos-cp1', 'ip': '192.168.1.101', 'type': 'controlplane'},
+    {'name': 'talos-w1', 'ip': '192.168.1.111', 'type': 'worker'},
+    {'name': 'talos-cp2', 'ip': '192.168.1.102', 'type': 'controlplane'},
+    {'name': 'talos-w2', 'ip': '192.168.1.112', 'type': 'worker'},
+    {'name': 'talos-w3', 'ip': '192.168.1.113', 'type': 'worker'},
+]
+
+READY_NODE = json.dumps({'status': {'conditions': [{'type': 'Ready', 'status': 'True'}]}})
+ETCD_HEALTHY = "NODE     192.168.1.101\nID       etcd\nSTATE    Running\nHEALTH   OK\n"
+
+
+class FakeCluster:
+    """Answers node operation commands and records them."""
+
+    def __init__(self, fail=None):
+        self.fail = fail or ()
+        self.commands = []
+        self.lock = threading.Lock()
+
+    def __call__(self, command):
+        with self.lock:
+            self.commands.append(command)
+        if any(marker in command for marker in self.fail):
+            return 1, "", "boom"
+        if command.startswith("kubectl get node"):
+            return 0, READY_NODE, ""
+        if " service etcd" in command:
+            return 0, ETCD_HEALTHY, ""
+        return 0, "", ""
+
+
+def _operations(cluster, **kwargs):
+    return NodeOperations(run=cluster, config_file=lambda node: f"/configs/{node['name']}.yaml",
+                          sleep=lambda seconds: None, **kwargs)
+
+
+def test_plan_batches_keeps_control_plane_serial():
+    """Test control plane nodes go alone and workers in batches of max_unavailable."""
+    batches = plan_batches(NODES, max_unavailable=2)
+    assert [[node['name'] for node in batch] for batch in batches] == [
+        ['talos-cp1'], ['talos-cp2'], ['talos-w1', 'talos-w2'], ['talos-w3']
+    ]
+
+
+def test_plan_batches_per_pool():
+    """Test pool workers are batched per pool with the pool's own limit."""
+    nodes = NODES + [
+        {'name': 'talos-g1', 'ip': '192.168.1.121', 'type': 'worker', 'pool': 'gpu'},
+        {'name': 'talos-c1', 'ip': '192.168.1.131', 'type': 'worker', 'pool': 'compute'},
+        {'name': 'talos-g2', 'ip': '192.168.1.122', 'type': 'worker', 'pool': 'gpu'},
+        {'name': 'talos-c2', 'ip': '192.168.1.132', 'type': 'worker', 'pool': 'compute'},
+        {'name': 'talos-c3', 'ip': '192.168.1.133', 'type': 'worker', 'pool': 'compute'},
+    ]
+    batches = plan_batches(nodes, max_unavailable=2, pool_limits={'compute': 3, 'gpu': None})
+    assert [[node['name'] for node in batch] for batch in batches] == [
+        ['talos-cp1'], ['talos-cp2'], ['talos-w1', 'talos-w2'], ['talos-w3'],
+        ['talos-g1', 'talos-g2'], ['talos-c1', 'talos-c2', 'talos-c3'],
+    ]
+
+
+def test_node_ready_and_service_healthy():
+    """Test the Ready condition and talosctl service health parsing."""
+    assert node_ready(json.loads(READY_NODE)) is True
+    assert node_ready({'status': {'conditions': [{'type': 'Ready', 'status': 'Unknown'}]}}) is False
+    assert service_healthy(ETCD_HEALTHY) is True
+    assert service_healthy("STATE    Running\nHEALTH   Fail\n") is False
+
+
+def test_upgrade_node_runs_phases_in_order():
+    """Test a control plane node goes through every phase, including etcd."""
+    cluster = FakeCluster()
+    rollout = RollingUpgrade(_operations(cluster, talos_version="v1.7.5"))
+    assert rollout.upgrade_node(NODES[0]) is True
+    assert [result.phase for result in rollout.results] == [
+        "cordon", "drain", "apply", "upgrade", "ready", "etcd", "uncordon"
+    ]
+    assert cluster.commands[0] == "kubectl cordon talos-cp1"
+    assert "ghcr.io/siderolabs/installer:v1.7.5" in cluster.commands[3]
+    assert cluster.commands[-1] == "kubectl uncordon talos-cp1"
+
+
+def test_worker_skips_etcd_and_upgrade_without_version():
+    """Test workers have no etcd phase and no Talos upgrade without a version."""
+    cluster = FakeCluster()
+    rollout = RollingUpgrade(_operations(cluster))
+    assert rollout.upgrade_node(NODES[1]) is True
+    assert "etcd" not in [result.phase for result in rollout.results]
+    assert not any(command.startswith("talosctl upgrade") for command in cluster.commands)
+
+
+def test_failure_stops_rollout_and_keeps_node_cordoned():
+    """Test a failed drain stops the rollout before later batches."""
+    cluster = FakeCluster(fail=("drain talos-cp2",))
+    rollout = RollingUpgrade(_operations(cluster))
+    assert rollout.run(NODES) is False
+    failed = [result for result in rollout.results if not result.ok]
+    assert [(result.node, result.phase, result.detail) for result in failed] == [('talos-cp2', 'drain', 'boom')]
+    assert "kubectl uncordon talos-cp2" not in cluster.commands
+    assert not any("talos-w" in command for command in cluster.commands)
+
+
+def test_workers_upgrade_in_parallel():
+    """Test the workers of one batch are upgraded at the same time."""
+    barrier = threading.Barrier(3, timeout=5)
+    cluster = FakeCluster()
+
+    def run(command):
+        if command.startswith("kubectl cordon talos-w"):
+            barrier.wait()  # Only passes if all three workers are cordoned together
+        return cluster(command)
+
+    rollout = RollingUpgrade(_operations(run), max_unavailable=3)
+    assert rollout.run(NODES) is True
+
+
+def test_ready_timeout():
+    """Test a node that never becomes Ready fails its ready phase."""
+    clock = iter(range(0, 10_000, 10))
+
+    def run(command):
+        if command.startswith("kubectl get node"):
+            return 0, json.dumps({'status': {'conditions': [{'type': 'Ready', 'status': 'False'}]}}), ""
+        return 0, "", ""
+
+    operations = _operations(run, ready_timeout=60, clock=lambda: next(clock))
+    with pytest.raises(UpgradeError, match="Ready not reached within 60s"):
+        operations.ready(NODES[1])
@@ -0,0 +1,81 @@
+"""
+Start-up checks for the CLI entry point. The import time budget is a
+benchmark and only runs with HM_CLI_BENCHMARKS=1.
+"""
+
+import subprocess
+import sys
+import pytest
+
+import hm_cli.cli
+
+
+# Cumulative import time budget for hm_cli.cli, in microseconds. Importing the
+# managers eagerly took about 400 ms; the lazy entry point needs roughly a third.
+IMPORT_BUDGET_US = 250_000
+
+# Modules that only specific commands need
+HEAVY_MODULES = (
+    "git",
+    "questionary",
+    "prompt_toolkit",
+    "asyncio",
+    "rich.logging",
+    "rich.progress",
+    "hm_cli.cluster",
+    "hm_cli.service",
+    "hm_cli.gitops",
+    "hm_cli.kube",
+)
+
+
+def _importtime(code, *args):
+    """Run code in a fresh interpreter with -X importtime.
+
+    Returns:
+        Dict of module name to cumulative import time in microseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code, *args],
+        capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            timings[name.strip()] = int(cumulative)
+        except ValueError:
+            continue  # header line
+    return timings
+
+
+def test_import_skips_heavy_modules():
+    """Importing the entry point must not load command-specific dependencies."""
+    timings = _importtime("import hm_cli.cli")
+    loaded = [module for module in HEAVY_MODULES if module in timings]
+    assert loaded == []
+
+
+def test_help_skips_heavy_modules():
+    """`hm-cli --help` must not load command-specific dependencies."""
+    timings = _importtime("from hm_cli.cli import main; main()", "--help")
+    loaded = [module for module in HEAVY_MODULES if module in timings]
+    assert loaded == []
+
+
+@pytest.mark.benchmark
+def test_import_time_budget():
+    """Cold-start import of the entry point stays within the budget (best of 3)."""
+    best = min(_importtime("import hm_cli.cli")["hm_cli.cli"] for _ in range(3))
+    assert best < IMPORT_BUDGET_US, f"hm_cli.cli took {best / 1000:.0f} ms to import"
+
+
+def test_lazy_manager_names():
+    """Managers stay reachable as attributes of hm_cli.cli."""
+    from hm_cli.cluster import ClusterManager
+    assert hm_cli.cli.ClusterManager is ClusterManager
+    with pytest.raises(AttributeError):
+        hm_cli.cli.NoSuchManager
@@ -0,0 +1,470 @@
+"""
+Unit tests for the status module.
+"""
+
+import gc
+import json
+import os
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock
+
+from hm_cli.kube import KubeApiError
+from hm_cli.status import (
+    SectionBuffer, StatusCheck, StatusEngine, StatusTable, ClusterSnapshot, StatusCache, StatusResults,
+    PodQuery, PodSummary, kustomization_rows, flux_source_rows, parse_kubectl_table, pod_healthy, pod_rows, status_style,
+    status_fields
+)
+
+
+def _sleeping_check(name, delay, tracker=None):
+    """Create a check that sleeps and prints its name."""
+    def run(out):
+        if tracker is not None:
+            tracker.enter()
+        time.sleep(delay)
+        out.print(name)
+        if tracker is not None:
+            tracker.exit()
+    return StatusCheck(name, run)
+
+
+class _ActiveTracker:
+    """Tracks the maximum number of checks running at once."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def enter(self):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def exit(self):
+        with self.lock:
+            self.active -= 1
+
+
+class TestSectionBuffer:
+    """Tests for the SectionBuffer class."""
+
+    def test_flush_replays_calls(self):
+        """Recorded calls are replayed on the target in order."""
+        buffer = SectionBuffer()
+        buffer.print("first", style="bold")
+        buffer.print("second")
+        target = MagicMock()
+        buffer.flush(target)
+        assert [c.args for c in target.print.call_args_list] == [("first",), ("second",)]
+        assert target.print.call_args_list[0].kwargs == {"style": "bold"}
+
+
+class TestStatusEngine:
+    """Tests for the StatusEngine class."""
+
+    def test_sections_printed_in_check_order(self):
+        """Sections keep their order even when later checks finish first."""
+        checks = [_sleeping_check("a", 0.15), _sleeping_check("b", 0.05), _sleeping_check("c", 0.0)]
+        target = MagicMock()
+        StatusEngine(checks, max_concurrency=3).run(target=target)
+        assert [c.args[0] for c in target.print.call_args_list] == ["a", "b", "c"]
+
+    def test_wall_time_close_to_slowest_check(self):
+        """Checks run concurrently rather than one after another."""
+        checks = [_sleeping_check(str(i), 0.2) for i in range(5)]
+        start = time.monotonic()
+        StatusEngine(checks, max_concurrency=5).run(target=MagicMock())
+        assert time.monotonic() - start < 0.6
+
+    def test_concurrency_limit_respected(self):
+        """No more than max_concurrency checks run at once."""
+        tracker = _ActiveTracker()
+        checks = [_sleeping_check(str(i), 0.05, tracker) for i in range(6)]
+        StatusEngine(checks, max_concurrency=2).run(target=MagicMock())
+        assert tracker.peak == 2
+
+    def test_failing_check_does_not_stop_others(self):
+        """An exception becomes section output; other sections still print."""
+        def boom(out):
+            raise RuntimeError("kaboom")
+        checks = [StatusCheck("broken", boom), _sleeping_check("ok", 0.0)]
+        target = MagicMock()
+        StatusEngine(checks).run(target=target)
+        printed = [str(c.args[0]) for c in target.print.call_args_list]
+        assert any("kaboom" in line for line in printed)
+        assert printed[-1] == "ok"
+
+    def test_progress_callback(self):
+        """The progress callback reports finished counts and pending checks."""
+        calls = []
+        checks = [_sleeping_check("a", 0.0), _sleeping_check("b", 0.0)]
+        StatusEngine(checks).run(on_progress=lambda done, pending: calls.append((done, pending)), target=MagicMock())
+        assert calls[-1] == (2, [])
+
+
+def _pod(name, namespace, labels=None):
+    """Create a minimal pod object."""
+    return {'metadata': {'name': name, 'namespace': namespace, 'labels': labels or {}}}
+
+
+class _FakeKube:
+    """Backend stub that counts list calls per kind."""
+
+    def __init__(self, items, errors=None):
+        self.items = items
+        self.errors = errors or {}
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def list(self, kind, **kwargs):
+        with self.lock:
+            self.calls.append(kind)
+        if kind in self.errors:
+            raise self.errors[kind]
+        return {'items': self.items.get(kind, [])}
+
+
+class TestClusterSnapshot:
+    """Test cases for ClusterSnapshot."""
+
+    def test_one_list_call_per_kind(self):
+        """Test that every kind is listed exactly once however often it is read."""
+        kube = _FakeKube({'pods': [_pod('a', 'default')], 'namespaces': []})
+        snapshot = ClusterSnapshot(kube, kinds=('pods', 'namespaces'))
+        for _ in range(3):
+            snapshot.items('pods')
+            snapshot.in_namespace('pods', 'default')
+            snapshot.select('pods', {'app': 'x'})
+            snapshot.has_namespace('default')
+        snapshot.close()
+        assert sorted(kube.calls) == ['namespaces', 'pods']
+
+    def test_in_namespace_and_select(self):
+        """Test namespace and label index lookups."""
+        pods = [
+            _pod('kube-vip-1', 'kube-system', {'name': 'kube-vip'}),
+            _pod('etcd-1', 'kube-system', {'component': 'etcd', 'tier': 'control-plane'}),
+            _pod('api-1', 'kube-system', {'component': 'kube-apiserver', 'tier': 'control-plane'}),
+            _pod('kube-vip-other', 'default', {'name': 'kube-vip'}),
+        ]
+        snapshot = ClusterSnapshot.from_items({'pods': pods})
+        assert [p['metadata']['name'] for p in snapshot.in_namespace('pods', 'default')] == ['kube-vip-other']
+        assert snapshot.in_namespace('pods', 'missing') == []
+        assert [p['metadata']['name'] for p in snapshot.select('pods', {'name': 'kube-vip'}, namespace='kube-system')] == ['kube-vip-1']
+        assert [p['metadata']['name'] for p in snapshot.select('pods', {'tier': 'control-plane', 'component': 'etcd'})] == ['etcd-1']
+        assert len(snapshot.select('pods', {})) == 4
+
+    def test_has_namespace(self):
+        """Test namespace existence checks."""
+        snapshot = ClusterSnapshot.from_items({'namespaces': [{'metadata': {'name': 'flux-system'}}]})
+        assert snapshot.has_namespace('flux-system')
+        assert not snapshot.has_namespace('cubefs')
+
+    def test_scoped_kind_listed_per_namespace(self):
+        """Test that scoped kinds are only listed in the given namespaces."""
+        class ScopedKube(_FakeKube):
+            def list(self, kind, namespace=None, **kwargs):
+                with self.lock:
+                    self.calls.append((kind, namespace))
+                return {'items': [_pod(f"{namespace}-pod", namespace)]}
+
+        kube = ScopedKube({})
+        snapshot = ClusterSnapshot(kube, kinds=('pods',), scopes={'pods': ('kube-system', 'cubefs')})
+        assert [p['metadata']['name'] for p in snapshot.items('pods')] == ['kube-system-pod', 'cubefs-pod']
+        snapshot.close()
+        assert sorted(kube.calls) == [('pods', 'cubefs'), ('pods', 'kube-system')]
+
+    def test_missing_kind_is_empty(self):
+        """Test that kinds the cluster does not serve yield no objects."""
+        kube = _FakeKube({}, errors={'kustomizations': KubeApiError("not found", status=404)})
+        snapshot = ClusterSnapshot(kube, kinds=('kustomizations',))
+        assert snapshot.items('kustomizations') == []
+        snapshot.close()
+
+    def test_fetch_error_raised_on_read(self):
+        """Test that other errors surface when the kind is read."""
+        kube = _FakeKube({}, errors={'nodes': KubeApiError("forbidden", status=403)})
+        snapshot = ClusterSnapshot(kube, kinds=('nodes',))
+        with pytest.raises(KubeApiError, match="forbidden"):
+            snapshot.items('nodes')
+        with pytest.raises(KubeApiError):
+            snapshot.items('pods')
+        snapshot.close()
+
+    def test_context_manager_closes_owned_backend(self):
+        """Test that leaving the block releases the workers and only a backend the snapshot owns."""
+        shared, owned = MagicMock(), MagicMock()
+        shared.list.return_value = owned.list.return_value = {'items': []}
+        with ClusterSnapshot(shared, kinds=('nodes',)) as snapshot:
+            assert snapshot.items('nodes') == []
+        with ClusterSnapshot(owned, kinds=('nodes',), close_backend=True) as snapshot:
+            assert snapshot.items('nodes') == []
+        assert snapshot._executor._shutdown
+        shared.close.assert_not_called()
+        owned.close.assert_called_once()
+
+
+class TestFluxRows:
+    """Test cases for the Flux row builders."""
+
+    def test_kustomization_rows(self):
+        """Test that the Ready condition is reported."""
+        item = {
+            'metadata': {'name': 'apps', 'namespace': 'flux-system'},
+            'status': {'conditions': [{'type': 'Ready', 'status': 'False', 'message': 'build failed'}]},
+        }
+        headers, rows = kustomization_rows([item])
+        assert headers[:2] == ['NAMESPACE', 'NAME']
+        assert rows[0][:2] == ['flux-system', 'apps']
+        assert 'False' in rows[0]
+        assert 'build failed' in rows[0]
+
+    def test_flux_source_rows(self):
+        """Test source rows include kind and revision."""
+        item = {
+            'kind': 'GitRepository',
+            'metadata': {'name': 'flux-system', 'namespace': 'flux-system'},
+            'spec': {},
+            'status': {
+                'artifact': {'revision': 'main@sha1:abc'},
+                'conditions': [{'type': 'Ready', 'status': 'True', 'message': 'stored artifact'}],
+            },
+        }
+        headers, rows = flux_source_rows([item])
+        assert rows[0][0] == 'GitRepository'
+        assert 'main@sha1:abc' in rows[0]
+        assert 'True' in rows[0]
+
+
+class TestStatusStyle:
+    """Test cases for the status classifier."""
+
+    @pytest.mark.parametrize("value, style", [
+        ("Running", "green"),
+        ("Bound", "green"),
+        ("True", "green"),
+        ("CrashLoopBackOff", "red"),
+        ("NotReady", "red"),
+        ("False", "red"),
+        ("Pending", "yellow"),
+        ("ContainerCreating", "yellow"),
+        ("Ready,SchedulingDisabled", "yellow"),
+        ("Init:CrashLoopBackOff", "red"),
+        ("Init:0/2", None),
+        ("1/2", None),
+        ("error-pages", None),
+    ])
+    def test_status_style(self, value, style):
+        """Test whole-token classification with the most severe token winning."""
+        assert status_style(value) == style
+
+
+class TestStatusTable:
+    """Test cases for StatusTable."""
+
+    def test_only_status_columns_styled(self):
+        """Test that names containing status words are left unstyled."""
+        table = StatusTable.from_rows(["NAME", "STATUS"], [["error-pages-ready", "Running"]])
+        assert table.status_columns == frozenset({1})
+        cells = [column._cells[0] for column in table.render().columns]
+        assert cells[0].style == ""
+        assert cells[1].style == "green"
+
+    def test_short_rows_padded(self):
+        """Test rows with missing cells still render one cell per column."""
+        rendered = StatusTable.from_rows(["NAME", "STATUS", "AGE"], [["a"]]).render()
+        assert [len(column._cells) for column in rendered.columns] == [1, 1, 1]
+
+    def test_duplicate_headers(self):
+        """Test duplicate headers are made unique."""
+        rendered = StatusTable.from_rows(["NAME", "NAME"], [["a", "b"]]).render()
+        assert [column.header for column in rendered.columns] == ["NAME", "NAME(1)"]
+
+    @pytest.mark.benchmark
+    def test_render_scales_linearly(self):
+        """Benchmark: building the table for 20k pods costs about 10x building it for 2k."""
+        def pods(count):
+            return [{
+                'metadata': {'name': f"pod-{i}", 'namespace': f"ns-{i % 50}", 'creationTimestamp': '2024-01-01T00:00:00Z'},
+                'spec': {'nodeName': f"node-{i % 3}", 'containers': [{'name': 'app'}]},
+                'status': {'phase': ('Running', 'Pending', 'Failed')[i % 3], 'podIP': '10.0.0.1',
+                           'containerStatuses': [{'ready': i % 3 == 0, 'restartCount': i % 5, 'state': {}}]},
+            } for i in range(count)]
+
+        def best_time(items, repeats):
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                headers, rows = pod_rows(items)
+                StatusTable.from_rows(headers, rows).render()
+                timings.append(time.perf_counter() - start)
+            return min(timings)
+
+        small, large = pods(2000), pods(20000)
+        best_time(small, 1)  # warm up caches
+        # Collector pauses grow with the heap, not with the code under test
+        gc.disable()
+        try:
+            ratio = best_time(large, 2) / best_time(small, 3)
+        finally:
+            gc.enable()
+        # Linear scaling gives ~10; allow generous headroom for noisy machines
+        assert ratio < 20
+
+
+class TestParseKubectlTable:
+    """Test cases for parse_kubectl_table."""
+
+    def test_columns_cut_at_header_offsets(self):
+        """Test that empty and multi-word cells stay in their columns."""
+        output = (
+            "NAME    READY   STATUS     RESTARTS   AGE   IP          NODE        NOMINATED NODE   READINESS GATES\n"
+            "web-1   1/1     Running    0          5d    10.0.0.5    talos-cp1   <none>           <none>\n"
+            "job-2   0/1     Init:0/1   0          1m    <none>      talos-cp2   <none>           <none>\n"
+        )
+        headers, rows = parse_kubectl_table(output)
+        assert headers == ["NAME", "READY", "STATUS", "RESTARTS", "AGE", "IP", "NODE", "NOMINATED NODE", "READINESS GATES"]
+        assert rows[0] == ["web-1", "1/1", "Running", "0", "5d", "10.0.0.5", "talos-cp1", "<none>", "<none>"]
+        assert rows[1][2] == "Init:0/1"
+        assert rows[1][7] == "<none>"
+
+    def test_empty_output(self):
+        """Test empty output yields no headers."""
+        assert parse_kubectl_table("\n") == ([], [])
+
+
+def _status_pod(name, namespace, phase, ready=True, waiting=None):
+    """Create a pod with one container in the given state."""
+    state = {'waiting': {'reason': waiting}} if waiting else {}
+    return {
+        'metadata': {'name': name, 'namespace': namespace},
+        'spec': {'containers': [{'name': 'app'}]},
+        'status': {'phase': phase, 'containerStatuses': [{'ready': ready, 'restartCount': 0, 'state': state}]},
+    }
+
+
+class TestPodSummary:
+    """Test cases for the pod summary view."""
+
+    def test_pod_healthy(self):
+        """Test Running-and-ready and Succeeded pods are healthy."""
+        assert pod_healthy(_status_pod('a', 'ns', 'Running'))
+        assert pod_healthy(_status_pod('b', 'ns', 'Succeeded', ready=False))
+        assert not pod_healthy(_status_pod('c', 'ns', 'Running', ready=False))
+        assert not pod_healthy(_status_pod('d', 'ns', 'Running', ready=False, waiting='CrashLoopBackOff'))
+        assert not pod_healthy(_status_pod('e', 'ns', 'Pending', ready=False))
+
+    def test_counts_per_namespace(self):
+        """Test phases are counted per namespace across pages, keeping only unhealthy pods."""
+        summary = PodSummary()
+        summary.add([_status_pod('a', 'apps', 'Running'), _status_pod('b', 'apps', 'Pending', ready=False)])
+        summary.add([_status_pod('c', 'kube-system', 'Running'), _status_pod('d', 'apps', 'Failed', ready=False)])
+        headers, rows = summary.rows()
+        assert headers == ['NAMESPACE', 'TOTAL', 'RUNNING', 'PENDING', 'SUCCEEDED', 'FAILED', 'UNKNOWN', 'UNHEALTHY']
+        assert rows == [
+            ['apps', '3', '1', '1', '0', '1', '0', '2'],
+            ['kube-system', '1', '1', '0', '0', '0', '0', '0'],
+        ]
+        assert [pod['metadata']['name'] for pod in summary.unhealthy] == ['b', 'd']
+        assert summary.total == 4
+
+        restored = PodSummary.from_dict(summary.to_dict())
+        assert restored.rows() == (headers, rows)
+        assert (restored.total, restored.unhealthy) == (4, summary.unhealthy)
+
+    def test_query_describe(self):
+        """Test the filter description used in section titles."""
+        assert PodQuery().describe() == "All Namespaces"
+        assert not PodQuery().filtered
+        query = PodQuery(namespace='apps', label_selector='app=web')
+        assert query.filtered
+        assert query.describe() == "namespace=apps, -l app=web"
+
+
+class TestStatusCache:
+    """Test cases for the status cache."""
+
+    def test_results_computed_once(self):
+        """Test a result is computed on first use and errors are kept and raised again."""
+        results = StatusResults()
+        compute = MagicMock(return_value=[1, 2])
+        assert results.get('etcd', compute) == [1, 2]
+        assert results.get('etcd', compute) == [1, 2]
+        assert compute.call_count == 1
+
+        failing = MagicMock(side_effect=KubeApiError("no etcd pods"))
+        for _ in range(2):
+            with pytest.raises(KubeApiError, match="no etcd pods"):
+                results.get('probes', failing)
+        assert failing.call_count == 1
+
+        replayed = StatusResults(results.export())
+        assert replayed.get('etcd', MagicMock(side_effect=AssertionError("recomputed"))) == [1, 2]
+        with pytest.raises(KubeApiError):
+            replayed.get('probes', MagicMock(side_effect=AssertionError("recomputed")))
+
+    def test_snapshot_round_trip(self, tmp_path):
+        """Test a stored run is served while fresh, with its objects and results."""
+        kube = _FakeKube({'pods': [_pod('a', 'default')], 'namespaces': []})
+        snapshot = ClusterSnapshot(kube, kinds=('pods', 'namespaces'))
+        results = StatusResults()
+        results.get('etcd', lambda: [{'endpoint': 'https://192.168.1.101:2379'}])
+        kubeconfig = tmp_path / "kubeconfig"
+        kubeconfig.write_text("apiVersion: v1\n")
+        cache = StatusCache(str(tmp_path / "status"), ttl=60)
+        key = StatusCache.key(str(kubeconfig), 'homelab', mode='tables')
+
+        assert cache.get(key) is None
+        cache.put(key, snapshot, results)
+        cached = cache.get(key)
+        assert cached is not None and cached.age() < 60
+        assert [p['metadata']['name'] for p in cached.snapshot().items('pods')] == ['a']
+        assert cached.snapshot().items('namespaces') == []
+        assert cached.status_results().get('etcd', lambda: []) == [{'endpoint': 'https://192.168.1.101:2379'}]
+
+        # Other clusters, views and expired runs are not served
+        assert cache.get(StatusCache.key(str(kubeconfig), 'lab', mode='tables')) is None
+        assert cache.get(StatusCache.key(str(kubeconfig), 'homelab', mode='records')) is None
+        assert StatusCache(str(tmp_path / "status"), ttl=0).get(key) is None
+        cached_file = tmp_path / "status" / f"{key}.json"
+        data = json.loads(cached_file.read_text())
+        data['created_at'] -= 120
+        cached_file.write_text(json.dumps(data))
+        assert cache.get(key) is None
+
+    def test_stored_privately_without_unread_fields(self, tmp_path):
+        """Test the cache is owner-only and keeps only the fields the sections read."""
+        pod = {
+            'metadata': {'name': 'a', 'namespace': 'default', 'labels': {'app': 'web'},
+                         'annotations': {'secret-note': 'x'}, 'managedFields': [{'manager': 'kubectl'}]},
+            'spec': {'nodeName': 'w1', 'containers': [{'name': 'web', 'env': [{'name': 'TOKEN', 'value': 'hunter2'}]}]},
+            'status': {'phase': 'Running', 'podIP': '10.244.0.5',
+                       'containerStatuses': [{'ready': True, 'restartCount': 2, 'state': {'running': {}}, 'imageID': 'sha'}]},
+        }
+        snapshot = ClusterSnapshot(_FakeKube({'pods': [pod]}), kinds=('pods',))
+        cache = StatusCache(str(tmp_path / "status"), ttl=60)
+        cache.put('key', snapshot, StatusResults())
+
+        assert os.stat(tmp_path / "status").st_mode & 0o777 == 0o700
+        assert os.stat(tmp_path / "status" / "key.json").st_mode & 0o777 == 0o600
+        text = (tmp_path / "status" / "key.json").read_text()
+        assert 'hunter2' not in text and 'managedFields' not in text and 'secret-note' not in text
+        [cached] = cache.get('key').snapshot().items('pods')
+        assert pod_rows([cached]) == pod_rows([pod])
+        assert status_fields(pod)['spec']['containers'] == [{'name': 'web'}]
+
+    def test_failed_lists_not_stored(self, tmp_path):
+        """Test a run in which a kind could not be listed is not cached."""
+        kube = _FakeKube({'pods': []}, errors={'nodes': KubeApiError("connection refused")})
+        snapshot = ClusterSnapshot(kube, kinds=('pods', 'nodes'))
+        items, errors = snapshot.export()
+        assert (items, errors) == ({'pods': []}, {'nodes': 'connection refused'})
+        with pytest.raises(KubeApiError, match="connection refused"):
+            ClusterSnapshot.from_items(items, errors).items('nodes')
+
+        cache = StatusCache(str(tmp_path / "status"), ttl=60)
+        cache.put('key', snapshot, StatusResults())
+        assert cache.get('key') is None
@@ -0,0 +1,224 @@
+"""
+Unit tests for the talos module.
+"""
+
+import os
+import shlex
+import pytest
+import yaml
+
+from hm_cli.talos import TalosRenderer, TalosRenderError, merge_config, render_template
+
+
+SECRETS = {
+    'cluster': {'id': 'cluster-id', 'secret': 'cluster-secret'},
+    'secrets': {'bootstraptoken': 'abc.def', 'secretboxencryptionsecret': 'secretbox'},
+    'trustdinfo': {'token': 'trustd.token'},
+    'certs': {
+        'etcd': {'crt': 'etcd-crt', 'key': 'etcd-key'},
+        'k8s': {'crt': 'k8s-crt', 'key': 'k8s-key'},
+        'k8saggregator': {'crt': 'agg-crt', 'key': 'agg-key'},
+        'k8sserviceaccount': {'key': 'sa-key'},
+        'os': {'crt': 'os-crt', 'key': 'os-key'},
+    },
+}
+
+PATCHES = {
+    'common.yaml': "machine:\n  network:\n    hostname: {{ .hostname }}\n  kubelet:\n    extraArgs:\n      node-ip: {{ .nodeIP }}\n",
+    'controlplane-patch.yaml': "machine:\n  certSANs:\n    - 192.168.1.100\n    - 127.0.0.1\n",
+    'worker-patch.yaml': "machine:\n  type: worker\n  kubelet:\n    extraArgs:\n      node-labels: role=worker\n",
+    'mac-mini-controlplane-patch.yaml': "machine:\n  certSANs:\n    - 192.168.1.100\n    - 192.168.1.103\n  install:\n    disk: /dev/vda\n",
+}
+
+CLUSTER = {
+    'name': 'homelab',
+    'control_plane_vip': '192.168.1.100',
+    'talos_version': 'v1.7.0',
+    'kubernetes_version': 'v1.29.0',
+    'nodes': [
+        {'name': 'talos-cp1', 'ip': '192.168.1.101', 'type': 'controlplane', 'hardware': 'ryzen'},
+        {'name': 'talos-cp3', 'ip': '192.168.1.103', 'type': 'controlplane', 'hardware': 'mac-mini'},
+        {'name': 'talos-w1', 'ip': '192.168.1.111', 'type': 'worker', 'hardware': 'intel'},
+    ],
+}
+
+
+def _gen_config(command, **kwargs):
+    """Stand in for `talosctl gen config`, writing role configurations derived from the secrets bundle."""
+    args = shlex.split(command)
+    options = dict(zip(args[5::2], args[6::2]))
+    with open(options['--with-secrets']) as f:
+        secrets = yaml.safe_load(f)
+    for role in options['--output-types'].split(','):
+        control_plane = role == 'controlplane'
+        ca = dict(secrets['certs']['os'])
+        if not control_plane:
+            ca.pop('key')
+        config = {
+            'version': 'v1alpha1',
+            'machine': {
+                'type': role,
+                'ca': ca,
+                'certSANs': [],
+                'install': {'disk': '/dev/sda', 'image': options['--install-image']},
+                'features': {'rbac': True, 'kubePrism': {'enabled': True, 'port': 7445}},
+            },
+            'cluster': {'clusterName': args[3], 'controlPlane': {'endpoint': args[4]}, 'discovery': {'enabled': True}},
+        }
+        if control_plane:
+            config['cluster']['etcd'] = {'ca': secrets['certs']['etcd']}
+        with open(os.path.join(options['--output'], f"{role}.yaml"), 'w') as f:
+            yaml.safe_dump(config, f)
+    return 0, "", ""
+
+
+@pytest.fixture
+def gen_config(monkeypatch):
+    """Record the `talosctl gen config` runs of the renderer."""
+    calls = []
+
+    def run(command, **kwargs):
+        calls.append(command)
+        return _gen_config(command, **kwargs)
+
+    monkeypatch.setattr('hm_cli.talos.run_command', run)
+    return calls
+
+
+@pytest.fixture
+def renderer(temp_dir, gen_config):
+    talos_dir = os.path.join(temp_dir, "talos")
+    os.makedirs(talos_dir)
+    for name, text in PATCHES.items():
+        with open(os.path.join(talos_dir, name), 'w') as f:
+            f.write(text)
+    secrets_file = os.path.join(temp_dir, "secrets.yaml")
+    with open(secrets_file, 'w') as f:
+        yaml.safe_dump(SECRETS, f)
+    return TalosRenderer(talos_dir, secrets_file, cache_file=os.path.join(temp_dir, "cache", "render.json"),
+                         base_dir=os.path.join(temp_dir, "cache", "base"))
+
+
+def _load(renderer, name):
+    node = next(node for node in CLUSTER['nodes'] if node['name'] == name)
+    with open(renderer.output_file(node)) as f:
+        return yaml.safe_load(f)
+
+
+def test_merge_config():
+    """Test mappings merge recursively, lists gain new entries and scalars are replaced."""
+    base = {'machine': {'certSANs': ['a'], 'install': {'disk': '/dev/sda', 'wipe': False}}}
+    merged = merge_config(base, {'machine': {'certSANs': ['a', 'b'], 'install': {'disk': '/dev/vda'}}})
+    assert merged == {'machine': {'certSANs': ['a', 'b'], 'install': {'disk': '/dev/vda', 'wipe': False}}}
+    assert base['machine']['certSANs'] == ['a']
+
+
+def test_render_template_unknown_variable():
+    """Test placeholders are substituted and unknown ones rejected."""
+    assert render_template("hostname: {{ .hostname }}", {'hostname': 'cp1'}) == "hostname: cp1"
+    with pytest.raises(TalosRenderError):
+        render_template("{{ .missing }}", {})
+
+
+def test_render_merges_patches(renderer):
+    """Test node configurations combine the generated base with the common, role and hardware patches."""
+    result = renderer.render(CLUSTER)
+    assert result.rendered == ['talos-cp1', 'talos-cp3', 'talos-w1']
+
+    cp1 = _load(renderer, 'talos-cp1')
+    assert cp1['machine']['network']['hostname'] == 'talos-cp1'
+    assert cp1['machine']['kubelet']['extraArgs']['node-ip'] == '192.168.1.101'
+    assert cp1['machine']['ca'] == {'crt': 'os-crt', 'key': 'os-key'}
+    assert cp1['cluster']['etcd']['ca']['key'] == 'etcd-key'
+    assert cp1['machine']['install']['disk'] == '/dev/sda'
+    assert cp1['machine']['install']['image'] == 'ghcr.io/siderolabs/installer:v1.7.0'
+    assert cp1['machine']['features']['kubePrism'] == {'enabled': True, 'port': 7445}
+    assert cp1['cluster']['discovery'] == {'enabled': True}
+
+    cp3 = _load(renderer, 'talos-cp3')
+    assert cp3['machine']['install']['disk'] == '/dev/vda'
+    assert cp3['machine']['certSANs'] == ['192.168.1.100', '127.0.0.1', '192.168.1.103']
+
+    worker = _load(renderer, 'talos-w1')
+    assert renderer.output_file(CLUSTER['nodes'][2]).endswith(os.path.join("workers", "talos-w1.yaml"))
+    assert worker['machine']['type'] == 'worker'
+    assert 'key' not in worker['machine']['ca']
+    assert 'etcd' not in worker['cluster']
+
+
+def test_base_generated_once_per_input_hash(renderer, gen_config):
+    """Test `talosctl gen config` runs once for both roles and again only when its inputs change."""
+    renderer.render(CLUSTER)
+    assert len(gen_config) == 1
+    args = shlex.split(gen_config[0])
+    assert args[:5] == ['talosctl', 'gen', 'config', 'homelab', 'https://192.168.1.100:6443']
+    assert args[args.index('--with-secrets') + 1] == renderer.secrets_file
+    assert args[args.index('--output-types') + 1] == 'controlplane,worker'
+
+    renderer.render(CLUSTER, force=True)
+    assert len(gen_config) == 1
+
+    renderer.render(dict(CLUSTER, kubernetes_version='v1.30.0'))
+    assert len(gen_config) == 2
+    assert '--kubernetes-version v1.30.0' in gen_config[1]
+
+
+def test_base_generation_failure(renderer, monkeypatch):
+    """Test a failing `talosctl gen config` is reported and leaves no base behind."""
+    monkeypatch.setattr('hm_cli.talos.run_command', lambda command, **kwargs: (1, "", "invalid secrets bundle"))
+    with pytest.raises(TalosRenderError, match="invalid secrets bundle"):
+        renderer.render(CLUSTER)
+    assert os.listdir(renderer.base_dir) == []
+
+
+def test_render_skips_unchanged_nodes(renderer):
+    """Test only nodes whose inputs changed are rendered again."""
+    renderer.render(CLUSTER)
+    assert renderer.render(CLUSTER).unchanged == ['talos-cp1', 'talos-cp3', 'talos-w1']
+
+    with open(os.path.join(renderer.talos_dir, 'worker-patch.yaml'), 'a') as f:
+        f.write("  install:\n    disk: /dev/nvme0n1\n")
+    result = renderer.render(CLUSTER)
+    assert result.rendered == ['talos-w1']
+    assert result.unchanged == ['talos-cp1', 'talos-cp3']
+
+    upgraded = dict(CLUSTER, talos_version='v1.7.5')
+    assert renderer.render(upgraded).rendered == ['talos-cp1', 'talos-cp3', 'talos-w1']
+
+
+def test_render_replaces_edited_output(renderer):
+    """Test an output changed on disk is rendered again."""
+    renderer.render(CLUSTER)
+    with open(renderer.output_file(CLUSTER['nodes'][0]), 'a') as f:
+        f.write("# edited\n")
+    assert renderer.render(CLUSTER).rendered == ['talos-cp1']
+
+
+def test_render_missing_secrets(renderer):
+    """Test a missing secrets bundle is reported."""
+    os.remove(renderer.secrets_file)
+    with pytest.raises(TalosRenderError, match="secrets bundle"):
+        renderer.render(CLUSTER)
+
+
+def test_node_install_disk_and_labels(renderer):
+    """Test the install disk and labels of a node override the patches and trigger a new render."""
+    renderer.render(CLUSTER)
+    nodes = [dict(CLUSTER['nodes'][0], install_disk='/dev/nvme0n1', labels={'zone': 'rack-1'})] + CLUSTER['nodes'][1:]
+    assert renderer.render(dict(CLUSTER, nodes=nodes)).rendered == ['talos-cp1']
+
+    cp1 = _load(renderer, 'talos-cp1')
+    assert cp1['machine']['install']['disk'] == '/dev/nvme0n1'
+    assert cp1['machine']['nodeLabels'] == {'zone': 'rack-1'}
+
+
+def test_pool_patch(renderer):
+    """Test workers of a pool get the pool patch after the role patch."""
+    with open(os.path.join(renderer.talos_dir, "compute-pool-patch.yaml"), 'w') as f:
+        f.write("machine:\n  kubelet:\n    extraArgs:\n      node-labels: role=compute\n")
+    worker = dict(CLUSTER['nodes'][2], pool='compute')
+    assert renderer.patch_files(worker) == ['common.yaml', 'worker-patch.yaml', 'compute-pool-patch.yaml']
+
+    renderer.render(dict(CLUSTER, nodes=[worker]))
+    w1 = _load(renderer, 'talos-w1')
+    assert w1['machine']['kubelet']['extraArgs']['node-labels'] == 'role=compute'
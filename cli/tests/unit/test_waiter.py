@@ -0,0 +1,142 @@
+"""
+Unit tests for the waiter module.
+"""
+
+import json
+import random
+
+from hm_cli.waiter import (
+    Condition,
+    Waiter,
+    api_reachable,
+    etcd_healthy,
+    git_revision,
+    kustomization_ready,
+    nodes_ready,
+)
+
+
+class FakeClock:
+    """Monotonic clock advanced only by the fake sleep."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _counting(name, ready_after):
+    """Condition that holds from its `ready_after`-th check on."""
+    calls = []
+
+    def check():
+        calls.append(None)
+        return len(calls) >= ready_after, f"check {len(calls)}"
+
+    return Condition(name, check), calls
+
+
+def _waiter(conditions, clock, timeout=100, **kwargs):
+    return Waiter(conditions, timeout, sleep=clock.sleep, clock=clock, rng=random.Random(0), **kwargs)
+
+
+def test_returns_as_soon_as_conditions_hold():
+    """Test the wait ends at the first poll where every condition holds."""
+    clock = FakeClock()
+    api, api_calls = _counting("api", 3)
+    nodes, node_calls = _counting("nodes", 1)
+    updates = []
+
+    result = _waiter([api, nodes], clock, on_update=lambda *update: updates.append(update[:2])).wait()
+
+    assert result.ok is True
+    assert (len(api_calls), len(node_calls)) == (3, 1)
+    assert list(result.met) == ["api", "nodes"]
+    assert [name for name, _ in updates] == ["api", "api", "api", "nodes"]
+    assert result.elapsed == sum(clock.sleeps)
+
+
+def test_backoff_grows_with_jitter_up_to_max_delay():
+    """Test delays double from the initial delay, stay within the jitter and are capped."""
+    clock = FakeClock()
+    condition, _ = _counting("api", 8)
+
+    _waiter([condition], clock, initial_delay=1, max_delay=8, jitter=0.2).wait()
+
+    for delay, expected in zip(clock.sleeps, [1, 2, 4, 8, 8, 8, 8]):
+        assert expected * 0.8 <= delay <= expected * 1.2
+    assert len(clock.sleeps) == 7
+
+
+def test_timeout_reports_pending_condition():
+    """Test a condition that never holds fails the wait once the timeout expires."""
+    clock = FakeClock()
+    never = Condition("etcd", lambda: (False, "1/3 healthy"))
+
+    result = _waiter([never], clock, timeout=30).wait()
+
+    assert result.ok is False
+    assert (result.pending, result.detail) == ("etcd", "1/3 healthy")
+    assert clock.now == 30
+
+
+def test_failing_check_counts_as_unmet():
+    """Test an exception raised by a check is retried like an unmet condition."""
+    clock = FakeClock()
+    answers = iter([ValueError("connection refused"), (True, "ok")])
+
+    def check():
+        answer = next(answers)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    assert _waiter([Condition("api", check)], clock).wait().ok is True
+
+
+def test_cluster_conditions():
+    """Test the API, node and etcd conditions parse kubectl and talosctl output."""
+    nodes = {'items': [
+        {'metadata': {'name': 'talos-cp1'}, 'status': {'conditions': [{'type': 'Ready', 'status': 'True'}]}},
+        {'metadata': {'name': 'talos-w1'}, 'status': {'conditions': [{'type': 'Ready', 'status': 'False'}]}},
+    ]}
+
+    def run(command):
+        if command == "kubectl get --raw /readyz":
+            return 0, "ok", ""
+        if command == "kubectl get nodes -o json":
+            return 0, json.dumps(nodes), ""
+        if "192.168.1.101" in command:
+            return 0, "STATE    Running\nHEALTH   OK\n", ""
+        return 1, "", "connection refused"
+
+    assert api_reachable(run).check() == (True, "ok")
+    assert nodes_ready(run, ['talos-cp1']).check() == (True, "1/1 Ready")
+    assert nodes_ready(run, ['talos-cp1', 'talos-w1']).check() == (False, "1/2 Ready, waiting for talos-w1")
+    assert etcd_healthy(run, ['192.168.1.101', '192.168.1.102']).check() == (
+        False, "1/2 healthy, waiting for 192.168.1.102"
+    )
+
+
+def test_kustomization_ready_at_revision():
+    """Test a Kustomization is only ready once it applied the expected revision."""
+    status = {'lastAppliedRevision': "main@sha1:old", 'conditions': [{'type': 'Ready', 'status': 'True'}]}
+
+    def run(command):
+        if "gitrepositories" in command:
+            return 0, json.dumps({'status': {'artifact': {'revision': "main@sha1:new"}}}), ""
+        return 0, json.dumps({'status': status}), ""
+
+    revision = git_revision(run)
+    assert revision == "main@sha1:new"
+    condition = kustomization_ready(run, "flux-system", revision=revision)
+    assert condition.check() == (False, "at main@sha1:old, waiting for main@sha1:new")
+
+    status['lastAppliedRevision'] = revision
+    assert condition.check() == (True, "Ready at main@sha1:new")
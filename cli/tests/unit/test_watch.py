@@ -0,0 +1,161 @@
+"""
+Unit tests for the watch module.
+"""
+
+import threading
+
+from hm_cli.kube import KubeApiError
+from hm_cli.watch import ResourceWatcher, ClusterWatch
+
+
+def _node(name, version):
+    """Create a minimal node object."""
+    return {'metadata': {'name': name, 'resourceVersion': version}}
+
+
+class _WatchKube:
+    """Backend stub serving scripted lists and watch streams."""
+
+    def __init__(self, lists, watches):
+        self.lists = list(lists)
+        self.watches = list(watches)
+        self.list_calls = 0
+        self.watch_versions = []
+
+    def list(self, kind, **kwargs):
+        self.list_calls += 1
+        return self.lists.pop(0)
+
+    def watch(self, kind, resource_version, timeout_seconds=None):
+        self.watch_versions.append(resource_version)
+        script = self.watches.pop(0) if self.watches else KubeApiError("done", status=500)
+        if isinstance(script, Exception):
+            raise script
+        for event in script:
+            yield event
+
+    def close(self):
+        pass
+
+
+def _run_until(watcher, condition):
+    """Run a watcher in a thread until the condition holds, then stop it."""
+    done = threading.Event()
+    original = watcher.on_change
+
+    def on_change():
+        original()
+        if condition():
+            watcher.stop.set()
+            done.set()
+
+    watcher.on_change = on_change
+    thread = threading.Thread(target=watcher.run, daemon=True)
+    thread.start()
+    assert done.wait(5)
+    thread.join(5)
+
+
+class TestResourceWatcher:
+    """Test cases for ResourceWatcher."""
+
+    def test_list_then_apply_events(self):
+        """Test that one list is followed by incremental events."""
+        kube = _WatchKube(
+            lists=[{'metadata': {'resourceVersion': '10'}, 'items': [_node('a', '5'), _node('b', '6')]}],
+            watches=[[
+                {'type': 'MODIFIED', 'object': _node('a', '11')},
+                {'type': 'BOOKMARK', 'object': {'metadata': {'resourceVersion': '12'}}},
+                {'type': 'DELETED', 'object': _node('b', '13')},
+                {'type': 'ADDED', 'object': _node('c', '14')},
+            ]],
+        )
+        watcher = ResourceWatcher(kube, 'nodes', retry_delay=0.01)
+        _run_until(watcher, lambda: [n['metadata']['name'] for n in watcher.items()] == ['a', 'c'])
+        assert kube.list_calls == 1
+        assert kube.watch_versions[0] == '10'
+        assert watcher.items()[0]['metadata']['resourceVersion'] == '11'
+
+    def test_resume_from_last_version(self):
+        """Test that a watch ended by the server resumes without relisting."""
+        kube = _WatchKube(
+            lists=[{'metadata': {'resourceVersion': '10'}, 'items': []}],
+            watches=[
+                [{'type': 'ADDED', 'object': _node('a', '11')}],
+                [{'type': 'ADDED', 'object': _node('b', '12')}],
+            ],
+        )
+        watcher = ResourceWatcher(kube, 'nodes', retry_delay=0.01)
+        _run_until(watcher, lambda: len(watcher.items()) == 2)
+        assert kube.list_calls == 1
+        assert kube.watch_versions[:2] == ['10', '11']
+
+    def test_expired_version_relists(self):
+        """Test that 410 Gone triggers a fresh list."""
+        kube = _WatchKube(
+            lists=[
+                {'metadata': {'resourceVersion': '10'}, 'items': [_node('a', '5')]},
+                {'metadata': {'resourceVersion': '50'}, 'items': [_node('z', '49')]},
+            ],
+            watches=[KubeApiError("too old resource version", status=410)],
+        )
+        watcher = ResourceWatcher(kube, 'nodes', retry_delay=0.01)
+        _run_until(watcher, lambda: [n['metadata']['name'] for n in watcher.items()] == ['z'])
+        assert kube.list_calls == 2
+        assert watcher.error is None
+
+    def test_missing_kind_is_empty(self):
+        """Test that a kind the cluster does not serve ends the watcher with no objects."""
+        class MissingKube:
+            def list(self, kind, **kwargs):
+                raise KubeApiError("not found", status=404)
+
+        watcher = ResourceWatcher(MissingKube(), 'kustomizations')
+        watcher.run()
+        assert watcher.synced
+        assert watcher.items() == []
+
+    def test_backend_without_watch_relists(self):
+        """Test that backends without watch support are relisted periodically."""
+        class ListOnlyKube:
+            def __init__(self):
+                self.calls = 0
+
+            def list(self, kind, **kwargs):
+                self.calls += 1
+                return {'items': [_node(f"n{self.calls}", str(self.calls))]}
+
+        kube = ListOnlyKube()
+        watcher = ResourceWatcher(kube, 'nodes', relist_interval=0.01)
+        _run_until(watcher, lambda: kube.calls >= 3)
+        assert watcher.items()[0]['metadata']['name'].startswith('n')
+
+
+class TestClusterWatch:
+    """Test cases for ClusterWatch."""
+
+    def test_snapshot_and_change_notification(self):
+        """Test that changes are signalled and exposed as a snapshot."""
+        class ListOnlyKube:
+            closed = False
+
+            def list(self, kind, **kwargs):
+                return {'items': [_node(f"{kind}-1", '1')]}
+
+            def close(self):
+                ListOnlyKube.closed = True
+
+        watch = ClusterWatch(ListOnlyKube(), kinds=('nodes', 'pods'), relist_interval=0.05).start()
+        try:
+            assert watch.wait_for_change(timeout=5)
+            for _ in range(100):
+                if all(w.synced for w in watch.watchers.values()):
+                    break
+                watch.wait_for_change(timeout=0.1)
+            snapshot = watch.snapshot()
+            assert snapshot.items('nodes')[0]['metadata']['name'] == 'nodes-1'
+            assert snapshot.items('pods')[0]['metadata']['name'] == 'pods-1'
+            assert watch.errors() == {}
+        finally:
+            watch.stop()
+        assert ListOnlyKube.closed